@@ -4,3 +4,10 @@ A polyrhythmic, polylogical programming language compiler.
 """
 
 __version__ = "0.1.0"
+
+from .program import CompiledProgram, compile_source, compile_file
+from .modules import ModuleLoader
+from .api import Runtime
+from .population import SharedProgram, InstanceState
+
+__all__ = ['Runtime', 'CompiledProgram', 'compile_source', 'compile_file', 'ModuleLoader', 'SharedProgram', 'InstanceState']
@@ -0,0 +1,8 @@
+"""Static analysis of HaackLang programs."""
+
+from .dependencies import RuleDependencies, rule_dependencies, analyze, aliases_of, partition
+from .liveness import TrackLiveness, analyze_liveness, prune_tracks
+from .shapes import ProgramShapes, infer_shapes
+
+__all__ = ['RuleDependencies', 'rule_dependencies', 'analyze', 'aliases_of', 'partition',
+           'TrackLiveness', 'analyze_liveness', 'prune_tracks', 'ProgramShapes', 'infer_shapes']
@@ -0,0 +1,249 @@
+"""
+Dependency analysis - read and write sets of rules, and independent rule components.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from ..parser.ast_nodes import (ASTNode, Assignment, BinaryOp, ContextSwitch, ExpressionStatement,
+                                FunctionCall, FunctionDecl, GuardStatement, IfStatement, MetaOp, ReturnStatement,
+                                RuleDecl, UnaryOp, Variable)
+from ..runtime.stdlib import BUILTINS
+
+# Built-in functions with effects outside the program state
+EFFECT_BUILTINS = frozenset({'print'})
+
+# Meta-operators that may read aggregates over every truth value
+AGGREGATE_OPERATORS = frozenset({'dom', 'meta'})
+
+# Built-in functions whose result depends on the global beat
+BEAT_BUILTINS = frozenset({'rhythm::beat'})
+
+
+@dataclass
+class RuleDependencies:
+    """
+    The program state a rule reads and writes.
+
+    Names are the truth values and variables the rule's statements refer to,
+    including those of the functions it calls (their parameters excluded).
+
+    Attributes:
+        index (int): The rule's position in the interpreter's rule list.
+        name (str): The rule name.
+        reads (FrozenSet[str]): The names the rule reads.
+        writes (FrozenSet[str]): The names the rule assigns.
+        calls (FrozenSet[str]): The user-defined functions the rule calls,
+            directly or indirectly.
+        effects (bool): Whether the rule has effects outside the program
+            state, such as printing, or calls a module function whose body
+            is not known yet.
+        aggregates (bool): Whether the rule reads meta-logic aggregates
+            (`@coh()`, `@dom`, `@meta`), which depend on every truth value.
+        beat (bool): Whether the rule reads the global beat (`rhythm::beat`).
+        contexts (FrozenSet[str]): The contexts the rule enters or exits.
+    """
+    index: int
+    name: str
+    reads: FrozenSet[str] = frozenset()
+    writes: FrozenSet[str] = frozenset()
+    calls: FrozenSet[str] = frozenset()
+    effects: bool = False
+    aggregates: bool = False
+    beat: bool = False
+    contexts: FrozenSet[str] = frozenset()
+
+    @property
+    def names(self) -> FrozenSet[str]:
+        """Every name the rule reads or writes."""
+        return self.reads | self.writes
+
+
+class _Collector:
+    """Walks statements and expressions, collecting what they read and write."""
+
+    def __init__(self, functions: Dict[str, FunctionDecl], aliases: Dict[str, str]):
+        self.functions = functions
+        self.aliases = aliases
+        self.reads: Set[str] = set()
+        self.writes: Set[str] = set()
+        self.calls: Set[str] = set()
+        self.effects = False
+        self.aggregates = False
+        self.beat = False
+        self.contexts: Set[str] = set()
+
+    def name(self, name: str, local: FrozenSet[str]) -> Optional[str]:
+        if name in local:
+            return None
+        return self.aliases.get(name, name)
+
+    def statements(self, body: Iterable[ASTNode], local: FrozenSet[str]):
+        for stmt in body:
+            self.statement(stmt, local)
+
+    def statement(self, node: ASTNode, local: FrozenSet[str]):
+        if isinstance(node, Assignment):
+            self.expression(node.value, local)
+            target = self.name(node.target, local)
+            if target is not None:
+                self.writes.add(target)
+                if node.track:
+                    # A track-qualified assignment keeps the other tracks
+                    self.reads.add(target)
+        elif isinstance(node, IfStatement):
+            self.expression(node.condition, local)
+            self.statements(node.then_body, local)
+            self.statements(node.else_body or [], local)
+        elif isinstance(node, GuardStatement):
+            self.expression(node.condition, local)
+            self.statements(node.body, local)
+        elif isinstance(node, ExpressionStatement):
+            self.expression(node.expression, local)
+        elif isinstance(node, ReturnStatement):
+            if node.value:
+                self.expression(node.value, local)
+        elif isinstance(node, ContextSwitch):
+            self.contexts.add(node.context)
+
+    def expression(self, node: ASTNode, local: FrozenSet[str]):
+        if isinstance(node, Variable):
+            name = self.name(node.name, local)
+            if name is not None:
+                self.reads.add(name)
+        elif isinstance(node, BinaryOp):
+            self.expression(node.left, local)
+            self.expression(node.right, local)
+        elif isinstance(node, UnaryOp):
+            self.expression(node.operand, local)
+        elif isinstance(node, FunctionCall):
+            for arg in node.args:
+                self.expression(arg, local)
+            if node.name in EFFECT_BUILTINS:
+                self.effects = True
+            elif node.name in BEAT_BUILTINS:
+                self.beat = True
+            elif node.name in self.functions:
+                if node.name not in self.calls:
+                    self.calls.add(node.name)
+                    func = self.functions[node.name]
+                    self.statements(func.body, frozenset(func.params))
+            elif '::' in node.name and node.name not in BUILTINS:
+                # A module function not compiled yet: its body is unknown
+                self.effects = True
+        elif isinstance(node, MetaOp):
+            if node.operator in AGGREGATE_OPERATORS or (node.operator == 'coh' and not node.args):
+                # Conservatively: @meta(x) may name a track rather than a truth value
+                self.aggregates = True
+            else:
+                for arg in node.args:
+                    self.expression(arg, local)
+
+
+def rule_dependencies(rule: RuleDecl, functions: Dict[str, FunctionDecl], index: int = 0,
+                      aliases: Optional[Dict[str, str]] = None) -> RuleDependencies:
+    """
+    Computes the read and write sets of a rule.
+
+    Args:
+        rule (RuleDecl): The rule.
+        functions (Dict[str, FunctionDecl]): The user-defined functions.
+        index (int): The rule's position in the rule list.
+        aliases (Optional[Dict[str, str]]): Maps names bound to the same truth
+            value object to one canonical name.
+
+    Returns:
+        RuleDependencies: The rule's dependencies.
+    """
+    collector = _Collector(functions, aliases or {})
+    collector.statements(rule.body, frozenset())
+    return RuleDependencies(index, rule.name, frozenset(collector.reads), frozenset(collector.writes),
+                            frozenset(collector.calls), collector.effects, collector.aggregates,
+                            collector.beat, frozenset(collector.contexts))
+
+
+def analyze(rules: Iterable[Tuple[RuleDecl, object]], functions: Dict[str, FunctionDecl],
+            aliases: Optional[Dict[str, str]] = None) -> List[RuleDependencies]:
+    """
+    Computes the dependencies of every rule of an interpreter.
+
+    Args:
+        rules (Iterable[Tuple[RuleDecl, Optional[Context]]]): The rules and
+            their declaring contexts, as in `Interpreter.rules`.
+        functions (Dict[str, FunctionDecl]): The user-defined functions.
+        aliases (Optional[Dict[str, str]]): Canonical names of aliased truth
+            values.
+
+    Returns:
+        List[RuleDependencies]: The dependencies, in rule order.
+    """
+    return [rule_dependencies(rule, functions, index, aliases)
+            for index, (rule, _context) in enumerate(rules)]
+
+
+def aliases_of(truthvalues: Dict[str, object]) -> Dict[str, str]:
+    """
+    Maps every truth value name to the first name bound to the same object.
+
+    Args:
+        truthvalues (Dict[str, TruthValue]): The interpreter's truth values.
+
+    Returns:
+        Dict[str, str]: The canonical name of each aliased name.
+    """
+    first: Dict[int, str] = {}
+    aliases: Dict[str, str] = {}
+    for name, tv in truthvalues.items():
+        canonical = first.setdefault(id(tv), name)
+        if canonical != name:
+            aliases[name] = canonical
+    return aliases
+
+
+def partition(dependencies: List[RuleDependencies]) -> List[List[int]]:
+    """
+    Partitions rules into independent components.
+
+    Two rules are in the same component when one writes a name the other
+    reads or writes; a rule reading meta-logic aggregates joins every rule
+    that writes anything. Rules in different components touch disjoint state, so
+    the components can run in any order, or concurrently, with the result of
+    running every rule in declaration order. Rules that only share reads stay
+    independent.
+
+    Args:
+        dependencies (List[RuleDependencies]): The rule dependencies.
+
+    Returns:
+        List[List[int]]: The components as lists of rule indices in rule
+            order, ordered by their first rule.
+    """
+    parent = list(range(len(dependencies)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int):
+        a, b = find(i), find(j)
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+
+    writers: Dict[str, int] = {}
+    for dep in dependencies:
+        for name in dep.writes:
+            union(dep.index, writers.setdefault(name, dep.index))
+    for dep in dependencies:
+        for name in dep.reads:
+            if name in writers:
+                union(dep.index, writers[name])
+        if dep.aggregates:
+            for writer in writers.values():
+                union(dep.index, writer)
+
+    components: Dict[int, List[int]] = {}
+    for dep in dependencies:
+        components.setdefault(find(dep.index), []).append(dep.index)
+    return sorted(components.values(), key=lambda indices: indices[0])
@@ -0,0 +1,287 @@
+"""
+Track liveness - which track components of each truth value are ever observed.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from ..parser.ast_nodes import (ASTNode, Assignment, BinaryOp, ExpressionStatement, FunctionCall,
+                                GuardStatement, IfStatement, MetaOp, ReturnStatement, UnaryOp, Variable)
+from ..runtime.stdlib import BUILTINS
+from .dependencies import aliases_of
+
+
+@dataclass
+class TrackLiveness:
+    """
+    The live track components of an interpreter's truth values.
+
+    A component is live if, after the program is loaded, a rule, meta block,
+    event rule or function can observe it: a track-qualified read, a guard or
+    condition, a conversion to a number (which reads the main track), a
+    print, a function or meta-operator argument, or a track-wise operation
+    whose result flows into a live component.
+
+    Attributes:
+        tracks (Tuple[str, ...]): The interpreter's tracks.
+        live (Dict[str, FrozenSet[str]]): The live tracks of each truth value
+            name; aliased names share one entry.
+        pruned_statements (FrozenSet[int]): The ids of rule assignments that
+            only write dead components and have no effects.
+        conservative (Optional[str]): Why every component was kept, if the
+            analysis could not be precise (e.g. meta-logic aggregates).
+    """
+    tracks: Tuple[str, ...]
+    live: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    pruned_statements: FrozenSet[int] = frozenset()
+    conservative: Optional[str] = None
+
+    @property
+    def total_components(self) -> int:
+        """The number of track components stored without pruning."""
+        return len(self.live) * len(self.tracks)
+
+    @property
+    def live_components(self) -> int:
+        """The number of live track components."""
+        return sum(len(tracks) for tracks in self.live.values())
+
+    def dead(self, name: str) -> List[str]:
+        """The dead tracks of a truth value, in track order."""
+        live = self.live.get(name, frozenset(self.tracks))
+        return [track for track in self.tracks if track not in live]
+
+    def report(self, limit: int = 10) -> str:
+        """
+        Formats how much storage and computation pruning eliminates.
+
+        Args:
+            limit (int): The maximum number of truth values to list.
+
+        Returns:
+            str: The formatted report.
+        """
+        total = self.total_components
+        dead = total - self.live_components
+        share = dead / total * 100 if total else 0.0
+        lines = [f"Track liveness: {self.live_components} of {total} track components live "
+                 f"({dead} pruned, {share:.0f}%), {len(self.pruned_statements)} rule assignments skipped"]
+        if self.conservative:
+            lines.append(f"  Every component kept: {self.conservative}")
+        pruned = [(name, self.dead(name)) for name in self.live if self.dead(name)]
+        pruned.sort(key=lambda item: len(item[1]), reverse=True)
+        for name, tracks in pruned[:limit]:
+            lines.append(f"  {name:<30} dead: {', '.join(tracks)}")
+        return '\n'.join(lines)
+
+
+class _Analyzer:
+    """Propagates track demand from observations back to the truth values read."""
+
+    def __init__(self, interpreter: Any, aliases: Dict[str, str]):
+        self.interpreter = interpreter
+        self.aliases = aliases
+        self.all = frozenset(interpreter.tracks)
+        # Converting a truth value to a number reads its main track
+        self.scalar = frozenset({'main'}) if 'main' in interpreter.tracks else self.all
+        self.tvs = set(interpreter.truthvalues)
+        self.live: Dict[str, Set[str]] = {aliases.get(name, name): set() for name in self.tvs}
+        self.changed = False
+        self.conservative: Optional[str] = None
+
+    def live_of(self, name: str) -> Set[str]:
+        return self.live[self.aliases.get(name, name)]
+
+    def mark(self, name: str, tracks: FrozenSet[str]):
+        if name not in self.tvs or not tracks:
+            return
+        live = self.live_of(name)
+        if not tracks <= live:
+            live |= tracks
+            self.changed = True
+
+    def pure(self, node: ASTNode) -> bool:
+        """Whether evaluating an expression has no effects beyond its value."""
+        if isinstance(node, FunctionCall):
+            return node.name in BUILTINS and all(self.pure(arg) for arg in node.args)
+        if isinstance(node, BinaryOp):
+            return self.pure(node.left) and self.pure(node.right)
+        if isinstance(node, UnaryOp):
+            return self.pure(node.operand)
+        if isinstance(node, MetaOp):
+            return all(self.pure(arg) for arg in node.args)
+        return True
+
+    def need(self, node: ASTNode, demand: FrozenSet[str]):
+        """Marks what evaluating an expression reads when `demand` tracks of its value are used."""
+        if isinstance(node, Variable):
+            self.mark(node.name, frozenset({node.track}) if node.track else demand)
+        elif isinstance(node, BinaryOp):
+            if node.operator not in ('and', 'or'):
+                demand = self.scalar
+            self.need(node.left, demand)
+            self.need(node.right, demand)
+        elif isinstance(node, UnaryOp):
+            self.need(node.operand, demand if node.operator == 'not' else self.scalar)
+        elif isinstance(node, FunctionCall):
+            builtin = BUILTINS.get(node.name)
+            if builtin is not None and builtin.trackwise:
+                # Numeric parameters read the main track of a truth value
+                if demand:
+                    demand = demand | self.scalar
+            else:
+                demand = self.all
+                if builtin is None and node.name != 'print' and node.name not in self.interpreter.functions:
+                    self.resolve(node)
+            for i, arg in enumerate(node.args):
+                if builtin is None or i not in builtin.symbols:
+                    self.need(arg, demand)
+        elif isinstance(node, MetaOp):
+            if node.operator in ('dom', 'meta') or (node.operator == 'coh' and not node.args):
+                self.conservative = "meta-logic aggregates read every truth value"
+            for arg in node.args:
+                self.need(arg, self.all)
+
+    def resolve(self, node: FunctionCall):
+        """Compiles a module function the rules refer to, so its body is analyzed."""
+        if '::' in node.name:
+            try:
+                self.interpreter.resolve_module_function(node)
+                return
+            except RuntimeError:
+                pass
+        self.conservative = f"the body of {node.name} is unknown"
+
+    def statements(self, body: Iterable[ASTNode], conditional: bool):
+        """
+        Marks what statements read.
+
+        With `conditional`, an effect-free assignment only reads its value
+        for the live components of its target (rule bodies); otherwise every
+        value is read in full (function bodies, which run in any context).
+        """
+        for stmt in body:
+            if isinstance(stmt, Assignment):
+                target = stmt.target
+                if target not in self.tvs:
+                    self.need(stmt.value, self.all)
+                elif stmt.track:
+                    if not conditional or stmt.track in self.live_of(target) or not self.pure(stmt.value):
+                        self.need(stmt.value, self.scalar)
+                else:
+                    demand = frozenset(self.live_of(target)) if conditional else self.all
+                    if demand or not self.pure(stmt.value):
+                        self.need(stmt.value, demand)
+            elif isinstance(stmt, IfStatement):
+                # if!! compares every track of its condition to decide whether to fork
+                self.need(stmt.condition, self.all if stmt.paraconsistent else self.scalar)
+                self.statements(stmt.then_body, conditional)
+                self.statements(stmt.else_body or [], conditional)
+            elif isinstance(stmt, GuardStatement):
+                self.need(stmt.condition, frozenset({stmt.track}) & self.all or self.all)
+                self.statements(stmt.body, conditional)
+            elif isinstance(stmt, ExpressionStatement):
+                self.need(stmt.expression, frozenset())
+            elif isinstance(stmt, ReturnStatement):
+                if stmt.value:
+                    self.need(stmt.value, self.all)
+
+    def pruned(self, body: Iterable[ASTNode], found: Set[int]):
+        """Collects the rule assignments that only write dead components."""
+        for stmt in body:
+            if isinstance(stmt, Assignment):
+                if stmt.target in self.tvs and self.pure(stmt.value):
+                    live = self.live_of(stmt.target)
+                    if (stmt.track not in live) if stmt.track else not live:
+                        found.add(id(stmt))
+            elif isinstance(stmt, IfStatement):
+                self.pruned(stmt.then_body, found)
+                self.pruned(stmt.else_body or [], found)
+            elif isinstance(stmt, GuardStatement):
+                self.pruned(stmt.body, found)
+
+
+def analyze_liveness(interpreter: Any, keep: Iterable[str] = ()) -> TrackLiveness:
+    """
+    Computes which track components of an interpreter's truth values are live.
+
+    The analysis covers what runs after the program is loaded: the rules,
+    meta blocks, event rules and the functions they call. It is conservative: anything it
+    cannot follow (function arguments, prints, meta-operators) keeps every
+    track, and reading aggregates with @dom, @meta or @coh() keeps every
+    component of every truth value.
+
+    Args:
+        interpreter (Interpreter): The interpreter, with its program loaded.
+        keep (Iterable[str]): Truth values observed from outside the program
+            (traces, host reads); all their tracks stay live.
+
+    Returns:
+        TrackLiveness: The live components.
+    """
+    aliases = aliases_of(interpreter.truthvalues)
+    analyzer = _Analyzer(interpreter, aliases)
+    for name in keep:
+        analyzer.mark(name, analyzer.all)
+    if interpreter.meta is not None:
+        analyzer.conservative = "the meta-logic engine observes every truth value"
+
+    analyzer.changed = True
+    while analyzer.changed and analyzer.conservative is None:
+        analyzer.changed = False
+        for func in list(interpreter.functions.values()):
+            analyzer.statements(func.body, conditional=False)
+        for rule, _context in interpreter.rules:
+            analyzer.statements(rule.body, conditional=True)
+        for block, _context in interpreter.meta_rules:
+            analyzer.statements(block.body, conditional=True)
+        for event, _context in interpreter.events:
+            analyzer.need(event.condition, analyzer.scalar)
+            analyzer.statements(event.body + (event.else_body or []), conditional=True)
+
+    tracks = tuple(interpreter.tracks)
+    if analyzer.conservative is not None:
+        return TrackLiveness(tracks, {name: analyzer.all for name in analyzer.live},
+                             conservative=analyzer.conservative)
+    pruned: Set[int] = set()
+    for rule, _context in interpreter.rules:
+        analyzer.pruned(rule.body, pruned)
+    for block, _context in interpreter.meta_rules:
+        analyzer.pruned(block.body, pruned)
+    for event, _context in interpreter.events:
+        analyzer.pruned(event.body + (event.else_body or []), pruned)
+    return TrackLiveness(tracks, {name: frozenset(live) for name, live in analyzer.live.items()},
+                         frozenset(pruned))
+
+
+def prune_tracks(interpreter: Any, keep: Iterable[str] = ()) -> TrackLiveness:
+    """
+    Drops the dead track components of an interpreter's truth values.
+
+    Dead components are removed from each truth value's storage, beat
+    assignments compute only the firing live tracks of their target, and
+    rule assignments that only write dead components are skipped. Values
+    the program can observe are unchanged. Reading a pruned component from
+    the host raises KeyError like any unknown track; pass such truth values
+    in `keep`. Truth values first bound later, or restored from a
+    checkpoint, have every track again.
+
+    Args:
+        interpreter (Interpreter): The interpreter, with its program loaded.
+        keep (Iterable[str]): Truth values observed from outside the program.
+
+    Returns:
+        TrackLiveness: The analysis the pruning applied.
+    """
+    liveness = analyze_liveness(interpreter, keep)
+    if liveness.conservative is not None:
+        return liveness
+    aliases = aliases_of(interpreter.truthvalues)
+    for name, tv in interpreter.truthvalues.items():
+        if name in aliases:
+            continue
+        live = liveness.live[name]
+        if len(live) < len(tv.values):
+            tv.values = {track: value for track, value in tv.values.items() if track in live}
+    interpreter.pruned_statements = liveness.pruned_statements
+    return liveness
@@ -0,0 +1,342 @@
+"""
+Shape inference - which expressions evaluate to numbers and which to truth vectors.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ..parser.ast_nodes import (ASTNode, Assignment, BinaryOp, BoolLiteral, ContextDecl, Expression,
+                                ExpressionStatement, FunctionCall, FunctionDecl, GuardStatement,
+                                IfStatement, MetaDecl, MetaOp, NumberLiteral, Program, ReturnStatement,
+                                RuleDecl, Shape, TruthValueDecl, UnaryOp, Variable, WhenDecl)
+from ..runtime.stdlib import BUILTINS
+
+SCALAR, TRUTHVECTOR, TRACK, DYNAMIC = Shape.SCALAR, Shape.TRUTHVECTOR, Shape.TRACK, Shape.DYNAMIC
+
+# The values a name can be bound to, by the shape of the value assigned
+_PHASES = {
+    SCALAR: frozenset({SCALAR}),
+    TRACK: frozenset({SCALAR}),
+    TRUTHVECTOR: frozenset({TRUTHVECTOR}),
+    DYNAMIC: frozenset({SCALAR, TRUTHVECTOR}),
+}
+
+
+@dataclass
+class ProgramShapes:
+    """
+    The inferred shapes of a program's expressions.
+
+    Attributes:
+        counts (Dict[Shape, int]): The number of expressions of each shape.
+        errors (List[str]): The shape errors found, with their positions.
+    """
+    counts: Dict[Shape, int] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        """The number of expressions labelled."""
+        return sum(self.counts.values())
+
+    @property
+    def static(self) -> int:
+        """The number of expressions whose shape is known before the run."""
+        return self.total - self.counts.get(DYNAMIC, 0)
+
+    def report(self) -> str:
+        """
+        Formats the shape counts.
+
+        Returns:
+            str: One line with the number of expressions of each shape.
+        """
+        shapes = ', '.join(f"{self.counts.get(shape, 0)} {shape.value}" for shape in Shape)
+        return f"Shapes: {self.static} of {self.total} expressions static ({shapes})"
+
+    def check(self):
+        """
+        Raises the shape errors, if any.
+
+        Raises:
+            TypeError: With every error found, one per line.
+        """
+        if self.errors:
+            raise TypeError('\n'.join(self.errors))
+
+
+def _join(a: Optional[Shape], b: Optional[Shape]) -> Optional[Shape]:
+    """The shape of a value that has shape a or b; None is not known yet."""
+    if a is None or a is b:
+        return b
+    if b is None:
+        return a
+    if a in (SCALAR, TRACK) and b in (SCALAR, TRACK):
+        return SCALAR
+    return DYNAMIC
+
+
+def _broadcast(shapes: Iterable[Optional[Shape]]) -> Optional[Shape]:
+    """The shape of a track-wise operation's result: a truth vector if any operand is one."""
+    shapes = set(shapes)
+    if DYNAMIC in shapes:
+        return DYNAMIC
+    if None in shapes:
+        return None
+    return TRUTHVECTOR if TRUTHVECTOR in shapes else SCALAR
+
+
+class _Inference:
+    """
+    Infers the shapes of the names a program binds, to a fixpoint.
+
+    Truth values and variables share one namespace: a name read as a truth
+    value on one run and a number on another is dynamic. Once a name is a
+    truth value it stays one (assigning a number updates its tracks), so
+    numbers assigned after a truth value declaration do not make it dynamic.
+    """
+
+    def __init__(self, program: Program, interpreter: Any):
+        self.functions: Dict[str, List[FunctionDecl]] = {}
+        # Parameters are bound by calls; one never called can hold anything
+        self.params: Set[str] = set()
+        self._collect(program.declarations)
+        self.phases: Dict[str, Set[Shape]] = {}
+        self.returns: Dict[int, Optional[Shape]] = {}
+        self.initial: Set[str] = set(interpreter.truthvalues)
+        for name in interpreter.truthvalues:
+            self.phases[name] = {TRUTHVECTOR}
+        for name, value in interpreter.variables.items():
+            if name not in interpreter.truthvalues:
+                self.phases[name] = set(_PHASES[SCALAR if isinstance(value, (int, float)) else DYNAMIC])
+        self.declared: Set[str] = set()
+        # Calls to functions whose bodies are not in the program; they can
+        # bind any name to a truth value
+        self.opaque = False
+        self.changed = False
+        self.final = False
+        self.result = ProgramShapes()
+
+    def _collect(self, declarations: Iterable[ASTNode]):
+        for decl in declarations:
+            if isinstance(decl, FunctionDecl):
+                self.functions.setdefault(decl.name, []).append(decl)
+                self.params.update(decl.params)
+            elif isinstance(decl, ContextDecl):
+                self._collect(decl.body)
+
+    def run(self, declarations: Iterable[ASTNode]):
+        """Walks the program once, in execution order."""
+        self.declared = set(self.initial)
+        for decl in declarations:
+            self.declaration(decl, conditional=False)
+
+    def error(self, message: str, node: ASTNode):
+        if self.final:
+            error = f"Type error at {node.line}:{node.column}: {message}"
+            if error not in self.result.errors:
+                self.result.errors.append(error)
+
+    def bind(self, name: str, shape: Optional[Shape]):
+        if shape is None or self.final or name in self.declared:
+            return
+        phases = self.phases.setdefault(name, set())
+        new = _PHASES[shape]
+        if not new <= phases:
+            phases |= new
+            self.changed = True
+
+    def name(self, name: str) -> Optional[Shape]:
+        phases = self.phases.get(name)
+        if not phases:
+            return DYNAMIC if self.final else None
+        if len(phases) > 1:
+            return DYNAMIC
+        if TRUTHVECTOR in phases:
+            return TRUTHVECTOR
+        # Opaque functions can rebind a variable to a truth value
+        return DYNAMIC if self.opaque else SCALAR
+
+    def check_truthvalue(self, name: str, node: ASTNode):
+        phases = self.phases.get(name)
+        if (phases and TRUTHVECTOR not in phases) or (not phases and not self.opaque
+                                                      and name not in self.params):
+            self.error(f"{name} is not a truth value", node)
+
+    def declaration(self, node: ASTNode, conditional: bool):
+        if isinstance(node, TruthValueDecl):
+            if node.initial_value is not None:
+                self.expression(node.initial_value)
+            self.bind(node.name, TRUTHVECTOR)
+            if not conditional:
+                self.declared.add(node.name)
+        elif isinstance(node, ContextDecl):
+            for decl in node.body:
+                self.declaration(decl, conditional)
+        elif isinstance(node, (RuleDecl, MetaDecl)):
+            self.statements(node.body)
+        elif isinstance(node, WhenDecl):
+            self.expression(node.condition)
+            self.statements(node.body)
+            self.statements(node.else_body or [])
+        elif isinstance(node, FunctionDecl):
+            self.function(node)
+        elif isinstance(node, Assignment):
+            shape = self.assignment(node)
+            if shape is TRUTHVECTOR and not node.track and not conditional:
+                self.declared.add(node.target)
+        elif isinstance(node, (IfStatement, GuardStatement, ExpressionStatement, ReturnStatement)):
+            self.statements([node])
+
+    def statements(self, body: Iterable[ASTNode]):
+        for stmt in body:
+            if isinstance(stmt, Assignment):
+                self.assignment(stmt)
+            elif isinstance(stmt, IfStatement):
+                self.expression(stmt.condition)
+                self.statements(stmt.then_body)
+                self.statements(stmt.else_body or [])
+            elif isinstance(stmt, GuardStatement):
+                self.expression(stmt.condition)
+                self.statements(stmt.body)
+            elif isinstance(stmt, ExpressionStatement):
+                self.expression(stmt.expression)
+            elif isinstance(stmt, ReturnStatement):
+                if stmt.value is not None:
+                    self.expression(stmt.value)
+            else:
+                self.declaration(stmt, conditional=True)
+
+    def assignment(self, node: Assignment) -> Optional[Shape]:
+        shape = self.expression(node.value)
+        if node.track:
+            self.check_truthvalue(node.target, node)
+            if shape is TRUTHVECTOR:
+                self.error(f"Cannot assign a truth vector to track {node.target}.{node.track}", node)
+        else:
+            self.bind(node.target, shape)
+        return shape
+
+    def function(self, node: FunctionDecl):
+        # A function without a return value returns 0.0
+        shape = SCALAR
+        returned = False
+        for stmt in node.body:
+            if not returned and isinstance(stmt, ReturnStatement):
+                returned = True
+                if stmt.value is not None:
+                    shape = self.expression(stmt.value)
+            else:
+                self.statements([stmt])
+        shape = _join(self.returns.get(id(node)), shape)
+        if shape is not self.returns.get(id(node)):
+            self.returns[id(node)] = shape
+            self.changed = True
+
+    def expression(self, node: Expression) -> Optional[Shape]:
+        shape = self._expression(node)
+        if self.final:
+            node.shape = shape
+            self.result.counts[shape] = self.result.counts.get(shape, 0) + 1
+        return shape
+
+    def _expression(self, node: Expression) -> Optional[Shape]:
+        if isinstance(node, (NumberLiteral, BoolLiteral)):
+            return SCALAR
+        if isinstance(node, Variable):
+            if node.track:
+                self.check_truthvalue(node.name, node)
+                return TRACK
+            return self.name(node.name)
+        if isinstance(node, BinaryOp):
+            left = self.expression(node.left)
+            right = self.expression(node.right)
+            if node.operator in ('and', 'or'):
+                return _broadcast((left, right))
+            return SCALAR
+        if isinstance(node, UnaryOp):
+            operand = self.expression(node.operand)
+            return _broadcast((operand,)) if node.operator == 'not' else SCALAR
+        if isinstance(node, FunctionCall):
+            return self.call(node)
+        if isinstance(node, MetaOp):
+            return self.meta_op(node)
+        return DYNAMIC
+
+    def call(self, node: FunctionCall) -> Optional[Shape]:
+        builtin = BUILTINS.get(node.name)
+        if builtin is not None:
+            shapes = {i: self.expression(arg) for i, arg in enumerate(node.args) if i not in builtin.symbols}
+            if not builtin.vectors:
+                return SCALAR
+            return _broadcast(shape for i, shape in shapes.items() if i in builtin.vectors)
+        shapes = [self.expression(arg) for arg in node.args]
+        if node.name == 'print':
+            return SCALAR
+        decls = self.functions.get(node.name)
+        if decls is None:
+            if not self.opaque:
+                self.opaque = True
+                self.changed = True
+            return DYNAMIC
+        shape = None
+        for decl in decls:
+            for param, arg in zip(decl.params, shapes):
+                self.bind(param, arg)
+            shape = _join(shape, self.returns.get(id(decl)))
+        if shape is None and self.final:
+            return DYNAMIC
+        return SCALAR if shape is TRACK else shape
+
+    def meta_op(self, node: MetaOp) -> Optional[Shape]:
+        args = node.args
+        if node.operator in ('blend', 'resolve'):
+            shapes = [self.expression(arg) for arg in args]
+            # @blend reads its weight as a number
+            return _broadcast(shapes[:2] if node.operator == 'blend' else shapes)
+        if node.operator in ('coh', 'meta'):
+            for arg in args:
+                # @meta(period(t)) and @meta(phase(t)) name a track
+                if not (isinstance(arg, FunctionCall) and arg.name in ('period', 'phase')):
+                    self.expression(arg)
+            return SCALAR
+        if node.operator == 'dom':
+            return SCALAR
+        return DYNAMIC
+
+
+def infer_shapes(program: Program, interpreter: Any) -> ProgramShapes:
+    """
+    Labels every expression of a program with the shape of its value.
+
+    Each expression's `shape` becomes scalar (a number), truthvector (a
+    truth value), track (a number read from one track of a truth value) or
+    dynamic (either, depending on the run). The interpreter evaluates
+    expressions of a static shape without checking their operands' types
+    and broadcasts numbers into truth vectors without allocating them.
+
+    Shapes are inferred from the program and the interpreter's state before
+    the program is loaded. Labels are a function of those alone, so a program
+    shared by several fresh interpreters is labelled the same for each.
+    Module functions are not labelled and stay dynamic.
+
+    Shape errors are collected rather than raised: assigning a truth vector
+    to a track (`x.slow = a and b`) and reading or assigning a track of a
+    name that is never a truth value.
+
+    Args:
+        program (Program): The parsed program.
+        interpreter (Interpreter): The interpreter the program is loaded
+            into, for the names it already binds.
+
+    Returns:
+        ProgramShapes: The shape counts and errors.
+    """
+    inference = _Inference(program, interpreter)
+    inference.changed = True
+    while inference.changed:
+        inference.changed = False
+        inference.run(program.declarations)
+    inference.final = True
+    inference.run(program.declarations)
+    return inference.result
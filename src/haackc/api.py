@@ -0,0 +1,187 @@
+"""
+Embeddable runtime - host a compiled HaackLang program inside a Python process.
+"""
+
+import io
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+from .interpreter import Interpreter
+from .program import CompiledProgram, compile_file, compile_source
+
+
+class Runtime:
+    """
+    A running HaackLang program driven from Python.
+
+    The program is compiled once (or taken precompiled, possibly shared with
+    other runtimes) and loaded into its own interpreter; afterwards the host
+    advances beats, writes inputs and reads truth values without any lexing
+    or parsing.
+
+    Example:
+        runtime = Runtime(source)
+        runtime.set('threat', 'main', 0.9)
+        runtime.step(10)
+        fear = runtime.get('fear', 'main')
+
+    Attributes:
+        program (CompiledProgram): The program being run.
+        interpreter (Interpreter): The interpreter holding the program state.
+    """
+
+    def __init__(self, program: Union[str, CompiledProgram], capture_output: bool = True):
+        """
+        Initializes a Runtime and runs the program's top level.
+
+        Args:
+            program (Union[str, CompiledProgram]): HaackLang source, or a
+                compiled program.
+            capture_output (bool): Collect `print` output in a buffer, read
+                with `read_output`, instead of writing it to stdout.
+
+        Raises:
+            SyntaxError: If the source does not compile.
+            RuntimeError: If the program fails while loading.
+        """
+        if isinstance(program, str):
+            program = compile_source(program)
+        self.program = program
+        self.interpreter = Interpreter()
+        self._output = io.StringIO() if capture_output else None
+        self.interpreter.output = self._output
+        self.interpreter.interpret(program.ast)
+
+    @classmethod
+    def from_file(cls, path: str, cache_dir: Optional[str] = None,
+                  capture_output: bool = True) -> 'Runtime':
+        """
+        Creates a Runtime for a source file.
+
+        Args:
+            path (str): The source file.
+            cache_dir (Optional[str]): A directory of compiled artifacts to
+                reuse and populate.
+            capture_output (bool): Collect `print` output in a buffer.
+
+        Returns:
+            Runtime: The runtime.
+        """
+        return cls(compile_file(path, cache_dir), capture_output)
+
+    @property
+    def beat(self) -> int:
+        """The number of beats executed."""
+        return self.interpreter.global_beat
+
+    def step(self, n: int = 1) -> int:
+        """
+        Executes beats.
+
+        Args:
+            n (int): The number of beats.
+
+        Returns:
+            int: The global beat after stepping.
+        """
+        self.interpreter.run(n)
+        return self.interpreter.global_beat
+
+    def _truthvalue(self, tv_name: str, track_name: Optional[str] = None):
+        tv = self.interpreter.truthvalues.get(tv_name)
+        if tv is None:
+            raise KeyError(f"Unknown truth value: {tv_name}")
+        if track_name is not None and track_name not in tv.values:
+            raise KeyError(f"Unknown track: {track_name}")
+        return tv
+
+    def set(self, tv_name: str, track_name: str, value: float):
+        """
+        Sets one track of a truth value.
+
+        Args:
+            tv_name (str): The truth value.
+            track_name (str): The track.
+            value (float): The value, clamped by the track's logic.
+
+        Raises:
+            KeyError: If the truth value or track does not exist.
+        """
+        self._truthvalue(tv_name, track_name).set(track_name, value)
+
+    def set_many(self, values: Mapping[Union[str, Tuple[str, str]], float]):
+        """
+        Sets several truth value tracks at once.
+
+        All targets are checked before any is written, so a bad name leaves
+        the state unchanged.
+
+        Args:
+            values (Mapping[Union[str, Tuple[str, str]], float]): Values keyed
+                by `"tv.track"` or `(tv, track)`.
+
+        Raises:
+            KeyError: If a truth value or track does not exist.
+            ValueError: If a key is not track-qualified.
+        """
+        updates = []
+        for key, value in values.items():
+            if isinstance(key, str):
+                tv_name, _, track_name = key.partition('.')
+                if not track_name:
+                    raise ValueError(f"Expected a track-qualified name (tv.track): {key}")
+            else:
+                tv_name, track_name = key
+            updates.append((self._truthvalue(tv_name, track_name), track_name, value))
+        for tv, track_name, value in updates:
+            tv.set(track_name, value)
+
+    def get(self, tv_name: str, track_name: Optional[str] = None) -> Union[float, Dict[str, float]]:
+        """
+        Reads a truth value.
+
+        Args:
+            tv_name (str): The truth value.
+            track_name (Optional[str]): The track; None reads every track.
+
+        Returns:
+            Union[float, Dict[str, float]]: The track's value, or all values
+                by track.
+
+        Raises:
+            KeyError: If the truth value or track does not exist.
+        """
+        tv = self._truthvalue(tv_name, track_name)
+        if track_name is None:
+            return dict(tv.values)
+        return tv.values[track_name]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Copies the observable state.
+
+        Returns:
+            Dict[str, Any]: The beat, every truth value by track, and the
+                scalar variables.
+        """
+        interp = self.interpreter
+        return {
+            'beat': interp.global_beat,
+            'truthvalues': {name: dict(tv.values) for name, tv in interp.truthvalues.items()},
+            'variables': {name: value for name, value in interp.variables.items()
+                          if isinstance(value, (int, float))},
+        }
+
+    def read_output(self) -> str:
+        """
+        Takes the captured `print` output.
+
+        Returns:
+            str: Everything printed since the last call; empty when output
+                is not captured.
+        """
+        if self._output is None:
+            return ''
+        text = self._output.getvalue()
+        self._output.seek(0)
+        self._output.truncate()
+        return text
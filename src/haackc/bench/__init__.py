@@ -0,0 +1,7 @@
+"""Benchmark suite for the HaackLang toolchain."""
+
+from .programs import scaled_program, stdlib_program
+from .workload import WorkloadSpec, WorkloadGenerator, generate
+from .suite import BenchResult, Comparison, run_benchmark, run_suite, compare
+
+__all__ = ['scaled_program', 'stdlib_program', 'WorkloadSpec', 'WorkloadGenerator', 'generate', 'BenchResult', 'Comparison', 'run_benchmark', 'run_suite', 'compare']
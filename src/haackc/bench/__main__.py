@@ -0,0 +1,91 @@
+"""
+Benchmark CLI - `python -m haackc.bench`.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from .suite import (BENCHMARKS, DEFAULT_BEATS, DEFAULT_REPEAT, DEFAULT_SIZES, PROGRAMS,
+                    BenchResult, compare, run_suite)
+
+
+def _print_result(result: BenchResult):
+    """Prints one benchmark result as a table row."""
+    print(f"{result.key:<26} {result.median * 1000:>10.3f} ms  ±{result.noise * 100:>5.1f}%  "
+          f"{result.throughput:>14,.0f} {result.unit}/s  {result.peak_bytes / 1024:>10,.0f} KiB peak")
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command-line interface for the benchmark suite.
+
+    Args:
+        argv (Optional[List[str]]): The arguments; defaults to the process arguments.
+    """
+    parser = argparse.ArgumentParser(prog='python -m haackc.bench',
+                                     description='Benchmark the HaackLang lexer, parser, interpreter and beat loop')
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS), metavar='AREA',
+                        help=f"Benchmark area to run (repeatable): {', '.join(BENCHMARKS)}")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='Comma-separated program sizes (number of truth values)')
+    parser.add_argument('--program', choices=sorted(PROGRAMS), default='scaled',
+                        help='Program family: fixed-shape scaled programs, seeded generated workloads, '
+                             'or standard library calls (stdlib) and their user-fn equivalents (stdlib-fn)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed runs per benchmark')
+    parser.add_argument('--beats', type=int, default=DEFAULT_BEATS, help='Beats per beat-loop run')
+    parser.add_argument('--quick', action='store_true', help='Small sizes and few runs, for smoke testing')
+    parser.add_argument('--save', metavar='FILE', help='Write the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='Compare against a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Minimum relative slowdown reported as a regression (default: 0.10)')
+    parser.add_argument('--noise-factor', type=float, default=3.0,
+                        help='Noise widths a change must exceed to be flagged (default: 3.0)')
+
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    repeat = args.repeat
+    beats = args.beats
+    if args.quick:
+        sizes = [min(size, 100) for size in sizes[:1]]
+        repeat = min(repeat, 3)
+        beats = min(beats, 5)
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot read baseline {args.compare}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    print(f"{'benchmark':<26} {'median':>13}  {'noise':>7}  {'throughput':>20}  {'memory':>15}")
+    report = run_suite(args.only or tuple(BENCHMARKS), sizes, repeat, beats, args.program,
+                       progress=_print_result)
+
+    if args.save:
+        directory = os.path.dirname(args.save)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.save}")
+
+    if baseline is not None:
+        comparisons = compare(report, baseline, args.threshold, args.noise_factor)
+        print()
+        print(f"{'benchmark':<26} {'baseline':>12} {'current':>12} {'change':>9} {'allowed':>9}  status")
+        for c in comparisons:
+            print(f"{c.key:<26} {c.baseline * 1000:>9.3f} ms {c.current * 1000:>9.3f} ms "
+                  f"{c.change * 100:>+8.1f}% {c.allowed * 100:>8.1f}%  {c.status}")
+        if any(c.status == 'regression' for c in comparisons):
+            print("Performance regression detected", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Scaled HaackLang programs used by the benchmark suite.
+"""
+
+
+def scaled_program(size: int) -> str:
+    """
+    Builds a program whose declarations and rules grow linearly with `size`.
+
+    Args:
+        size (int): The number of truth values; the program has about half
+            as many rules and a function per ten truth values.
+
+    Returns:
+        str: The HaackLang source.
+    """
+    lines = [
+        "track main period 1 using classical",
+        "track slow period 4 using fuzzy",
+        "track syncop period 7 phase 2 using paraconsistent",
+        "",
+    ]
+    for i in range(size):
+        lines.append(f"tv v{i} = {(i % 10) / 10:.1f}")
+    for i in range(0, size, 10):
+        lines.append(f"fn f{i}(a, b) {{")
+        lines.append("    let r = a and not b")
+        lines.append("    return r")
+        lines.append("}")
+    for i in range(0, size - 1, 2):
+        fn = f"f{i - i % 10}"
+        lines.append(f"rule r{i} {{")
+        lines.append(f"    v{i} = v{i} and not v{i + 1} or v{(i * 7) % size}")
+        lines.append(f"    guard slow v{i + 1} > 0.3 {{")
+        lines.append(f"        v{i + 1}.slow = v{i + 1}.slow * 0.9 + 0.05")
+        lines.append("    }")
+        if i % 10 == 0:
+            lines.append(f"    v{i + 1} = {fn}(v{i}, v{i + 1})")
+        lines.append("}")
+    return '\n'.join(lines) + '\n'
+
+
+STDLIB_TRACKS = ('main', 'slow', 'syncop')
+
+
+def stdlib_program(size: int, native: bool = True) -> str:
+    """
+    Builds a program whose rules update whole truth vectors with standard library functions.
+
+    With `native=False` the same updates are written the way a program
+    without the native standard library must: user-defined scalar functions
+    called once per track. Both variants compute identical states, so their
+    beat throughput compares native builtins with the equivalent `fn`s.
+
+    Args:
+        size (int): The number of truth values; the program has half as
+            many rules.
+        native (bool): Whether to call the native builtins.
+
+    Returns:
+        str: The HaackLang source.
+    """
+    lines = [
+        "track main period 1 using classical",
+        "track slow period 4 using fuzzy",
+        "track syncop period 7 phase 2 using paraconsistent",
+        "",
+    ]
+    for i in range(size):
+        lines.append(f"tv v{i} = {(i % 10) / 10:.1f}")
+    if not native:
+        lines.extend([
+            "fn blend(a, b, w) {",
+            "    return a * (1 - w) + b * w",
+            "}",
+            "fn drift(a, rate) {",
+            "    return a * (1 - rate)",
+            "}",
+            "fn smooth_step(x, k) {",
+            "    let t = (x - 0.5 + k) / (2 * k)",
+            "    if t < 0 {",
+            "        t = 0",
+            "    }",
+            "    if t > 1 {",
+            "        t = 1",
+            "    }",
+            "    return t * t * (3 - 2 * t)",
+            "}",
+        ])
+    for i in range(0, size - 1, 2):
+        a, b = f"v{i}", f"v{i + 1}"
+        lines.append(f"rule r{i} {{")
+        if native:
+            lines.append(f"    {a} = tv::blend({a}, {b}, 0.3)")
+            lines.append(f"    {b} = fuzzy::smooth_step(tv::drift({b}, 0.05), 0.5)")
+        else:
+            for track in STDLIB_TRACKS:
+                lines.append(f"    {a}.{track} = blend({a}.{track}, {b}.{track}, 0.3)")
+            for track in STDLIB_TRACKS:
+                lines.append(f"    {b}.{track} = smooth_step(drift({b}.{track}, 0.05), 0.5)")
+        lines.append("}")
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,290 @@
+"""
+Benchmark suite - lexer, parser, interpreter and beat-loop throughput.
+"""
+
+import gc
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..lexer import Lexer
+from ..parser import Parser
+from ..parser.ast_nodes import ASTNode
+from ..interpreter import Interpreter
+from .programs import scaled_program, stdlib_program
+from .workload import WorkloadSpec, generate
+
+
+DEFAULT_SIZES = (100, 1000, 4000)
+DEFAULT_REPEAT = 5
+DEFAULT_BEATS = 20
+
+
+def generated_program(size: int) -> str:
+    """Builds a seeded synthetic workload with `size` truth values and half as many rules."""
+    return generate(WorkloadSpec(tvs=size, rules=max(size // 2, 1)))
+
+
+def stdlib_fn_program(size: int) -> str:
+    """Builds the `stdlib` program with user-defined functions in place of the native builtins."""
+    return stdlib_program(size, native=False)
+
+
+PROGRAMS: Dict[str, Callable[[int], str]] = {
+    'scaled': scaled_program,
+    'generated': generated_program,
+    'stdlib': stdlib_program,
+    'stdlib-fn': stdlib_fn_program,
+}
+
+
+@dataclass
+class BenchResult:
+    """
+    Timing and memory results of one benchmark at one size.
+
+    Attributes:
+        area (str): The benchmark area (lexer, parser, interpreter, beats).
+        size (int): The program size parameter.
+        unit (str): What `items` counts (tokens, nodes, beats).
+        items (int): The amount of work done per run.
+        times (List[float]): The wall time of each run, in seconds.
+        peak_bytes (int): Peak traced memory allocated during one run.
+        program (str): The program family the benchmark ran on.
+    """
+    area: str
+    size: int
+    unit: str
+    items: int
+    times: List[float] = field(default_factory=list)
+    peak_bytes: int = 0
+    program: str = 'scaled'
+
+    @property
+    def key(self) -> str:
+        if self.program != 'scaled':
+            return f"{self.area}/{self.program}/{self.size}"
+        return f"{self.area}/{self.size}"
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def noise(self) -> float:
+        """The median absolute deviation of the run times, relative to the median."""
+        median = self.median
+        if len(self.times) < 2 or not median:
+            return 0.0
+        return statistics.median(abs(t - median) for t in self.times) / median
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.median if self.median else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update(median=self.median, noise=self.noise, throughput=self.throughput)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BenchResult':
+        return cls(data['area'], data['size'], data['unit'], data['items'],
+                   list(data['times']), data.get('peak_bytes', 0), data.get('program', 'scaled'))
+
+
+def count_nodes(node: Any) -> int:
+    """Counts the AST nodes reachable from `node`."""
+    if isinstance(node, list):
+        return sum(count_nodes(item) for item in node)
+    if not isinstance(node, ASTNode):
+        return 0
+    return 1 + sum(count_nodes(value) for value in vars(node).values())
+
+
+# A benchmark returns (unit, items, setup, run): `setup` builds fresh input for
+# one run outside the timed region, `run` does the timed work on it.
+Benchmark = Callable[[str, int], Tuple[str, int, Callable[[], Any], Callable[[Any], Any]]]
+
+
+def bench_lexer(source: str, beats: int):
+    tokens = Lexer(source).tokenize()
+    return 'tokens', len(tokens), lambda: source, lambda src: Lexer(src).tokenize()
+
+
+def bench_parser(source: str, beats: int):
+    tokens = Lexer(source).tokenize()
+    nodes = count_nodes(Parser(tokens).parse())
+    return 'nodes', nodes, lambda: tokens, lambda toks: Parser(toks).parse()
+
+
+def bench_interpreter(source: str, beats: int):
+    ast = Parser(Lexer(source).tokenize()).parse()
+    return 'nodes', count_nodes(ast), lambda: ast, lambda tree: Interpreter().interpret(tree)
+
+
+def bench_beats(source: str, beats: int):
+    ast = Parser(Lexer(source).tokenize()).parse()
+
+    def setup():
+        interpreter = Interpreter()
+        interpreter.interpret(ast)
+        return interpreter
+
+    return 'beats', beats, setup, lambda interpreter: interpreter.run(beats)
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    'lexer': bench_lexer,
+    'parser': bench_parser,
+    'interpreter': bench_interpreter,
+    'beats': bench_beats,
+}
+
+
+def run_benchmark(area: str, size: int, repeat: int = DEFAULT_REPEAT,
+                  beats: int = DEFAULT_BEATS, program: str = 'scaled') -> BenchResult:
+    """
+    Runs one benchmark at one size.
+
+    Each run gets fresh input from the benchmark's setup step. Timed runs are
+    made with the garbage collector disabled; memory is measured on a
+    separate run under tracemalloc so that tracing does not skew the timings.
+
+    Args:
+        area (str): The benchmark area.
+        size (int): The program size parameter.
+        repeat (int): The number of timed runs.
+        beats (int): The number of beats for the beat-loop benchmark.
+        program (str): The program family to run on (see PROGRAMS).
+
+    Returns:
+        BenchResult: The results.
+    """
+    unit, items, setup, run = BENCHMARKS[area](PROGRAMS[program](size), beats)
+    result = BenchResult(area, size, unit, items, program=program)
+
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run(state)
+            result.times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+    state = setup()
+    tracemalloc.start()
+    try:
+        run(state)
+        result.peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def run_suite(areas: Sequence[str] = tuple(BENCHMARKS), sizes: Sequence[int] = DEFAULT_SIZES,
+              repeat: int = DEFAULT_REPEAT, beats: int = DEFAULT_BEATS, program: str = 'scaled',
+              progress: Optional[Callable[[BenchResult], None]] = None) -> Dict[str, Any]:
+    """
+    Runs the benchmark suite.
+
+    Args:
+        areas (Sequence[str]): The benchmark areas to run.
+        sizes (Sequence[int]): The program sizes to run each area at.
+        repeat (int): The number of timed runs per benchmark.
+        beats (int): The number of beats for the beat-loop benchmark.
+        program (str): The program family to run on (see PROGRAMS).
+        progress (Optional[Callable[[BenchResult], None]]): Called with each
+            result as it completes.
+
+    Returns:
+        Dict[str, Any]: A JSON-serializable report with run metadata and the
+            results keyed by "area/size".
+    """
+    results = {}
+    for area in areas:
+        for size in sizes:
+            result = run_benchmark(area, size, repeat, beats, program)
+            results[result.key] = result.to_dict()
+            if progress:
+                progress(result)
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': repeat,
+            'beats': beats,
+            'program': program,
+        },
+        'results': results,
+    }
+
+
+@dataclass
+class Comparison:
+    """
+    The comparison of one benchmark against its baseline.
+
+    Attributes:
+        key (str): The benchmark key ("area/size").
+        baseline (float): The baseline median time, in seconds.
+        current (float): The current median time, in seconds.
+        change (float): The relative change of the median time (+ is slower).
+        allowed (float): The relative change tolerated before flagging.
+        status (str): 'ok', 'faster' or 'regression'.
+    """
+    key: str
+    baseline: float
+    current: float
+    change: float
+    allowed: float
+    status: str
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.10,
+            noise_factor: float = 3.0) -> List[Comparison]:
+    """
+    Compares a suite report against a baseline report.
+
+    A benchmark is only flagged when its median time moved by more than the
+    larger of `threshold` and `noise_factor` times the combined relative
+    noise of the two runs, so noisy benchmarks need a larger change.
+
+    Args:
+        current (Dict[str, Any]): The report to check.
+        baseline (Dict[str, Any]): The stored baseline report.
+        threshold (float): The minimum relative change to flag.
+        noise_factor (float): How many noise widths a change must exceed.
+
+    Returns:
+        List[Comparison]: One entry per benchmark present in both reports.
+    """
+    comparisons = []
+    for key, data in current['results'].items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        cur_result = BenchResult.from_dict(data)
+        base_result = BenchResult.from_dict(base)
+        # Compare time per item so baselines recorded with other beat counts stay usable
+        cur_time = cur_result.median / max(cur_result.items, 1)
+        base_time = base_result.median / max(base_result.items, 1)
+        change = cur_time / base_time - 1.0 if base_time else 0.0
+        allowed = max(threshold, noise_factor * (cur_result.noise + base_result.noise))
+        if change > allowed:
+            status = 'regression'
+        elif change < -allowed:
+            status = 'faster'
+        else:
+            status = 'ok'
+        comparisons.append(Comparison(key, base_result.median, cur_result.median, change, allowed, status))
+    return comparisons
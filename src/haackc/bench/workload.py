@@ -0,0 +1,276 @@
+"""
+Synthetic workload generator - seeded, scalable HaackLang programs.
+"""
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+
+LOGICS = ('classical', 'fuzzy', 'paraconsistent')
+PERIODS = (1, 2, 3, 4, 5, 8, 16)
+
+
+@dataclass
+class WorkloadSpec:
+    """
+    The dimensions of a generated program.
+
+    Periods, phases and logics are taken from the given sequences in turn
+    (cycling when there are more tracks than entries) and drawn from the
+    seeded generator when left unset.
+
+    Attributes:
+        seed (int): The random seed; equal specs generate identical programs.
+        tracks (int): The number of tracks.
+        periods (Optional[Sequence[int]]): The track periods.
+        phases (Optional[Sequence[int]]): The track phases.
+        logics (Optional[Sequence[str]]): The track logics.
+        tvs (int): The number of truth values.
+        rules (int): The number of rules.
+        statements (int): Statements per rule body.
+        guard_density (float): The probability that a rule statement is
+            wrapped in a guard.
+        expr_depth (int): The maximum depth of generated expressions.
+        functions (int): The number of function call chains.
+        call_depth (int): The number of nested calls in each chain.
+        contexts (int): The number of top-level contexts.
+        context_depth (int): How deeply each top-level context nests.
+    """
+    seed: int = 0
+    tracks: int = 3
+    periods: Optional[Sequence[int]] = None
+    phases: Optional[Sequence[int]] = None
+    logics: Optional[Sequence[str]] = None
+    tvs: int = 100
+    rules: int = 50
+    statements: int = 2
+    guard_density: float = 0.3
+    expr_depth: int = 3
+    functions: int = 4
+    call_depth: int = 2
+    contexts: int = 2
+    context_depth: int = 2
+
+
+class WorkloadGenerator:
+    """
+    Emits a HaackLang program for a WorkloadSpec.
+
+    The generated program declares the tracks, then the truth values, the
+    function chains, and finally the rules, spread round-robin over the top
+    level and every level of the context trees. Every name referenced is
+    declared first, so the output always lexes, parses and runs.
+    """
+
+    def __init__(self, spec: WorkloadSpec):
+        """
+        Initializes a WorkloadGenerator.
+
+        Args:
+            spec (WorkloadSpec): The program dimensions.
+
+        Raises:
+            ValueError: If the spec has no tracks or truth values, or names an
+                unknown logic.
+        """
+        if spec.tracks < 1 or spec.tvs < 1:
+            raise ValueError("A workload needs at least one track and one truth value")
+        for logic in spec.logics or ():
+            if logic not in LOGICS:
+                raise ValueError(f"Unknown logic: {logic}")
+        self.spec = spec
+        self.random = random.Random(spec.seed)
+        self.track_names = [f"t{i}" for i in range(spec.tracks)]
+
+    def _pick(self, values: Optional[Sequence], i: int, default: Callable[[], object]):
+        return values[i % len(values)] if values else default()
+
+    def _tv(self) -> str:
+        return f"v{self.random.randrange(self.spec.tvs)}"
+
+    def _scalar(self) -> str:
+        """A track-qualified read, which evaluates to a number."""
+        return f"{self._tv()}.{self.random.choice(self.track_names)}"
+
+    def _expression(self, depth: int, params: Sequence[str] = ()) -> str:
+        """Builds a logical expression over truth values (or `params`) at most `depth` deep."""
+        rnd = self.random
+        if depth <= 1 or rnd.random() < 0.2:
+            return rnd.choice(params) if params else self._tv()
+        kind = rnd.random()
+        if kind < 0.15:
+            return f"not {self._expression(depth - 1, params)}"
+        op = 'and' if kind < 0.6 else 'or'
+        left = self._expression(depth - 1, params)
+        right = self._expression(depth - 1, params)
+        if rnd.random() < 0.3:
+            return f"({left} {op} {right})"
+        return f"{left} {op} {right}"
+
+    def _condition(self) -> str:
+        return f"{self._scalar()} > {self.random.randrange(1, 10) / 10:.1f}"
+
+    def _statement(self, indent: str) -> List[str]:
+        """Builds one rule statement: a whole-tv, track-qualified or call assignment."""
+        rnd = self.random
+        spec = self.spec
+        kind = rnd.random()
+        if spec.functions and kind < 0.2:
+            chain = rnd.randrange(spec.functions)
+            line = f"{self._tv()} = f{chain}_{spec.call_depth}({self._tv()}, {self._tv()})"
+        elif kind < 0.5:
+            track = rnd.choice(self.track_names)
+            line = (f"{self._tv()}.{track} = {self._scalar()} * 0.{rnd.randrange(1, 10)} "
+                    f"+ 0.0{rnd.randrange(1, 10)}")
+        else:
+            line = f"{self._tv()} = {self._expression(spec.expr_depth)}"
+
+        if rnd.random() < spec.guard_density:
+            return [f"{indent}guard {rnd.choice(self.track_names)} {self._condition()} {{",
+                    f"{indent}    {line}",
+                    f"{indent}}}"]
+        return [f"{indent}{line}"]
+
+    def _rule(self, number: int, indent: str) -> List[str]:
+        lines = [f"{indent}rule r{number} {{"]
+        for _ in range(max(self.spec.statements, 1)):
+            lines.extend(self._statement(indent + '    '))
+        lines.append(f"{indent}}}")
+        return lines
+
+    def _context_header(self, name: str) -> str:
+        rnd = self.random
+        if rnd.random() < 0.5:
+            return f"context {name} using track {rnd.choice(self.track_names)} {{"
+        return f"context {name} using logic {rnd.choice(LOGICS)} {{"
+
+    def lines(self) -> List[str]:
+        """
+        Generates the program.
+
+        Returns:
+            List[str]: The source lines.
+        """
+        spec = self.spec
+        rnd = self.random
+        lines = [f"# Generated workload: {spec}", ""]
+
+        for i, name in enumerate(self.track_names):
+            period = int(self._pick(spec.periods, i, lambda: rnd.choice(PERIODS)))
+            phase = int(self._pick(spec.phases, i, lambda: rnd.randrange(period)))
+            logic = self._pick(spec.logics, i, lambda: rnd.choice(LOGICS))
+            phase_text = f" phase {phase}" if phase else ""
+            lines.append(f"track {name} period {period}{phase_text} using {logic}")
+        lines.append("")
+
+        for i in range(spec.tvs):
+            lines.append(f"tv v{i} = {rnd.randrange(11) / 10:.1f}")
+        lines.append("")
+
+        # Chain c: f{c}_0 is a leaf and f{c}_k calls f{c}_{k-1}
+        for chain in range(spec.functions):
+            for level in range(spec.call_depth + 1):
+                lines.append(f"fn f{chain}_{level}(a, b) {{")
+                body = self._expression(spec.expr_depth, ('a', 'b'))
+                if level:
+                    body = f"f{chain}_{level - 1}({body}, b)"
+                lines.append(f"    return {body}")
+                lines.append("}")
+        lines.append("")
+
+        # Slots where rules are placed: the top level, then every nesting level of each context
+        slots = spec.contexts * spec.context_depth + 1
+        per_slot = [[] for _ in range(slots)]
+        for number in range(spec.rules):
+            per_slot[number % slots].append(number)
+
+        for number in per_slot[0]:
+            lines.extend(self._rule(number, ''))
+        for context in range(spec.contexts):
+            for level in range(spec.context_depth):
+                indent = '    ' * level
+                lines.append(indent + self._context_header(f"c{context}_{level}"))
+                for number in per_slot[1 + context * spec.context_depth + level]:
+                    lines.extend(self._rule(number, indent + '    '))
+            for level in reversed(range(spec.context_depth)):
+                lines.append('    ' * level + '}')
+        return lines
+
+    def generate(self) -> str:
+        """
+        Generates the program.
+
+        Returns:
+            str: The HaackLang source.
+        """
+        return '\n'.join(self.lines()) + '\n'
+
+
+def generate(spec: WorkloadSpec) -> str:
+    """
+    Generates a synthetic HaackLang program.
+
+    Args:
+        spec (WorkloadSpec): The program dimensions.
+
+    Returns:
+        str: The HaackLang source.
+    """
+    return WorkloadGenerator(spec).generate()
+
+
+def _int_list(text: str) -> List[int]:
+    return [int(value) for value in text.split(',') if value]
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command-line interface for the workload generator.
+
+    Args:
+        argv (Optional[List[str]]): The arguments; defaults to the process arguments.
+    """
+    defaults = WorkloadSpec()
+    parser = argparse.ArgumentParser(prog='python -m haackc.bench.workload',
+                                     description='Generate a synthetic HaackLang program')
+    parser.add_argument('-o', '--output', metavar='FILE', help='Output file (default: stdout)')
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--tracks', type=int, default=defaults.tracks)
+    parser.add_argument('--periods', type=_int_list, help='Comma-separated track periods')
+    parser.add_argument('--phases', type=_int_list, help='Comma-separated track phases')
+    parser.add_argument('--logics', type=lambda text: text.split(','),
+                        help=f"Comma-separated track logics ({', '.join(LOGICS)})")
+    parser.add_argument('--tvs', type=int, default=defaults.tvs)
+    parser.add_argument('--rules', type=int, default=defaults.rules)
+    parser.add_argument('--statements', type=int, default=defaults.statements, help='Statements per rule')
+    parser.add_argument('--guard-density', type=float, default=defaults.guard_density)
+    parser.add_argument('--expr-depth', type=int, default=defaults.expr_depth)
+    parser.add_argument('--functions', type=int, default=defaults.functions, help='Function call chains')
+    parser.add_argument('--call-depth', type=int, default=defaults.call_depth)
+    parser.add_argument('--contexts', type=int, default=defaults.contexts)
+    parser.add_argument('--context-depth', type=int, default=defaults.context_depth)
+
+    args = parser.parse_args(argv)
+    spec = WorkloadSpec(**{name: value for name, value in vars(args).items() if name != 'output'})
+
+    start = time.perf_counter()
+    try:
+        source = generate(spec)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(source)
+        print(f"Wrote {len(source):,} bytes to {args.output} in {time.perf_counter() - start:.2f}s",
+              file=sys.stderr)
+    else:
+        sys.stdout.write(source)
+
+
+if __name__ == '__main__':
+    main()
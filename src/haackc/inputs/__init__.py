@@ -0,0 +1,6 @@
+"""External input bindings for HaackLang truth values."""
+
+from .binding import InputBinding, parse_binding
+from .pipeline import InputPipeline
+
+__all__ = ['InputBinding', 'parse_binding', 'InputPipeline']
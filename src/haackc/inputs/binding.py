@@ -0,0 +1,133 @@
+"""
+Input bindings - map fields of external JSON messages to truth value tracks.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+
+SCHEMES = ('jsonl', 'pipe', 'unix', 'tcp')
+POLICIES = ('block', 'drop-oldest', 'drop-newest')
+
+DEFAULT_QUEUE_SIZE = 1024
+DEFAULT_POLICY = 'drop-oldest'
+
+# (tv name, track name, value)
+Update = Tuple[str, str, float]
+
+
+@dataclass
+class InputBinding:
+    """
+    Binds an external source of JSON messages to truth value tracks.
+
+    Each message is a JSON object. With `targets` empty its keys are read as
+    `tv.track` names directly; otherwise only the listed fields are used and
+    are mapped to the given `tv.track`.
+
+    Attributes:
+        scheme (str): The source kind: 'jsonl' (a tailed file), 'pipe' (a
+            named pipe), 'unix' (a Unix domain socket) or 'tcp' (localhost).
+        address (str): The file or socket path, or `[host:]port` for tcp.
+        targets (Dict[str, str]): Message field -> `tv.track`.
+        queue_size (int): The bound on messages waiting to be coalesced.
+        policy (str): What happens when the queue is full: 'block' stops
+            reading the source (backpressure), 'drop-oldest' discards the
+            oldest queued message, 'drop-newest' discards the new one.
+        from_start (bool): Read a tailed file from its start instead of
+            only following new lines.
+    """
+    scheme: str
+    address: str
+    targets: Dict[str, str] = field(default_factory=dict)
+    queue_size: int = DEFAULT_QUEUE_SIZE
+    policy: str = DEFAULT_POLICY
+    from_start: bool = False
+
+    def __post_init__(self):
+        if self.scheme not in SCHEMES:
+            raise ValueError(f"Unknown input scheme: {self.scheme}")
+        if self.policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy: {self.policy}")
+        if self.queue_size < 1:
+            raise ValueError("Input queue size must be positive")
+        for target in self.targets.values():
+            _split_target(target)
+
+    @property
+    def uri(self) -> str:
+        return f"{self.scheme}:{self.address}"
+
+    def decode(self, line: bytes) -> List[Update]:
+        """
+        Decodes one message into truth value updates.
+
+        Args:
+            line (bytes): One JSON object.
+
+        Returns:
+            List[Update]: The updates carried by the message.
+
+        Raises:
+            ValueError: If the line is not a JSON object of numbers for
+                `tv.track` targets.
+        """
+        message = json.loads(line)
+        if not isinstance(message, dict):
+            raise ValueError("Input message is not a JSON object")
+        updates = []
+        for key, value in message.items():
+            target = self.targets.get(key) if self.targets else key
+            if target is None:
+                continue
+            tv_name, track_name = _split_target(target)
+            updates.append((tv_name, track_name, _to_float(value)))
+        return updates
+
+
+def _split_target(target: str) -> Tuple[str, str]:
+    tv_name, _, track_name = target.partition('.')
+    if not tv_name or not track_name:
+        raise ValueError(f"Input target must be track-qualified (tv.track): {target}")
+    return tv_name, track_name
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if not isinstance(value, (int, float)):
+        raise ValueError(f"Input value is not a number: {value!r}")
+    return float(value)
+
+
+def parse_binding(text: str, queue_size: int = DEFAULT_QUEUE_SIZE,
+                  policy: str = DEFAULT_POLICY) -> InputBinding:
+    """
+    Parses a binding written as `scheme:address[?field=tv.track&...]`.
+
+    Examples: `jsonl:sensors.jsonl`, `unix:/tmp/haack.sock?threat=threat_detected.main`,
+    `tcp:127.0.0.1:7000`.
+
+    Args:
+        text (str): The binding.
+        queue_size (int): The queue bound for the binding.
+        policy (str): The queue policy for the binding.
+
+    Returns:
+        InputBinding: The parsed binding.
+
+    Raises:
+        ValueError: If the binding is malformed.
+    """
+    scheme, sep, rest = text.partition(':')
+    if not sep or not rest:
+        raise ValueError(f"Input binding must look like scheme:address: {text}")
+    address, _, query = rest.partition('?')
+    targets = {}
+    for pair in filter(None, query.split('&')):
+        key, sep, target = pair.partition('=')
+        if not sep:
+            raise ValueError(f"Input mapping must look like field=tv.track: {pair}")
+        targets[key] = target
+    return InputBinding(scheme, address, targets, queue_size, policy)
@@ -0,0 +1,197 @@
+"""
+Input pipeline - asyncio ingestion of external inputs, applied at beat starts.
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .binding import InputBinding
+from .sources import open_source
+
+
+STAT_NAMES = ('received', 'errors', 'dropped', 'applied', 'unknown')
+
+
+class InputPipeline:
+    """
+    Ingests external inputs and feeds them to an interpreter's truth values.
+
+    Sources are read by an asyncio loop on a background thread. Each binding
+    has a bounded queue of decoded messages governed by its queue policy; a
+    consumer coalesces the queued messages so that only the latest value per
+    `tv.track` is kept. `apply` takes everything coalesced so far in one swap
+    and writes it to the truth values. Registered as a beat start hook, this
+    makes each beat see a consistent snapshot of the inputs: every update of
+    a message lands on the same beat, before any rule runs.
+
+    Attributes:
+        bindings (List[InputBinding]): The bound sources.
+        stats (Dict[str, Dict[str, int]]): Per binding URI, the number of
+            messages received, undecodable and dropped, and of updates
+            applied or targeting unknown truth values.
+    """
+
+    def __init__(self, bindings: Sequence[InputBinding]):
+        """
+        Initializes an InputPipeline.
+
+        Args:
+            bindings (Sequence[InputBinding]): The sources to read.
+        """
+        self.bindings: List[InputBinding] = list(bindings)
+        self.stats: Dict[str, Dict[str, int]] = {
+            binding.uri: dict.fromkeys(STAT_NAMES, 0) for binding in self.bindings
+        }
+        self._pending: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._main: Optional[asyncio.Task] = None
+        self._started = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def start(self):
+        """
+        Starts reading the sources on a background thread.
+
+        Returns once every source is open, so inputs sent afterwards are
+        not missed.
+
+        Raises:
+            OSError: If a source cannot be opened.
+            ValueError: If a source address is invalid.
+        """
+        if self._thread is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name='haackc-inputs', daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._error is not None:
+            error = self._error
+            self.stop()
+            raise error
+
+    def stop(self):
+        """Stops reading the sources and waits for the background thread."""
+        if self._thread is None:
+            return
+        if self._main is not None:
+            self._loop.call_soon_threadsafe(self._main.cancel)
+        self._thread.join()
+        self._loop.close()
+        self._thread = None
+        self._loop = None
+        self._main = None
+        self._started.clear()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve())
+        except asyncio.CancelledError:
+            pass
+
+    async def _serve(self):
+        self._main = asyncio.current_task()
+        tasks = []
+        try:
+            for binding in self.bindings:
+                queue: asyncio.Queue = asyncio.Queue(binding.queue_size)
+                reader = await open_source(binding, self._make_handler(binding, queue))
+                tasks.append(asyncio.ensure_future(reader))
+                tasks.append(asyncio.ensure_future(self._consume(binding, queue)))
+        except (OSError, ValueError) as e:
+            self._error = e
+        self._started.set()
+        try:
+            if tasks and self._error is None:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _make_handler(self, binding: InputBinding, queue: asyncio.Queue):
+        """Builds the line handler enforcing the binding's queue policy."""
+        stats = self.stats[binding.uri]
+        policy = binding.policy
+
+        async def on_line(line: bytes):
+            try:
+                updates = binding.decode(line)
+            except ValueError:
+                stats['errors'] += 1
+                return
+            stats['received'] += 1
+            if policy == 'block':
+                await queue.put(updates)
+                return
+            if queue.full():
+                stats['dropped'] += 1
+                if policy == 'drop-newest':
+                    return
+                queue.get_nowait()
+            queue.put_nowait(updates)
+
+        return on_line
+
+    async def _consume(self, binding: InputBinding, queue: asyncio.Queue):
+        """Coalesces queued messages into the pending updates, latest value wins."""
+        lock = self._lock
+        uri = binding.uri
+        while True:
+            updates = await queue.get()
+            batch = [updates]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            with lock:
+                # apply() swaps in a new dict, so look it up on every message
+                pending = self._pending
+                for updates in batch:
+                    for tv_name, track_name, value in updates:
+                        pending[(tv_name, track_name)] = (value, uri)
+
+    def apply(self, interpreter: Any) -> int:
+        """
+        Writes the latest coalesced input values to the interpreter.
+
+        Args:
+            interpreter (Interpreter): The interpreter to update.
+
+        Returns:
+            int: The number of track values written.
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending = self._pending
+            self._pending = {}
+        truthvalues = interpreter.truthvalues
+        applied = 0
+        for (tv_name, track_name), (value, uri) in pending.items():
+            tv = truthvalues.get(tv_name)
+            if tv is None:
+                self.stats[uri]['unknown'] += 1
+                continue
+            tv.set(track_name, value)
+            self.stats[uri]['applied'] += 1
+            applied += 1
+        return applied
+
+    def attach(self, interpreter: Any):
+        """
+        Applies the inputs at the start of every beat of an interpreter.
+
+        Args:
+            interpreter (Interpreter): The interpreter to feed.
+        """
+        interpreter.beat_start_hooks.append(self.apply)
+
+    def __enter__(self) -> 'InputPipeline':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
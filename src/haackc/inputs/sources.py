@@ -0,0 +1,126 @@
+"""
+Input sources - asyncio readers delivering lines from files, pipes and sockets.
+"""
+
+import asyncio
+import os
+import stat
+from typing import Awaitable, Callable, Coroutine
+
+from .binding import InputBinding
+
+
+LineHandler = Callable[[bytes], Awaitable[None]]
+
+POLL_INTERVAL = 0.01
+
+
+async def open_source(binding: InputBinding, on_line: LineHandler) -> Coroutine:
+    """
+    Opens the source of a binding.
+
+    Setup (binding sockets, creating the pipe, locating the end of a tailed
+    file) is done before this returns, so no input sent afterwards is missed.
+    The returned coroutine then delivers every line to `on_line`; a handler
+    that waits stops the source from being read further, which pushes back
+    on the sender.
+
+    Args:
+        binding (InputBinding): The binding to open.
+        on_line (LineHandler): Called with every non-empty line.
+
+    Returns:
+        Coroutine: Reads the source until cancelled.
+    """
+    if binding.scheme == 'jsonl':
+        position = 0
+        if not binding.from_start and os.path.exists(binding.address):
+            position = os.path.getsize(binding.address)
+        return _tail_file(binding.address, position, on_line)
+
+    if binding.scheme == 'pipe':
+        path = binding.address
+        if not os.path.exists(path):
+            os.mkfifo(path)
+        elif not stat.S_ISFIFO(os.stat(path).st_mode):
+            raise ValueError(f"Not a named pipe: {path}")
+        return _read_pipe(path, on_line)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await _read_lines(reader, on_line)
+        finally:
+            writer.close()
+
+    if binding.scheme == 'unix':
+        if os.path.exists(binding.address):
+            # Only a socket left behind by an earlier run is replaced
+            if not stat.S_ISSOCK(os.stat(binding.address).st_mode):
+                raise ValueError(f"Not a Unix socket: {binding.address}")
+            os.unlink(binding.address)
+        server = await asyncio.start_unix_server(handle, binding.address)
+        return _serve(server, binding.address)
+
+    host, _, port = binding.address.rpartition(':')
+    server = await asyncio.start_server(handle, host or '127.0.0.1', int(port))
+    return _serve(server)
+
+
+async def _read_lines(reader: asyncio.StreamReader, on_line: LineHandler):
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        line = line.strip()
+        if line:
+            await on_line(line)
+
+
+async def _serve(server: asyncio.AbstractServer, path: str = None):
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if path and os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+
+
+async def _tail_file(path: str, position: int, on_line: LineHandler):
+    """Follows a file as lines are appended, starting at `position`."""
+    while not os.path.exists(path):
+        await asyncio.sleep(POLL_INTERVAL)
+    with open(path, 'rb') as f:
+        f.seek(position)
+        partial = b''
+        while True:
+            chunk = f.read(65536)
+            if not chunk:
+                if os.path.getsize(path) < f.tell():
+                    # Truncated or rotated in place: start over
+                    f.seek(0)
+                    partial = b''
+                    continue
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+            lines = (partial + chunk).split(b'\n')
+            partial = lines.pop()
+            for line in lines:
+                line = line.strip()
+                if line:
+                    await on_line(line)
+
+
+async def _read_pipe(path: str, on_line: LineHandler):
+    """Reads lines from a named pipe, across any number of writers."""
+    loop = asyncio.get_running_loop()
+    read_fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+    # Holding a write end open keeps the pipe from reporting EOF between writers
+    keep_fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+    reader = asyncio.StreamReader()
+    transport, _protocol = await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(read_fd, 'rb', 0))
+    try:
+        await _read_lines(reader, on_line)
+    finally:
+        transport.close()
+        os.close(keep_fd)
@@ -1,5 +1,14 @@
 """Interpreter module for HaackLang."""
 
 from .interpreter import Interpreter
+from .profiler import Profiler
+from .metrics import MetricsRegistry, RuntimeMetrics, MetricsServer
+from .tempo import TempoScheduler
+from .deadline import DeadlineScheduler
+from .parallel import ParallelExecutor
+from .reactive import ReactiveExecutor
+from .saturation import SaturationExecutor
 
-__all__ = ['Interpreter']
+__all__ = ['Interpreter', 'Profiler', 'MetricsRegistry', 'RuntimeMetrics', 'MetricsServer', 'TempoScheduler',
+           'DeadlineScheduler', 'ParallelExecutor', 'ReactiveExecutor',
+           'SaturationExecutor']
@@ -0,0 +1,202 @@
+"""
+Deadline-aware degradation - defers low-priority rules when a beat runs out of time.
+"""
+
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+
+class DeadlineScheduler:
+    """
+    Runs an interpreter's rules against a per-beat deadline, deferring
+    lower-priority rules to the next beat when time runs short.
+
+    A rule's priority is that of its declaring context, or else that of the
+    context's track. Rules at the highest declared priority are critical and
+    always run. Before each other rule the scheduler checks whether its
+    estimated cost, plus the estimated cost of the critical rules still to
+    come, fits in the time left; if not the rule is deferred.
+
+    Rules outside a track-bound context update every track, so they are
+    deferred track by track instead: they always run, but when time runs
+    short they run with only the firing tracks at the highest priority
+    active and owe the others.
+
+    A deferred rule owes the tracks that fired on the beat it missed. It runs
+    in its usual place on the next beat with those tracks active in addition
+    to the new beat's, so its updates land one beat late instead of being
+    lost, while every other track stays frozen as on a beat it does not fire
+    on. A rule that is deferred again carries its owed tracks forward, so
+    deferrals never pile up into more than one pending run per rule.
+
+    Like the profiler, the scheduler shadows `execute_rules` on the one
+    interpreter instance between `enable` and `disable`.
+
+    Attributes:
+        interpreter (Interpreter): The interpreter being scheduled.
+        deadline (Callable[[], Optional[float]]): Returns the clock time the
+            current beat must finish by, or None for no deadline.
+        deferrals (Dict[str, int]): The number of times each rule was
+            deferred, by "context::rule" name.
+        total_deferred (int): The number of rule deferrals.
+        log (Deque[Tuple[int, str]]): The most recent (beat, rule) deferrals.
+    """
+
+    def __init__(self, interpreter: Any, deadline: Optional[Callable[[], Optional[float]]] = None,
+                 budget: Optional[float] = None, clock: Callable[[], float] = time.monotonic,
+                 smoothing: float = 0.2, log_size: int = 1000):
+        """
+        Initializes a DeadlineScheduler.
+
+        Args:
+            interpreter (Interpreter): The interpreter to schedule.
+            deadline (Optional[Callable[[], Optional[float]]]): Returns the
+                current beat's deadline, e.g. that of a TempoScheduler.
+            budget (Optional[float]): A fixed time budget per beat, in
+                seconds, used when no deadline function is given.
+            clock (Callable[[], float]): The clock deadlines are measured on.
+            smoothing (float): The weight of the latest sample in each rule's
+                moving average cost.
+            log_size (int): The number of deferrals kept in the log.
+
+        Raises:
+            ValueError: If neither a deadline nor a budget is given.
+        """
+        if deadline is None and budget is None:
+            raise ValueError("A deadline function or a per-beat budget is required")
+        self.interpreter = interpreter
+        self.clock = clock
+        self.budget = budget
+        self.deadline = deadline or self._budget_deadline
+        self.smoothing = smoothing
+        self.deferrals: Dict[str, int] = {}
+        self.total_deferred = 0
+        self.log: Deque[Tuple[int, str]] = deque(maxlen=log_size)
+        self._costs: List[float] = []
+        self._owed: Dict[int, Set[str]] = {}
+        self._beat_start = 0.0
+        self.enabled = False
+
+    def _budget_deadline(self) -> float:
+        return self._beat_start + self.budget
+
+    def enable(self):
+        """Installs the scheduler on the interpreter."""
+        if self.enabled:
+            return
+        self._saved = vars(self.interpreter).get('execute_rules')
+        self.interpreter.execute_rules = self.execute_rules
+        self.enabled = True
+
+    def disable(self):
+        """Removes the scheduler from the interpreter."""
+        if not self.enabled:
+            return
+        if self._saved is None:
+            del self.interpreter.execute_rules
+        else:
+            self.interpreter.execute_rules = self._saved
+        self.enabled = False
+
+    def priority(self, context: Any) -> Optional[int]:
+        """
+        Gets the priority of the rules declared in a context.
+
+        Args:
+            context (Optional[Context]): The declaring context.
+
+        Returns:
+            Optional[int]: The priority, or None for rules that are always run.
+        """
+        if context is None:
+            return None
+        if context.priority is not None:
+            return context.priority
+        track = self.interpreter.tracks.get(context.track) if context.track else None
+        return track.priority if track else None
+
+    def _critical_level(self) -> int:
+        levels = [track.priority for track in self.interpreter.tracks.values()]
+        levels.extend(c.priority for c in self.interpreter.contexts.values() if c.priority is not None)
+        return max(levels, default=0)
+
+    def execute_rules(self):
+        """Executes the rules of the current beat, deferring those that do not fit."""
+        interp = self.interpreter
+        clock = self.clock
+        self._beat_start = clock()
+        deadline = self.deadline()
+        rules = interp.rules
+        costs = self._costs
+        if len(costs) < len(rules):
+            costs.extend([0.0] * (len(rules) - len(costs)))
+        owed = self._owed
+        active = interp._active_tracks
+
+        level = self._critical_level()
+        priorities = [self.priority(context) for _rule, context in rules]
+        critical = [p is None or p >= level for p in priorities]
+        remaining = sum(cost for cost, is_critical in zip(costs, critical) if is_critical)
+        tracks_by_name = interp.tracks
+
+        smoothing = self.smoothing
+        try:
+            for index, (rule, context) in enumerate(rules):
+                if context is not None and not context.is_active():
+                    continue
+                tracks = active
+                previously_owed = owed.pop(index, None)
+                if previously_owed:
+                    tracks = active + [name for name in interp.tracks
+                                       if name in previously_owed and name not in active]
+
+                if priorities[index] is None:
+                    # Unbound rules defer their low-priority tracks only
+                    remaining -= costs[index]
+                    low = [name for name in tracks if tracks_by_name[name].priority < level]
+                    if (low and deadline is not None
+                            and clock() + costs[index] + remaining > deadline):
+                        owed[index] = set(low)
+                        self._record(rule, context)
+                        tracks = [name for name in tracks if name not in owed[index]]
+                elif critical[index]:
+                    remaining -= costs[index]
+                elif deadline is not None and clock() + costs[index] + remaining > deadline:
+                    owed[index] = set(tracks)
+                    self._record(rule, context)
+                    continue
+
+                interp._active_tracks = tracks
+                interp.current_context = context
+                start = clock()
+                interp.execute_rule(rule)
+                costs[index] += smoothing * (clock() - start - costs[index])
+        finally:
+            interp._active_tracks = active
+
+    def _record(self, rule: Any, context: Any):
+        name = f"{context.name}::{rule.name}" if context else rule.name
+        self.deferrals[name] = self.deferrals.get(name, 0) + 1
+        self.total_deferred += 1
+        self.log.append((self.interpreter.global_beat, name))
+
+    @property
+    def pending(self) -> int:
+        """The number of rules deferred to the next beat."""
+        return len(self._owed)
+
+    def report(self, limit: int = 10) -> str:
+        """
+        Formats the deferral statistics.
+
+        Args:
+            limit (int): The maximum number of rules to list.
+
+        Returns:
+            str: The formatted report.
+        """
+        lines = [f"Deferred rules: {self.total_deferred} deferrals, {self.pending} pending"]
+        for name, count in sorted(self.deferrals.items(), key=lambda item: item[1], reverse=True)[:limit]:
+            lines.append(f"  {name:<30} {count:>9}")
+        return '\n'.join(lines)
@@ -2,11 +2,58 @@
 Interpreter implementation for HaackLang.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, TextIO, Tuple
 from ..parser.ast_nodes import *
 from ..runtime.track import Track, LogicType as RuntimeLogicType
 from ..runtime.truthvalue import TruthValue, apply_logic_operator
 from ..runtime.context import Context
+from ..runtime.meta import MetaEngine, META_OPERATORS
+from ..runtime.events import COMPARISONS, EventIndex, Threshold
+from ..runtime.branches import Branch, BranchEngine, MergedState
+from ..runtime.stdlib import BUILTINS, tv_blend
+from ..runtime.checkpoint import write_checkpoint, read_checkpoint
+from ..modules import Module, ModuleLoader, default_loader
+from ..analysis.shapes import infer_shapes
+
+# Bound once: looking up enum members is slow on the evaluation paths
+SCALAR, TRUTHVECTOR, TRACK, DYNAMIC = Shape.SCALAR, Shape.TRUTHVECTOR, Shape.TRACK, Shape.DYNAMIC
+
+# The comparison with its operands swapped: 0.8 < x is x > 0.8
+_SWAPPED = {'<': '>', '<=': '>=', '>': '<', '>=': '<='}
+
+
+def _contradictory(condition: TruthValue) -> bool:
+    """Whether a condition is true on some tracks and false on others."""
+    values = condition.values.values()
+    return any(value >= 0.5 for value in values) and any(value < 0.5 for value in values)
+
+
+def _threshold_condition(condition: Expression, tracks: Dict[str, Track]) -> Optional[Threshold]:
+    """
+    Recognizes a condition comparing one track of a truth value with a number.
+
+    `x.fast > 0.8`, `0.2 >= x.slow` and `x > 0.5` (the main track) are
+    threshold conditions. The condition must be labelled with its shapes, so
+    the name is known to be a truth value.
+
+    Returns:
+        Optional[Threshold]: The truth value name, track, comparison and
+            threshold, with the truth value on the left; None for any other
+            condition.
+    """
+    if not isinstance(condition, BinaryOp) or condition.operator not in COMPARISONS:
+        return None
+    op, left, right = condition.operator, condition.left, condition.right
+    if isinstance(left, NumberLiteral):
+        op, left, right = _SWAPPED[op], right, left
+    if not isinstance(left, Variable) or not isinstance(right, NumberLiteral):
+        return None
+    if left.track and left.shape is TRACK and left.track in tracks:
+        return left.name, left.track, op, float(right.value)
+    # A truth value compared as a number reads its main track
+    if not left.track and left.shape is TRUTHVECTOR and 'main' in tracks:
+        return left.name, 'main', op, float(right.value)
+    return None
 
 
 class Interpreter:
@@ -24,6 +71,27 @@ class Interpreter:
         global_beat (int): The global beat counter for the interpreter.
         current_context (Optional[Context]): The currently active context.
         functions (Dict[str, FunctionDecl]): A dictionary of user-defined functions.
+        rules (List[Tuple[RuleDecl, Optional[Context]]]): Declared rules and the
+            context they were declared in, re-evaluated on every beat.
+        rule_sets (List[List[Any]]): The rules grouped into runs of
+            consecutive rules declared in the same context, as [context,
+            start, end) slices of `rules`; a beat skips the rule sets of
+            inactive contexts.
+        beat_hooks (List[Callable[[Interpreter], None]]): Callables invoked with
+            the interpreter after every beat, including skipped beats.
+        meta_rules (List[Tuple[MetaDecl, Optional[Context]]]): Declared meta
+            blocks and their contexts, run on every meta-beat.
+        events (List[Tuple[WhenDecl, Optional[Context]]]): Declared event
+            rules and their contexts, run when their conditions flip.
+        event_index (EventIndex): The state of the event rules' conditions.
+        branches (BranchEngine): How `if!!` forks are merged and limited.
+        meta_beat (Optional[int]): The declared meta-beat interval; None means
+            the longest track period.
+        meta (Optional[MetaEngine]): The meta-logic engine, created when the
+            program first uses meta-logic.
+        modules (ModuleLoader): Finds and loads imported modules.
+        imports (Dict[str, Module]): Modules by the namespaces their functions
+            are called under (`ns::name`).
     """
     
     def __init__(self):
@@ -35,6 +103,38 @@ class Interpreter:
         self.global_beat = 0
         self.current_context: Optional[Context] = None
         self.functions: Dict[str, FunctionDecl] = {}
+        self.rules: List[Tuple[RuleDecl, Optional[Context]]] = []
+        self.rule_sets: List[List[Any]] = []
+        self.beat_start_hooks: List[Callable[['Interpreter'], None]] = []
+        self.beat_hooks: List[Callable[['Interpreter'], None]] = []
+        self.meta_rules: List[Tuple[MetaDecl, Optional[Context]]] = []
+        self.events: List[Tuple[WhenDecl, Optional[Context]]] = []
+        self.event_index = EventIndex()
+        self.branches = BranchEngine()
+        self.meta_beat: Optional[int] = None
+        self.meta: Optional[MetaEngine] = None
+        self.modules: ModuleLoader = default_loader()
+        self.imports: Dict[str, Module] = {}
+        
+        # Modules imported by loaded modules, loaded on first reference
+        self._lazy_imports: Dict[str, ASTNode] = {}
+        
+        # Where print() writes; None means standard output
+        self.output: Optional[TextIO] = None
+        
+        # Tracks firing on the beat being executed; None outside the beat engine
+        self._active_tracks: Optional[List[str]] = None
+        
+        # Stored value of the truth value a beat assignment is computing; logical
+        # operators copy its frozen tracks instead of computing them
+        self._frozen: Optional[TruthValue] = None
+        self._frozen_tracks: List[str] = []
+        
+        # The arm of an `if!!` fork being executed; None outside forks
+        self._branch: Optional[Branch] = None
+        
+        # Ids of rule assignments that only write pruned track components
+        self.pruned_statements: FrozenSet[int] = frozenset()
         
         # Default tracks
         self._create_default_tracks()
@@ -64,14 +164,23 @@ class Interpreter:
         """
         Interprets a HaackLang program.
 
-        This method serves as the entry point for interpreting a program. It
-        iterates through the top-level declarations in the AST and executes them.
+        This method serves as the entry point for interpreting a program. The
+        program's expressions are first labelled with their shapes (see
+        `haackc.analysis.infer_shapes`), then the top-level declarations in
+        the AST are executed. Event rules are checked once the program is
+        loaded, so new ones record their conditions.
 
         Args:
             program (Program): The root of the AST to be interpreted.
+
+        Raises:
+            TypeError: If the program has shape errors; nothing is executed.
         """
+        infer_shapes(program, self).check()
         for decl in program.declarations:
             self.execute_declaration(decl)
+        if self.events:
+            self.execute_events()
     
     def execute_declaration(self, node: ASTNode):
         """
@@ -96,6 +205,20 @@ class Interpreter:
             self.execute_rule_decl(node)
         elif isinstance(node, FunctionDecl):
             self.functions[node.name] = node
+        elif isinstance(node, MetaDecl):
+            self.meta_rules.append((node, self.current_context))
+            self.get_meta()
+        elif isinstance(node, WhenDecl):
+            self.events.append((node, self.current_context))
+            self.event_index.add(_threshold_condition(node.condition, self.tracks))
+        elif isinstance(node, ImportDecl):
+            self.import_module(node)
+        elif isinstance(node, ModuleDecl):
+            self._bind_module(node.name, Module.from_declarations(node.name, node.body), node)
+        elif isinstance(node, MetaBeatDecl):
+            if node.interval < 1:
+                self.error("Meta-beat interval must be at least 1", node)
+            self.meta_beat = node.interval
         elif isinstance(node, Assignment):
             self.execute_assignment(node)
         elif isinstance(node, IfStatement):
@@ -104,6 +227,8 @@ class Interpreter:
             self.execute_guard_statement(node)
         elif isinstance(node, ExpressionStatement):
             self.evaluate_expression(node.expression)
+        elif isinstance(node, ContextSwitch):
+            self.execute_context_switch(node)
         else:
             self.error(f"Unknown declaration type: {type(node).__name__}", node)
     
@@ -124,7 +249,8 @@ class Interpreter:
             name=node.name,
             period=node.period,
             phase=node.phase,
-            logic=logic_map[node.logic]
+            logic=logic_map[node.logic],
+            priority=node.priority
         )
         self.tracks[node.name] = track
     
@@ -145,18 +271,111 @@ class Interpreter:
         context = Context(
             name=node.name,
             logic=runtime_logic,
-            track=node.track
+            track=node.track,
+            priority=node.priority,
+            parent=self.current_context
         )
         self.contexts[node.name] = context
         
         # Execute context body in the context
         old_context = self.current_context
         self.current_context = context
+        first_rule, first_event = len(self.rules), len(self.events)
         
         for stmt in node.body:
-            self.execute_declaration(stmt)
+            if isinstance(stmt, Assignment) and stmt.declare:
+                self.execute_context_variable(context, stmt)
+            else:
+                self.execute_declaration(stmt)
         
         self.current_context = old_context
+        
+        # Compile the context's rules, and those of the contexts nested in it,
+        # once every enclosing variable is declared: resolve the variables
+        # they see to frame slots
+        if context.parent is None:
+            for rule, rule_context in self.rules[first_rule:]:
+                slots = self._visible_slots(rule_context)
+                if slots:
+                    self._resolve_slots(rule.body, slots)
+            for event, event_context in self.events[first_event:]:
+                slots = self._visible_slots(event_context)
+                if slots:
+                    self._resolve_slots([ExpressionStatement(event.condition)], slots)
+                    self._resolve_slots(event.body + (event.else_body or []), slots)
+    
+    def execute_context_variable(self, context: Context, node: Assignment):
+        """
+        Declares a context variable (`let` in a context body).
+
+        Args:
+            context (Context): The context being declared.
+            node (Assignment): The let statement.
+        """
+        if node.target in self.truthvalues:
+            self.error(f"Context variable {node.target} is already a truth value", node)
+        value = self.evaluate_expression(node.value)
+        if isinstance(value, TruthValue):
+            self.error(f"Context variable {node.target} must be a number, not a truth value", node)
+        context.declare(node.target, value)
+    
+    @staticmethod
+    def _visible_slots(context: Optional[Context]) -> Dict[str, Tuple[int, int]]:
+        """The slot and depth of each variable a context's rules see, innermost context first."""
+        slots: Dict[str, Tuple[int, int]] = {}
+        for depth, owner in enumerate(context.chain() if context is not None else ()):
+            for name, slot in owner.slots.items():
+                slots.setdefault(name, (slot, depth))
+        return slots
+    
+    def _resolve_slots(self, body: List[ASTNode], slots: Dict[str, Tuple[int, int]]):
+        """Labels the references to context variables in statements with their slots."""
+        for stmt in body:
+            if isinstance(stmt, Assignment):
+                if not stmt.track and stmt.target in slots:
+                    stmt.slot, stmt.depth = slots[stmt.target]
+                self._resolve_expression_slots(stmt.value, slots)
+            elif isinstance(stmt, IfStatement):
+                self._resolve_expression_slots(stmt.condition, slots)
+                self._resolve_slots(stmt.then_body, slots)
+                self._resolve_slots(stmt.else_body or [], slots)
+            elif isinstance(stmt, GuardStatement):
+                self._resolve_expression_slots(stmt.condition, slots)
+                self._resolve_slots(stmt.body, slots)
+            elif isinstance(stmt, (ExpressionStatement, ReturnStatement)):
+                value = stmt.expression if isinstance(stmt, ExpressionStatement) else stmt.value
+                if value is not None:
+                    self._resolve_expression_slots(value, slots)
+    
+    def _resolve_expression_slots(self, node: Expression, slots: Dict[str, Tuple[int, int]]):
+        if isinstance(node, Variable):
+            if not node.track and node.name in slots:
+                node.slot, node.depth = slots[node.name]
+        elif isinstance(node, BinaryOp):
+            self._resolve_expression_slots(node.left, slots)
+            self._resolve_expression_slots(node.right, slots)
+        elif isinstance(node, UnaryOp):
+            self._resolve_expression_slots(node.operand, slots)
+        elif isinstance(node, (FunctionCall, MetaOp)):
+            for arg in node.args:
+                self._resolve_expression_slots(arg, slots)
+    
+    def execute_context_switch(self, node: ContextSwitch):
+        """
+        Enters or exits a context, activating or deactivating its rules.
+
+        Switching sets a flag; rule sets later in the same beat see it.
+
+        Args:
+            node (ContextSwitch): The enter or exit statement.
+        """
+        context = self.contexts.get(node.context)
+        if context is None:
+            self.error(f"Unknown context: {node.context}", node)
+        if self._branch is not None:
+            self._branch.switches[context.name] = (context, node.enter)
+        else:
+            context.active = node.enter
     
     def execute_truthvalue_decl(self, node: TruthValueDecl):
         """
@@ -172,11 +391,11 @@ class Interpreter:
                 initial_val = float(result)
             elif isinstance(result, TruthValue):
                 # Use the TruthValue as-is
-                self.truthvalues[node.name] = result
+                self._bind_truthvalue(node.name, result)
                 return
         
         tv = TruthValue(self.tracks, initial_val)
-        self.truthvalues[node.name] = tv
+        self._bind_truthvalue(node.name, tv)
     
     def execute_rule_decl(self, node: RuleDecl):
         """
@@ -185,10 +404,25 @@ class Interpreter:
         Args:
             node (RuleDecl): The rule declaration node to be executed.
         """
-        # For now, rules are executed immediately
-        # In a full implementation, rules would be stored and evaluated on each beat
+        # Rules run once when declared and are re-evaluated on every beat
+        index = len(self.rules)
+        self.rules.append((node, self.current_context))
+        last = self.rule_sets[-1] if self.rule_sets else None
+        if last is not None and last[0] is self.current_context and last[2] == index:
+            last[2] = index + 1
+        else:
+            self.rule_sets.append([self.current_context, index, index + 1])
+        self.execute_rule(node)
+    
+    def execute_rule(self, node: RuleDecl):
+        """
+        Executes the body of a rule.
+
+        Args:
+            node (RuleDecl): The rule whose body should be executed.
+        """
         for stmt in node.body:
-            if isinstance(stmt, (Assignment, IfStatement, GuardStatement, ExpressionStatement)):
+            if isinstance(stmt, (Assignment, IfStatement, GuardStatement, ExpressionStatement, ContextSwitch)):
                 self.execute_declaration(stmt)
     
     def execute_assignment(self, node: Assignment):
@@ -198,13 +432,24 @@ class Interpreter:
         Args:
             node (Assignment): The assignment node to be executed.
         """
+        # Freeze-on-no-beat (spec 6.5): tracks that do not fire keep their values
+        if self._active_tracks is not None:
+            if self.pruned_statements and id(node) in self.pruned_statements:
+                return
+            if node.track:
+                if node.track in self.tracks and node.track not in self._active_tracks:
+                    return
+            elif node.target in self.truthvalues:
+                self._assign_active_tracks(node)
+                return
+        
         value = self.evaluate_expression(node.value)
         
         # Check if it's a track-qualified assignment
         if node.track:
             # Assigning to a specific track of a truthvalue
             if node.target in self.truthvalues:
-                tv = self.truthvalues[node.target]
+                tv = self.truthvalues[node.target] if self._branch is None else self._branch.own(node.target)
                 if isinstance(value, (int, float)):
                     tv.set(node.track, float(value))
                 else:
@@ -213,11 +458,71 @@ class Interpreter:
                 self.error(f"Variable {node.target} is not a truth value", node)
         else:
             # Regular assignment
-            if isinstance(value, TruthValue):
-                self.truthvalues[node.target] = value
+            owner = self.current_context
+            if owner is not None:
+                if node.slot is not None:
+                    for _ in range(node.depth):
+                        owner = owner.parent
+                else:
+                    owner = owner.find(node.target)
+            if owner is not None:
+                if isinstance(value, TruthValue):
+                    self.error(f"Context variable {node.target} must be a number, not a truth value", node)
+                frame = owner.frame if self._branch is None else self._branch.frame(owner)
+                frame[owner.slots[node.target] if node.slot is None else node.slot] = value
+            elif isinstance(value, TruthValue):
+                self._bind_truthvalue(node.target, value)
             else:
                 self.variables[node.target] = value
     
+    def _bind_truthvalue(self, name: str, tv: TruthValue):
+        """Binds a name to a truth value object, keeping the meta engine informed."""
+        self.truthvalues[name] = tv
+        if self._branch is not None:
+            # Bound in the fork's state; the merge binds it for the meta engine
+            return
+        if self.meta is not None:
+            self.meta.bind(name, tv)
+    
+    def _assign_active_tracks(self, node: Assignment):
+        """
+        Assigns a whole truth value during a beat, updating only firing tracks.
+
+        While the value is evaluated, logical operators only compute the firing
+        tracks and take the frozen tracks from the target's stored value.
+
+        Args:
+            node (Assignment): The assignment node to be executed.
+        """
+        tv = self.truthvalues[node.target] if self._branch is None else self._branch.own(node.target)
+        track_names = self._active_tracks
+        if len(tv.values) < len(self.tracks):
+            # Pruned components (see haackc.analysis.prune_tracks) are never computed
+            track_names = [name for name in track_names if name in tv.values]
+        saved = self._frozen, self._frozen_tracks
+        self._frozen, self._frozen_tracks = tv, track_names
+        try:
+            value = self.evaluate_expression(node.value)
+        finally:
+            self._frozen, self._frozen_tracks = saved
+        
+        shape = node.value.shape
+        if shape is TRUTHVECTOR:
+            for track_name in track_names:
+                tv.set(track_name, value.get(track_name))
+        elif shape is SCALAR or shape is TRACK:
+            value = float(value)
+            for track_name in track_names:
+                tv.set(track_name, value)
+        elif isinstance(value, TruthValue):
+            for track_name in track_names:
+                tv.set(track_name, value.get(track_name))
+        elif isinstance(value, (int, float)):
+            for track_name in track_names:
+                tv.set(track_name, float(value))
+        else:
+            self.error(f"Cannot assign {type(value).__name__} to truth value", node)
+    
     def execute_if_statement(self, node: IfStatement):
         """
         Executes an if statement.
@@ -227,8 +532,16 @@ class Interpreter:
         """
         condition = self.evaluate_expression(node.condition)
         
+        if node.paraconsistent and isinstance(condition, TruthValue) and _contradictory(condition):
+            if self.branches.fork():
+                self.execute_forked_if(node, condition)
+                return
+        
         # Convert condition to boolean
-        if isinstance(condition, TruthValue):
+        shape = node.condition.shape
+        if shape is SCALAR or shape is TRACK:
+            condition_bool = condition >= 0.5
+        elif shape is TRUTHVECTOR or isinstance(condition, TruthValue):
             condition_bool = condition.to_classical()
         elif isinstance(condition, (int, float)):
             condition_bool = condition >= 0.5
@@ -242,6 +555,63 @@ class Interpreter:
             for stmt in node.else_body:
                 self.execute_declaration(stmt)
     
+    def execute_forked_if(self, node: IfStatement, condition: TruthValue):
+        """
+        Executes both arms of an `if!!` with a contradictory condition (spec 15.10).
+
+        Each arm runs on its own Branch of the state, sharing everything it
+        does not write; the arms' writes are then merged by the branch
+        engine's policy into the state they forked from. The fork's two
+        branches must already be reserved with `self.branches.fork()`.
+
+        Args:
+            node (IfStatement): The if!! statement.
+            condition (TruthValue): Its condition, true on some tracks and
+                false on others.
+        """
+        weights = dict(condition.values)
+        parent = self._branch
+        truthvalues, variables = self.truthvalues, self.variables
+        arms = []
+        try:
+            for body in (node.then_body, node.else_body or []):
+                branch = Branch(truthvalues, variables, parent)
+                self._branch = branch
+                self.truthvalues, self.variables = branch.truthvalues, branch.variables
+                try:
+                    for stmt in body:
+                        self.execute_declaration(stmt)
+                finally:
+                    branch.close(self.variables)
+                    self.truthvalues, self.variables = truthvalues, variables
+                arms.append(branch)
+        finally:
+            self._branch = parent
+            self.branches.join()
+        self._apply_merge(self.branches.merge(arms[0], arms[1], weights))
+    
+    def _apply_merge(self, merged: MergedState):
+        """Writes the merged arms of a fork to the current state."""
+        branch = self._branch
+        for name, values in merged.truthvalues.items():
+            if name in self.truthvalues:
+                tv = self.truthvalues[name] if branch is None else branch.own(name)
+                for track_name, value in values.items():
+                    tv.set(track_name, value)
+            else:
+                self._bind_truthvalue(name, TruthValue(self.tracks, values))
+        for name, value in merged.variables.items():
+            self.variables[name] = value
+        for context, slots in merged.frames.values():
+            frame = context.frame if branch is None else branch.frame(context)
+            for slot, value in slots.items():
+                frame[slot] = value
+        for name, (context, active) in merged.switches.items():
+            if branch is not None:
+                branch.switches[name] = (context, active)
+            else:
+                context.active = active
+    
     def execute_guard_statement(self, node: GuardStatement):
         """
         Executes a guard statement.
@@ -264,7 +634,10 @@ class Interpreter:
         # Evaluate condition
         condition = self.evaluate_expression(node.condition)
         
-        if isinstance(condition, TruthValue):
+        shape = node.condition.shape
+        if shape is SCALAR or shape is TRACK:
+            condition_bool = condition >= 0.5
+        elif shape is TRUTHVECTOR or isinstance(condition, TruthValue):
             condition_bool = condition.get(node.track) >= 0.5
         elif isinstance(condition, (int, float)):
             condition_bool = condition >= 0.5
@@ -306,8 +679,18 @@ class Interpreter:
         elif isinstance(node, UnaryOp):
             return self.evaluate_unary_op(node)
         
-        elif isinstance(node, FunctionCall):
-            return self.evaluate_function_call(node)
+        elif isinstance(node, (FunctionCall, MetaOp)):
+            evaluate = self.evaluate_function_call if isinstance(node, FunctionCall) else self.evaluate_meta_op
+            if self._frozen is None:
+                return evaluate(node)
+            # Arguments and bodies may read any track, so compute them all
+            frozen, self._frozen = self._frozen, None
+            try:
+                if isinstance(node, FunctionCall):
+                    return evaluate(node, frozen)
+                return evaluate(node)
+            finally:
+                self._frozen = frozen
         
         else:
             self.error(f"Unknown expression type: {type(node).__name__}", node)
@@ -325,6 +708,14 @@ class Interpreter:
         Raises:
             RuntimeError: If the variable is not defined.
         """
+        # Context variables resolved to a frame slot
+        slot = node.slot
+        if slot is not None:
+            context = self.current_context
+            for _ in range(node.depth):
+                context = context.parent
+            return context.frame[slot]
+        
         name = node.name
         
         # Check if it's a track-qualified reference
@@ -335,15 +726,17 @@ class Interpreter:
             else:
                 self.error(f"Variable {name} is not a truth value", node)
         
-        # Regular variable lookup
+        # Regular variable lookup; context variables shadow global ones
+        context = self.current_context
         if name in self.truthvalues:
             return self.truthvalues[name]
-        elif name in self.variables:
+        if context is not None:
+            owner = context.find(name)
+            if owner is not None:
+                return owner.frame[owner.slots[name]]
+        if name in self.variables:
             return self.variables[name]
-        elif self.current_context and name in self.current_context.variables:
-            return self.current_context.variables[name]
-        else:
-            self.error(f"Undefined variable: {name}", node)
+        self.error(f"Undefined variable: {name}", node)
     
     def evaluate_binary_op(self, node: BinaryOp) -> Any:
         """
@@ -358,18 +751,39 @@ class Interpreter:
         Raises:
             RuntimeError: If an unknown operator is encountered.
         """
-        left = self.evaluate_expression(node.left)
-        right = self.evaluate_expression(node.right)
-        
         # Handle logical operators with polylogical semantics
         if node.operator in ['and', 'or']:
+            left = self.evaluate_expression(node.left)
+            right = self.evaluate_expression(node.right)
+            # Operands of a static shape need no type checks
+            shape = node.shape
+            if shape is TRUTHVECTOR:
+                return self._logical_tracks(node.operator, left, right, node.left.shape is TRUTHVECTOR,
+                                            node.right.shape is TRUTHVECTOR)
+            if shape is SCALAR:
+                return apply_logic_operator(node.operator, RuntimeLogicType.CLASSICAL, left, right)
             return self.evaluate_logical_op(node.operator, left, right)
         
+        # Operands converted to numbers need every track computed
+        frozen = self._frozen
+        if frozen is not None:
+            self._frozen = None
+            try:
+                left = self.evaluate_expression(node.left)
+                right = self.evaluate_expression(node.right)
+            finally:
+                self._frozen = frozen
+        else:
+            left = self.evaluate_expression(node.left)
+            right = self.evaluate_expression(node.right)
+        
         # Arithmetic and comparison operators
-        # Convert TruthValues to float
-        if isinstance(left, TruthValue):
+        # Convert TruthValues to float; operands of a static shape need no type check
+        shape = node.left.shape
+        if shape is TRUTHVECTOR or (shape is None or shape is DYNAMIC) and isinstance(left, TruthValue):
             left = float(left)
-        if isinstance(right, TruthValue):
+        shape = node.right.shape
+        if shape is TRUTHVECTOR or (shape is None or shape is DYNAMIC) and isinstance(right, TruthValue):
             right = float(right)
         
         if node.operator == '+':
@@ -401,6 +815,9 @@ class Interpreter:
         """
         Evaluates a logical operation with polylogical semantics.
 
+        During a beat assignment only the firing tracks are computed (see
+        `_track_result`).
+
         Args:
             op (str): The logical operator ('and' or 'or').
             left (Any): The left operand.
@@ -409,23 +826,15 @@ class Interpreter:
         Returns:
             Any: The result of the logical operation.
         """
-        # If both operands are TruthValues, apply track-wise operations
-        if isinstance(left, TruthValue) and isinstance(right, TruthValue):
-            result = TruthValue(self.tracks)
-            for track_name, track in self.tracks.items():
-                left_val = left.get(track_name)
-                right_val = right.get(track_name)
-                result_val = apply_logic_operator(op, track.logic, left_val, right_val)
-                result.set(track_name, result_val)
-            return result
-        
-        # If one is TruthValue, convert the other to TruthValue
-        if isinstance(left, TruthValue) or isinstance(right, TruthValue):
-            if not isinstance(left, TruthValue):
-                left = self._to_truthvalue(left)
-            if not isinstance(right, TruthValue):
-                right = self._to_truthvalue(right)
-            return self.evaluate_logical_op(op, left, right)
+        # If either operand is a TruthValue, apply track-wise operations
+        left_tv = isinstance(left, TruthValue)
+        right_tv = isinstance(right, TruthValue)
+        if left_tv or right_tv:
+            if not left_tv:
+                left = float(left) if isinstance(left, (int, float)) else 0.0
+            if not right_tv:
+                right = float(right) if isinstance(right, (int, float)) else 0.0
+            return self._logical_tracks(op, left, right, left_tv, right_tv)
         
         # Both are scalars - use classical logic
         left_val = float(left) if isinstance(left, (int, float)) else 0.0
@@ -446,14 +855,17 @@ class Interpreter:
         Raises:
             RuntimeError: If an unknown unary operator is encountered.
         """
-        operand = self.evaluate_expression(node.operand)
-        
         if node.operator == 'not':
-            if isinstance(operand, TruthValue):
-                result = TruthValue(self.tracks)
-                for track_name, track in self.tracks.items():
+            operand = self.evaluate_expression(node.operand)
+            shape = node.shape
+            if shape is SCALAR:
+                return apply_logic_operator('not', RuntimeLogicType.CLASSICAL, operand)
+            if shape is TRUTHVECTOR or isinstance(operand, TruthValue):
+                result, track_names = self._track_result()
+                tracks = self.tracks
+                for track_name in track_names:
                     val = operand.get(track_name)
-                    result_val = apply_logic_operator('not', track.logic, val)
+                    result_val = apply_logic_operator('not', tracks[track_name].logic, val)
                     result.set(track_name, result_val)
                 return result
             else:
@@ -461,19 +873,28 @@ class Interpreter:
                 return apply_logic_operator('not', RuntimeLogicType.CLASSICAL, val)
         
         elif node.operator == '-':
-            if isinstance(operand, TruthValue):
+            frozen, self._frozen = self._frozen, None
+            try:
+                operand = self.evaluate_expression(node.operand)
+            finally:
+                self._frozen = frozen
+            shape = node.operand.shape
+            if shape is TRUTHVECTOR or (shape is None or shape is DYNAMIC) and isinstance(operand, TruthValue):
                 return -float(operand)
             return -operand
         
         else:
             self.error(f"Unknown unary operator: {node.operator}", node)
     
-    def evaluate_function_call(self, node: FunctionCall) -> Any:
+    def evaluate_function_call(self, node: FunctionCall, frozen: Optional[TruthValue] = None) -> Any:
         """
         Evaluates a function call.
 
         Args:
             node (FunctionCall): The function call node to be evaluated.
+            frozen (Optional[TruthValue]): The truth value being assigned, if
+                the call is the whole value of a beat assignment; passed on
+                to builtins.
 
         Returns:
             Any: The return value of the function.
@@ -485,15 +906,18 @@ class Interpreter:
         if node.name == 'print':
             args = [self.evaluate_expression(arg) for arg in node.args]
             for arg in args:
-                if isinstance(arg, TruthValue):
-                    print(arg)
-                else:
-                    print(arg)
+                print(arg, file=self.output)
             return 0.0
         
-        # User-defined functions
-        if node.name in self.functions:
-            func = self.functions[node.name]
+        # Native standard library (spec chapter 20)
+        if node.name in BUILTINS:
+            return self.evaluate_builtin(node, frozen)
+        
+        # User-defined functions, including module functions on first reference
+        func = self.functions.get(node.name)
+        if func is None and '::' in node.name:
+            func = self.resolve_module_function(node)
+        if func is not None:
             args = [self.evaluate_expression(arg) for arg in node.args]
             
             # Create new scope
@@ -524,6 +948,212 @@ class Interpreter:
         
         self.error(f"Unknown function: {node.name}", node)
     
+    def import_module(self, node: ImportDecl):
+        """
+        Executes an import: loads the module and binds it to its alias.
+
+        Args:
+            node (ImportDecl): The import node.
+
+        Raises:
+            RuntimeError: If the module is not found or the alias is taken.
+        """
+        try:
+            module = self.modules.load(node.module)
+        except KeyError as e:
+            self.error(e.args[0], node)
+        self._bind_module(node.alias, module, node)
+    
+    def _bind_module(self, namespace: str, module: Module, node: ASTNode):
+        """Binds a module to a namespace, and its full name for its own qualified calls."""
+        for name in (namespace, module.name):
+            bound = self.imports.get(name)
+            if bound is not None and bound is not module:
+                self.error(f"Namespace {name} is already bound to module {bound.name}", node)
+            self.imports[name] = module
+        for name in module.imports.values():
+            if name not in self.imports:
+                self._lazy_imports.setdefault(name, node)
+    
+    def resolve_module_function(self, node: FunctionCall) -> FunctionDecl:
+        """
+        Resolves a namespaced call to a module function, compiling it if needed.
+
+        The function is registered under the called name, so later calls find
+        it directly.
+
+        Args:
+            node (FunctionCall): The call, named "<namespace>::<name>".
+
+        Returns:
+            FunctionDecl: The function.
+
+        Raises:
+            RuntimeError: If the namespace or function is unknown.
+        """
+        namespace, _, symbol = node.name.rpartition('::')
+        module = self.imports.get(namespace)
+        if module is None and namespace in self._lazy_imports:
+            import_node = self._lazy_imports.pop(namespace)
+            try:
+                module = self.modules.load(namespace)
+            except KeyError as e:
+                self.error(e.args[0], import_node)
+            self._bind_module(namespace, module, import_node)
+        if module is None:
+            self.error(f"Unknown module: {namespace}", node)
+        func = module.function(symbol)
+        if func is None:
+            self.error(f"Unknown function: {node.name}", node)
+        self.functions[node.name] = func
+        return func
+    
+    def evaluate_builtin(self, node: FunctionCall, frozen: Optional[TruthValue] = None) -> Any:
+        """
+        Evaluates a call to a native standard library function.
+
+        Args:
+            node (FunctionCall): The call, named "<namespace>::<name>".
+            frozen (Optional[TruthValue]): The truth value being assigned, if
+                the call is the whole value of a beat assignment; track-wise
+                builtins then compute only the firing tracks.
+
+        Returns:
+            Any: The function's result.
+
+        Raises:
+            RuntimeError: If the arguments are invalid.
+        """
+        builtin = BUILTINS[node.name]
+        if not builtin.min_args <= len(node.args) <= builtin.max_args:
+            expected = (str(builtin.min_args) if builtin.min_args == builtin.max_args
+                        else f"{builtin.min_args} to {builtin.max_args}")
+            self.error(f"Function {node.name} expects {expected} arguments, got {len(node.args)}", node)
+        args = []
+        for i, arg in enumerate(node.args):
+            if i in builtin.symbols:
+                if not isinstance(arg, Variable) or arg.track:
+                    self.error(f"Argument {i + 1} of {node.name} must be a name", node)
+                args.append(arg.name)
+            else:
+                args.append(self.evaluate_expression(arg))
+        
+        # Builtins evaluate no expressions, so the target can be frozen again
+        saved, self._frozen = self._frozen, frozen
+        try:
+            return builtin.function(self, *args)
+        except ValueError as e:
+            self.error(str(e), node)
+        finally:
+            self._frozen = saved
+    
+    def get_meta(self) -> MetaEngine:
+        """
+        Gets the meta-logic engine, creating it on first use.
+
+        Returns:
+            MetaEngine: The engine observing this interpreter's truth values.
+        """
+        if self.meta is None:
+            self.meta = MetaEngine(self.tracks, self.truthvalues)
+        return self.meta
+    
+    def evaluate_meta_op(self, node: MetaOp) -> Any:
+        """
+        Evaluates a meta-operator (spec 10.5).
+
+        - `@coh(x)`: cross-track coherence of x; `@coh()` the mean coherence
+          of every truth value.
+        - `@blend(a, b, w)`: `a * (1 - w) + b * w`, track by track.
+        - `@resolve(x)`: x snapped on every track to its classical verdict,
+          1.0 if its mean over the tracks is at least 0.5, else 0.0.
+        - `@dom(track)`: the track's share of the decisiveness (distance from
+          0.5) of every truth value.
+        - `@meta(x)`: the mean of x over its tracks; `@meta(track)` the mean
+          of a track over every truth value; `@meta(beat)` the global beat;
+          `@meta(period(t))` and `@meta(phase(t))` a track's timing.
+
+        Aggregates come from the meta engine, which maintains them as truth
+        values change.
+
+        Args:
+            node (MetaOp): The meta-operator node to be evaluated.
+
+        Returns:
+            Any: The result of the meta-operator.
+
+        Raises:
+            RuntimeError: If the operator is unknown or given the wrong arguments.
+        """
+        op = node.operator
+        args = node.args
+        if op not in META_OPERATORS:
+            self.error(f"Unknown meta-operator: @{op}", node)
+        meta = self.get_meta()
+        
+        if op == 'dom':
+            if len(args) != 1 or not isinstance(args[0], Variable) or args[0].name not in self.tracks:
+                self.error("@dom expects a track name", node)
+            return meta.dominance(args[0].name)
+        
+        if op == 'coh':
+            if not args:
+                return meta.coherence()
+            if len(args) != 1:
+                self.error("@coh expects at most one argument", node)
+            value = self.evaluate_expression(args[0])
+            return meta.coherence(value) if isinstance(value, TruthValue) else 1.0
+        
+        if op == 'meta':
+            if len(args) != 1:
+                self.error("@meta expects one argument", node)
+            arg = args[0]
+            if isinstance(arg, FunctionCall) and arg.name in ('period', 'phase'):
+                track = self.tracks.get(arg.args[0].name)
+                if track is None:
+                    self.error(f"Unknown track: {arg.args[0].name}", node)
+                return float(getattr(track, arg.name))
+            if isinstance(arg, Variable) and not arg.track:
+                if arg.name == 'beat' and arg.name not in self.truthvalues and arg.name not in self.variables:
+                    return float(self.global_beat)
+                if arg.name in self.tracks and arg.name not in self.truthvalues:
+                    return meta.track_mean(arg.name)
+            value = self.evaluate_expression(arg)
+            if isinstance(value, TruthValue):
+                return meta.intensity(value)
+            return float(value) if isinstance(value, (int, float)) else 0.0
+        
+        if op == 'blend':
+            if len(args) != 3:
+                self.error("@blend expects three arguments", node)
+            return tv_blend(self, *(self.evaluate_expression(arg) for arg in args))
+        
+        # resolve
+        if len(args) != 1:
+            self.error("@resolve expects one argument", node)
+        value = self.evaluate_expression(args[0])
+        if isinstance(value, TruthValue):
+            return TruthValue(self.tracks, 1.0 if meta.intensity(value) >= 0.5 else 0.0)
+        return 1.0 if float(value) >= 0.5 else 0.0
+    
+    def _track_result(self) -> Tuple[TruthValue, Any]:
+        """
+        Creates the result of a track-wise operation and the tracks to compute.
+
+        Freeze-on-no-beat (spec 6.5): while a beat assignment is evaluated,
+        tracks that do not fire keep their stored value, so only the firing
+        tracks the target stores are computed and the others are copied from
+        the target.
+
+        Returns:
+            Tuple[TruthValue, Iterable[str]]: The result, and the names of the
+                tracks to compute into it.
+        """
+        frozen = self._frozen
+        if frozen is None:
+            return TruthValue(self.tracks), self.tracks
+        return TruthValue(self.tracks, frozen.values), self._frozen_tracks
+    
     def _to_truthvalue(self, value: Any) -> TruthValue:
         """Convert a scalar value to a TruthValue."""
         if isinstance(value, TruthValue):
@@ -531,6 +1161,37 @@ class Interpreter:
         val = float(value) if isinstance(value, (int, float)) else 0.0
         return TruthValue(self.tracks, val)
     
+    def _logical_tracks(self, op: str, left: Any, right: Any, left_tv: bool, right_tv: bool) -> TruthValue:
+        """
+        Applies a logical operator track by track.
+
+        A number operand is broadcast to every track without being converted
+        to a TruthValue.
+
+        Args:
+            op (str): The logical operator ('and' or 'or').
+            left (Any): The left operand, a TruthValue if `left_tv`, else a number.
+            right (Any): The right operand, a TruthValue if `right_tv`, else a number.
+            left_tv (bool): Whether the left operand is a TruthValue.
+            right_tv (bool): Whether the right operand is a TruthValue.
+
+        Returns:
+            TruthValue: The result.
+        """
+        result, track_names = self._track_result()
+        tracks = self.tracks
+        # The result is new and unobserved, so clamp into its values directly
+        values = result.values
+        clamp = result.clamp
+        left_values = left.values if left_tv else None
+        right_values = right.values if right_tv else None
+        for track_name in track_names:
+            left_val = left_values.get(track_name, 0.0) if left_tv else left
+            right_val = right_values.get(track_name, 0.0) if right_tv else right
+            values[track_name] = clamp(track_name, apply_logic_operator(op, tracks[track_name].logic,
+                                                                        left_val, right_val))
+        return result
+    
     def advance_beat(self):
         """
         Advances the global beat counter by one.
@@ -541,3 +1202,191 @@ class Interpreter:
         self.global_beat += 1
         for track in self.tracks.values():
             track.advance()
+    
+    def skip_beat(self):
+        """
+        Advances over a beat without running it.
+
+        No rules, meta blocks or event rules run, so every track stays frozen
+        on the skipped beat, but beat hooks are still called so that observers
+        such as trace writers see every beat.
+        """
+        self.advance_beat()
+        for hook in self.beat_hooks:
+            hook(self)
+    
+    def step(self):
+        """
+        Executes one beat of the global beat engine.
+
+        The global beat is advanced and every declared rule is re-evaluated
+        in the context it was declared in. Assignments only update the
+        tracks that fire on the new beat; all other tracks stay frozen.
+        On meta-beats the meta blocks run after the rules. Event rules are
+        checked last, with the beat's firing tracks. Beat start hooks are
+        called before the first rule runs, beat hooks once the beat is
+        complete.
+        """
+        self.advance_beat()
+        for hook in self.beat_start_hooks:
+            hook(self)
+        beat = self.global_beat
+        active = [name for name, track in self.tracks.items() if track.is_active(beat)]
+        self._active_tracks = active
+        old_context = self.current_context
+        try:
+            self.execute_rules()
+            if self.meta_rules and beat % self.meta_interval() == 0:
+                self._active_tracks = list(self.tracks)
+                self.execute_meta_rules()
+            if self.events:
+                self._active_tracks = active
+                self.execute_events()
+        finally:
+            self.current_context = old_context
+            self._active_tracks = None
+        for hook in self.beat_hooks:
+            hook(self)
+    
+    def execute_rules(self):
+        """
+        Executes the rules of the active contexts, in declaration order, each in its declaring context.
+
+        Inactive contexts' rule sets are skipped whole, so a beat costs in
+        proportion to the rules of the active contexts.
+        """
+        rules = self.rules
+        for context, start, end in self.rule_sets:
+            if context is not None and not context.is_active():
+                continue
+            self.current_context = context
+            for index in range(start, end):
+                self.execute_rule(rules[index][0])
+    
+    def execute_events(self):
+        """
+        Checks the event rules and runs those whose conditions flipped.
+
+        An event rule's body runs when its condition becomes true and its else
+        body when it becomes false; a rule checked for the first time only
+        records its condition. Only the rules the event index finds may have
+        flipped are checked, in declaration order, each in its declaring
+        context. Changes an event body makes are seen by the rules checked
+        after it, or else at the next check. The rules of inactive contexts
+        are checked once their contexts are entered again.
+        """
+        index = self.event_index
+        old_context = self.current_context
+        try:
+            for event in index.candidates(self.truthvalues):
+                node, self.current_context = self.events[event]
+                if self.current_context is not None and not self.current_context.is_active():
+                    index.defer(event)
+                    continue
+                state = index.check(event, self.truthvalues)
+                if state is None:
+                    state = self._condition_truth(node.condition)
+                if index.update(event, state):
+                    self.execute_event(node, state)
+        finally:
+            self.current_context = old_context
+    
+    def execute_event(self, node: WhenDecl, state: bool):
+        """
+        Runs an event rule that fired, in the current context.
+
+        Args:
+            node (WhenDecl): The event rule.
+            state (bool): The condition's new value: True runs the body,
+                False the else body.
+        """
+        for stmt in (node.body if state else node.else_body) or ():
+            self.execute_declaration(stmt)
+    
+    def scalar(self, name: str, context: Optional[Context], default: Any = None) -> Any:
+        """
+        Gets a variable as the rules of a context see it: the variable of the
+        innermost context of its chain declaring one, or else the global
+        variable.
+
+        Args:
+            name (str): The variable name.
+            context (Optional[Context]): The context; None means global.
+            default (Any): The value if the variable is not defined.
+
+        Returns:
+            Any: The variable's value.
+        """
+        owner = context.find(name) if context is not None else None
+        if owner is not None:
+            return owner.frame[owner.slots[name]]
+        return self.variables.get(name, default)
+    
+    def _condition_truth(self, condition: Expression) -> bool:
+        """Evaluates a condition to a boolean, as an if statement does."""
+        value = self.evaluate_expression(condition)
+        if isinstance(value, TruthValue):
+            return value.to_classical()
+        if isinstance(value, (int, float)):
+            return value >= 0.5
+        return bool(value)
+    
+    def meta_interval(self) -> int:
+        """
+        Gets the number of global beats between meta-beats.
+
+        Returns:
+            int: The declared meta-beat, or else the longest track period, so
+                meta-logic runs no more often than any track.
+        """
+        if self.meta_beat is not None:
+            return self.meta_beat
+        return max((track.period for track in self.tracks.values()), default=1)
+    
+    def execute_meta_rules(self):
+        """
+        Executes the meta blocks of the active contexts, in declaration order, each in its declaring context.
+
+        Meta-logic governs all tracks, so during a beat its assignments update
+        every track in place rather than only those firing on the beat.
+        """
+        for meta_rule, context in self.meta_rules:
+            if context is not None and not context.is_active():
+                continue
+            self.current_context = context
+            self.execute_rule(meta_rule)
+    
+    def run(self, beats: int):
+        """
+        Runs the beat engine for a number of beats.
+
+        Args:
+            beats (int): The number of beats to execute.
+        """
+        for _ in range(beats):
+            self.step()
+    
+    def checkpoint(self, path: str):
+        """
+        Writes the interpreter state to a binary checkpoint file.
+
+        Args:
+            path (str): The destination file path.
+        """
+        write_checkpoint(self, path)
+    
+    def restore(self, path: str):
+        """
+        Restores the interpreter state from a checkpoint file.
+
+        The program (functions and rules) must already be loaded; only the
+        runtime state is replaced.
+
+        Args:
+            path (str): The checkpoint file path.
+        """
+        read_checkpoint(self, path)
+        # Event conditions are sampled afresh, without firing
+        self.event_index.reset()
+        if self.events:
+            self.execute_events()
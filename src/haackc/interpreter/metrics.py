@@ -0,0 +1,396 @@
+"""
+Runtime metrics - beat throughput, beat latency and evaluation counters.
+"""
+
+import bisect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..runtime.truthvalue import TruthValue
+
+
+# Metric labels are stored as sorted (name, value) pairs
+Labels = Tuple[Tuple[str, str], ...]
+
+# Beat latency buckets: 1us .. ~16s in powers of two
+LATENCY_BUCKETS = tuple(1e-6 * 2 ** i for i in range(25))
+
+
+class Histogram:
+    """
+    A fixed-bucket histogram with an exact maximum.
+
+    Attributes:
+        bounds (Tuple[float, ...]): The upper bounds of the buckets.
+        counts (List[int]): The number of observations per bucket, plus one
+            overflow bucket.
+        count (int): The number of observations.
+        total (float): The sum of the observations.
+        max (float): The largest observation.
+    """
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Records one observation."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile by interpolating within its bucket.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimated value, never above the observed maximum.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                low = self.bounds[i - 1] if i > 0 else 0.0
+                high = self.bounds[i] if i < len(self.bounds) else self.max
+                estimate = low + (high - low) * (rank - seen) / bucket_count
+                return min(estimate, self.max)
+            seen += bucket_count
+        return self.max
+
+
+class MetricsRegistry:
+    """
+    A thread-safe store of counters, gauges and histograms.
+
+    Values are updated by the beat engine thread and read by exporters
+    (Prometheus text, HTTP endpoint) from other threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._help: Dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str):
+        """Sets the help text of a metric."""
+        self._help[name] = help_text
+
+    def add(self, name: str, amount: float, labels: Labels = ()):
+        """Increments a counter."""
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + amount
+
+    def add_many(self, name: str, amounts: Dict[Labels, float]):
+        """Increments several labelled series of a counter at once."""
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            for labels, amount in amounts.items():
+                series[labels] = series.get(labels, 0) + amount
+
+    def set(self, name: str, value: float, labels: Labels = ()):
+        """Sets a gauge."""
+        with self._lock:
+            self._gauges.setdefault(name, {})[labels] = value
+
+    def histogram(self, name: str) -> Histogram:
+        """Gets or creates a histogram."""
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = Histogram()
+            return self._histograms[name]
+
+    def observe(self, name: str, value: float):
+        """Records an observation in a histogram."""
+        histogram = self.histogram(name)
+        with self._lock:
+            histogram.observe(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Gets a copy of all metric values.
+
+        Returns:
+            Dict[str, Any]: Counters and gauges as {name: {labels: value}},
+                histograms as {name: {count, sum, max, p50, p99}}.
+        """
+        with self._lock:
+            result: Dict[str, Any] = {}
+            for name, series in list(self._counters.items()) + list(self._gauges.items()):
+                result[name] = {labels: value for labels, value in series.items()}
+            for name, histogram in self._histograms.items():
+                result[name] = {
+                    'count': histogram.count,
+                    'sum': histogram.total,
+                    'max': histogram.max,
+                    'p50': histogram.quantile(0.5),
+                    'p99': histogram.quantile(0.99),
+                }
+            return result
+
+    def to_prometheus(self) -> str:
+        """
+        Formats all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics text.
+        """
+        lines: List[str] = []
+        with self._lock:
+            for kind, metrics in (('counter', self._counters), ('gauge', self._gauges)):
+                for name in sorted(metrics):
+                    if name in self._help:
+                        lines.append(f"# HELP {name} {self._help[name]}")
+                    lines.append(f"# TYPE {name} {kind}")
+                    for labels, value in sorted(metrics[name].items()):
+                        lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            for name in sorted(self._histograms):
+                histogram = self._histograms[name]
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.bounds, histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{le="{bound:g}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{le="+Inf"}} {histogram.count}')
+                lines.append(f"{name}_sum {histogram.total:g}")
+                lines.append(f"{name}_count {histogram.count}")
+                for suffix, value in (('p50', histogram.quantile(0.5)),
+                                      ('p99', histogram.quantile(0.99)),
+                                      ('max', histogram.max)):
+                    lines.append(f"# TYPE {name}_{suffix} gauge")
+                    lines.append(f"{name}_{suffix} {value:g}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str):
+        """
+        Writes the Prometheus text to a file, replacing it atomically.
+
+        Args:
+            path (str): The output file path.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+def _format_labels(labels: Labels) -> str:
+    """Formats metric labels as `{name="value",...}`."""
+    if not labels:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"') for _, value in labels)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + '}'
+
+
+def _restore(interpreter: Any, saved: Dict[str, Optional[Callable]]):
+    """Puts back the instance attributes that were shadowed by wrappers."""
+    for name, previous in saved.items():
+        if previous is None:
+            delattr(interpreter, name)
+        else:
+            setattr(interpreter, name, previous)
+
+
+class RuntimeMetrics:
+    """
+    Collects metrics from a running interpreter into a MetricsRegistry.
+
+    Like the profiler, the collector shadows a few interpreter methods on the
+    instance it observes. The wrappers only bump plain integers; those are
+    flushed into the registry once per beat together with the beat latency,
+    so the locked registry is touched once per beat rather than once per
+    evaluation. TruthValue allocations are the exception: they are counted
+    for the whole process, across every interpreter in it.
+
+    Attributes:
+        interpreter (Interpreter): The interpreter being observed.
+        registry (MetricsRegistry): The registry metrics are written to.
+    """
+
+    WRAPPED = ('step', 'execute_rule', 'execute_guard_statement', 'evaluate_function_call')
+
+    def __init__(self, interpreter: Any, registry: Optional[MetricsRegistry] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        """
+        Initializes RuntimeMetrics.
+
+        Args:
+            interpreter (Interpreter): The interpreter to observe.
+            registry (Optional[MetricsRegistry]): The registry to write to.
+            clock (Callable[[], float]): The clock used to time beats.
+        """
+        self.interpreter = interpreter
+        self.registry = registry or MetricsRegistry()
+        self.clock = clock
+        self.enabled = False
+
+        self._rules: Dict[Labels, int] = {}
+        self._guards: Dict[Labels, int] = {}
+        self._calls: Dict[Labels, int] = {}
+        self._window_start = clock()
+        self._window_beats = 0
+
+        registry = self.registry
+        registry.describe('haackc_beats_total', 'Beats executed by the beat engine.')
+        registry.describe('haackc_beat_duration_seconds', 'Wall time spent executing each beat.')
+        registry.describe('haackc_beats_per_second', 'Beat throughput over the last measurement window.')
+        registry.describe('haackc_global_beat', 'Current global beat.')
+        registry.describe('haackc_rule_evaluations_total', 'Rule evaluations per track.')
+        registry.describe('haackc_guard_evaluations_total', 'Guard conditions evaluated per track.')
+        registry.describe('haackc_function_calls_total', 'Function calls per function.')
+        registry.describe('haackc_process_truthvalue_allocations',
+                          'TruthValues allocated by every interpreter in the process.')
+
+    def enable(self):
+        """Installs the counting wrappers on the interpreter."""
+        if self.enabled:
+            return
+        interpreter = self.interpreter
+        self._saved = {name: vars(interpreter).get(name) for name in self.WRAPPED}
+        for name in self.WRAPPED:
+            setattr(interpreter, name, getattr(self, f'_wrap_{name}')(getattr(interpreter, name)))
+        self.enabled = True
+
+    def disable(self):
+        """Removes the counting wrappers from the interpreter."""
+        if not self.enabled:
+            return
+        _restore(self.interpreter, self._saved)
+        self.enabled = False
+
+    def _wrap_step(self, method: Callable) -> Callable:
+        clock = self.clock
+
+        def step():
+            start = clock()
+            try:
+                method()
+            finally:
+                self._flush(clock() - start)
+
+        return step
+
+    def _wrap_execute_rule(self, method: Callable) -> Callable:
+        interpreter = self.interpreter
+        counts = self._rules
+
+        def execute_rule(node):
+            context = interpreter.current_context
+            key = (('track', (context.track if context else None) or 'unbound'),)
+            counts[key] = counts.get(key, 0) + 1
+            return method(node)
+
+        return execute_rule
+
+    def _wrap_execute_guard_statement(self, method: Callable) -> Callable:
+        interpreter = self.interpreter
+        counts = self._guards
+
+        def execute_guard_statement(node):
+            track = interpreter.tracks.get(node.track)
+            if track is not None and track.is_active(interpreter.global_beat):
+                key = (('track', node.track),)
+                counts[key] = counts.get(key, 0) + 1
+            return method(node)
+
+        return execute_guard_statement
+
+    def _wrap_evaluate_function_call(self, method: Callable) -> Callable:
+        counts = self._calls
+
+        def evaluate_function_call(node, frozen=None):
+            key = (('function', node.name),)
+            counts[key] = counts.get(key, 0) + 1
+            return method(node, frozen)
+
+        return evaluate_function_call
+
+    def _flush(self, duration: float):
+        """Moves the counts gathered during a beat into the registry."""
+        registry = self.registry
+        registry.add('haackc_beats_total', 1)
+        registry.observe('haackc_beat_duration_seconds', duration)
+        registry.set('haackc_global_beat', self.interpreter.global_beat)
+
+        for name, counts in (('haackc_rule_evaluations_total', self._rules),
+                             ('haackc_guard_evaluations_total', self._guards),
+                             ('haackc_function_calls_total', self._calls)):
+            if counts:
+                registry.add_many(name, counts)
+                counts.clear()
+
+        # TruthValues do not know their interpreter, so allocations are only
+        # counted per process; a gauge keeps collectors sharing a registry
+        # from counting them twice
+        registry.set('haackc_process_truthvalue_allocations', TruthValue.allocations)
+
+        self._window_beats += 1
+        now = self.clock()
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            registry.set('haackc_beats_per_second', self._window_beats / elapsed)
+            self._window_start = now
+            self._window_beats = 0
+
+
+class MetricsServer:
+    """
+    Serves a registry's Prometheus text over HTTP on localhost.
+
+    Attributes:
+        registry (MetricsRegistry): The registry being served.
+        port (int): The port the server listens on.
+    """
+
+    def __init__(self, registry: MetricsRegistry, port: int = 0, host: str = '127.0.0.1'):
+        """
+        Starts the server in a daemon thread.
+
+        Args:
+            registry (MetricsRegistry): The registry to serve.
+            port (int): The port to listen on; 0 picks a free port.
+            host (str): The address to bind to.
+        """
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path not in ('/', '/metrics'):
+                    handler.send_error(404)
+                    return
+                body = registry.to_prometheus().encode('utf-8')
+                handler.send_response(200)
+                handler.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                handler.send_header('Content-Length', str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stops the server."""
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,292 @@
+"""
+Parallel beat execution - runs independent rule components in worker processes.
+"""
+
+import multiprocessing
+from array import array
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..analysis import aliases_of, analyze, partition, rule_dependencies
+from ..parser.ast_nodes import RuleDecl
+
+# Control slots at the start of the shared block
+BEAT, RUNNING, FAILED, CONTROL = 0, 1, 2, 3
+
+
+def _put_scalar(view: memoryview, slot: int, value: Any):
+    """Stores a numeric variable as its value and whether it is an int."""
+    if isinstance(value, (int, float)):
+        view[slot] = float(value)
+        view[slot + 1] = 1.0 if isinstance(value, int) else 0.0
+
+
+def _get_scalar(view: memoryview, slot: int) -> Any:
+    value = view[slot]
+    return int(value) if view[slot + 1] else value
+
+
+class ParallelExecutor:
+    """
+    Executes an interpreter's rules with independent components in parallel.
+
+    The rules are partitioned by their read and write sets (see
+    `haackc.analysis.partition`); rules in different components touch
+    disjoint state. Components are spread over worker processes forked from
+    the interpreter once its program is loaded, so every worker holds the
+    same tracks, functions and rules. The truth values and numeric variables
+    live in one float64 block of shared memory: each beat the interpreter
+    publishes the state and the active tracks, the workers load what their
+    components read, run their rules in declaration order, store what they
+    wrote and meet at a barrier at the end of the beat, after which the
+    interpreter loads the workers' writes back. Because no two components
+    share written state, the result is exactly that of sequential execution.
+
+    Components that print, read model-wide meta-logic aggregates, or bind
+    names outside the shared layout (e.g. variables first created during a
+    beat), run in the interpreter process itself, in declaration order,
+    while the workers run. So do components that enter or exit contexts,
+    or have rules in contexts that are entered or exited or hold context
+    variables: the interpreter skips those of inactive contexts.
+
+    Like the profiler, the executor shadows `execute_rules` on the one
+    interpreter instance between `enable` and `disable`. Instrumentation
+    installed on the interpreter does not see rules run by workers.
+
+    Attributes:
+        interpreter (Interpreter): The interpreter being executed.
+        workers (int): The maximum number of worker processes.
+        components (List[List[int]]): The rule components, as rule indices.
+        assignments (List[List[int]]): The rule indices run by each worker.
+        local (List[int]): The rule indices run in the interpreter process.
+    """
+
+    def __init__(self, interpreter: Any, workers: Optional[int] = None, timeout: Optional[float] = 30.0):
+        """
+        Initializes a ParallelExecutor and partitions the interpreter's rules.
+
+        Args:
+            interpreter (Interpreter): The interpreter, with its program loaded.
+            workers (Optional[int]): The maximum number of worker processes;
+                None uses the number of CPUs.
+            timeout (Optional[float]): How long to wait at a beat barrier, in
+                seconds, before treating a worker as failed.
+
+        Raises:
+            ValueError: If `workers` is less than 1.
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("At least one worker is required")
+        self.interpreter = interpreter
+        self.workers = workers or multiprocessing.cpu_count()
+        self.timeout = timeout
+        self.enabled = False
+        self._build_layout()
+        self._plan()
+
+    def _build_layout(self):
+        """Assigns every truth value track and numeric variable a shared slot."""
+        interp = self.interpreter
+        self._aliases = aliases_of(interp.truthvalues)
+        self._rows: Dict[str, Tuple[Any, Tuple[str, ...], int]] = {}
+        offset = CONTROL + len(interp.tracks)
+        for name, tv in interp.truthvalues.items():
+            if name not in self._aliases:
+                keys = tuple(tv.values)
+                self._rows[name] = (tv, keys, offset)
+                offset += len(keys)
+        self._scalars: Dict[str, int] = {}
+        for name, value in interp.variables.items():
+            if isinstance(value, (int, float)) and name not in interp.truthvalues:
+                self._scalars[name] = offset
+                offset += 2
+        self._size = offset
+
+    def _plan(self):
+        """Partitions the rules and assigns components to workers."""
+        interp = self.interpreter
+        dependencies = analyze(interp.rules, interp.functions, self._aliases)
+        self.components = partition(dependencies)
+        shared = set(self._rows) | set(self._scalars)
+        switched = set().union(*(dep.contexts for dep in dependencies))
+        for block, _context in interp.meta_rules:
+            switched |= rule_dependencies(block, interp.functions).contexts
+        for event, _context in interp.events:
+            body = RuleDecl('when', event.body + (event.else_body or []))
+            switched |= rule_dependencies(body, interp.functions).contexts
+        contextual = [context is not None
+                      and any(c.name in switched or c.slots or not c.active for c in context.chain())
+                      for _rule, context in interp.rules]
+
+        loads = [0] * self.workers
+        assignments: List[List[int]] = [[] for _ in range(self.workers)]
+        local: List[int] = []
+        for component in sorted(self.components, key=len, reverse=True):
+            deps = [dependencies[i] for i in component]
+            if any(dep.effects or dep.aggregates or dep.contexts or contextual[dep.index]
+                   or not dep.writes <= shared for dep in deps):
+                local.extend(component)
+                continue
+            worker = loads.index(min(loads))
+            loads[worker] += len(component)
+            assignments[worker].extend(component)
+        self.assignments = [sorted(indices) for indices in assignments if indices]
+        self.local = sorted(local)
+
+        self._worker_state = []
+        for indices in self.assignments:
+            reads = set().union(*(dependencies[i].names for i in indices)) & shared
+            writes = set().union(*(dependencies[i].writes for i in indices))
+            self._worker_state.append((sorted(reads), sorted(writes)))
+
+    def enable(self):
+        """Starts the workers and installs the executor on the interpreter."""
+        if self.enabled:
+            return
+        self._start()
+        self._saved = vars(self.interpreter).get('execute_rules')
+        self.interpreter.execute_rules = self.execute_rules
+        self.enabled = True
+
+    def disable(self):
+        """Stops the workers and removes the executor from the interpreter."""
+        if not self.enabled:
+            return
+        if self._saved is None:
+            del self.interpreter.execute_rules
+        else:
+            self.interpreter.execute_rules = self._saved
+        self._stop()
+        self.enabled = False
+
+    def __enter__(self) -> 'ParallelExecutor':
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def _start(self):
+        try:
+            ctx = multiprocessing.get_context('fork')
+        except ValueError:
+            raise RuntimeError("Parallel execution requires the fork start method") from None
+        self._shm = shared_memory.SharedMemory(create=True, size=8 * self._size)
+        self._view = self._shm.buf.cast('d')
+        self._view[RUNNING] = 1.0
+        self._view[FAILED] = 0.0
+        self._barrier = ctx.Barrier(len(self.assignments) + 1)
+        self._errors = ctx.SimpleQueue()
+        self._processes = [ctx.Process(target=self._serve, args=(index,), daemon=True)
+                           for index in range(len(self.assignments))]
+        for process in self._processes:
+            process.start()
+
+    def _stop(self):
+        self._view[RUNNING] = 0.0
+        try:
+            if self._processes:
+                self._barrier.wait(self.timeout)
+        except BrokenBarrierError:
+            pass
+        for process in self._processes:
+            process.join(self.timeout)
+            if process.is_alive():
+                process.terminate()
+        self._view.release()
+        self._shm.close()
+        self._shm.unlink()
+
+    def _serve(self, index: int):
+        """The loop of one worker process."""
+        interp = self.interpreter
+        view = self._view
+        rules = [interp.rules[i] for i in self.assignments[index]]
+        reads, writes = self._worker_state[index]
+        read_rows = [self._rows[name] for name in reads if name in self._rows]
+        read_scalars = [(name, self._scalars[name]) for name in reads if name in self._scalars]
+        write_rows = [self._rows[name] for name in writes if name in self._rows]
+        write_scalars = [(name, self._scalars[name]) for name in writes if name in self._scalars]
+        track_names = list(interp.tracks)
+        while True:
+            self._barrier.wait()
+            if not view[RUNNING]:
+                return
+            try:
+                interp.global_beat = int(view[BEAT])
+                interp._active_tracks = [name for i, name in enumerate(track_names)
+                                         if view[CONTROL + i]]
+                for tv, keys, start in read_rows:
+                    tv.values.update(zip(keys, view[start:start + len(keys)]))
+                    if interp.meta is not None:
+                        interp.meta.refresh(tv)
+                for name, slot in read_scalars:
+                    interp.variables[name] = _get_scalar(view, slot)
+                for rule, context in rules:
+                    interp.current_context = context
+                    interp.execute_rule(rule)
+                for tv, keys, start in write_rows:
+                    view[start:start + len(keys)] = array('d', tv.values.values())
+                for name, slot in write_scalars:
+                    _put_scalar(view, slot, interp.variables.get(name))
+            except Exception as e:
+                view[FAILED] = 1.0
+                self._errors.put(str(e))
+            self._barrier.wait()
+
+    def _wait(self):
+        try:
+            self._barrier.wait(self.timeout)
+        except BrokenBarrierError:
+            raise RuntimeError("Runtime error: a parallel worker did not finish the beat") from None
+
+    def _execute_local(self):
+        """Runs the rules of the interpreter process, skipping inactive contexts."""
+        interp = self.interpreter
+        for index in self.local:
+            rule, context = interp.rules[index]
+            if context is not None and not context.is_active():
+                continue
+            interp.current_context = context
+            interp.execute_rule(rule)
+
+    def execute_rules(self):
+        """Executes the current beat's rules, with worker-owned components in parallel."""
+        interp = self.interpreter
+        if not self._processes:
+            self._execute_local()
+            return
+
+        view = self._view
+        view[BEAT] = float(interp.global_beat)
+        active = interp._active_tracks
+        for i, name in enumerate(interp.tracks):
+            view[CONTROL + i] = 1.0 if name in active else 0.0
+        for tv, keys, start in self._rows.values():
+            view[start:start + len(keys)] = array('d', tv.values.values())
+        for name, slot in self._scalars.items():
+            _put_scalar(view, slot, interp.variables.get(name))
+
+        self._wait()
+        try:
+            self._execute_local()
+        finally:
+            self._wait()
+
+        if view[FAILED]:
+            view[FAILED] = 0.0
+            messages = []
+            while not self._errors.empty():
+                messages.append(self._errors.get())
+            raise RuntimeError(messages[0])
+        for _reads, writes in self._worker_state:
+            for name in writes:
+                row = self._rows.get(name)
+                if row is not None:
+                    tv, keys, start = row
+                    tv.values.update(zip(keys, view[start:start + len(keys)]))
+                    if interp.meta is not None:
+                        interp.meta.refresh(tv)
+                else:
+                    interp.variables[name] = _get_scalar(view, self._scalars[name])
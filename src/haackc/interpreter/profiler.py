@@ -0,0 +1,214 @@
+"""
+Execution profiler - attributes interpreter time to HaackLang source constructs.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..parser.ast_nodes import *
+
+
+# (kind, name, line, column)
+ProfileKey = Tuple[str, str, int, int]
+
+
+def _label(key: ProfileKey) -> str:
+    """Formats a profile key as a flamegraph frame name."""
+    kind, name, line, column = key
+    label = f"{kind} {name}" if name else kind
+    if line:
+        label = f"{label} @{line}:{column}"
+    return label.replace(';', ',')
+
+
+class Profiler:
+    """
+    Measures wall time and call counts per rule, guard, function, context and
+    statement of a running interpreter.
+
+    Profiling works by shadowing the interpreter's dispatch methods with
+    timing wrappers on that one instance. Nothing is installed until `enable`
+    is called and `disable` removes the wrappers again, so an interpreter that
+    is not being profiled runs exactly the same code as before.
+
+    Attributes:
+        interpreter (Interpreter): The interpreter being profiled.
+        stats (Dict[ProfileKey, List[float]]): For each construct, its
+            [calls, total seconds, self seconds].
+        stacks (Dict[Tuple[ProfileKey, ...], float]): Self time per call
+            stack, for collapsed-stack output.
+        track_of (Dict[ProfileKey, Optional[str]]): The track each profiled
+            rule or guard runs on.
+    """
+
+    WRAPPED = ('step', 'interpret', 'execute_declaration', 'execute_rule',
+               'execute_guard_statement', 'execute_context_decl', 'evaluate_function_call')
+
+    def __init__(self, interpreter: Any, clock: Callable[[], float] = time.perf_counter):
+        """
+        Initializes a Profiler.
+
+        Args:
+            interpreter (Interpreter): The interpreter to profile.
+            clock (Callable[[], float]): The clock used to measure time.
+        """
+        self.interpreter = interpreter
+        self.clock = clock
+        self.stats: Dict[ProfileKey, List[float]] = {}
+        self.stacks: Dict[Tuple[ProfileKey, ...], float] = {}
+        self.track_of: Dict[ProfileKey, Optional[str]] = {}
+        self._keys: List[ProfileKey] = []
+        self._children: List[float] = []
+        self.enabled = False
+
+    def enable(self):
+        """Installs the timing wrappers on the interpreter."""
+        if self.enabled:
+            return
+        self._saved = {name: vars(self.interpreter).get(name) for name in self.WRAPPED}
+        for name in self.WRAPPED:
+            method = getattr(self.interpreter, name)
+            setattr(self.interpreter, name, self._wrap(method, getattr(self, f'_key_{name}')))
+        self.enabled = True
+
+    def disable(self):
+        """Removes the timing wrappers from the interpreter."""
+        if not self.enabled:
+            return
+        for name, previous in self._saved.items():
+            if previous is None:
+                delattr(self.interpreter, name)
+            else:
+                setattr(self.interpreter, name, previous)
+        self.enabled = False
+
+    def _key_step(self, *args) -> ProfileKey:
+        return ('beat', '', 0, 0)
+
+    def _key_interpret(self, node: Program) -> ProfileKey:
+        return ('program', '', 0, 0)
+
+    def _key_execute_declaration(self, node: ASTNode) -> Optional[ProfileKey]:
+        # Rules, guards and contexts get their own frames
+        if isinstance(node, Assignment):
+            target = f"{node.target}.{node.track}" if node.track else node.target
+            return ('statement', f"{target} =", node.line, node.column)
+        if isinstance(node, IfStatement):
+            return ('statement', 'if', node.line, node.column)
+        if isinstance(node, TruthValueDecl):
+            return ('statement', f"tv {node.name}", node.line, node.column)
+        if isinstance(node, ExpressionStatement):
+            return ('statement', 'expr', node.line, node.column)
+        return None
+
+    def _key_execute_rule(self, node: RuleDecl) -> ProfileKey:
+        context = self.interpreter.current_context
+        name = f"{context.name}::{node.name}" if context else node.name
+        key = ('rule', name, node.line, node.column)
+        self.track_of.setdefault(key, context.track if context else None)
+        return key
+
+    def _key_execute_guard_statement(self, node: GuardStatement) -> ProfileKey:
+        key = ('guard', node.track, node.line, node.column)
+        self.track_of.setdefault(key, node.track)
+        return key
+
+    def _key_execute_context_decl(self, node: ContextDecl) -> ProfileKey:
+        return ('context', node.name, node.line, node.column)
+
+    def _key_evaluate_function_call(self, node: FunctionCall, frozen: Any = None) -> ProfileKey:
+        return ('fn', node.name, node.line, node.column)
+
+    def _wrap(self, method: Callable, key_fn: Callable[..., Optional[ProfileKey]]) -> Callable:
+        """Builds a timing wrapper around an interpreter method."""
+        clock = self.clock
+        stats = self.stats
+        stacks = self.stacks
+        keys = self._keys
+        children = self._children
+
+        def wrapper(*args):
+            key = key_fn(*args)
+            if key is None:
+                return method(*args)
+            keys.append(key)
+            children.append(0.0)
+            start = clock()
+            try:
+                return method(*args)
+            finally:
+                elapsed = clock() - start
+                self_time = elapsed - children.pop()
+                if children:
+                    children[-1] += elapsed
+                entry = stats.get(key)
+                if entry is None:
+                    stats[key] = [1, elapsed, self_time]
+                else:
+                    entry[0] += 1
+                    entry[1] += elapsed
+                    entry[2] += self_time
+                stack = tuple(keys)
+                stacks[stack] = stacks.get(stack, 0.0) + self_time
+                keys.pop()
+
+        return wrapper
+
+    def by_track(self) -> Dict[str, float]:
+        """
+        Aggregates the time spent in rules and guards by the track they run on.
+
+        Each sample is attributed to the innermost rule or guard on its stack,
+        so a guard nested in a rule is not counted twice.
+
+        Returns:
+            Dict[str, float]: Seconds per track; rules outside a track-bound
+                context are reported under '(unbound)'.
+        """
+        totals: Dict[str, float] = {}
+        for stack, seconds in self.stacks.items():
+            for key in reversed(stack):
+                if key in self.track_of:
+                    name = self.track_of[key] or '(unbound)'
+                    totals[name] = totals.get(name, 0.0) + seconds
+                    break
+        return totals
+
+    def report(self, limit: int = 25) -> str:
+        """
+        Formats the profile as a table sorted by self time.
+
+        Args:
+            limit (int): The maximum number of rows to show.
+
+        Returns:
+            str: The formatted report.
+        """
+        rows = sorted(self.stats.items(), key=lambda item: item[1][2], reverse=True)
+        lines = [f"{'kind':<10} {'name':<28} {'location':<10} {'calls':>9} {'total ms':>11} {'self ms':>11}"]
+        for (kind, name, line, column), (calls, total, self_time) in rows[:limit]:
+            location = f"{line}:{column}" if line else '-'
+            lines.append(f"{kind:<10} {(name or '-')[:28]:<28} {location:<10} {int(calls):>9} "
+                         f"{total * 1000:>11.3f} {self_time * 1000:>11.3f}")
+
+        track_totals = self.by_track()
+        if track_totals:
+            lines.append('')
+            lines.append('Time by track (rules and guards):')
+            for track, total in sorted(track_totals.items(), key=lambda item: item[1], reverse=True):
+                lines.append(f"  {track:<20} {total * 1000:>11.3f} ms")
+        return '\n'.join(lines)
+
+    def write_collapsed(self, path: str):
+        """
+        Writes self time per call stack in the collapsed format used by
+        flamegraph tools (`frame;frame;frame microseconds`).
+
+        Args:
+            path (str): The output file path.
+        """
+        with open(path, 'w') as f:
+            for stack, seconds in sorted(self.stacks.items()):
+                micros = int(round(seconds * 1e6))
+                if micros:
+                    f.write(f"{';'.join(_label(key) for key in stack)} {micros}\n")
@@ -0,0 +1,301 @@
+"""
+Reactive execution - re-evaluates only the rules whose inputs changed.
+"""
+
+import heapq
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..analysis import analyze, rule_dependencies
+from ..parser.ast_nodes import RuleDecl
+
+_MISSING = object()
+
+
+class ReactiveExecutor:
+    """
+    Executes an interpreter's rules reactively: a rule runs on a beat only if
+    a name it reads or writes changed since it last ran with no effect.
+
+    A rule's run is determined by the values of the names it reads and
+    writes (see `haackc.analysis.rule_dependencies`) and by the tracks that
+    fire on the beat. When a rule runs and changes nothing it is settled for
+    that set of firing tracks, and is skipped on later beats with the same
+    firing tracks until one of its names changes. Each change bumps the
+    name's version and makes the rules depending on it pending again; rules
+    later in the beat are scheduled into the same beat, in declaration order,
+    exactly where full re-evaluation would run them. Values that do not
+    change stop the propagation, so a beat only evaluates the rules
+    downstream of what changed. Programs whose values all change on every
+    beat gain nothing and pay the bookkeeping.
+
+    Rules with effects (printing, unknown module functions), rules reading
+    meta-logic aggregates and rules reading the global beat run on every
+    beat. The rules of inactive contexts do not run and stay pending until
+    their contexts are entered again.
+
+    Changes are seen through `TruthValue.set`, which records changed truth
+    values in a journal, through truth values bound to names while the
+    executor is enabled, and through the numeric variables rules, meta
+    blocks and event rules assign, compared around the runs that assign
+    them. Each change adds the rules depending on it to a pending set per
+    set of firing tracks, so a beat only looks at the rules pending for its
+    tracks and the rules run on every beat, never the whole program. Writes
+    that bypass these (restoring a checkpoint, swapping in a population
+    instance, assigning `interpreter.variables` from the host) must be
+    followed by `invalidate`.
+
+    Like the profiler, the executor shadows `execute_rules`,
+    `execute_meta_rules`, `execute_event` and `_bind_truthvalue` on the one
+    interpreter instance between `enable` and `disable`.
+
+    Attributes:
+        interpreter (Interpreter): The interpreter being executed.
+        versions (Dict[str, int]): The number of changes seen to each name.
+        executed (int): The number of rule runs.
+        skipped (int): The number of rule runs skipped as settled.
+    """
+
+    def __init__(self, interpreter: Any):
+        """
+        Initializes a ReactiveExecutor and builds the rule dependency graph.
+
+        Args:
+            interpreter (Interpreter): The interpreter, with its program loaded.
+        """
+        self.interpreter = interpreter
+        self.versions: Dict[str, int] = {}
+        self.executed = 0
+        self.skipped = 0
+        self.enabled = False
+        self._journal: Set[Any] = set()
+        self._rebound: Set[str] = set()
+        self._build()
+
+    def _build(self):
+        """Builds the graph from names to the rules that read or write them."""
+        interp = self.interpreter
+        dependencies = analyze(interp.rules, interp.functions)
+        self._size = len(interp.rules)
+        self._readers: Dict[str, List[int]] = {}
+        self._writes: List[Tuple[str, ...]] = []
+        self._volatile: List[int] = []
+        for dep in dependencies:
+            for name in dep.names:
+                self._readers.setdefault(name, []).append(dep.index)
+            self._writes.append(tuple(sorted(dep.writes)))
+            if dep.effects or dep.aggregates or dep.beat:
+                self._volatile.append(dep.index)
+        # Variables meta blocks and event rules assign, outside execute_rules
+        self._meta_writes = sorted({(name, id(context), context) for block, context in interp.meta_rules
+                                    for name in rule_dependencies(block, interp.functions).writes},
+                                   key=lambda item: item[:2])
+        self._event_writes: Dict[int, Tuple[str, ...]] = {}
+        for event, _context in interp.events:
+            body = RuleDecl('when', event.body + (event.else_body or []))
+            self._event_writes[id(event)] = tuple(sorted(rule_dependencies(body, interp.functions).writes))
+        self._volatile_set = frozenset(self._volatile)
+        self._stable = frozenset(index for index in range(self._size) if index not in self._volatile_set)
+        # Per set of firing tracks, the stable rules whose names changed since
+        # they last ran on those tracks without changing anything; a set of
+        # firing tracks not seen yet starts with every stable rule pending
+        self._pending: Dict[Tuple[str, ...], Set[int]] = {}
+
+    def _observe(self):
+        """Journals every truth value and maps each one to the names bound to it."""
+        self._names: Dict[int, List[str]] = {}
+        for name, tv in self.interpreter.truthvalues.items():
+            tv.journal = self._journal
+            self._names.setdefault(id(tv), []).append(name)
+
+    def enable(self):
+        """Installs the executor on the interpreter."""
+        if self.enabled:
+            return
+        interp = self.interpreter
+        self._observe()
+        self._saved = {name: vars(interp).get(name) for name in
+                       ('execute_rules', 'execute_meta_rules', 'execute_event', '_bind_truthvalue')}
+        self._bind = interp._bind_truthvalue
+        self._execute_meta_rules = interp.execute_meta_rules
+        self._execute_event = interp.execute_event
+        interp.execute_rules = self.execute_rules
+        interp.execute_meta_rules = self.execute_meta_rules
+        interp.execute_event = self.execute_event
+        interp._bind_truthvalue = self._bind_truthvalue
+        self.invalidate()
+        self.enabled = True
+
+    def disable(self):
+        """Removes the executor from the interpreter."""
+        if not self.enabled:
+            return
+        interp = self.interpreter
+        for name, previous in self._saved.items():
+            if previous is None:
+                delattr(interp, name)
+            else:
+                setattr(interp, name, previous)
+        for tv in interp.truthvalues.values():
+            tv.journal = None
+        self.enabled = False
+
+    def __enter__(self) -> 'ReactiveExecutor':
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def invalidate(self, names: Optional[Iterable[str]] = None):
+        """
+        Records changes made behind the executor's back.
+
+        Args:
+            names (Optional[Iterable[str]]): The names whose values changed;
+                None means any name may have changed, and every rule runs on
+                the next beat.
+        """
+        if names is None:
+            self._observe()
+            self._pending = {}
+            return
+        self._changed(names, -1, None, None)
+
+    def _scalar_changes(self, run: Callable[[], None], writes: Iterable[Tuple[str, Any]]):
+        """Runs a function, then makes the rules depending on the variables it changed pending."""
+        interp = self.interpreter
+        scalar = interp.scalar
+        before = [(name, context, scalar(name, context, _MISSING)) for name, context in writes
+                  if name not in interp.truthvalues]
+        run()
+        changed = [name for name, context, value in before
+                   if name not in interp.truthvalues and scalar(name, context, _MISSING) != value]
+        if changed:
+            self._changed(changed, -1, None, None)
+
+    def execute_meta_rules(self):
+        """Executes the meta blocks through the interpreter, recording the variables they change."""
+        self._scalar_changes(self._execute_meta_rules,
+                             [(name, context) for name, _id, context in self._meta_writes])
+
+    def execute_event(self, node: Any, state: bool):
+        """Runs a fired event rule through the interpreter, recording the variables it changes."""
+        context = self.interpreter.current_context
+        self._scalar_changes(lambda: self._execute_event(node, state),
+                             [(name, context) for name in self._event_writes.get(id(node), ())])
+
+    def _bind_truthvalue(self, name: str, tv: Any):
+        """Binds a truth value through the interpreter, journaling it and the rebinding."""
+        if self.interpreter._branch is not None:
+            # Bound in an `if!!` arm; merging the arms binds it again
+            self._bind(name, tv)
+            return
+        previous = self.interpreter.truthvalues.get(name)
+        self._bind(name, tv)
+        if previous is tv:
+            return
+        if previous is not None:
+            names = self._names.get(id(previous))
+            if names and name in names:
+                names.remove(name)
+        tv.journal = self._journal
+        self._names.setdefault(id(tv), []).append(name)
+        self._rebound.add(name)
+
+    def _drain(self) -> Set[str]:
+        """Collects the names changed since the last drain."""
+        changed = self._rebound
+        self._rebound = set()
+        if self._journal:
+            names = self._names
+            for tv in self._journal:
+                changed.update(names.get(id(tv), ()))
+            self._journal.clear()
+        return changed
+
+    def _changed(self, names: Iterable[str], index: int, heap: Optional[List[int]],
+                 scheduled: Optional[Set[int]]):
+        """
+        Bumps the versions of changed names and makes their rules pending.
+
+        Rules after `index` are also scheduled into the current beat.
+        """
+        versions = self.versions
+        stable = self._stable
+        pending_sets = list(self._pending.values())
+        for name in names:
+            versions[name] = versions.get(name, 0) + 1
+            for reader in self._readers.get(name, ()):
+                if reader in stable:
+                    for pending in pending_sets:
+                        pending.add(reader)
+                if heap is not None and reader > index and reader not in scheduled:
+                    scheduled.add(reader)
+                    heapq.heappush(heap, reader)
+
+    def execute_rules(self):
+        """Executes the current beat's pending rules, in declaration order."""
+        interp = self.interpreter
+        rules = interp.rules
+        if len(rules) != self._size:
+            self._build()
+
+        external = self._drain()
+        if external:
+            self._changed(external, -1, None, None)
+
+        key = tuple(interp._active_tracks)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = set(self._stable)
+        scheduled = pending | self._volatile_set
+        heap = list(scheduled)
+        heapq.heapify(heap)
+        pending.clear()
+        self.skipped += self._size - len(heap)
+        scalar = interp.scalar
+
+        volatile = self._volatile_set
+        writes = self._writes
+        journal = self._journal
+        while heap:
+            index = heapq.heappop(heap)
+            pending.discard(index)
+            rule, context = rules[index]
+            if context is not None and not context.is_active():
+                # Left pending until its context is entered again
+                if index not in volatile:
+                    pending.add(index)
+                self.skipped += 1
+                continue
+            interp.current_context = context
+            truthvalues = interp.truthvalues
+            scalars = [(name, scalar(name, context, _MISSING))
+                       for name in writes[index] if name not in truthvalues]
+            interp.execute_rule(rule)
+            self.executed += 1
+
+            changed = self._drain() if journal or self._rebound else None
+            if scalars:
+                for name, value in scalars:
+                    if scalar(name, context, _MISSING) != value:
+                        if changed is None:
+                            changed = set()
+                        changed.add(name)
+            if changed:
+                self._changed(changed, index, heap, scheduled)
+                if index not in volatile:
+                    pending.add(index)
+            # Otherwise running it again would change nothing until its names change
+
+    def report(self) -> str:
+        """
+        Formats how many rule runs were skipped.
+
+        Returns:
+            str: The formatted report.
+        """
+        total = self.executed + self.skipped
+        share = self.skipped / total * 100 if total else 0.0
+        return (f"Reactive: {self.executed} rule runs, {self.skipped} skipped ({share:.0f}%), "
+                f"{len(self._volatile)} of {self._size} rules run every beat")
@@ -0,0 +1,237 @@
+"""
+Rule saturation - iterates mutually dependent rules to a fixpoint within each beat.
+"""
+
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from ..analysis import aliases_of, analyze
+
+_MISSING = object()
+
+
+class SaturationExecutor:
+    """
+    Runs an interpreter's rules to a fixpoint on every beat.
+
+    Every rule runs once, in declaration order, as without saturation. Then
+    the beat proceeds in rounds with semi-naive evaluation: a round only
+    re-runs, in declaration order, the rules reading a name that changed
+    during the previous round (or also writing it, if several rules do), so
+    a set of mutually dependent rules settles into a state that no longer
+    depends on which of them was declared first. Rules reading meta-logic
+    aggregates re-run after any change. Rules with effects such as printing
+    run again in every round whose changes reach them.
+
+    A name changed in a round if a track of its truth value moved by more
+    than `epsilon` (fuzzy tracks approach their fixpoint without reaching it),
+    if it was bound to a different truth value, or if a numeric variable
+    moved by more than `epsilon`. Rounds stop when nothing changed or after
+    `max_rounds` rounds, counting the first pass; a beat that hits the cap
+    keeps its last state and records the names still changing.
+
+    Only the beat engine saturates: the pass made when the program is loaded
+    and the meta blocks run once. The rules of inactive contexts do not run;
+    a context entered during a round runs its rules from the next round.
+
+    Like the profiler, the executor shadows `execute_rules` on the one
+    interpreter instance between `enable` and `disable`.
+
+    Attributes:
+        interpreter (Interpreter): The interpreter being executed.
+        epsilon (float): The smallest change that counts as a change.
+        max_rounds (int): The maximum number of rounds per beat.
+        rounds (int): The number of rounds run, over all beats.
+        beats (int): The number of beats run.
+        rule_runs (int): The number of rule runs, over all rounds.
+        most_rounds (int): The most rounds any beat took.
+        capped (int): The number of beats that hit the round cap.
+        unconverged (Dict[str, int]): For each name still changing when a
+            beat hit the cap, the number of such beats.
+        last_unconverged (List[str]): The names still changing on the most
+            recent beat that hit the cap.
+    """
+
+    def __init__(self, interpreter: Any, epsilon: float = 1e-6, max_rounds: int = 100):
+        """
+        Initializes a SaturationExecutor.
+
+        Args:
+            interpreter (Interpreter): The interpreter, with its program loaded.
+            epsilon (float): The smallest change that counts as a change.
+            max_rounds (int): The maximum number of rounds per beat.
+
+        Raises:
+            ValueError: If epsilon is negative or max_rounds is less than 1.
+        """
+        if epsilon < 0:
+            raise ValueError(f"Saturation epsilon must not be negative, got {epsilon}")
+        if max_rounds < 1:
+            raise ValueError(f"Saturation needs at least one round, got {max_rounds}")
+        self.interpreter = interpreter
+        self.epsilon = epsilon
+        self.max_rounds = max_rounds
+        self.rounds = 0
+        self.beats = 0
+        self.rule_runs = 0
+        self.most_rounds = 0
+        self.capped = 0
+        self.unconverged: Dict[str, int] = {}
+        self.last_unconverged: List[str] = []
+        self.enabled = False
+        self._build()
+
+    def _build(self):
+        """Maps every name to the rules a change to it can affect."""
+        interp = self.interpreter
+        self._aliases = aliases_of(interp.truthvalues)
+        dependencies = analyze(interp.rules, interp.functions, self._aliases)
+        self._size = len(interp.rules)
+        writers: Dict[str, List[int]] = {}
+        for dep in dependencies:
+            for name in dep.writes:
+                writers.setdefault(name, []).append(dep.index)
+        affected: Dict[str, Set[int]] = {}
+        for dep in dependencies:
+            for name in dep.reads:
+                affected.setdefault(name, set()).add(dep.index)
+        for name, indices in writers.items():
+            # Rules writing the same name overwrite each other's value
+            if len(indices) > 1:
+                affected.setdefault(name, set()).update(indices)
+        self._readers: Dict[str, List[int]] = {name: sorted(indices) for name, indices in affected.items()}
+        self._writes: List[Tuple[str, ...]] = [tuple(sorted(dep.writes)) for dep in dependencies]
+        members: Dict[int, Tuple[Any, List[int]]] = {}
+        for index, (_rule, context) in enumerate(interp.rules):
+            if context is not None:
+                members.setdefault(id(context), (context, []))[1].append(index)
+        self._contexts: List[Tuple[Any, List[int]]] = list(members.values())
+        self._aggregates: List[int] = [dep.index for dep in dependencies if dep.aggregates]
+
+    def enable(self):
+        """Installs the executor on the interpreter."""
+        if self.enabled:
+            return
+        self._saved = vars(self.interpreter).get('execute_rules')
+        self.interpreter.execute_rules = self.execute_rules
+        self.enabled = True
+
+    def disable(self):
+        """Removes the executor from the interpreter."""
+        if not self.enabled:
+            return
+        if self._saved is None:
+            del self.interpreter.execute_rules
+        else:
+            self.interpreter.execute_rules = self._saved
+        self.enabled = False
+
+    def __enter__(self) -> 'SaturationExecutor':
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def _snapshot(self, indices: List[int]) -> Dict[Tuple[str, Any], Tuple[Any, Any]]:
+        """Copies the values of the names the given rules write, as their contexts see them."""
+        interp = self.interpreter
+        rules = interp.rules
+        snapshot = {}
+        for index in indices:
+            context = rules[index][1]
+            for name in self._writes[index]:
+                key = (name, context)
+                if key in snapshot:
+                    continue
+                tv = interp.truthvalues.get(name)
+                if tv is not None:
+                    snapshot[key] = (tv, dict(tv.values))
+                else:
+                    snapshot[key] = (None, interp.scalar(name, context, _MISSING))
+        return snapshot
+
+    def _changes(self, snapshot: Dict[Tuple[str, Any], Tuple[Any, Any]]) -> Set[str]:
+        """Finds the names that moved by more than epsilon since the snapshot."""
+        interp = self.interpreter
+        epsilon = self.epsilon
+        changed = set()
+        for (name, context), (tv, old) in snapshot.items():
+            current = interp.truthvalues.get(name)
+            if tv is not None or current is not None:
+                if current is not tv or current.values.keys() != old.keys():
+                    changed.add(name)
+                elif any(abs(value - old[track]) > epsilon for track, value in current.values.items()):
+                    changed.add(name)
+                continue
+            value = interp.scalar(name, context, _MISSING)
+            if isinstance(value, (int, float)) and isinstance(old, (int, float)):
+                if abs(value - old) > epsilon:
+                    changed.add(name)
+            elif value is not old and value != old:
+                changed.add(name)
+        return changed
+
+    def execute_rules(self):
+        """Executes every rule, then re-runs the rules affected by each round's changes."""
+        interp = self.interpreter
+        rules = interp.rules
+        if len(rules) != self._size or aliases_of(interp.truthvalues) != self._aliases:
+            self._build()
+
+        changed: Set[str] = set()
+        rounds = 0
+        scheduled = self._active(range(self._size))
+        while scheduled:
+            if rounds == self.max_rounds:
+                self.capped += 1
+                self.last_unconverged = sorted(changed)
+                for name in changed:
+                    self.unconverged[name] = self.unconverged.get(name, 0) + 1
+                break
+            rounds += 1
+            snapshot = self._snapshot(scheduled)
+            inactive = [entry for entry in self._contexts if not entry[0].is_active()]
+            for index in scheduled:
+                rule, interp.current_context = rules[index]
+                interp.execute_rule(rule)
+            self.rule_runs += len(scheduled)
+
+            changed = self._changes(snapshot)
+            affected: Set[int] = set()
+            for name in changed:
+                affected.update(self._readers.get(name, ()))
+            if changed:
+                affected.update(self._aggregates)
+            for context, indices in inactive:
+                if context.is_active():
+                    # Entered during the round: its rules have not run yet
+                    affected.update(indices)
+            scheduled = self._active(sorted(affected))
+
+        self.beats += 1
+        self.rounds += rounds
+        self.most_rounds = max(self.most_rounds, rounds)
+
+    def _active(self, indices: Iterable[int]) -> List[int]:
+        """Drops the rules of inactive contexts."""
+        rules = self.interpreter.rules
+        return [index for index in indices
+                if rules[index][1] is None or rules[index][1].is_active()]
+
+    def report(self, limit: int = 10) -> str:
+        """
+        Formats the rounds run and the names that did not converge.
+
+        Args:
+            limit (int): The maximum number of unconverged names to list.
+
+        Returns:
+            str: The formatted report.
+        """
+        mean = self.rounds / self.beats if self.beats else 0.0
+        lines = [f"Saturation: {self.beats} beats, {mean:.1f} rounds per beat (at most {self.most_rounds}), "
+                 f"{self.rule_runs} rule runs, {self.capped} beats hit the cap of {self.max_rounds} rounds"]
+        names = sorted(self.unconverged.items(), key=lambda item: item[1], reverse=True)
+        for name, beats in names[:limit]:
+            lines.append(f"  {name:<30} still changing on {beats} beats")
+        return '\n'.join(lines)
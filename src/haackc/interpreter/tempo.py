@@ -0,0 +1,209 @@
+"""
+Tempo scheduling - runs the beat engine against a wall-clock tempo.
+"""
+
+import asyncio
+import math
+import time
+from typing import Any, Callable, Optional
+
+from .metrics import Histogram
+
+
+POLICIES = ('catch-up', 'skip')
+
+
+def parse_tempo(text: str) -> float:
+    """
+    Parses a tempo such as `100Hz`, `100` (Hz) or `120bpm`.
+
+    Args:
+        text (str): The tempo.
+
+    Returns:
+        float: The tempo in beats per second.
+
+    Raises:
+        ValueError: If the tempo is malformed or not positive.
+    """
+    value = text.strip().lower()
+    scale = 1.0
+    if value.endswith('bpm'):
+        value, scale = value[:-3], 1 / 60
+    elif value.endswith('hz'):
+        value = value[:-2]
+    try:
+        hz = float(value) * scale
+    except ValueError:
+        raise ValueError(f"Invalid tempo: {text}") from None
+    if not hz > 0 or math.isinf(hz):
+        raise ValueError(f"Tempo must be positive: {text}")
+    return hz
+
+
+class TempoScheduler:
+    """
+    Drives an interpreter's beats from a monotonic clock.
+
+    Beat n is due at `origin + n * period`; the scheduler sleeps until each
+    beat is due, runs it, and measures how late it started and how long it
+    took against its deadline (the time the next beat is due). When beats
+    fall behind, the 'catch-up' policy runs the missed beats back to back
+    until the schedule is met again, while 'skip' drops every beat that is a
+    whole period overdue: the global beat still advances over skipped beats
+    but no rules run, so all tracks stay frozen on them; beat hooks are still
+    called for skipped beats.
+
+    Attributes:
+        interpreter (Interpreter): The interpreter being driven.
+        hz (float): The tempo in beats per second.
+        period (float): The time between beats, in seconds.
+        policy (str): 'catch-up' or 'skip'.
+        beats (int): The number of beats executed.
+        skipped (int): The number of beats skipped.
+        overruns (int): The number of beats that finished after their deadline.
+        lateness (Histogram): How late each beat started, in seconds.
+        compute (Histogram): How long each beat took, in seconds.
+        deadline (Optional[float]): The deadline of the beat being executed,
+            in clock time; None between beats.
+    """
+
+    def __init__(self, interpreter: Any, hz: float, policy: str = 'catch-up',
+                 step: Optional[Callable[[], None]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initializes a TempoScheduler.
+
+        Args:
+            interpreter (Interpreter): The interpreter to drive.
+            hz (float): The tempo in beats per second.
+            policy (str): 'catch-up' or 'skip'.
+            step (Optional[Callable[[], None]]): Runs one beat; defaults to
+                `interpreter.step`.
+            clock (Callable[[], float]): The monotonic clock.
+            sleep (Callable[[float], None]): Sleeps for a duration.
+
+        Raises:
+            ValueError: If the tempo or policy is invalid.
+        """
+        if hz <= 0:
+            raise ValueError("Tempo must be positive")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown tempo policy: {policy}")
+        self.interpreter = interpreter
+        self.hz = hz
+        self.period = 1.0 / hz
+        self.policy = policy
+        self.step = step or interpreter.step
+        self.clock = clock
+        self.sleep = sleep
+        self.beats = 0
+        self.skipped = 0
+        self.overruns = 0
+        self.lateness = Histogram()
+        self.compute = Histogram()
+        self.deadline: Optional[float] = None
+        self._origin: Optional[float] = None
+        self._slot = 0
+        self._last_start: Optional[float] = None
+        # Running mean and sum of squares of the start-to-start interval error
+        self._jitter_n = 0
+        self._jitter_mean = 0.0
+        self._jitter_m2 = 0.0
+
+    def _wait_time(self) -> float:
+        """Returns how long until the next beat is due, skipping overdue beats under 'skip'."""
+        now = self.clock()
+        if self._origin is None:
+            self._origin = now
+        due = self._origin + self._slot * self.period
+        if self.policy == 'skip' and now - due >= self.period:
+            missed = int((now - due) // self.period)
+            for _ in range(missed):
+                self.interpreter.skip_beat()
+            self.skipped += missed
+            self._slot += missed
+            due += missed * self.period
+        return due - now
+
+    def _beat(self):
+        """Runs the beat that is due and records its timing."""
+        due = self._origin + self._slot * self.period
+        self.deadline = due + self.period
+        started = self.clock()
+        try:
+            self.step()
+        finally:
+            finished = self.clock()
+            self.deadline = None
+        self._slot += 1
+        self.beats += 1
+        self.lateness.observe(max(started - due, 0.0))
+        self.compute.observe(finished - started)
+        if finished > due + self.period:
+            self.overruns += 1
+        if self._last_start is not None:
+            error = (started - self._last_start) - self.period
+            self._jitter_n += 1
+            delta = error - self._jitter_mean
+            self._jitter_mean += delta / self._jitter_n
+            self._jitter_m2 += delta * (error - self._jitter_mean)
+        self._last_start = started
+
+    def run(self, beats: Optional[int] = None):
+        """
+        Runs beats at the tempo, sleeping until each is due.
+
+        Args:
+            beats (Optional[int]): The number of beats to execute; None runs
+                until interrupted.
+        """
+        target = None if beats is None else self.beats + beats
+        while target is None or self.beats < target:
+            wait = self._wait_time()
+            if wait > 0:
+                self.sleep(wait)
+            self._beat()
+
+    async def run_async(self, beats: Optional[int] = None):
+        """
+        Runs beats at the tempo, yielding to the event loop between beats.
+
+        Args:
+            beats (Optional[int]): The number of beats to execute; None runs
+                until cancelled.
+        """
+        target = None if beats is None else self.beats + beats
+        while target is None or self.beats < target:
+            wait = self._wait_time()
+            await asyncio.sleep(max(wait, 0.0))
+            self._beat()
+
+    @property
+    def jitter(self) -> float:
+        """The standard deviation of the start-to-start interval, in seconds."""
+        if self._jitter_n < 2:
+            return 0.0
+        return math.sqrt(self._jitter_m2 / (self._jitter_n - 1))
+
+    def report(self) -> str:
+        """
+        Formats the scheduling statistics.
+
+        Returns:
+            str: The formatted report.
+        """
+        ms = 1000.0
+        busy = self.compute.total / (self.beats * self.period) if self.beats else 0.0
+        return '\n'.join([
+            f"Tempo: {self.hz:g} Hz ({self.period * ms:.3f} ms per beat, {self.policy})",
+            f"Beats: {self.beats} executed, {self.skipped} skipped, {self.overruns} overruns",
+            f"Lateness: mean {self.lateness.total / max(self.lateness.count, 1) * ms:.3f} ms, "
+            f"p50 {self.lateness.quantile(0.5) * ms:.3f} ms, p99 {self.lateness.quantile(0.99) * ms:.3f} ms, "
+            f"max {self.lateness.max * ms:.3f} ms",
+            f"Jitter: {self.jitter * ms:.3f} ms",
+            f"Compute: mean {self.compute.total / max(self.compute.count, 1) * ms:.3f} ms, "
+            f"p99 {self.compute.quantile(0.99) * ms:.3f} ms, max {self.compute.max * ms:.3f} ms, "
+            f"utilization {busy * 100:.1f}%",
+        ])
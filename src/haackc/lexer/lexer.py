@@ -19,6 +19,7 @@ class TokenType(Enum):
     TRACK = auto()
     PERIOD = auto()
     PHASE = auto()
+    PRIORITY = auto()
     USING = auto()
     LOGIC = auto()
     CONTEXT = auto()
@@ -28,6 +29,7 @@ class TokenType(Enum):
     RULE = auto()
     FN = auto()
     MODULE = auto()
+    IMPORT = auto()
     IF = auto()
     ELSE = auto()
     GUARD = auto()
@@ -54,6 +56,7 @@ class TokenType(Enum):
     # Comparison
     EQ = auto()           # ==
     NE = auto()           # !=
+    BANG_BANG = auto()    # !! (as in if!!)
     LT = auto()           # <
     LE = auto()           # <=
     GT = auto()           # >
@@ -119,6 +122,7 @@ class Lexer:
         'track': TokenType.TRACK,
         'period': TokenType.PERIOD,
         'phase': TokenType.PHASE,
+        'priority': TokenType.PRIORITY,
         'using': TokenType.USING,
         'logic': TokenType.LOGIC,
         'context': TokenType.CONTEXT,
@@ -128,6 +132,7 @@ class Lexer:
         'rule': TokenType.RULE,
         'fn': TokenType.FN,
         'module': TokenType.MODULE,
+        'import': TokenType.IMPORT,
         'if': TokenType.IF,
         'else': TokenType.ELSE,
         'guard': TokenType.GUARD,
@@ -343,6 +348,12 @@ class Lexer:
                 self.tokens.append(Token(TokenType.NE, '!=', line, col))
                 continue
             
+            if char == '!' and next_char == '!':
+                self.advance()
+                self.advance()
+                self.tokens.append(Token(TokenType.BANG_BANG, '!!', line, col))
+                continue
+            
             if char == '<' and next_char == '=':
                 self.advance()
                 self.advance()
@@ -9,7 +9,18 @@ from pathlib import Path
 
 from haackc.lexer import Lexer
 from haackc.parser import Parser
-from haackc.interpreter import Interpreter
+from haackc.interpreter import (Interpreter, Profiler, RuntimeMetrics, MetricsServer, TempoScheduler,
+                                DeadlineScheduler)
+from haackc.interpreter.parallel import ParallelExecutor
+from haackc.interpreter.reactive import ReactiveExecutor
+from haackc.interpreter.saturation import SaturationExecutor
+from haackc.modules import ModuleLoader, default_module_paths
+from haackc.analysis import prune_tracks
+from haackc.interpreter.tempo import POLICIES as TEMPO_POLICIES, parse_tempo
+from haackc.runtime.branches import BranchEngine, MERGE_POLICIES
+from haackc.trace import TraceWriter
+from haackc.inputs import InputPipeline, parse_binding
+from haackc.inputs.binding import POLICIES, DEFAULT_POLICY, DEFAULT_QUEUE_SIZE
 
 
 def main():
@@ -19,7 +30,19 @@ def main():
     This function parses command-line arguments to compile and run a HaackLang
     source file. It handles file reading, lexing, parsing, and interpretation,
     providing options for verbose output and debugging stages.
+
+    `haackc trace ...` is dispatched to the trace tools and `haackc serve ...`
+    to the program server.
     """
+    if len(sys.argv) > 1 and sys.argv[1] == 'trace':
+        from haackc.trace.cli import main as trace_main
+        trace_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from haackc.server import main as serve_main
+        serve_main(sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(
         description='HaackLang Reference Compiler - A polyrhythmic, polylogical programming language'
     )
@@ -27,8 +50,84 @@ def main():
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     parser.add_argument('--lex-only', action='store_true', help='Only run lexer and print tokens')
     parser.add_argument('--parse-only', action='store_true', help='Only run parser and print AST')
+    parser.add_argument('-I', '--module-path', action='append', default=[], metavar='DIR',
+                        help='Directory to search for imported modules (repeatable); searched after '
+                             'the source file\'s directory and before the working directory and HAACK_PATH')
+    parser.add_argument('--module-cache', metavar='DIR',
+                        help='Compile imported modules once into artifacts kept in DIR')
+    parser.add_argument('--beats', type=int, default=0, metavar='N',
+                        help='Run the beat engine for N beats after the program is loaded')
+    parser.add_argument('--checkpoint-every', type=int, default=0, metavar='N',
+                        help='Write a state checkpoint every N beats')
+    parser.add_argument('--checkpoint-file', metavar='FILE',
+                        help='Checkpoint file path (default: <file>.ckpt)')
+    parser.add_argument('--restore', metavar='FILE',
+                        help='Restore interpreter state from a checkpoint before running beats')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='Record per-beat truth values to a columnar trace file')
+    parser.add_argument('--trace-tv', action='append', metavar='NAME',
+                        help='Truth value to trace (repeatable, default: all)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile rules, guards, functions and statements and print a report')
+    parser.add_argument('--profile-stacks', metavar='FILE',
+                        help='Collapsed-stack output for flamegraph tools (default: <file>.folded)')
+    parser.add_argument('--metrics-file', metavar='FILE',
+                        help='Periodically write runtime metrics in Prometheus text format')
+    parser.add_argument('--metrics-every', type=int, default=1000, metavar='N',
+                        help='Write the metrics file every N beats (default: 1000)')
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help='Serve runtime metrics over HTTP on localhost')
+    parser.add_argument('--tempo', type=parse_tempo, metavar='RATE',
+                        help='Run beats at a wall-clock tempo, in Hz (100, 100Hz) or BPM (120bpm); '
+                             'with --beats 0 runs until interrupted')
+    parser.add_argument('--tempo-policy', choices=TEMPO_POLICIES, default='catch-up',
+                        help='What to do with beats that are a period or more overdue (default: catch-up)')
+    parser.add_argument('--degrade', action='store_true',
+                        help='Defer lower-priority rules to the next beat when a beat would miss its '
+                             'deadline (the --tempo deadline, or --beat-budget)')
+    parser.add_argument('--beat-budget', type=float, metavar='MS',
+                        help='Time budget per beat in milliseconds for --degrade')
+    parser.add_argument('--prune-tracks', action='store_true',
+                        help='Drop track components of truth values that the program never observes '
+                             'and print how much was pruned')
+    parser.add_argument('--parallel', type=int, metavar='N',
+                        help='Run independent rule components in up to N worker processes')
+    parser.add_argument('--reactive', action='store_true',
+                        help='Re-run only the rules whose truth values or variables changed, and '
+                             'report how many rule runs were skipped')
+    parser.add_argument('--saturate', action='store_true',
+                        help='Re-run rules affected by changes within each beat until the truth values '
+                             'reach a fixpoint, and report the rounds and anything that did not converge')
+    parser.add_argument('--saturate-epsilon', type=float, default=1e-6, metavar='EPS',
+                        help='Smallest change that keeps --saturate iterating (default: 1e-6)')
+    parser.add_argument('--saturate-rounds', type=int, default=100, metavar='N',
+                        help='Maximum number of --saturate rounds per beat (default: 100)')
+    parser.add_argument('--branch-merge', choices=MERGE_POLICIES, default='blend',
+                        help='How the arms of an if!! with a contradictory condition are merged '
+                             '(default: blend)')
+    parser.add_argument('--max-branches', type=int, default=16, metavar='N',
+                        help='Most if!! branches alive at once; further contradictions are collapsed '
+                             'to a classical if (default: 16)')
+    parser.add_argument('--input', action='append', metavar='BINDING',
+                        help='Feed truth values from an external source, applied at each beat start '
+                             '(repeatable): jsonl:FILE, pipe:FIFO, unix:SOCKET or tcp:[HOST:]PORT, '
+                             'optionally followed by ?field=tv.track&...')
+    parser.add_argument('--input-queue', type=int, default=DEFAULT_QUEUE_SIZE, metavar='N',
+                        help=f'Bound on queued input messages per source (default: {DEFAULT_QUEUE_SIZE})')
+    parser.add_argument('--input-policy', choices=POLICIES, default=DEFAULT_POLICY,
+                        help=f'What to do when an input queue is full (default: {DEFAULT_POLICY})')
     
     args = parser.parse_args()
+    if args.degrade and not (args.tempo or args.beat_budget):
+        parser.error('--degrade needs --tempo or --beat-budget')
+    if args.degrade and args.parallel:
+        parser.error('--degrade and --parallel cannot be combined')
+    if args.reactive and (args.degrade or args.parallel):
+        parser.error('--reactive cannot be combined with --degrade or --parallel')
+    if args.saturate and (args.degrade or args.parallel or args.reactive):
+        parser.error('--saturate cannot be combined with --degrade, --parallel or --reactive')
+    if args.max_branches < 2:
+        parser.error('--max-branches must be at least 2')
     
     # Read source file
     source_path = Path(args.file)
@@ -70,12 +169,145 @@ def main():
         if args.verbose:
             print("\n=== Interpreting ===")
         interpreter = Interpreter()
+        interpreter.branches = BranchEngine(args.branch_merge, args.max_branches)
+        interpreter.modules = ModuleLoader([str(source_path.parent)] + args.module_path + default_module_paths(),
+                                           args.module_cache)
+        profiler = None
+        if args.profile:
+            profiler = Profiler(interpreter)
+            profiler.enable()
         interpreter.interpret(ast)
         
+        if args.restore:
+            interpreter.restore(args.restore)
+            if args.verbose:
+                print(f"Restored checkpoint at beat {interpreter.global_beat}")
+        
+        if args.prune_tracks:
+            # Traced and checkpointed truth values are observed from outside the program
+            keep = ()
+            if args.checkpoint_every or (args.trace and not args.trace_tv):
+                keep = list(interpreter.truthvalues)
+            elif args.trace:
+                keep = args.trace_tv
+            print(prune_tracks(interpreter, keep).report(), file=sys.stderr)
+        
+        trace = None
+        if args.trace:
+            trace = TraceWriter.for_interpreter(args.trace, interpreter, args.trace_tv)
+            trace.record(interpreter)
+            interpreter.beat_hooks.append(trace)
+        
+        metrics = None
+        metrics_server = None
+        if args.metrics_file or args.metrics_port is not None:
+            metrics = RuntimeMetrics(interpreter)
+            metrics.enable()
+            if args.metrics_port is not None:
+                metrics_server = MetricsServer(metrics.registry, args.metrics_port)
+                if args.verbose:
+                    print(f"Serving metrics on http://127.0.0.1:{metrics_server.port}/metrics")
+        
+        inputs = None
+        if args.input:
+            inputs = InputPipeline([parse_binding(text, args.input_queue, args.input_policy)
+                                    for text in args.input])
+            inputs.start()
+            inputs.attach(interpreter)
+        
+        checkpoint_file = args.checkpoint_file or str(source_path.with_suffix('.ckpt'))
+        
+        def run_beat():
+            interpreter.step()
+            beat = interpreter.global_beat
+            if args.checkpoint_every and beat % args.checkpoint_every == 0:
+                interpreter.checkpoint(checkpoint_file)
+            if args.metrics_file and beat % args.metrics_every == 0:
+                metrics.registry.write_prometheus(args.metrics_file)
+        
+        tempo = None
+        if args.tempo:
+            tempo = TempoScheduler(interpreter, args.tempo, args.tempo_policy, step=run_beat)
+        
+        degrade = None
+        if args.degrade:
+            if args.beat_budget:
+                degrade = DeadlineScheduler(interpreter, budget=args.beat_budget / 1000)
+            else:
+                degrade = DeadlineScheduler(interpreter, lambda: tempo.deadline, clock=tempo.clock)
+            degrade.enable()
+        
+        parallel = None
+        if args.parallel:
+            parallel = ParallelExecutor(interpreter, args.parallel)
+            parallel.enable()
+            if args.verbose:
+                print(f"Parallel: {len(parallel.components)} components on {len(parallel.assignments)} "
+                      f"workers, {len(parallel.local)} rules in process")
+        
+        reactive = None
+        if args.reactive:
+            reactive = ReactiveExecutor(interpreter)
+            reactive.enable()
+        
+        saturation = None
+        if args.saturate:
+            saturation = SaturationExecutor(interpreter, args.saturate_epsilon, args.saturate_rounds)
+            saturation.enable()
+        try:
+            if tempo:
+                try:
+                    tempo.run(args.beats or None)
+                except KeyboardInterrupt:
+                    pass
+            else:
+                for _ in range(args.beats):
+                    run_beat()
+        finally:
+            if parallel:
+                parallel.disable()
+            if reactive:
+                reactive.disable()
+            if saturation:
+                saturation.disable()
+            if inputs:
+                inputs.stop()
+                if args.verbose:
+                    for uri, stats in inputs.stats.items():
+                        print(f"Input {uri}: " + ', '.join(f"{name} {count}" for name, count in stats.items()))
+            if trace:
+                trace.close()
+            if metrics:
+                metrics.disable()
+                if args.metrics_file:
+                    metrics.registry.write_prometheus(args.metrics_file)
+            if metrics_server:
+                metrics_server.close()
+        
+        if tempo:
+            print(tempo.report(), file=sys.stderr)
+        if degrade:
+            degrade.disable()
+            print(degrade.report(), file=sys.stderr)
+        if reactive:
+            print(reactive.report(), file=sys.stderr)
+        if saturation:
+            print(saturation.report(), file=sys.stderr)
+        
+        if profiler:
+            profiler.disable()
+            print(profiler.report(), file=sys.stderr)
+            stacks_file = args.profile_stacks or str(source_path.with_suffix('.folded'))
+            profiler.write_collapsed(stacks_file)
+            print(f"Collapsed stacks written to {stacks_file}", file=sys.stderr)
+        
         if args.verbose:
             print("\n=== Execution Complete ===")
+            print(f"Beats executed: {interpreter.global_beat}")
             print(f"Tracks defined: {list(interpreter.tracks.keys())}")
             print(f"Truth values: {list(interpreter.truthvalues.keys())}")
+            if interpreter.branches.forks or interpreter.branches.collapsed:
+                print(interpreter.branches.report())
     
     except SyntaxError as e:
         print(f"Syntax Error: {e}", file=sys.stderr)
@@ -83,6 +315,9 @@ def main():
     except RuntimeError as e:
         print(f"Runtime Error: {e}", file=sys.stderr)
         sys.exit(1)
+    except TypeError as e:
+        print(f"Type Error: {e}", file=sys.stderr)
+        sys.exit(1)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         if args.verbose:
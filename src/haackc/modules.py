@@ -0,0 +1,339 @@
+"""
+Modules - function libraries imported by programs, cached as artifacts and compiled lazily.
+"""
+
+import copy
+import os
+import pickle
+import struct
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .lexer import Lexer
+from .parser import Parser
+from .parser.ast_nodes import ASTNode, FunctionCall, FunctionDecl, ImportDecl
+from .program import source_hash
+
+
+MODULE_SUFFIX = '.haack'
+
+MODULE_ARTIFACT_MAGIC = b'HAACKMOD'
+MODULE_ARTIFACT_VERSION = 1
+
+# magic, version, SHA-256 of the source, length of the pickled index
+MODULE_ARTIFACT_HEADER = struct.Struct('<8sI32sQ')
+
+# Environment variable listing extra module directories, separated by os.pathsep
+MODULE_PATH_ENV = 'HAACK_PATH'
+
+
+def default_module_paths() -> List[str]:
+    """Returns the working directory followed by the directories in HAACK_PATH."""
+    paths = [os.getcwd()]
+    paths.extend(path for path in os.environ.get(MODULE_PATH_ENV, '').split(os.pathsep) if path)
+    return paths
+
+
+def _calls(node: ASTNode) -> Iterable[FunctionCall]:
+    """Yields every function call in a subtree."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, FunctionCall):
+            yield node
+        for value in vars(node).values():
+            if isinstance(value, ASTNode):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(item for item in value if isinstance(item, ASTNode))
+
+
+class Module:
+    """
+    A library of functions, each compiled when it is first referenced.
+
+    Calls inside a module's functions are resolved within the module: calls to
+    sibling functions and through the module's own imports are qualified with
+    the full module name (`lib.fear::calm`), so they do not depend on how the
+    importing program names its namespaces.
+
+    Attributes:
+        name (str): The full module name.
+        imports (Dict[str, str]): The module's own imports, alias to module name.
+        symbols (Tuple[str, ...]): The functions the module declares.
+        path (Optional[str]): The source file, for file modules.
+        digest (Optional[str]): The SHA-256 of the source, for file modules.
+        compiled (Dict[str, FunctionDecl]): The functions compiled so far.
+    """
+
+    def __init__(self, name: str, imports: Dict[str, str], symbols: Iterable[str],
+                 compile_symbol: Callable[[str], FunctionDecl], path: Optional[str] = None,
+                 digest: Optional[str] = None):
+        """
+        Initializes a Module.
+
+        Args:
+            name (str): The full module name.
+            imports (Dict[str, str]): Alias to module name of its imports.
+            symbols (Iterable[str]): The function names.
+            compile_symbol (Callable[[str], FunctionDecl]): Compiles one
+                function to a fresh, unqualified declaration.
+            path (Optional[str]): The source file.
+            digest (Optional[str]): The content hash of the source.
+        """
+        self.name = name
+        self.imports = imports
+        self.symbols = tuple(symbols)
+        self.path = path
+        self.digest = digest
+        self.compiled: Dict[str, FunctionDecl] = {}
+        self._symbol_set = frozenset(self.symbols)
+        self._compile_symbol = compile_symbol
+
+    @classmethod
+    def from_declarations(cls, name: str, body: Sequence[ASTNode]) -> 'Module':
+        """
+        Creates a module from parsed declarations (an inline `module` block).
+
+        Args:
+            name (str): The module name.
+            body (Sequence[ASTNode]): Its function declarations and imports.
+
+        Returns:
+            Module: The module; the declarations are copied when first used.
+        """
+        functions = {decl.name: decl for decl in body if isinstance(decl, FunctionDecl)}
+        imports = {decl.alias: decl.module for decl in body if isinstance(decl, ImportDecl)}
+        return cls(name, imports, functions, lambda symbol: copy.deepcopy(functions[symbol]))
+
+    def function(self, symbol: str) -> Optional[FunctionDecl]:
+        """
+        Gets a function, compiling it on first reference.
+
+        Args:
+            symbol (str): The unqualified function name.
+
+        Returns:
+            Optional[FunctionDecl]: The function, or None if the module does
+                not declare it.
+        """
+        decl = self.compiled.get(symbol)
+        if decl is None:
+            if symbol not in self._symbol_set:
+                return None
+            decl = self._compile_symbol(symbol)
+            self._qualify(decl)
+            self.compiled[symbol] = decl
+        return decl
+
+    def _qualify(self, decl: FunctionDecl):
+        """Qualifies the calls in a function with the modules they refer to."""
+        for call in _calls(decl):
+            namespace, separator, symbol = call.name.rpartition('::')
+            if separator:
+                if namespace in self.imports:
+                    call.name = f"{self.imports[namespace]}::{symbol}"
+            elif call.name in self._symbol_set:
+                call.name = f"{self.name}::{call.name}"
+
+    def save(self, path: str):
+        """
+        Writes the module as an artifact file, atomically.
+
+        Every function is compiled and pickled separately, so loading the
+        artifact reads only its index and unpickles functions on demand.
+
+        Args:
+            path (str): The artifact path.
+        """
+        blobs = [pickle.dumps(self._compile_symbol(symbol), protocol=pickle.HIGHEST_PROTOCOL)
+                 for symbol in self.symbols]
+        offsets = {}
+        offset = 0
+        for symbol, blob in zip(self.symbols, blobs):
+            offsets[symbol] = (offset, len(blob))
+            offset += len(blob)
+        index = pickle.dumps((self.imports, offsets), protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(MODULE_ARTIFACT_HEADER.pack(MODULE_ARTIFACT_MAGIC, MODULE_ARTIFACT_VERSION,
+                                                bytes.fromhex(self.digest), len(index)))
+            f.write(index)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, path)
+
+
+def compile_module(source: str, name: str, path: Optional[str] = None) -> Module:
+    """
+    Compiles a module's source lazily.
+
+    The source is lexed and indexed; each function is parsed from its tokens
+    when first referenced.
+
+    Args:
+        source (str): The module source: function declarations and imports.
+        name (str): The full module name.
+        path (Optional[str]): Where the source came from.
+
+    Returns:
+        Module: The module.
+
+    Raises:
+        SyntaxError: If the source does not lex or is not a valid module.
+    """
+    tokens = Lexer(source).tokenize()
+    imports, ranges = Parser(tokens).index_module()
+    eof = tokens[-1]
+
+    def compile_symbol(symbol: str) -> FunctionDecl:
+        start, end = ranges[symbol]
+        return Parser(tokens[start:end] + [eof]).parse_function_decl()
+
+    return Module(name, {decl.alias: decl.module for decl in imports}, ranges, compile_symbol,
+                  path, source_hash(source))
+
+
+def load_module(artifact: str, name: str, path: Optional[str] = None) -> Module:
+    """
+    Reads a module artifact written by `Module.save`.
+
+    Only the index is read; each function is unpickled when first referenced.
+    Artifacts are pickles: only load files written by a trusted haackc.
+
+    Args:
+        artifact (str): The artifact path.
+        name (str): The full module name.
+        path (Optional[str]): The module's source file.
+
+    Returns:
+        Module: The module.
+
+    Raises:
+        ValueError: If the file is not a module artifact of this version.
+    """
+    with open(artifact, 'rb') as f:
+        header = f.read(MODULE_ARTIFACT_HEADER.size)
+        if len(header) < MODULE_ARTIFACT_HEADER.size:
+            raise ValueError(f"Not a HaackLang module artifact: {artifact}")
+        magic, version, digest, index_size = MODULE_ARTIFACT_HEADER.unpack(header)
+        if magic != MODULE_ARTIFACT_MAGIC:
+            raise ValueError(f"Not a HaackLang module artifact: {artifact}")
+        if version != MODULE_ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported module artifact version: {version}")
+        imports, offsets = pickle.loads(f.read(index_size))
+    base = MODULE_ARTIFACT_HEADER.size + index_size
+
+    def compile_symbol(symbol: str) -> FunctionDecl:
+        offset, size = offsets[symbol]
+        with open(artifact, 'rb') as f:
+            f.seek(base + offset)
+            return pickle.loads(f.read(size))
+
+    return Module(name, imports, offsets, compile_symbol, path, digest.hex())
+
+
+class ModuleLoader:
+    """
+    Finds modules on a search path and keeps each one loaded once.
+
+    `import a.b` looks for `a/b.haack` in each search directory in turn. A
+    loaded module is reused by every interpreter sharing the loader until its
+    file changes. With a cache directory, a module is compiled once into an
+    artifact named by its source hash and later loads read that artifact.
+
+    Attributes:
+        paths (List[str]): The directories searched, in order.
+        cache_dir (Optional[str]): Where module artifacts are kept.
+        loads (int): The number of times a module was read from source or
+            from an artifact.
+    """
+
+    def __init__(self, paths: Optional[Sequence[str]] = None, cache_dir: Optional[str] = None):
+        """
+        Initializes a ModuleLoader.
+
+        Args:
+            paths (Optional[Sequence[str]]): The search directories; None uses
+                the working directory and HAACK_PATH.
+            cache_dir (Optional[str]): A directory of module artifacts to
+                reuse and populate; None disables artifacts.
+        """
+        self.paths = list(paths) if paths is not None else default_module_paths()
+        self.cache_dir = cache_dir
+        self.loads = 0
+        self._modules: Dict[str, Tuple[Tuple[int, int], Module]] = {}
+        self._lock = threading.Lock()
+
+    def find(self, name: str) -> str:
+        """
+        Finds a module's source file.
+
+        Args:
+            name (str): The dotted module name.
+
+        Returns:
+            str: The path of the source file.
+
+        Raises:
+            KeyError: If no search directory holds the module.
+        """
+        relative = os.path.join(*name.split('.')) + MODULE_SUFFIX
+        for base in self.paths:
+            candidate = os.path.join(base, relative)
+            if os.path.isfile(candidate):
+                return os.path.abspath(candidate)
+        raise KeyError(f"Module not found: {name}")
+
+    def load(self, name: str) -> Module:
+        """
+        Loads a module, reusing it if its file is unchanged.
+
+        Args:
+            name (str): The dotted module name.
+
+        Returns:
+            Module: The module.
+
+        Raises:
+            KeyError: If the module is not found.
+            SyntaxError: If the module source is not valid.
+        """
+        path = self.find(name)
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._modules.get(path)
+            if cached is not None and cached[0] == key and cached[1].name == name:
+                return cached[1]
+
+            with open(path) as f:
+                source = f.read()
+            module = None
+            artifact = None
+            if self.cache_dir is not None:
+                artifact = os.path.join(self.cache_dir, f"{source_hash(source)}.hkm")
+                if os.path.exists(artifact):
+                    try:
+                        module = load_module(artifact, name, path)
+                    except (ValueError, pickle.UnpicklingError, EOFError, struct.error):
+                        module = None
+            if module is None:
+                module = compile_module(source, name, path)
+                if artifact is not None:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    module.save(artifact)
+            self.loads += 1
+            self._modules[path] = (key, module)
+            return module
+
+
+_default_loader: Optional[ModuleLoader] = None
+
+
+def default_loader() -> ModuleLoader:
+    """Returns the process-wide loader used by interpreters without their own."""
+    global _default_loader
+    if _default_loader is None:
+        _default_loader = ModuleLoader()
+    return _default_loader
@@ -15,6 +15,16 @@ class LogicType(Enum):
     PARACONSISTENT = "paraconsistent"
 
 
+class Shape(Enum):
+    """
+    The static shape of an expression's value (see `haackc.analysis.infer_shapes`).
+    """
+    SCALAR = "scalar"
+    TRUTHVECTOR = "truthvector"
+    TRACK = "track"
+    DYNAMIC = "dynamic"
+
+
 class ASTNode:
     """
     Base class for all AST nodes.
@@ -42,21 +52,24 @@ class Program(ASTNode):
 
 class TrackDecl(ASTNode):
     """
-    Track declaration: track name period N phase M using logic.
+    Track declaration: track name period N phase M priority P using logic.
 
     Attributes:
         name (str): The name of the track.
         period (int): The period of the track.
         phase (int): The phase of the track.
         logic (LogicType): The logic system used by the track.
+        priority (int): The scheduling priority of the track.
     """
     def __init__(self, name: str, period: int, phase: int = 0, 
-                 logic: LogicType = LogicType.CLASSICAL, line: int = 0, column: int = 0):
+                 logic: LogicType = LogicType.CLASSICAL, line: int = 0, column: int = 0,
+                 priority: int = 0):
         super().__init__(line, column)
         self.name = name
         self.period = period
         self.phase = phase
         self.logic = logic
+        self.priority = priority
 
 
 class ContextDecl(ASTNode):
@@ -68,14 +81,18 @@ class ContextDecl(ASTNode):
         logic (Optional[LogicType]): The logic system used by the context.
         track (Optional[str]): The track associated with the context.
         body (List[ASTNode]): A list of declarations within the context.
+        priority (Optional[int]): The scheduling priority of the context's
+            rules, overriding that of its track.
     """
     def __init__(self, name: str, logic: Optional[LogicType], track: Optional[str],
-                 body: List[ASTNode], line: int = 0, column: int = 0):
+                 body: List[ASTNode], line: int = 0, column: int = 0,
+                 priority: Optional[int] = None):
         super().__init__(line, column)
         self.name = name
         self.logic = logic
         self.track = track
         self.body = body
+        self.priority = priority
 
 
 class TruthValueDecl(ASTNode):
@@ -104,20 +121,35 @@ class Assignment(ASTNode):
         target (str): The name of the variable being assigned.
         track (Optional[str]): The track in which the assignment occurs.
         value (Expression): The value being assigned to the variable.
-    """
+        declare (bool): Whether the assignment is a `let`, which in a context
+            body declares a context variable.
+        slot (Optional[int]): The target's slot in its context's frame, if it
+            is a context variable; set when the context is compiled.
+        depth (int): The number of contexts enclosing the rule's own context
+            to go out to reach the frame holding the slot.
+    """
+    slot: Optional[int] = None
+    depth: int = 0
+    
     def __init__(self, target: str, track: Optional[str], value: 'Expression',
-                 line: int = 0, column: int = 0):
+                 line: int = 0, column: int = 0, declare: bool = False):
         super().__init__(line, column)
         self.target = target
         self.track = track
         self.value = value
+        self.declare = declare
 
 
 class Expression(ASTNode):
     """
     Base class for all expression nodes.
+
+    Attributes:
+        shape (Optional[Shape]): The inferred shape of the value: a number, a
+            truth vector, a number read from one track of a truth value, or
+            dynamic if it depends on the run; None before shape inference.
     """
-    pass
+    shape: Optional[Shape] = None
 
 
 class NumberLiteral(Expression):
@@ -151,7 +183,14 @@ class Variable(Expression):
     Attributes:
         name (str): The name of the variable.
         track (Optional[str]): The track from which to read the variable's value.
-    """
+        slot (Optional[int]): The variable's slot in its context's frame, if it
+            is a context variable; set when the context is compiled.
+        depth (int): The number of contexts enclosing the rule's own context
+            to go out to reach the frame holding the slot.
+    """
+    slot: Optional[int] = None
+    depth: int = 0
+    
     def __init__(self, name: str, track: Optional[str] = None, line: int = 0, column: int = 0):
         super().__init__(line, column)
         self.name = name
@@ -203,6 +242,20 @@ class FunctionCall(Expression):
         self.args = args
 
 
+class MetaOp(Expression):
+    """
+    Meta-operator application: @coh(x), @blend(a, b, w), @resolve(x), @dom(track), @meta(x).
+
+    Attributes:
+        operator (str): The operator name, without the '@'.
+        args (List[Expression]): A list of arguments to the operator.
+    """
+    def __init__(self, operator: str, args: List[Expression], line: int = 0, column: int = 0):
+        super().__init__(line, column)
+        self.operator = operator
+        self.args = args
+
+
 class IfStatement(ASTNode):
     """
     If statement.
@@ -255,6 +308,51 @@ class RuleDecl(ASTNode):
         self.body = body
 
 
+class WhenDecl(ASTNode):
+    """
+    Event rule: when condition { body } [else { body }], run on transitions.
+
+    Attributes:
+        condition (Expression): The condition whose transitions are watched.
+        body (List[ASTNode]): The block of code run when the condition
+            becomes true (rising edge).
+        else_body (Optional[List[ASTNode]]): The block of code run when the
+            condition becomes false (falling edge).
+    """
+    def __init__(self, condition: Expression, body: List[ASTNode],
+                 else_body: Optional[List[ASTNode]] = None, line: int = 0, column: int = 0):
+        super().__init__(line, column)
+        self.condition = condition
+        self.body = body
+        self.else_body = else_body
+
+
+class MetaDecl(ASTNode):
+    """
+    Meta-logic block: meta name { body }, run on every meta-beat.
+
+    Attributes:
+        name (str): The name of the meta block.
+        body (List[ASTNode]): The block of code run on each meta-beat.
+    """
+    def __init__(self, name: str, body: List[ASTNode], line: int = 0, column: int = 0):
+        super().__init__(line, column)
+        self.name = name
+        self.body = body
+
+
+class MetaBeatDecl(ASTNode):
+    """
+    Meta-beat declaration: meta-beat N.
+
+    Attributes:
+        interval (int): The number of global beats between meta-beats.
+    """
+    def __init__(self, interval: int, line: int = 0, column: int = 0):
+        super().__init__(line, column)
+        self.interval = interval
+
+
 class FunctionDecl(ASTNode):
     """
     Function declaration.
@@ -272,6 +370,36 @@ class FunctionDecl(ASTNode):
         self.body = body
 
 
+class ModuleDecl(ASTNode):
+    """
+    Inline module declaration: module name { functions and imports }.
+
+    Attributes:
+        name (str): The module name, used as the namespace of its functions.
+        body (List[ASTNode]): The module's function declarations and imports.
+    """
+    def __init__(self, name: str, body: List[ASTNode], line: int = 0, column: int = 0):
+        super().__init__(line, column)
+        self.name = name
+        self.body = body
+
+
+class ImportDecl(ASTNode):
+    """
+    Module import: import a.b [as alias].
+
+    Attributes:
+        module (str): The dotted module name, found as a/b.haack on the
+            module search path.
+        alias (str): The namespace the module's functions are called under;
+            defaults to the last component of the module name.
+    """
+    def __init__(self, module: str, alias: Optional[str] = None, line: int = 0, column: int = 0):
+        super().__init__(line, column)
+        self.module = module
+        self.alias = alias or module.rsplit('.', 1)[-1]
+
+
 class ReturnStatement(ASTNode):
     """
     Return statement.
@@ -284,6 +412,20 @@ class ReturnStatement(ASTNode):
         self.value = value
 
 
+class ContextSwitch(ASTNode):
+    """
+    Context switch: enter name | exit name.
+
+    Attributes:
+        context (str): The name of the context.
+        enter (bool): Whether the context is entered (activated) or exited.
+    """
+    def __init__(self, context: str, enter: bool, line: int = 0, column: int = 0):
+        super().__init__(line, column)
+        self.context = context
+        self.enter = enter
+
+
 class ExpressionStatement(ASTNode):
     """
     Statement consisting of just an expression.
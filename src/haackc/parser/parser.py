@@ -2,7 +2,7 @@
 Parser implementation for HaackLang.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from ..lexer import Token, TokenType
 from .ast_nodes import *
 
@@ -146,7 +146,9 @@ class Parser:
         """
         token = self.current()
         
-        if self.match(TokenType.TRACK):
+        if self.is_namespaced():
+            return self.parse_statement()
+        elif self.match(TokenType.TRACK):
             return self.parse_track_decl()
         elif self.match(TokenType.CONTEXT):
             return self.parse_context_decl()
@@ -154,8 +156,16 @@ class Parser:
             return self.parse_truthvalue_decl()
         elif self.match(TokenType.RULE):
             return self.parse_rule_decl()
+        elif self.match(TokenType.WHEN):
+            return self.parse_when_decl()
         elif self.match(TokenType.FN):
             return self.parse_function_decl()
+        elif self.match(TokenType.META):
+            return self.parse_meta_decl()
+        elif self.match(TokenType.MODULE):
+            return self.parse_module_decl()
+        elif self.match(TokenType.IMPORT):
+            return self.parse_import_decl()
         else:
             return self.parse_statement()
     
@@ -163,7 +173,7 @@ class Parser:
         """
         Parses a track declaration.
 
-        Syntax: track <name> period <N> [phase <M>] [using <logic>]
+        Syntax: track <name> period <N> [phase <M>] [priority <P>] [using <logic>]
 
         Returns:
             TrackDecl: The parsed track declaration node.
@@ -182,6 +192,11 @@ class Parser:
             phase_token = self.expect(TokenType.NUMBER)
             phase = int(phase_token.value)
         
+        priority = 0
+        if self.match(TokenType.PRIORITY):
+            self.advance()
+            priority = int(self.expect(TokenType.NUMBER).value)
+        
         logic = LogicType.CLASSICAL
         if self.match(TokenType.USING):
             self.advance()
@@ -203,14 +218,15 @@ class Parser:
             phase=phase,
             logic=logic,
             line=track_token.line,
-            column=track_token.column
+            column=track_token.column,
+            priority=priority
         )
     
     def parse_context_decl(self) -> ContextDecl:
         """
         Parses a context declaration.
 
-        Syntax: context <name> [using logic <logic> | using track <track>] { <body> }
+        Syntax: context <name> [using logic <logic> | using track <track>] [priority <P>] { <body> }
 
         Returns:
             ContextDecl: The parsed context declaration node.
@@ -241,6 +257,11 @@ class Parser:
                 track_token = self.expect(TokenType.IDENTIFIER)
                 track = track_token.value
         
+        priority = None
+        if self.match(TokenType.PRIORITY):
+            self.advance()
+            priority = int(self.expect(TokenType.NUMBER).value)
+        
         self.expect(TokenType.LBRACE)
         
         body = []
@@ -257,7 +278,8 @@ class Parser:
             track=track,
             body=body,
             line=context_token.line,
-            column=context_token.column
+            column=context_token.column,
+            priority=priority
         )
     
     def parse_truthvalue_decl(self) -> TruthValueDecl:
@@ -315,6 +337,231 @@ class Parser:
             column=rule_token.column
         )
     
+    def parse_when_decl(self) -> WhenDecl:
+        """
+        Parses an event rule.
+
+        Syntax: when <condition> { <body> } [else { <body> }]
+
+        Returns:
+            WhenDecl: The parsed event rule node.
+        """
+        when_token = self.expect(TokenType.WHEN)
+        
+        condition = self.parse_expression()
+        
+        self.expect(TokenType.LBRACE)
+        body = []
+        while not self.match(TokenType.RBRACE, TokenType.EOF):
+            stmt = self.parse_statement()
+            if stmt:
+                body.append(stmt)
+        self.expect(TokenType.RBRACE)
+        
+        else_body = None
+        if self.match(TokenType.ELSE):
+            self.advance()
+            self.expect(TokenType.LBRACE)
+            else_body = []
+            while not self.match(TokenType.RBRACE, TokenType.EOF):
+                stmt = self.parse_statement()
+                if stmt:
+                    else_body.append(stmt)
+            self.expect(TokenType.RBRACE)
+        
+        return WhenDecl(
+            condition=condition,
+            body=body,
+            else_body=else_body,
+            line=when_token.line,
+            column=when_token.column
+        )
+    
+    def parse_meta_decl(self) -> ASTNode:
+        """
+        Parses a meta-logic block or a meta-beat declaration.
+
+        Syntax: meta <name> { <body> } | meta-beat <N>
+
+        Returns:
+            ASTNode: The parsed MetaDecl or MetaBeatDecl node.
+        """
+        meta_token = self.expect(TokenType.META)
+        
+        if self.match(TokenType.MINUS):
+            self.advance()
+            beat_token = self.expect(TokenType.IDENTIFIER)
+            if beat_token.value != 'beat':
+                self.error(f"Expected 'meta-beat', got 'meta-{beat_token.value}'")
+            interval_token = self.expect(TokenType.NUMBER)
+            return MetaBeatDecl(
+                interval=int(interval_token.value),
+                line=meta_token.line,
+                column=meta_token.column
+            )
+        
+        name_token = self.expect(TokenType.IDENTIFIER)
+        
+        self.expect(TokenType.LBRACE)
+        body = []
+        while not self.match(TokenType.RBRACE, TokenType.EOF):
+            stmt = self.parse_statement()
+            if stmt:
+                body.append(stmt)
+        self.expect(TokenType.RBRACE)
+        
+        return MetaDecl(
+            name=name_token.value,
+            body=body,
+            line=meta_token.line,
+            column=meta_token.column
+        )
+    
+    def parse_meta_op(self) -> MetaOp:
+        """
+        Parses a meta-operator application.
+
+        Syntax: @<operator>(<args>), where @meta also accepts period(<track>)
+        and phase(<track>) as its argument.
+
+        Returns:
+            MetaOp: The parsed meta-operator node.
+        """
+        at_token = self.expect(TokenType.AT)
+        op_token = self.current()
+        if not self.match(TokenType.IDENTIFIER, TokenType.META):
+            self.error("Expected meta-operator name after '@'")
+        self.advance()
+        
+        self.expect(TokenType.LPAREN)
+        args = []
+        while not self.match(TokenType.RPAREN, TokenType.EOF):
+            if self.match(TokenType.PERIOD, TokenType.PHASE):
+                # period(t) and phase(t) are keywords elsewhere
+                field_token = self.current()
+                self.advance()
+                self.expect(TokenType.LPAREN)
+                track_token = self.expect(TokenType.IDENTIFIER)
+                self.expect(TokenType.RPAREN)
+                args.append(FunctionCall(
+                    name=field_token.value,
+                    args=[Variable(name=track_token.value, line=track_token.line, column=track_token.column)],
+                    line=field_token.line,
+                    column=field_token.column
+                ))
+            else:
+                args.append(self.parse_expression())
+            if self.match(TokenType.COMMA):
+                self.advance()
+        self.expect(TokenType.RPAREN)
+        
+        return MetaOp(operator=op_token.value, args=args, line=at_token.line, column=at_token.column)
+    
+    def parse_module_decl(self) -> ModuleDecl:
+        """
+        Parses an inline module declaration.
+
+        Syntax: module <name> { <functions and imports> }
+
+        Returns:
+            ModuleDecl: The parsed module declaration node.
+        """
+        module_token = self.expect(TokenType.MODULE)
+        name_token = self.expect(TokenType.IDENTIFIER)
+        self.expect(TokenType.LBRACE)
+        
+        body = []
+        while not self.match(TokenType.RBRACE, TokenType.EOF):
+            if self.match(TokenType.FN):
+                body.append(self.parse_function_decl())
+            elif self.match(TokenType.IMPORT):
+                body.append(self.parse_import_decl())
+            else:
+                self.error("Modules may only declare functions and imports")
+        
+        self.expect(TokenType.RBRACE)
+        
+        return ModuleDecl(name=name_token.value, body=body, line=module_token.line, column=module_token.column)
+    
+    def parse_module_name(self) -> str:
+        """
+        Parses a dotted module name; components may be keywords.
+
+        Returns:
+            str: The module name, e.g. "lib.fuzzy".
+        """
+        parts = []
+        while True:
+            token = self.current()
+            if not (isinstance(token.value, str) and token.value.isidentifier()):
+                self.error("Expected module name")
+            self.advance()
+            parts.append(token.value)
+            if not self.match(TokenType.DOT):
+                return '.'.join(parts)
+            self.advance()
+    
+    def parse_import_decl(self) -> ImportDecl:
+        """
+        Parses a module import.
+
+        Syntax: import <name>[.<name>...] [as <alias>]
+
+        Returns:
+            ImportDecl: The parsed import node.
+        """
+        import_token = self.expect(TokenType.IMPORT)
+        module = self.parse_module_name()
+        
+        alias = None
+        if self.match(TokenType.IDENTIFIER) and self.current().value == 'as':
+            self.advance()
+            alias = self.expect(TokenType.IDENTIFIER).value
+        
+        return ImportDecl(module=module, alias=alias, line=import_token.line, column=import_token.column)
+    
+    def index_module(self) -> Tuple[List[ImportDecl], Dict[str, Tuple[int, int]]]:
+        """
+        Indexes a module file without parsing its function bodies.
+
+        A module file holds only function declarations and imports. Imports
+        are parsed; each function is located by matching its braces, so it
+        can be parsed later on its own with `parse_function_decl`.
+
+        Returns:
+            Tuple[List[ImportDecl], Dict[str, Tuple[int, int]]]: The imports,
+                and the token range [start, end) of each function by name.
+
+        Raises:
+            SyntaxError: If the file declares anything else, or a function's
+                braces do not match.
+        """
+        imports = []
+        functions: Dict[str, Tuple[int, int]] = {}
+        while not self.match(TokenType.EOF):
+            if self.match(TokenType.IMPORT):
+                imports.append(self.parse_import_decl())
+                continue
+            if not self.match(TokenType.FN):
+                self.error("Modules may only declare functions and imports")
+            start = self.pos
+            self.advance()
+            name = self.expect(TokenType.IDENTIFIER).value
+            while not self.match(TokenType.LBRACE, TokenType.EOF):
+                self.advance()
+            self.expect(TokenType.LBRACE)
+            depth = 1
+            while depth:
+                if self.match(TokenType.EOF):
+                    self.error(f"Unterminated function: {name}")
+                if self.match(TokenType.LBRACE):
+                    depth += 1
+                elif self.match(TokenType.RBRACE):
+                    depth -= 1
+                self.advance()
+            functions[name] = (start, self.pos)
+        return imports, functions
+    
     def parse_function_decl(self) -> FunctionDecl:
         """
         Parses a function declaration.
@@ -367,7 +614,10 @@ class Parser:
             Optional[ASTNode]: The parsed statement node, or None if no
                 statement is found.
         """
-        if self.match(TokenType.IF):
+        if self.is_namespaced():
+            expr = self.parse_expression()
+            return ExpressionStatement(expression=expr, line=expr.line, column=expr.column)
+        elif self.match(TokenType.IF):
             return self.parse_if_statement()
         elif self.match(TokenType.GUARD):
             return self.parse_guard_statement()
@@ -375,6 +625,8 @@ class Parser:
             return self.parse_return_statement()
         elif self.match(TokenType.LET):
             return self.parse_let_statement()
+        elif self.match(TokenType.ENTER, TokenType.EXIT):
+            return self.parse_context_switch()
         elif self.match(TokenType.IDENTIFIER):
             # Could be assignment or expression
             return self.parse_assignment_or_expression()
@@ -387,12 +639,18 @@ class Parser:
         """
         Parses an if statement.
 
-        Syntax: if <condition> { <body> } [else { <body> }]
+        Syntax: if[!!] <condition> { <body> } [else { <body> }]
+
+        `if!!` is a contradiction-preserving branch (spec 13.4).
 
         Returns:
             IfStatement: The parsed if statement node.
         """
         if_token = self.expect(TokenType.IF)
+        paraconsistent = False
+        if self.match(TokenType.BANG_BANG):
+            self.advance()
+            paraconsistent = True
         
         condition = self.parse_expression()
         
@@ -419,6 +677,7 @@ class Parser:
             condition=condition,
             then_body=then_body,
             else_body=else_body,
+            paraconsistent=paraconsistent,
             line=if_token.line,
             column=if_token.column
         )
@@ -496,7 +755,28 @@ class Parser:
             track=None,
             value=value,
             line=let_token.line,
-            column=let_token.column
+            column=let_token.column,
+            declare=True
+        )
+    
+    def parse_context_switch(self) -> ContextSwitch:
+        """
+        Parses a context switch.
+
+        Syntax: enter [context] <context> | exit [context] <context>
+
+        Returns:
+            ContextSwitch: The parsed context switch node.
+        """
+        switch_token = self.advance()  # ENTER or EXIT
+        if self.match(TokenType.CONTEXT):
+            self.advance()
+        name_token = self.expect(TokenType.IDENTIFIER)
+        return ContextSwitch(
+            context=name_token.value,
+            enter=switch_token.type == TokenType.ENTER,
+            line=switch_token.line,
+            column=switch_token.column
         )
     
     def parse_assignment_or_expression(self) -> ASTNode:
@@ -698,6 +978,54 @@ class Parser:
         
         return self.parse_primary_expression()
     
+    def is_namespaced(self) -> bool:
+        """
+        Checks if the current token starts a namespaced name (`ns::name`).
+
+        Namespaces may be keywords (`tv`, `fuzzy`), so any word counts.
+
+        Returns:
+            bool: True if the current token is followed by `::`.
+        """
+        token = self.current()
+        return (isinstance(token.value, str) and token.value.isidentifier()
+                and self.peek(1).type == TokenType.COLON and self.peek(2).type == TokenType.COLON)
+    
+    def parse_namespaced_call(self) -> FunctionCall:
+        """
+        Parses a call to a namespaced standard library function.
+
+        Syntax: <namespace>::<name>(<args>). A logic type keyword given as an
+        argument (e.g. `para::resolve(x, classical)`) is passed as a name.
+
+        Returns:
+            FunctionCall: The call, named "<namespace>::<name>".
+        """
+        ns_token = self.advance()
+        self.expect(TokenType.COLON)
+        self.expect(TokenType.COLON)
+        name_token = self.current()
+        if not (isinstance(name_token.value, str) and name_token.value.isidentifier()):
+            self.error(f"Expected function name after '{ns_token.value}::'")
+        self.advance()
+        
+        self.expect(TokenType.LPAREN)
+        args = []
+        while not self.match(TokenType.RPAREN, TokenType.EOF):
+            arg_token = self.current()
+            if (self.match(TokenType.CLASSICAL, TokenType.FUZZY, TokenType.PARACONSISTENT)
+                    and self.peek(1).type in (TokenType.COMMA, TokenType.RPAREN)):
+                self.advance()
+                args.append(Variable(name=arg_token.value, line=arg_token.line, column=arg_token.column))
+            else:
+                args.append(self.parse_expression())
+            if self.match(TokenType.COMMA):
+                self.advance()
+        self.expect(TokenType.RPAREN)
+        
+        return FunctionCall(name=f"{ns_token.value}::{name_token.value}", args=args,
+                            line=ns_token.line, column=ns_token.column)
+    
     def parse_primary_expression(self) -> Expression:
         """
         Parses a primary expression.
@@ -713,6 +1041,10 @@ class Parser:
         """
         token = self.current()
         
+        # Namespaced standard library call
+        if self.is_namespaced():
+            return self.parse_namespaced_call()
+        
         # Number
         if self.match(TokenType.NUMBER):
             self.advance()
@@ -743,6 +1075,10 @@ class Parser:
             
             return Variable(name=name, track=track, line=token.line, column=token.column)
         
+        # Meta-operator
+        if self.match(TokenType.AT):
+            return self.parse_meta_op()
+        
         # Parenthesized expression
         if self.match(TokenType.LPAREN):
             self.advance()
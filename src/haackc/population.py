@@ -0,0 +1,300 @@
+"""
+Populations - many lightweight program instances sharing one compiled program.
+"""
+
+from array import array
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple, Union
+
+from .interpreter import Interpreter
+from .program import CompiledProgram, compile_source
+
+
+class InstanceState:
+    """
+    The complete mutable state of one program instance.
+
+    Attributes:
+        tvs (array): Every truth value track, packed as float64 in the
+            program's layout.
+        scalars (array): The numeric variables, in the program's layout.
+        beat (int): The instance's global beat.
+        frames (array): The context variables of every context, in the
+            program's layout.
+        active (array): Whether each context is active, in the program's
+            context order.
+        events (Optional[Tuple]): The edge state of the event rules (see
+            `EventIndex.save`); None if the program has none.
+    """
+
+    __slots__ = ('tvs', 'scalars', 'beat', 'frames', 'active', 'events')
+
+    def __init__(self, tvs: array, scalars: array, beat: int = 0, frames: Optional[array] = None,
+                 active: Optional[array] = None, events: Optional[Tuple] = None):
+        self.tvs = tvs
+        self.scalars = scalars
+        self.beat = beat
+        self.frames = frames if frames is not None else array('d')
+        self.active = active if active is not None else array('b')
+        self.events = events
+
+
+class SharedProgram:
+    """
+    A compiled program that steps any number of instances.
+
+    Tracks, functions, contexts, rules and the AST exist once, in a single
+    executor interpreter loaded when the program is created. An instance is
+    only an InstanceState: its truth values packed into one float64 array,
+    its numeric variables, its context variables and active contexts, the
+    edge state of its event rules, and its beat. Stepping an instance swaps its state
+    into the executor, runs the beats with the regular beat engine (so results
+    are exactly those of a dedicated Interpreter) and packs the state back.
+    `step_many` runs all beats of an instance per swap, so the swap cost is
+    paid once per instance per call rather than once per beat.
+
+    Truth values that name the same object (e.g. after a top-level `a = b`)
+    share one row of the layout. Temporaries that rules recompute every beat
+    (`let` results holding truth values) are not part of the state.
+
+    Attributes:
+        program (CompiledProgram): The compiled program.
+        tv_names (Tuple[str, ...]): The truth values in the state.
+        scalar_names (Tuple[str, ...]): The numeric variables in the state.
+    """
+
+    def __init__(self, program: Union[str, CompiledProgram], output: Optional[TextIO] = None):
+        """
+        Initializes a SharedProgram by running the program's top level once.
+
+        Args:
+            program (Union[str, CompiledProgram]): HaackLang source, or a
+                compiled program.
+            output (Optional[TextIO]): Where `print` writes, for the initial
+                run and for every instance; None means standard output.
+
+        Raises:
+            SyntaxError: If the source does not compile.
+            RuntimeError: If the program fails while loading.
+        """
+        if isinstance(program, str):
+            program = compile_source(program)
+        self.program = program
+        executor = Interpreter()
+        executor.output = output
+        executor.interpret(program.ast)
+        self._executor = executor
+
+        # One row per distinct truth value object, keyed by its tracks
+        rows: Dict[int, int] = {}
+        self._objects: List[Any] = []
+        self._keys: List[Tuple[str, ...]] = []
+        self._offsets: List[int] = []
+        self._row_of: Dict[str, int] = {}
+        size = 0
+        for name, tv in executor.truthvalues.items():
+            row = rows.get(id(tv))
+            if row is None:
+                row = rows[id(tv)] = len(self._objects)
+                self._objects.append(tv)
+                self._keys.append(tuple(tv.values))
+                self._offsets.append(size)
+                size += len(tv.values)
+            self._row_of[name] = row
+        self._offsets.append(size)
+        self._rows = [(tv, keys, start, end) for tv, keys, start, end
+                      in zip(self._objects, self._keys, self._offsets, self._offsets[1:])]
+        self._bindings = dict(executor.truthvalues)
+        self.tv_names = tuple(self._row_of)
+
+        self._variables = {name: value for name, value in executor.variables.items()
+                           if not isinstance(value, (int, float))}
+        self.scalar_names = tuple(name for name, value in executor.variables.items()
+                                  if isinstance(value, (int, float)))
+
+        self._contexts = list(executor.contexts.values())
+
+        self._initial = self._pack_state(executor.global_beat)
+
+    def _pack_state(self, beat: int) -> InstanceState:
+        """Packs the executor's current state into a new InstanceState."""
+        tvs = array('d')
+        for tv in self._objects:
+            tvs.extend(tv.values.values())
+        variables = self._executor.variables
+        scalars = array('d', (float(variables.get(name, 0.0)) for name in self.scalar_names))
+        frames, active = self._pack_contexts()
+        return InstanceState(tvs, scalars, beat, frames, active, self._save_events())
+
+    def _save_events(self) -> Optional[Tuple]:
+        executor = self._executor
+        return executor.event_index.save() if executor.events else None
+
+    def _pack_contexts(self) -> Tuple[array, array]:
+        """Packs the executor's context variables and active flags."""
+        contexts = self._contexts
+        frames = array('d', (float(value) for value in chain.from_iterable(c.frame for c in contexts)))
+        active = array('b', (1 if context.active else 0 for context in contexts))
+        return frames, active
+
+    def _copy(self, state: InstanceState) -> InstanceState:
+        return InstanceState(array('d', state.tvs), array('d', state.scalars), state.beat,
+                             array('d', state.frames), array('b', state.active), state.events)
+
+    def spawn(self, count: Optional[int] = None) -> Union[InstanceState, List[InstanceState]]:
+        """
+        Creates instances in the program's initial state.
+
+        Args:
+            count (Optional[int]): The number of instances; None creates one.
+
+        Returns:
+            Union[InstanceState, List[InstanceState]]: The instance, or a list
+                of `count` instances.
+        """
+        initial = self._initial
+        if count is None:
+            return self._copy(initial)
+        return [self._copy(initial) for _ in range(count)]
+
+    def _load(self, state: InstanceState):
+        """Swaps an instance's state into the executor."""
+        executor = self._executor
+        tvs = state.tvs
+        for tv, keys, start, end in self._rows:
+            tv.values = dict(zip(keys, tvs[start:end]))
+        executor.truthvalues.update(self._bindings)
+        variables = dict(self._variables)
+        variables.update(zip(self.scalar_names, state.scalars))
+        executor.variables = variables
+        frames = state.frames
+        start = 0
+        for context, active in zip(self._contexts, state.active):
+            end = start + len(context.frame)
+            context.frame = list(frames[start:end])
+            context.active = bool(active)
+            start = end
+        if state.events is not None:
+            executor.event_index.load(state.events)
+        executor.global_beat = state.beat
+        for track in executor.tracks.values():
+            track.current_beat = state.beat
+        if executor.meta is not None:
+            executor.meta.resync()
+
+    def _store(self, state: InstanceState):
+        """Packs the executor's state back into an instance."""
+        state.tvs = array('d', chain.from_iterable(tv.values.values() for tv in self._objects))
+        variables = self._executor.variables
+        scalars = state.scalars
+        for i, name in enumerate(self.scalar_names):
+            value = variables.get(name)
+            if isinstance(value, (int, float)):
+                scalars[i] = value
+        state.frames, state.active = self._pack_contexts()
+        state.events = self._save_events()
+        state.beat = self._executor.global_beat
+
+    def step(self, state: InstanceState, beats: int = 1):
+        """
+        Executes beats on one instance.
+
+        Args:
+            state (InstanceState): The instance.
+            beats (int): The number of beats.
+        """
+        self._load(state)
+        try:
+            self._executor.run(beats)
+        finally:
+            self._store(state)
+
+    def step_many(self, states: Iterable[InstanceState], beats: int = 1):
+        """
+        Executes the same number of beats on many instances.
+
+        Args:
+            states (Iterable[InstanceState]): The instances.
+            beats (int): The number of beats for each.
+        """
+        load = self._load
+        store = self._store
+        run = self._executor.run
+        for state in states:
+            load(state)
+            try:
+                run(beats)
+            finally:
+                store(state)
+
+    def _slot(self, tv_name: str, track_name: str) -> Tuple[int, Any]:
+        row = self._row_of.get(tv_name)
+        if row is None:
+            raise KeyError(f"Unknown truth value: {tv_name}")
+        try:
+            column = self._keys[row].index(track_name)
+        except ValueError:
+            raise KeyError(f"Unknown track: {track_name}") from None
+        return self._offsets[row] + column, self._objects[row]
+
+    def get(self, state: InstanceState, tv_name: str,
+            track_name: Optional[str] = None) -> Union[float, Dict[str, float]]:
+        """
+        Reads a truth value of an instance.
+
+        Args:
+            state (InstanceState): The instance.
+            tv_name (str): The truth value.
+            track_name (Optional[str]): The track; None reads every track.
+
+        Returns:
+            Union[float, Dict[str, float]]: The value, or all values by track.
+
+        Raises:
+            KeyError: If the truth value or track does not exist.
+        """
+        if track_name is not None:
+            return state.tvs[self._slot(tv_name, track_name)[0]]
+        if tv_name not in self._row_of:
+            raise KeyError(f"Unknown truth value: {tv_name}")
+        row = self._row_of[tv_name]
+        offsets = self._offsets
+        return dict(zip(self._keys[row], state.tvs[offsets[row]:offsets[row + 1]]))
+
+    def set(self, state: InstanceState, tv_name: str, track_name: str, value: float):
+        """
+        Sets one track of an instance's truth value, clamped by the track's logic.
+
+        Args:
+            state (InstanceState): The instance.
+            tv_name (str): The truth value.
+            track_name (str): The track.
+            value (float): The value.
+
+        Raises:
+            KeyError: If the truth value or track does not exist.
+        """
+        index, tv = self._slot(tv_name, track_name)
+        state.tvs[index] = tv.clamp(track_name, value)
+
+    def set_many(self, states: Sequence[InstanceState], tv_name: str, track_name: str,
+                 values: Sequence[float]):
+        """
+        Sets one truth value track across instances, one value per instance.
+
+        Args:
+            states (Sequence[InstanceState]): The instances.
+            tv_name (str): The truth value.
+            track_name (str): The track.
+            values (Sequence[float]): The values, in the order of `states`.
+
+        Raises:
+            KeyError: If the truth value or track does not exist.
+            ValueError: If there is not one value per instance.
+        """
+        if len(states) != len(values):
+            raise ValueError("Expected one value per instance")
+        index, tv = self._slot(tv_name, track_name)
+        clamp = tv.clamp
+        for state, value in zip(states, values):
+            state.tvs[index] = clamp(track_name, value)
@@ -0,0 +1,203 @@
+"""
+Compiled programs - parsed HaackLang programs that can be cached and reused.
+"""
+
+import hashlib
+import os
+import pickle
+import struct
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from .lexer import Lexer
+from .parser import Parser
+from .parser.ast_nodes import Program
+
+
+ARTIFACT_MAGIC = b'HAACKPRG'
+ARTIFACT_VERSION = 1
+
+# magic, version, SHA-256 of the source
+ARTIFACT_HEADER = struct.Struct('<8sI32s')
+
+
+def source_hash(source: str) -> str:
+    """Returns the content hash identifying a program's source."""
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+class CompiledProgram:
+    """
+    A lexed and parsed program, ready to be loaded into any number of
+    interpreters without repeating the front-end work.
+
+    The interpreter only labels the AST's expressions with their shapes,
+    which are the same for every fresh interpreter, so one compiled program
+    can be shared by all runtimes executing it.
+
+    Attributes:
+        ast (Program): The parsed program.
+        digest (str): The SHA-256 of the source the program was compiled from.
+        name (Optional[str]): Where the program came from, for messages.
+    """
+
+    def __init__(self, ast: Program, digest: str, name: Optional[str] = None):
+        """
+        Initializes a CompiledProgram.
+
+        Args:
+            ast (Program): The parsed program.
+            digest (str): The content hash of its source.
+            name (Optional[str]): Where the program came from.
+        """
+        self.ast = ast
+        self.digest = digest
+        self.name = name
+
+    def save(self, path: str):
+        """
+        Writes the program as an artifact file, atomically.
+
+        Args:
+            path (str): The artifact path.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(ARTIFACT_HEADER.pack(ARTIFACT_MAGIC, ARTIFACT_VERSION, bytes.fromhex(self.digest)))
+            pickle.dump(self.ast, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledProgram':
+        """
+        Reads an artifact written by `save`.
+
+        Artifacts are pickles: only load files written by a trusted haackc.
+
+        Args:
+            path (str): The artifact path.
+
+        Returns:
+            CompiledProgram: The program.
+
+        Raises:
+            ValueError: If the file is not a program artifact of this version.
+        """
+        with open(path, 'rb') as f:
+            header = f.read(ARTIFACT_HEADER.size)
+            if len(header) < ARTIFACT_HEADER.size:
+                raise ValueError(f"Not a HaackLang program artifact: {path}")
+            magic, version, digest = ARTIFACT_HEADER.unpack(header)
+            if magic != ARTIFACT_MAGIC:
+                raise ValueError(f"Not a HaackLang program artifact: {path}")
+            if version != ARTIFACT_VERSION:
+                raise ValueError(f"Unsupported program artifact version: {version}")
+            ast = pickle.load(f)
+        return cls(ast, digest.hex(), path)
+
+
+def compile_source(source: str, name: Optional[str] = None) -> CompiledProgram:
+    """
+    Compiles HaackLang source.
+
+    Args:
+        source (str): The source code.
+        name (Optional[str]): Where the source came from.
+
+    Returns:
+        CompiledProgram: The compiled program.
+
+    Raises:
+        SyntaxError: If the source does not lex or parse.
+    """
+    ast = Parser(Lexer(source).tokenize()).parse()
+    return CompiledProgram(ast, source_hash(source), name)
+
+
+def compile_file(path: str, cache_dir: Optional[str] = None) -> CompiledProgram:
+    """
+    Compiles a source file, reusing a cached artifact when its source is unchanged.
+
+    Args:
+        path (str): The source file.
+        cache_dir (Optional[str]): Where artifacts are kept, named by the
+            source hash; None disables the cache.
+
+    Returns:
+        CompiledProgram: The compiled program.
+    """
+    with open(path) as f:
+        source = f.read()
+    if cache_dir is None:
+        return compile_source(source, path)
+    digest = source_hash(source)
+    artifact = os.path.join(cache_dir, f"{digest}.hkp")
+    if os.path.exists(artifact):
+        try:
+            program = CompiledProgram.load(artifact)
+            program.name = path
+            return program
+        except (ValueError, pickle.UnpicklingError, EOFError):
+            pass
+    program = compile_source(source, path)
+    os.makedirs(cache_dir, exist_ok=True)
+    program.save(artifact)
+    return program
+
+
+class ProgramCache:
+    """
+    A least-recently-used cache of compiled programs keyed by source hash.
+
+    Attributes:
+        maxsize (int): The number of programs kept.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that compiled the source.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        """
+        Initializes a ProgramCache.
+
+        Args:
+            maxsize (int): The number of programs kept.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._programs: 'OrderedDict[str, CompiledProgram]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._programs)
+
+    def get(self, source: str, name: Optional[str] = None) -> Tuple[CompiledProgram, bool]:
+        """
+        Gets the compiled program for a source, compiling it on a miss.
+
+        Args:
+            source (str): The source code.
+            name (Optional[str]): Where the source came from.
+
+        Returns:
+            Tuple[CompiledProgram, bool]: The program, and whether it was cached.
+
+        Raises:
+            SyntaxError: If the source does not compile.
+        """
+        digest = source_hash(source)
+        with self._lock:
+            program = self._programs.get(digest)
+            if program is not None:
+                self._programs.move_to_end(digest)
+                self.hits += 1
+                return program, True
+        program = compile_source(source, name)
+        with self._lock:
+            self.misses += 1
+            self._programs[digest] = program
+            self._programs.move_to_end(digest)
+            while len(self._programs) > self.maxsize:
+                self._programs.popitem(last=False)
+        return program, False
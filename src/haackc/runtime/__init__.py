@@ -3,5 +3,6 @@
 from .track import Track
 from .truthvalue import TruthValue
 from .context import Context
+from .meta import MetaEngine
 
-__all__ = ['Track', 'TruthValue', 'Context']
+__all__ = ['Track', 'TruthValue', 'Context', 'MetaEngine']
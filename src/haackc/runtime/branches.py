@@ -0,0 +1,322 @@
+"""
+Contradiction-preserving branches - forked interpreter state for `if!!`, shared with its parent.
+"""
+
+from collections import ChainMap
+from typing import Any, Dict, List, Optional, Tuple
+
+from .context import Context
+from .meta import coherence
+from .truthvalue import TruthValue
+
+# How the two arms of a fork are merged (spec 15.10)
+MERGE_POLICIES = ('blend', 'max', 'min', 'then', 'else', 'coherent')
+
+_MISSING = object()
+
+
+def _maps(mapping: Any) -> List[Dict[str, Any]]:
+    return list(mapping.maps) if isinstance(mapping, ChainMap) else [mapping]
+
+
+class Branch:
+    """
+    The state of one arm of a fork, layered over the state it forked from.
+
+    Truth values and variables are ChainMaps whose first map holds what the
+    arm wrote and whose other maps are its parent's, shared rather than
+    copied: forking allocates two empty dictionaries, whatever the size of
+    the state. A truth value is copied into the arm the first time the arm
+    writes one of its tracks, and a context's variable frame the first time
+    the arm writes one of its variables, so an arm pays for what it writes.
+    Context switches are recorded rather than applied.
+
+    Attributes:
+        parent (Optional[Branch]): The enclosing arm, for nested forks.
+        base_truthvalues (Dict[str, TruthValue]): The truth values forked from.
+        base_variables (Dict[str, Any]): The variables forked from.
+        truthvalues (ChainMap): The arm's truth values.
+        variables (ChainMap): The arm's variables.
+        frames (Dict[int, Tuple[Context, List[Any], Optional[List[Any]]]]): For
+            each context whose frame the arm wrote, the frame forked from and,
+            once the arm is closed, the arm's frame.
+        switches (Dict[str, Tuple[Context, bool]]): The contexts the arm
+            entered (True) or exited (False).
+    """
+
+    def __init__(self, truthvalues: Dict[str, TruthValue], variables: Dict[str, Any],
+                 parent: Optional['Branch'] = None):
+        """
+        Forks a Branch from a state.
+
+        Args:
+            truthvalues (Dict[str, TruthValue]): The truth values to fork from.
+            variables (Dict[str, Any]): The variables to fork from.
+            parent (Optional[Branch]): The arm the state belongs to, if any.
+        """
+        self.parent = parent
+        self.base_truthvalues = truthvalues
+        self.base_variables = variables
+        self.truthvalues = ChainMap({}, *_maps(truthvalues))
+        self.variables = ChainMap({}, *_maps(variables))
+        self.frames: Dict[int, Tuple[Context, List[Any], Optional[List[Any]]]] = {}
+        self.switches: Dict[str, Tuple[Context, bool]] = {}
+
+    def own(self, name: str) -> TruthValue:
+        """
+        Gets a truth value the arm may write, copying it on the first write.
+
+        Args:
+            name (str): The truth value name.
+
+        Returns:
+            TruthValue: The arm's copy.
+        """
+        written = self.truthvalues.maps[0]
+        tv = written.get(name)
+        if tv is None:
+            shared = self.truthvalues[name]
+            tv = written[name] = TruthValue(shared.tracks, shared.values)
+        return tv
+
+    def frame(self, context: Context) -> List[Any]:
+        """
+        Gets a context's frame the arm may write, copying it on the first write.
+
+        Args:
+            context (Context): The context.
+
+        Returns:
+            List[Any]: The arm's frame, installed as the context's frame
+                until the arm is closed.
+        """
+        if id(context) not in self.frames:
+            self.frames[id(context)] = (context, context.frame, None)
+            context.frame = list(context.frame)
+        return context.frame
+
+    def active(self, context: Context) -> bool:
+        """Whether a context is active in this arm."""
+        branch = self
+        while branch is not None:
+            switched = branch.switches.get(context.name)
+            if switched is not None and switched[0] is context:
+                return switched[1]
+            branch = branch.parent
+        return context.active
+
+    def close(self, variables: Dict[str, Any]):
+        """
+        Ends the arm's execution, giving the contexts their forked frames back.
+
+        Args:
+            variables (ChainMap): The interpreter's variables at the end of the
+                arm; function calls replace the ChainMap with a copy.
+        """
+        if isinstance(variables, ChainMap):
+            self.variables = variables
+        for key, (context, base, _frame) in list(self.frames.items()):
+            self.frames[key] = (context, base, context.frame)
+            context.frame = base
+
+    @property
+    def written_truthvalues(self) -> Dict[str, TruthValue]:
+        """The truth values the arm wrote or bound."""
+        return self.truthvalues.maps[0]
+
+    @property
+    def written_variables(self) -> Dict[str, Any]:
+        """The variables the arm assigned."""
+        return self.variables.maps[0]
+
+
+def _merge(policy: str, weight: float, first: Any, second: Any) -> Any:
+    """Merges two values of a name under a policy."""
+    if first is _MISSING:
+        return second
+    if second is _MISSING:
+        return first
+    numeric = isinstance(first, (int, float)) and isinstance(second, (int, float))
+    if policy == 'max' and numeric:
+        return max(first, second)
+    if policy == 'min' and numeric:
+        return min(first, second)
+    if policy == 'blend' and numeric:
+        if first == second:
+            return first
+        return weight * first + (1.0 - weight) * second
+    if policy == 'else':
+        return second
+    if policy in ('blend', 'max', 'min'):
+        # Values that cannot be combined follow the stronger arm
+        return first if weight >= 0.5 else second
+    return first
+
+
+class MergedState:
+    """
+    The result of merging the two arms of a fork, to be written to the state they forked from.
+
+    Attributes:
+        truthvalues (Dict[str, Dict[str, float]]): The merged tracks of each
+            truth value an arm wrote.
+        variables (Dict[str, Any]): The merged value of each variable an arm
+            assigned.
+        frames (Dict[int, Tuple[Context, Dict[int, Any]]]): The merged slots
+            of each context frame an arm wrote.
+        switches (Dict[str, Tuple[Context, bool]]): Whether each context an
+            arm switched ends up active.
+    """
+
+    def __init__(self):
+        """Initializes an empty MergedState."""
+        self.truthvalues: Dict[str, Dict[str, float]] = {}
+        self.variables: Dict[str, Any] = {}
+        self.frames: Dict[int, Tuple[Context, Dict[int, Any]]] = {}
+        self.switches: Dict[str, Tuple[Context, bool]] = {}
+
+
+class BranchEngine:
+    """
+    Configures and counts the forks of contradiction-preserving branches.
+
+    `if!! condition` forks when its condition is contradictory: true on
+    some tracks and false on others. Both arms then run, each on a Branch
+    of the state, and their writes are merged under a policy:
+
+    - `blend` (default): fuzzy blending weighted by the condition. Each track
+      of a truth value is weighted by the condition's value on that track,
+      so a track where the condition holds takes the then arm's value;
+      variables are weighted by the condition's mean.
+    - `max` / `min`: the greater or lesser value, per track and variable.
+    - `then` / `else`: one arm's writes; the other arm only has effects.
+    - `coherent`: coherence maximization, keeping every write of the arm
+      whose written truth values agree best across their tracks.
+
+    A name written by one arm only is merged with its value in the state
+    forked from. A consistent condition does not fork. A fork needs two live
+    branches; when that would exceed `max_branches`, the condition is
+    collapsed to a classical boolean instead.
+
+    Attributes:
+        policy (str): The merge policy.
+        max_branches (int): The most branches alive at once, counting the
+            arms of enclosing forks.
+        live (int): The branches alive now.
+        forks (int): The number of forks.
+        collapsed (int): The number of contradictory conditions collapsed
+            because of the branch limit.
+        peak (int): The most branches that were alive at once.
+    """
+
+    def __init__(self, policy: str = 'blend', max_branches: int = 16):
+        """
+        Initializes a BranchEngine.
+
+        Args:
+            policy (str): The merge policy.
+            max_branches (int): The most branches alive at once.
+
+        Raises:
+            ValueError: If the policy is unknown or max_branches is less than 2.
+        """
+        if policy not in MERGE_POLICIES:
+            raise ValueError(f"Unknown merge policy {policy!r} (expected one of {', '.join(MERGE_POLICIES)})")
+        if max_branches < 2:
+            raise ValueError(f"A fork needs at least 2 branches, got {max_branches}")
+        self.policy = policy
+        self.max_branches = max_branches
+        self.live = 0
+        self.forks = 0
+        self.collapsed = 0
+        self.peak = 0
+
+    def fork(self) -> bool:
+        """
+        Reserves the two branches of a fork.
+
+        Returns:
+            bool: Whether the fork fits under the limit; if not, it is counted
+                as collapsed.
+        """
+        if self.live + 2 > self.max_branches:
+            self.collapsed += 1
+            return False
+        self.live += 2
+        self.forks += 1
+        self.peak = max(self.peak, self.live)
+        return True
+
+    def join(self):
+        """Releases the two branches of a fork."""
+        self.live -= 2
+
+    def merge(self, then: Branch, orelse: Branch, weights: Dict[str, float]) -> MergedState:
+        """
+        Merges the arms of a fork.
+
+        Args:
+            then (Branch): The arm run for the condition being true.
+            orelse (Branch): The arm run for the condition being false.
+            weights (Dict[str, float]): The condition's value on each track.
+
+        Returns:
+            MergedState: The merged writes.
+        """
+        policy = self.policy
+        if policy == 'coherent':
+            policy = 'then' if self._coherence(then, orelse) >= self._coherence(orelse, then) else 'else'
+        weight = sum(weights.values()) / len(weights) if weights else 0.5
+        merged = MergedState()
+
+        for name in then.written_truthvalues.keys() | orelse.written_truthvalues.keys():
+            first = then.truthvalues.get(name)
+            second = orelse.truthvalues.get(name)
+            tracks = (first or second).values.keys()
+            merged.truthvalues[name] = {
+                track: _merge(policy, weights.get(track, weight),
+                              first.values.get(track, 0.0) if first is not None else _MISSING,
+                              second.values.get(track, 0.0) if second is not None else _MISSING)
+                for track in tracks}
+
+        for name in then.written_variables.keys() | orelse.written_variables.keys():
+            merged.variables[name] = _merge(policy, weight, then.variables.get(name, _MISSING),
+                                            orelse.variables.get(name, _MISSING))
+
+        for key in then.frames.keys() | orelse.frames.keys():
+            entry = then.frames.get(key) or orelse.frames.get(key)
+            context, forked = entry[0], entry[1]
+            first = then.frames[key][2] if key in then.frames else forked
+            second = orelse.frames[key][2] if key in orelse.frames else forked
+            merged.frames[key] = (context, {
+                slot: _merge(policy, weight, first[slot], second[slot])
+                for slot in range(len(forked)) if first[slot] != forked[slot] or second[slot] != forked[slot]})
+
+        for name in then.switches.keys() | orelse.switches.keys():
+            context = (then.switches.get(name) or orelse.switches.get(name))[0]
+            first = 1.0 if then.active(context) else 0.0
+            second = 1.0 if orelse.active(context) else 0.0
+            merged.switches[name] = (context, _merge(policy, weight, first, second) >= 0.5)
+        return merged
+
+    @staticmethod
+    def _coherence(arm: Branch, other: Branch) -> float:
+        """The mean coherence, in an arm, of the truth values either arm wrote."""
+        names = arm.written_truthvalues.keys() | other.written_truthvalues.keys()
+        scores = []
+        for name in names:
+            tv = arm.truthvalues.get(name)
+            if tv is not None:
+                values = list(tv.values.values())
+                scores.append(coherence(len(values), sum(values), sum(v * v for v in values)))
+        return sum(scores) / len(scores) if scores else 1.0
+
+    def report(self) -> str:
+        """
+        Formats the forks made and collapsed.
+
+        Returns:
+            str: The formatted report.
+        """
+        return (f"Branches: {self.forks} forks merged by {self.policy}, at most {self.peak} of "
+                f"{self.max_branches} branches live, {self.collapsed} contradictions collapsed")
@@ -0,0 +1,241 @@
+"""
+Checkpoint implementation - binary snapshots of interpreter state.
+
+A checkpoint is a fixed-size header followed by a names block and contiguous
+little-endian float64 arrays, each aligned to 8 bytes:
+
+    header    magic, version, global beat, element counts, section offsets
+    names     newline-separated UTF-8 names (tracks, tvs, scalars, contexts)
+    tracks    n_tracks x [period, phase, logic, current_beat, priority]
+    tvs       n_tvs x n_tracks truth values, row-major
+    scalars   n_scalars values, context variables named "context::name"
+    contexts  n_contexts x [logic, track index, active, priority]
+
+Restoring memory-maps the file and reads each array with one cast of the
+mapped bytes, without parsing values one at a time. Truth values and
+variables are Python dictionaries, so restoring still builds one float
+object per value; only the decoding is done in bulk.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List
+
+from .track import Track, LogicType
+from .truthvalue import TruthValue
+from .context import Context
+from .meta import MetaEngine
+
+
+MAGIC = b'HAACKCKP'
+VERSION = 3
+# Version 1 checkpoints have no context variables and no active flags,
+# versions 1 and 2 no track or context priorities
+SUPPORTED_VERSIONS = (1, 2, 3)
+
+# magic, version, flags, global_beat, n_tracks, n_tvs, n_scalars, n_contexts,
+# names_offset, names_size, tracks_offset, tvs_offset, scalars_offset, contexts_offset
+HEADER = struct.Struct('<8sIIqIIIIQQQQQQ')
+
+# Fields per track and per context, by version
+TRACK_FIELDS = {1: 4, 2: 4, 3: 5}
+CONTEXT_FIELDS = {1: 2, 2: 3, 3: 4}
+
+LOGIC_CODES = {
+    LogicType.CLASSICAL: 0.0,
+    LogicType.FUZZY: 1.0,
+    LogicType.PARACONSISTENT: 2.0,
+}
+LOGIC_TYPES = {int(code): logic for logic, code in LOGIC_CODES.items()}
+
+
+def _align(offset: int) -> int:
+    """Rounds an offset up to the next multiple of 8 bytes."""
+    return (offset + 7) & ~7
+
+
+def _to_bytes(values: array) -> bytes:
+    """Serializes a float64 array in little-endian byte order."""
+    if sys.byteorder != 'little':
+        values = array('d', values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_checkpoint(interpreter: Any, path: str):
+    """
+    Writes the state of an interpreter to a checkpoint file.
+
+    The file is written next to its destination and atomically renamed into
+    place, so a crash while checkpointing never leaves a truncated file.
+
+    Args:
+        interpreter (Interpreter): The interpreter whose state is saved.
+        path (str): The destination file path.
+    """
+    track_names = list(interpreter.tracks)
+    track_index = {name: i for i, name in enumerate(track_names)}
+    tv_names = list(interpreter.truthvalues)
+    scalar_names = [name for name, value in interpreter.variables.items()
+                    if isinstance(value, (int, float))]
+    scalar_values = [interpreter.variables[name] for name in scalar_names]
+    context_names = list(interpreter.contexts)
+    for context_name in context_names:
+        context = interpreter.contexts[context_name]
+        for name, slot in context.slots.items():
+            scalar_names.append(f"{context_name}::{name}")
+            scalar_values.append(context.frame[slot])
+
+    names = '\n'.join(track_names + tv_names + scalar_names + context_names).encode('utf-8')
+
+    tracks = array('d')
+    for name in track_names:
+        track = interpreter.tracks[name]
+        tracks.extend((track.period, track.phase, LOGIC_CODES[track.logic], track.current_beat,
+                       track.priority))
+
+    tvs = array('d')
+    for name in tv_names:
+        values = interpreter.truthvalues[name].values
+        tvs.extend(values.get(track_name, 0.0) for track_name in track_names)
+
+    scalars = array('d', (float(value) for value in scalar_values))
+
+    contexts = array('d')
+    for name in context_names:
+        context = interpreter.contexts[name]
+        logic = LOGIC_CODES[context.logic] if context.logic else -1.0
+        priority = context.priority if context.priority is not None else -1.0
+        contexts.extend((logic, track_index.get(context.track, -1), 1.0 if context.active else 0.0,
+                         priority))
+
+    names_offset = HEADER.size
+    tracks_offset = _align(names_offset + len(names))
+    tvs_offset = tracks_offset + 8 * len(tracks)
+    scalars_offset = tvs_offset + 8 * len(tvs)
+    contexts_offset = scalars_offset + 8 * len(scalars)
+
+    header = HEADER.pack(
+        MAGIC, VERSION, 0, interpreter.global_beat,
+        len(track_names), len(tv_names), len(scalar_names), len(context_names),
+        names_offset, len(names), tracks_offset, tvs_offset, scalars_offset, contexts_offset
+    )
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(names)
+        f.write(b'\0' * (tracks_offset - names_offset - len(names)))
+        f.write(_to_bytes(tracks))
+        f.write(_to_bytes(tvs))
+        f.write(_to_bytes(scalars))
+        f.write(_to_bytes(contexts))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_floats(view: memoryview, offset: int, count: int) -> List[float]:
+    """Reads `count` little-endian float64 values starting at `offset`."""
+    section = view[offset:offset + 8 * count]
+    try:
+        if sys.byteorder == 'little':
+            floats = section.cast('d')
+            try:
+                return floats.tolist()
+            finally:
+                floats.release()
+        values = array('d', section.tobytes())
+        values.byteswap()
+        return values.tolist()
+    finally:
+        section.release()
+
+
+def read_checkpoint(interpreter: Any, path: str):
+    """
+    Restores the state of an interpreter from a checkpoint file.
+
+    Tracks, contexts, truth values, scalar variables and the global beat are
+    replaced with the checkpointed ones. Each section is decoded with a single
+    cast of the mapped file; the values are then copied into the
+    interpreter's dictionaries, which cannot share the mapped buffer. Functions and rules are not part of
+    the checkpoint and are kept from the program the interpreter has loaded.
+
+    Args:
+        interpreter (Interpreter): The interpreter to restore into.
+        path (str): The checkpoint file path.
+
+    Raises:
+        ValueError: If the file is not a checkpoint or has an unsupported version.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) < HEADER.size:
+            raise ValueError(f"Not a HaackLang checkpoint: {path}")
+        (magic, version, _flags, global_beat, n_tracks, n_tvs, n_scalars, n_contexts,
+         names_offset, names_size, tracks_offset, tvs_offset, scalars_offset,
+         contexts_offset) = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a HaackLang checkpoint: {path}")
+        if version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported checkpoint version {version} (expected {VERSION})")
+        track_fields = TRACK_FIELDS[version]
+        context_fields = CONTEXT_FIELDS[version]
+
+        names = mm[names_offset:names_offset + names_size].decode('utf-8').split('\n')
+        view = memoryview(mm)
+        try:
+            tracks = _read_floats(view, tracks_offset, track_fields * n_tracks)
+            tvs = _read_floats(view, tvs_offset, n_tvs * n_tracks)
+            scalars = _read_floats(view, scalars_offset, n_scalars)
+            contexts = _read_floats(view, contexts_offset, context_fields * n_contexts)
+        finally:
+            view.release()
+
+    track_names = names[:n_tracks]
+    tv_names = names[n_tracks:n_tracks + n_tvs]
+    scalar_names = names[n_tracks + n_tvs:n_tracks + n_tvs + n_scalars]
+    context_names = names[n_tracks + n_tvs + n_scalars:n_tracks + n_tvs + n_scalars + n_contexts]
+
+    # Truth values share the interpreter's track dictionary, so update it in place
+    interpreter.tracks.clear()
+    for i, name in enumerate(track_names):
+        fields = tracks[i * track_fields:(i + 1) * track_fields]
+        priority = int(fields[4]) if track_fields > 4 else 0
+        track = Track(name, int(fields[0]), int(fields[1]), LOGIC_TYPES[int(fields[2])], priority)
+        track.current_beat = int(fields[3])
+        interpreter.tracks[name] = track
+
+    truthvalues: Dict[str, TruthValue] = {}
+    for i, name in enumerate(tv_names):
+        tv = TruthValue(interpreter.tracks)
+        tv.values = dict(zip(track_names, tvs[i * n_tracks:(i + 1) * n_tracks]))
+        truthvalues[name] = tv
+    interpreter.truthvalues = truthvalues
+    if interpreter.meta is not None:
+        interpreter.meta = MetaEngine(interpreter.tracks, truthvalues)
+
+    contexts_by_name: Dict[str, Context] = {}
+    for i, name in enumerate(context_names):
+        fields = contexts[i * context_fields:(i + 1) * context_fields]
+        context = interpreter.contexts.get(name) or Context(name)
+        context.logic = LOGIC_TYPES[int(fields[0])] if fields[0] >= 0 else None
+        context.track = track_names[int(fields[1])] if fields[1] >= 0 else None
+        context.active = fields[2] != 0.0 if context_fields > 2 else True
+        if context_fields > 3:
+            context.priority = int(fields[3]) if fields[3] >= 0 else None
+        contexts_by_name[name] = context
+    interpreter.contexts = contexts_by_name
+
+    for name, value in zip(scalar_names, scalars):
+        context_name, _, variable = name.rpartition('::')
+        context = contexts_by_name.get(context_name)
+        if context is not None and variable in context.slots:
+            context.declare(variable, value)
+        else:
+            interpreter.variables[name] = value
+
+    interpreter.global_beat = global_beat
@@ -2,7 +2,7 @@
 Context implementation - cognitive domains with specific logic rules.
 """
 
-from typing import Dict, Optional, Any
+from typing import Any, Dict, List, Optional
 from .track import LogicType
 
 
@@ -11,16 +11,32 @@ class Context:
     Represents a cognitive context with specific logic and track bindings.
 
     A context is a domain of reasoning that can have its own logic system and
-    be associated with a specific track. It also holds its own set of variables.
+    be associated with a specific track. Only the rules of active contexts
+    run on a beat; `enter` and `exit` switch a context by setting its flag.
+    A context declared inside another is active only while every enclosing
+    context is.
+
+    A context's own variables (declared with `let` in its body) live in a
+    frame: a list of values indexed by slot. Variable references in the
+    context's rules are resolved to their slots when the context is compiled,
+    so reading or writing one is a list access. The rules of a nested context
+    also see the variables of the contexts enclosing it, innermost first.
 
     Attributes:
         name (str): The name of the context.
         logic (Optional[LogicType]): The logic system used by the context.
         track (Optional[str]): The track associated with the context.
-        variables (Dict[str, Any]): A dictionary of variables local to the context.
+        priority (Optional[int]): The scheduling priority of the context's
+            rules; None means the priority of its track.
+        parent (Optional[Context]): The context this one is declared in.
+        active (bool): Whether the context is entered; its rules run on beats
+            if its enclosing contexts are entered too.
+        slots (Dict[str, int]): The slot of each context variable.
+        frame (List[Any]): The values of the context variables, by slot.
     """
     
-    def __init__(self, name: str, logic: Optional[LogicType] = None, track: Optional[str] = None):
+    def __init__(self, name: str, logic: Optional[LogicType] = None, track: Optional[str] = None,
+                 priority: Optional[int] = None, parent: Optional['Context'] = None):
         """
         Initializes a Context.
 
@@ -28,11 +44,77 @@ class Context:
             name (str): The name of the context.
             logic (Optional[LogicType]): The logic system for the context.
             track (Optional[str]): The track associated with the context.
+            priority (Optional[int]): The scheduling priority of the context.
+            parent (Optional[Context]): The enclosing context, if any.
         """
         self.name = name
         self.logic = logic
         self.track = track
-        self.variables: Dict[str, Any] = {}
+        self.priority = priority
+        self.parent = parent
+        self.active = True
+        self.slots: Dict[str, int] = {}
+        self.frame: List[Any] = []
+    
+    @property
+    def variables(self) -> Dict[str, Any]:
+        """The context variables by name (a copy of the frame)."""
+        return {name: self.frame[slot] for name, slot in self.slots.items()}
+    
+    def chain(self) -> List['Context']:
+        """The context and the contexts enclosing it, innermost first."""
+        contexts = []
+        context: Optional[Context] = self
+        while context is not None:
+            contexts.append(context)
+            context = context.parent
+        return contexts
+    
+    def is_active(self) -> bool:
+        """Whether the context and every context enclosing it are entered."""
+        context: Optional[Context] = self
+        while context is not None:
+            if not context.active:
+                return False
+            context = context.parent
+        return True
+    
+    def find(self, name: str) -> Optional['Context']:
+        """
+        Finds the context whose frame holds a variable, as this context's rules see it.
+
+        Args:
+            name (str): The variable name.
+
+        Returns:
+            Optional[Context]: The innermost context of the chain declaring
+                the variable, or None.
+        """
+        context: Optional[Context] = self
+        while context is not None:
+            if name in context.slots:
+                return context
+            context = context.parent
+        return None
+    
+    def declare(self, name: str, value: Any) -> int:
+        """
+        Declares a context variable, or assigns it if already declared.
+
+        Args:
+            name (str): The variable name.
+            value (Any): The initial value.
+
+        Returns:
+            int: The variable's slot.
+        """
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = len(self.frame)
+            self.frame.append(value)
+        else:
+            self.frame[slot] = value
+        return slot
     
     def __repr__(self):
         return f"Context({self.name}, logic={self.logic}, track={self.track})"
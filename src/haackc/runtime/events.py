@@ -0,0 +1,200 @@
+"""
+Event index - edge detection for `when` rules, with threshold conditions indexed by value.
+"""
+
+import bisect
+import operator
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+COMPARISONS: Dict[str, Callable[[float, float], bool]] = {
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+# A threshold condition: truth value name, track, comparison and threshold
+Threshold = Tuple[str, str, str, float]
+
+
+class _Thresholds:
+    """The thresholds compared with one track of one truth value, in sorted order."""
+
+    def __init__(self):
+        self.values: List[float] = []
+        self.events: List[int] = []
+        self.last: Optional[float] = None
+
+    def add(self, threshold: float, event: int):
+        position = bisect.bisect_right(self.values, threshold)
+        self.values.insert(position, threshold)
+        self.events.insert(position, event)
+
+    def crossed(self, value: Optional[float]) -> List[int]:
+        """The events whose thresholds lie between the last value and this one."""
+        last, self.last = self.last, value
+        if value == last:
+            return []
+        if value is None or last is None:
+            return self.events
+        low, high = (last, value) if last < value else (value, last)
+        values = self.values
+        return self.events[bisect.bisect_left(values, low):bisect.bisect_right(values, high)]
+
+
+class EventIndex:
+    """
+    Tracks the state of an interpreter's event rules and finds the ones to check.
+
+    Each event rule's condition was last seen true or false; an event fires
+    when its condition flips. Threshold conditions (a truth value's track
+    compared with a number, e.g. `x.fast > 0.8`) are indexed by truth
+    value and track in sorted threshold lists: when the track's value moves,
+    only the events whose thresholds lie between the old and the new value
+    can have flipped, and those are compared directly, without evaluating
+    their conditions. Other conditions are polled on every check.
+
+    Attributes:
+        states (List[Optional[bool]]): Each event's condition when last
+            checked; None if not sampled yet.
+        thresholds (Dict[int, Threshold]): The threshold conditions, by event.
+        polled (List[int]): The events whose conditions are evaluated on
+            every check.
+        checks (int): The number of conditions checked.
+        fired (int): The number of transitions.
+    """
+
+    def __init__(self):
+        """Initializes an empty EventIndex."""
+        self.states: List[Optional[bool]] = []
+        self.thresholds: Dict[int, Threshold] = {}
+        self.polled: List[int] = []
+        self.checks = 0
+        self.fired = 0
+        self._index: Dict[Tuple[str, str], _Thresholds] = {}
+        self._unsampled: Set[int] = set()
+        self._deferred: Set[int] = set()
+
+    def add(self, threshold: Optional[Threshold] = None) -> int:
+        """
+        Adds an event, unsampled.
+
+        Args:
+            threshold (Optional[Threshold]): The event's condition, if it is a
+                threshold condition; None means it is polled.
+
+        Returns:
+            int: The event's index.
+        """
+        event = len(self.states)
+        self.states.append(None)
+        self._unsampled.add(event)
+        if threshold is None:
+            self.polled.append(event)
+        else:
+            name, track, _op, value = threshold
+            self.thresholds[event] = threshold
+            self._index.setdefault((name, track), _Thresholds()).add(value, event)
+        return event
+
+    def candidates(self, truthvalues: Dict[str, Any]) -> List[int]:
+        """
+        Finds the events whose conditions may have flipped since the last call.
+
+        Args:
+            truthvalues (Dict[str, TruthValue]): The interpreter's truth values.
+
+        Returns:
+            List[int]: The events to check, in declaration order.
+        """
+        found: Set[int] = set(self.polled)
+        for (name, track), thresholds in self._index.items():
+            tv = truthvalues.get(name)
+            found.update(thresholds.crossed(tv.values.get(track) if tv is not None else None))
+        if self._unsampled:
+            found |= self._unsampled
+            self._unsampled = set()
+        if self._deferred:
+            found |= self._deferred
+            self._deferred = set()
+        return sorted(found)
+
+    def defer(self, event: int):
+        """
+        Keeps a candidate that was not checked for the next call to candidates.
+
+        Args:
+            event (int): The event.
+        """
+        self._deferred.add(event)
+
+    def check(self, event: int, truthvalues: Dict[str, Any]) -> Optional[bool]:
+        """
+        Checks a threshold condition against the current track value.
+
+        Args:
+            event (int): The event.
+            truthvalues (Dict[str, TruthValue]): The interpreter's truth values.
+
+        Returns:
+            Optional[bool]: The condition, or None if it is not a threshold
+                condition (or its track has no value) and must be evaluated.
+        """
+        threshold = self.thresholds.get(event)
+        if threshold is None:
+            return None
+        name, track, op, value = threshold
+        tv = truthvalues.get(name)
+        current = tv.values.get(track) if tv is not None else None
+        if current is None:
+            return None
+        return COMPARISONS[op](current, value)
+
+    def update(self, event: int, state: bool) -> bool:
+        """
+        Records an event's condition.
+
+        Args:
+            event (int): The event.
+            state (bool): The condition's current value.
+
+        Returns:
+            bool: Whether the event fires: the condition flipped since it was
+                last sampled.
+        """
+        self.checks += 1
+        previous = self.states[event]
+        self.states[event] = state
+        if previous is None or previous == state:
+            return False
+        self.fired += 1
+        return True
+
+    def save(self) -> Tuple[List[Optional[bool]], List[Optional[float]], Set[int], Set[int]]:
+        """
+        Copies the edge state: every event's last condition and every indexed track's last value.
+
+        Returns:
+            Tuple: The state, to be passed to `load`.
+        """
+        return (list(self.states), [thresholds.last for thresholds in self._index.values()],
+                set(self._unsampled), set(self._deferred))
+
+    def load(self, state: Tuple[List[Optional[bool]], List[Optional[float]], Set[int], Set[int]]):
+        """
+        Replaces the edge state with one copied by `save` from an index of the same events.
+
+        Args:
+            state (Tuple): The saved state.
+        """
+        states, lasts, unsampled, deferred = state
+        self.states = list(states)
+        for thresholds, last in zip(self._index.values(), lasts):
+            thresholds.last = last
+        self._unsampled = set(unsampled)
+        self._deferred = set(deferred)
+
+    def reset(self):
+        """Forgets every event's state, so the next check samples without firing."""
+        self.states = [None] * len(self.states)
+        self._unsampled = set(range(len(self.states)))
+        self._deferred = set()
+        for thresholds in self._index.values():
+            thresholds.last = None
@@ -0,0 +1,244 @@
+"""
+Meta-logic engine - incrementally maintained meta-level aggregates over truth values.
+"""
+
+import math
+from typing import Dict, List, Optional
+
+from .track import Track
+from .truthvalue import TruthValue
+
+# Meta-operators understood by the interpreter (spec chapter 10.5)
+META_OPERATORS = ('coh', 'blend', 'resolve', 'dom', 'meta')
+
+
+def coherence(n: int, total: float, squares: float) -> float:
+    """
+    Computes cross-track coherence from a truth value's track statistics.
+
+    Coherence is 1 minus twice the standard deviation of the track values:
+    1.0 when every track agrees, 0.0 when half the tracks are 0 and half 1.
+
+    Args:
+        n (int): The number of tracks.
+        total (float): The sum of the track values.
+        squares (float): The sum of the squared track values.
+
+    Returns:
+        float: The coherence, in [0, 1].
+    """
+    if n == 0:
+        return 1.0
+    mean = total / n
+    variance = squares / n - mean * mean
+    if variance <= 1e-12:
+        return 1.0
+    return max(0.0, 1.0 - 2.0 * math.sqrt(variance))
+
+
+class MetaEngine:
+    """
+    Maintains the meta-level aggregates of an interpreter's truth values.
+
+    Every truth value bound to a name is observed: each change to one of its
+    tracks updates, in constant time, the truth value's sum and sum of squares
+    (from which its coherence and intensity follow), the mean coherence over
+    all truth values, and each track's sum of values and of decisiveness
+    (distance from 0.5, scaled to [0, 1]) from which track dominance follows.
+    Meta-operators therefore read aggregates instead of scanning every truth
+    value, and a meta-beat costs in proportion to what changed since the last.
+
+    Writes that bypass `TruthValue.set` (restoring a checkpoint, swapping in a
+    population instance, loading values computed in another process) must be
+    followed by `refresh` for the truth values concerned, or `resync`.
+
+    Attributes:
+        tracks (Dict[str, Track]): The interpreter's tracks.
+        truthvalues (Dict[str, TruthValue]): The interpreter's truth values.
+        updates (int): The number of track changes applied incrementally.
+    """
+
+    def __init__(self, tracks: Dict[str, Track], truthvalues: Dict[str, TruthValue]):
+        """
+        Initializes a MetaEngine and observes the given truth values.
+
+        Args:
+            tracks (Dict[str, Track]): The interpreter's tracks.
+            truthvalues (Dict[str, TruthValue]): The interpreter's truth
+                values, observed under their current names.
+        """
+        self.tracks = tracks
+        self.truthvalues = truthvalues
+        self.updates = 0
+        self._observed: Dict[int, TruthValue] = {}
+        self.resync()
+
+    def resync(self):
+        """Rebuilds every aggregate from the interpreter's current truth values."""
+        for tv in self._observed.values():
+            tv.observer = None
+        self._observed = {}
+        self._refs: Dict[int, int] = {}
+        self._names: Dict[str, int] = {}
+        # Per truth value: [n, sum, sum of squares, coherence], and the track
+        # values those were computed from
+        self._stats: Dict[int, List[float]] = {}
+        self._seen: Dict[int, Dict[str, float]] = {}
+        self._coherence_total = 0.0
+        self._track_totals: Dict[str, float] = {}
+        self._track_counts: Dict[str, int] = {}
+        self._decisiveness: Dict[str, float] = {}
+        self._decisiveness_total = 0.0
+        for name, tv in self.truthvalues.items():
+            self.bind(name, tv)
+
+    def bind(self, name: str, tv: TruthValue):
+        """
+        Records that a name is bound to a truth value.
+
+        Args:
+            name (str): The truth value name.
+            tv (TruthValue): The object now bound to it.
+        """
+        key = id(tv)
+        previous = self._names.get(name)
+        if previous == key:
+            return
+        if previous is not None:
+            self._release(previous)
+        self._names[name] = key
+        if key in self._refs:
+            self._refs[key] += 1
+            return
+        self._refs[key] = 1
+        self._observed[key] = tv
+        tv.observer = self._changed
+        self._add(tv)
+
+    def _release(self, key: int):
+        self._refs[key] -= 1
+        if self._refs[key] == 0:
+            del self._refs[key]
+            tv = self._observed.pop(key)
+            tv.observer = None
+            self._remove(tv)
+
+    def _add(self, tv: TruthValue):
+        values = tv.values
+        n = len(values)
+        total = sum(values.values())
+        squares = sum(v * v for v in values.values())
+        coh = coherence(n, total, squares)
+        self._stats[id(tv)] = [n, total, squares, coh]
+        self._seen[id(tv)] = dict(values)
+        self._coherence_total += coh
+        for track_name, value in values.items():
+            self._track_totals[track_name] = self._track_totals.get(track_name, 0.0) + value
+            self._track_counts[track_name] = self._track_counts.get(track_name, 0) + 1
+            decisive = abs(value - 0.5) * 2.0
+            self._decisiveness[track_name] = self._decisiveness.get(track_name, 0.0) + decisive
+            self._decisiveness_total += decisive
+
+    def _remove(self, tv: TruthValue):
+        stats = self._stats.pop(id(tv))
+        self._coherence_total -= stats[3]
+        for track_name, value in self._seen.pop(id(tv)).items():
+            self._track_totals[track_name] -= value
+            self._track_counts[track_name] -= 1
+            decisive = abs(value - 0.5) * 2.0
+            self._decisiveness[track_name] -= decisive
+            self._decisiveness_total -= decisive
+
+    def refresh(self, tv: TruthValue):
+        """
+        Recomputes one truth value's contribution after its values were
+        written directly.
+
+        Args:
+            tv (TruthValue): The truth value.
+        """
+        if id(tv) in self._stats:
+            self._remove(tv)
+            self._add(tv)
+
+    def _changed(self, tv: TruthValue, track_name: str, old: float, new: float):
+        """Applies one track change to the aggregates."""
+        stats = self._stats[id(tv)]
+        stats[1] += new - old
+        stats[2] += new * new - old * old
+        coh = coherence(stats[0], stats[1], stats[2])
+        self._coherence_total += coh - stats[3]
+        stats[3] = coh
+        self._seen[id(tv)][track_name] = new
+        self._track_totals[track_name] += new - old
+        decisive = (abs(new - 0.5) - abs(old - 0.5)) * 2.0
+        self._decisiveness[track_name] += decisive
+        self._decisiveness_total += decisive
+        self.updates += 1
+
+    def coherence(self, tv: Optional[TruthValue] = None) -> float:
+        """
+        Gets the cross-track coherence of a truth value, or of the model.
+
+        Args:
+            tv (Optional[TruthValue]): The truth value; None gives the mean
+                coherence over every observed truth value.
+
+        Returns:
+            float: The coherence, in [0, 1].
+        """
+        if tv is None:
+            if not self._stats:
+                return 1.0
+            return min(1.0, max(0.0, self._coherence_total / len(self._stats)))
+        stats = self._stats.get(id(tv))
+        if stats is not None:
+            return stats[3]
+        values = tv.values.values()
+        return coherence(len(tv.values), sum(values), sum(v * v for v in values))
+
+    def intensity(self, tv: TruthValue) -> float:
+        """
+        Gets the meta-value of a truth value: its mean over all tracks.
+
+        Args:
+            tv (TruthValue): The truth value.
+
+        Returns:
+            float: The intensity, in [0, 1].
+        """
+        stats = self._stats.get(id(tv))
+        if stats is not None:
+            return stats[1] / stats[0] if stats[0] else 0.0
+        return float(sum(tv.values.values()) / len(tv.values)) if tv.values else 0.0
+
+    def track_mean(self, track_name: str) -> float:
+        """
+        Gets the mean value of a track over every observed truth value.
+
+        Args:
+            track_name (str): The track.
+
+        Returns:
+            float: The mean value, or 0.0 if no truth value has the track.
+        """
+        count = self._track_counts.get(track_name, 0)
+        return self._track_totals[track_name] / count if count else 0.0
+
+    def dominance(self, track_name: str) -> float:
+        """
+        Gets the dominance of a track: its share of the model's decisiveness.
+
+        A track is decisive on a truth value in proportion to its distance
+        from the undecided value 0.5; dominance scores of all tracks sum to 1.
+
+        Args:
+            track_name (str): The track.
+
+        Returns:
+            float: The dominance, in [0, 1].
+        """
+        total = self._decisiveness_total
+        if total <= 1e-12:
+            return 0.0
+        return min(1.0, max(0.0, self._decisiveness.get(track_name, 0.0) / total))
@@ -0,0 +1,272 @@
+"""
+Native standard library - the HSL builtins (tv::, fuzzy::, para::, rhythm::) implemented in Python.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .track import LogicType
+from .truthvalue import TruthValue
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Truth vectors narrower than this are cheaper to process track by track
+# than to convert to and from NumPy arrays
+NUMPY_MIN_TRACKS = 64
+
+
+@dataclass(frozen=True)
+class Builtin:
+    """
+    A native standard library function.
+
+    Attributes:
+        name (str): The namespaced name, e.g. "tv::blend".
+        function (Callable[..., Any]): The implementation, called with the
+            interpreter and the argument values.
+        min_args (int): The minimum number of arguments.
+        max_args (int): The maximum number of arguments.
+        symbols (Tuple[int, ...]): Positions of arguments passed as bare
+            names (e.g. a mode) rather than evaluated.
+        trackwise (bool): Whether each track of the result depends only on
+            the same track of the truth value arguments.
+        vectors (Tuple[int, ...]): Positions of arguments applied track by
+            track; the result is a truth value if any of them is one, and a
+            number otherwise. Other arguments are read as numbers.
+    """
+    name: str
+    function: Callable[..., Any]
+    min_args: int
+    max_args: int
+    symbols: Tuple[int, ...] = ()
+    trackwise: bool = False
+    vectors: Tuple[int, ...] = ()
+
+
+BUILTINS: Dict[str, Builtin] = {}
+
+# Vectorized per-track kernels, used by `map_tracks` when NumPy is available
+KERNELS: Dict[str, Callable[..., Any]] = {}
+
+
+def builtin(name: str, min_args: int, max_args: Optional[int] = None, symbols: Sequence[int] = (),
+            trackwise: bool = False, vectors: Sequence[int] = ()):
+    """
+    Registers a native function under a namespaced name.
+
+    Args:
+        name (str): The namespaced name.
+        min_args (int): The minimum number of arguments.
+        max_args (Optional[int]): The maximum number of arguments; None
+            means exactly `min_args`.
+        symbols (Sequence[int]): Positions of arguments passed as names.
+        trackwise (bool): Whether the function works track by track.
+        vectors (Sequence[int]): Positions of arguments applied track by track.
+
+    Returns:
+        Callable: A decorator registering the function.
+    """
+    def register(function: Callable[..., Any]) -> Callable[..., Any]:
+        BUILTINS[name] = Builtin(name, function, min_args,
+                                 min_args if max_args is None else max_args, tuple(symbols), trackwise,
+                                 tuple(vectors))
+        return function
+    return register
+
+
+def _clamp_array(tracks: Dict[str, Any], names: List[str], values: Any) -> Any:
+    classical = numpy.array([tracks[name].logic == LogicType.CLASSICAL for name in names])
+    return numpy.where(classical, (values >= 0.5).astype(float), numpy.clip(values, 0.0, 1.0))
+
+
+def map_tracks(interp: Any, name: str, scalar: Callable[..., float], *operands: Any) -> Any:
+    """
+    Applies a per-track function to truth vectors and scalars in one call.
+
+    Scalars are broadcast to every track. If no operand is a truth value the
+    function is applied once and its scalar result returned. Results are
+    clamped by each track's logic. When the call is the value of a beat
+    assignment only the firing tracks are computed, as for logical operators.
+    With NumPy installed, vectors of at least NUMPY_MIN_TRACKS tracks use the
+    operation's vectorized kernel over every track.
+
+    Args:
+        interp (Interpreter): The interpreter, for its tracks.
+        name (str): The operation's name in KERNELS.
+        scalar (Callable[..., float]): The function of one track's values.
+        *operands (Any): Truth values or numbers.
+
+    Returns:
+        Any: A new TruthValue, or a number for all-scalar operands.
+    """
+    if not any(isinstance(op, TruthValue) for op in operands):
+        return scalar(*(float(op) for op in operands))
+    tracks = interp.tracks
+    # Inside a beat assignment, only the firing tracks (see Interpreter._track_result)
+    result, names = interp._track_result()
+    kernel = KERNELS.get(name)
+    if numpy is not None and kernel is not None and len(tracks) >= NUMPY_MIN_TRACKS:
+        names = list(tracks)
+        arrays = [numpy.fromiter((op.get(n) for n in names), float, len(names))
+                  if isinstance(op, TruthValue) else float(op) for op in operands]
+        result.values = dict(zip(names, _clamp_array(tracks, names, kernel(*arrays)).tolist()))
+        return result
+    # The result is new and unobserved, so clamp into its values directly
+    columns = [op.values if isinstance(op, TruthValue) else None for op in operands]
+    scalars = [float(op) if column is None else 0.0 for op, column in zip(operands, columns)]
+    values = result.values
+    clamp = result.clamp
+    for track_name in names:
+        args = [s if column is None else column.get(track_name, 0.0) for s, column in zip(scalars, columns)]
+        values[track_name] = clamp(track_name, scalar(*args))
+    return result
+
+
+def _vector(interp: Any, value: Any) -> TruthValue:
+    if isinstance(value, TruthValue):
+        return value
+    return TruthValue(interp.tracks, float(value))
+
+
+# tv:: truthvector utilities (spec 20.3)
+
+def _blend(a: float, b: float, w: float) -> float:
+    return a * (1.0 - w) + b * w
+
+
+@builtin('tv::blend', 3, trackwise=True, vectors=(0, 1))
+def tv_blend(interp: Any, a: Any, b: Any, w: Any) -> Any:
+    """Blends two truth vectors track by track: `a * (1 - w) + b * w`."""
+    return map_tracks(interp, 'blend', _blend, a, b, float(w))
+
+
+def _drift(a: float, rate: float) -> float:
+    return a * (1.0 - rate)
+
+
+@builtin('tv::drift', 2, trackwise=True, vectors=(0,))
+def tv_drift(interp: Any, a: Any, rate: Any) -> Any:
+    """Decays every track toward 0 by `rate`: `a * (1 - rate)`."""
+    return map_tracks(interp, 'drift', _drift, a, float(rate))
+
+
+# fuzzy:: fuzzy logic helpers (spec 20.4)
+
+@builtin('fuzzy::t_norm', 2, trackwise=True, vectors=(0, 1))
+def fuzzy_t_norm(interp: Any, a: Any, b: Any) -> Any:
+    """The Gödel t-norm, `min(a, b)` on every track."""
+    return map_tracks(interp, 't_norm', min, a, b)
+
+
+@builtin('fuzzy::s_norm', 2, trackwise=True, vectors=(0, 1))
+def fuzzy_s_norm(interp: Any, a: Any, b: Any) -> Any:
+    """The Gödel s-norm, `max(a, b)` on every track."""
+    return map_tracks(interp, 's_norm', max, a, b)
+
+
+def _smooth_step(x: float, k: float) -> float:
+    if k <= 0.0:
+        return 1.0 if x >= 0.5 else 0.0
+    t = min(1.0, max(0.0, (x - 0.5 + k) / (2.0 * k)))
+    return t * t * (3.0 - 2.0 * t)
+
+
+@builtin('fuzzy::smooth_step', 1, 2, trackwise=True, vectors=(0,))
+def fuzzy_smooth_step(interp: Any, a: Any, k: Any = 0.5) -> Any:
+    """
+    Smooths every track with a Hermite smoothstep centred on 0.5.
+
+    The transition runs from `0.5 - k` to `0.5 + k`; k = 0.5 is the classic
+    smoothstep over [0, 1] and k = 0 a hard threshold.
+    """
+    return map_tracks(interp, 'smooth_step', _smooth_step, a, float(k))
+
+
+def _soft_threshold(x: float, t: float, width: float) -> float:
+    if width <= 0.0:
+        return 1.0 if x >= t else 0.0
+    return min(1.0, max(0.0, (x - t) / width + 0.5))
+
+
+@builtin('fuzzy::soft_threshold', 2, 3, trackwise=True, vectors=(0,))
+def fuzzy_soft_threshold(interp: Any, a: Any, t: Any, width: Any = 0.1) -> Any:
+    """Graded conditional: a linear ramp of the given width centred on threshold t."""
+    return map_tracks(interp, 'soft_threshold', _soft_threshold, a, float(t), float(width))
+
+
+# para:: paraconsistent utilities (spec 20.5)
+
+RESOLVE_MODES = ('classical', 'preserve', 'blend')
+
+
+@builtin('para::resolve', 1, 2, symbols=(1,), vectors=(0,))
+def para_resolve(interp: Any, a: Any, mode: str = 'classical') -> Any:
+    """
+    Resolves contradictions between tracks.
+
+    Modes: `classical` snaps every track to 0 or 1, `preserve` keeps the
+    contradiction (returns a copy), `blend` sets every track to the mean of
+    all tracks.
+    """
+    if mode not in RESOLVE_MODES:
+        raise ValueError(f"Unknown para::resolve mode: {mode} (expected one of {', '.join(RESOLVE_MODES)})")
+    if not isinstance(a, TruthValue):
+        a = float(a)
+        return a if mode != 'classical' else (1.0 if a >= 0.5 else 0.0)
+    if mode == 'classical':
+        return map_tracks(interp, 'snap', lambda x: 1.0 if x >= 0.5 else 0.0, a)
+    if mode == 'preserve':
+        return TruthValue(interp.tracks, a.values)
+    values = a.values
+    return TruthValue(interp.tracks, sum(values.values()) / len(values) if values else 0.0)
+
+
+@builtin('para::conflict', 2)
+def para_conflict(interp: Any, a: Any, b: Any) -> float:
+    """The tension between two truth vectors: their mean absolute difference over the tracks."""
+    a, b = _vector(interp, a), _vector(interp, b)
+    names = interp.tracks
+    return sum(abs(a.get(n) - b.get(n)) for n in names) / len(names) if names else 0.0
+
+
+# rhythm:: rhythmic primitives (spec 20.6)
+
+@builtin('rhythm::beat', 0)
+def rhythm_beat(interp: Any) -> float:
+    """The current global beat."""
+    return float(interp.global_beat)
+
+
+@builtin('rhythm::resonance', 2, 3)
+def rhythm_resonance(interp: Any, a: Any, b: Any, c: Any = None) -> float:
+    """
+    Alignment of two or three truth vectors across the tracks firing now.
+
+    1.0 when they agree on every firing track, 0.0 when they are opposite;
+    the mean over every pair for three vectors.
+    """
+    vectors = [_vector(interp, v) for v in (a, b, c) if v is not None]
+    beat = interp.global_beat
+    names = [n for n, track in interp.tracks.items() if track.is_active(beat)] or list(interp.tracks)
+    pairs = [(x, y) for i, x in enumerate(vectors) for y in vectors[i + 1:]]
+    total = 0.0
+    for x, y in pairs:
+        total += 1.0 - sum(abs(x.get(n) - y.get(n)) for n in names) / len(names)
+    return total / len(pairs)
+
+
+if numpy is not None:
+    KERNELS.update({
+        'blend': lambda a, b, w: a * (1.0 - w) + b * w,
+        'drift': lambda a, rate: a * (1.0 - rate),
+        't_norm': numpy.minimum,
+        's_norm': numpy.maximum,
+        'smooth_step': lambda x, k: (lambda t: t * t * (3.0 - 2.0 * t))(
+            numpy.clip((x - 0.5 + k) / (2.0 * k), 0.0, 1.0)) if k > 0.0 else (x >= 0.5).astype(float),
+        'soft_threshold': lambda x, t, width: (numpy.clip((x - t) / width + 0.5, 0.0, 1.0)
+                                               if width > 0.0 else (x >= t).astype(float)),
+        'snap': lambda x: (x >= 0.5).astype(float),
+    })
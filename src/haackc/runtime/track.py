@@ -29,9 +29,12 @@ class Track:
         phase (int): The phase of the track.
         logic (LogicType): The logic system used by the track.
         current_beat (int): The internal beat counter for the track.
+        priority (int): The scheduling priority of the track; under deadline
+            pressure, work on lower-priority tracks is deferred first.
     """
     
-    def __init__(self, name: str, period: int, phase: int = 0, logic: LogicType = LogicType.CLASSICAL):
+    def __init__(self, name: str, period: int, phase: int = 0, logic: LogicType = LogicType.CLASSICAL,
+                 priority: int = 0):
         """
         Initializes a Track.
 
@@ -40,11 +43,13 @@ class Track:
             period (int): The period of the track.
             phase (int): The phase of the track.
             logic (LogicType): The logic system for the track.
+            priority (int): The scheduling priority of the track.
         """
         self.name = name
         self.period = period
         self.phase = phase
         self.logic = logic
+        self.priority = priority
         self.current_beat = 0
     
     def is_active(self, global_beat: int) -> bool:
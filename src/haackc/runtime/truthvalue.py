@@ -2,7 +2,7 @@
 TruthValue (BoolRhythm) implementation - multi-track truth values.
 """
 
-from typing import Dict, Optional, Union
+from typing import Callable, Dict, Optional, Set, Union
 from .track import Track, LogicType
 
 
@@ -18,8 +18,20 @@ class TruthValue:
             TruthValue is aware of.
         values (Dict[str, float]): A dictionary mapping track names to their
             current truth values.
+        allocations (int): Class-wide count of TruthValues created, read by
+            the runtime metrics.
+        observer (Optional[Callable[[TruthValue, str, float, float], None]]):
+            Called with the truth value, track, old and new value whenever
+            `set` changes a track; used by the meta-logic engine.
+        journal (Optional[Set[TruthValue]]): A set the truth value adds
+            itself to whenever `set` changes a track; used by the reactive
+            executor.
     """
     
+    allocations = 0
+    observer: Optional[Callable[['TruthValue', str, float, float], None]] = None
+    journal: Optional[Set['TruthValue']] = None
+    
     def __init__(self, tracks: Dict[str, Track], initial_value: Union[float, Dict[str, float]] = 0.0):
         """
         Initializes a TruthValue.
@@ -31,6 +43,7 @@ class TruthValue:
                 value to be applied to all tracks, or a dictionary of values
                 for specific tracks.
         """
+        TruthValue.allocations += 1
         self.tracks = tracks
         self.values: Dict[str, float] = {}
         
@@ -66,12 +79,31 @@ class TruthValue:
             value (float): The new truth value for the track.
         """
         if track_name in self.values:
-            # Clamp to [0, 1] for fuzzy/paraconsistent, {0, 1} for classical
-            track = self.tracks.get(track_name)
-            if track and track.logic == LogicType.CLASSICAL:
-                self.values[track_name] = 1.0 if value >= 0.5 else 0.0
-            else:
-                self.values[track_name] = max(0.0, min(1.0, float(value)))
+            value = self.clamp(track_name, value)
+            old = self.values[track_name]
+            if old != value:
+                if self.observer is not None:
+                    self.observer(self, track_name, old, value)
+                if self.journal is not None:
+                    self.journal.add(self)
+                self.values[track_name] = value
+    
+    def clamp(self, track_name: str, value: float) -> float:
+        """
+        Clamps a value to the range of a track's logic system.
+
+        Args:
+            track_name (str): The name of the track.
+            value (float): The value to clamp.
+
+        Returns:
+            float: The value in [0, 1] for fuzzy/paraconsistent tracks, or
+                in {0, 1} for classical tracks.
+        """
+        track = self.tracks.get(track_name)
+        if track and track.logic == LogicType.CLASSICAL:
+            return 1.0 if value >= 0.5 else 0.0
+        return max(0.0, min(1.0, float(value)))
     
     def set_all(self, value: float):
         """
@@ -0,0 +1,444 @@
+"""
+HaackLang server - hosts compiled programs and runtime sessions over a local socket.
+
+Requests and responses are JSON objects, each sent as a frame: a 4-byte
+big-endian length followed by that many bytes of UTF-8 JSON.
+
+    {"id": 1, "op": "load", "session": "agent", "source": "..."}    (or "path")
+    {"id": 2, "op": "set", "session": "agent", "values": {"threat.main": 0.9}}
+    {"id": 3, "op": "step", "session": "agent", "n": 10}
+    {"id": 4, "op": "get", "session": "agent", "tv": "fear", "track": "main"}
+    {"id": 5, "op": "snapshot", "session": "agent"}
+    {"id": 6, "op": "close", "session": "agent"}
+    {"id": 7, "op": "stats"}
+
+Every response echoes the id and carries `ok`, then either `result` or
+`error`, and the server-side handling time in `latency_us`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .api import Runtime
+from .interpreter.metrics import Histogram
+from .program import ProgramCache
+
+
+FRAME = struct.Struct('>I')
+MAX_FRAME = 64 << 20
+
+OPERATIONS = ('load', 'step', 'set', 'get', 'snapshot', 'close', 'stats')
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """Encodes a message as a length-prefixed JSON frame."""
+    payload = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    return FRAME.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """
+    Reads one frame.
+
+    Returns:
+        Optional[Dict[str, Any]]: The message, or None at end of stream.
+
+    Raises:
+        ValueError: If the frame is oversized or not a JSON object.
+    """
+    try:
+        header = await reader.readexactly(FRAME.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (size,) = FRAME.unpack(header)
+    if size > MAX_FRAME:
+        raise ValueError(f"Frame of {size} bytes exceeds the {MAX_FRAME} byte limit")
+    message = json.loads(await reader.readexactly(size))
+    if not isinstance(message, dict):
+        raise ValueError("Request is not a JSON object")
+    return message
+
+
+class Session:
+    """
+    A named runtime hosted by the server.
+
+    Attributes:
+        runtime (Runtime): The running program.
+        cached (bool): Whether its program came from the cache.
+        lock (asyncio.Lock): Serializes requests on this session.
+    """
+
+    def __init__(self, runtime: Runtime, cached: bool):
+        self.runtime = runtime
+        self.cached = cached
+        self.lock = asyncio.Lock()
+
+
+class HaackServer:
+    """
+    Serves runtime sessions to local clients.
+
+    Programs are compiled once per distinct source and kept in an LRU cache,
+    so loading a known program into a new session only builds its state.
+    Connections are served concurrently; requests on different sessions run
+    in parallel on a thread pool, while requests on one session are applied
+    in order.
+
+    Attributes:
+        cache (ProgramCache): The compiled programs.
+        sessions (Dict[str, Session]): The hosted sessions by name.
+        latency (Dict[str, Histogram]): Request handling time per operation.
+        address (Any): The bound address once started.
+    """
+
+    def __init__(self, cache_size: int = 64, workers: Optional[int] = None):
+        """
+        Initializes a HaackServer.
+
+        Args:
+            cache_size (int): The number of compiled programs kept.
+            workers (Optional[int]): Threads executing session requests.
+        """
+        self.cache = ProgramCache(cache_size)
+        self.sessions: Dict[str, Session] = {}
+        self.latency: Dict[str, Histogram] = {}
+        self.address: Any = None
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix='haackc-session')
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._unix_path: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        # Operations on an existing session, run on the thread pool
+        self._session_ops: Dict[str, Callable[[Runtime, Dict[str, Any]], Any]] = {
+            'step': self._op_step,
+            'set': self._op_set,
+            'get': self._op_get,
+            'snapshot': self._op_snapshot,
+        }
+
+    async def start(self, unix_path: Optional[str] = None, host: str = '127.0.0.1', port: int = 0):
+        """
+        Starts listening.
+
+        Args:
+            unix_path (Optional[str]): Listen on this Unix socket instead of TCP.
+            host (str): The TCP host.
+            port (int): The TCP port; 0 picks a free one.
+
+        Raises:
+            ValueError: If something other than a socket exists at unix_path.
+        """
+        if unix_path:
+            if os.path.exists(unix_path):
+                # Only a socket left behind by an earlier server is replaced
+                if not stat.S_ISSOCK(os.stat(unix_path).st_mode):
+                    raise ValueError(f"Not a Unix socket: {unix_path}")
+                os.unlink(unix_path)
+            self._server = await asyncio.start_unix_server(self._serve_connection, unix_path)
+            self._unix_path = unix_path
+            self.address = unix_path
+        else:
+            self._server = await asyncio.start_server(self._serve_connection, host, port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        """Serves until cancelled."""
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            path = self._unix_path
+            if path and os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+                os.unlink(path)
+            self._executor.shutdown(wait=False)
+
+    def serve_in_background(self, unix_path: Optional[str] = None, host: str = '127.0.0.1',
+                            port: int = 0) -> Any:
+        """
+        Starts the server on a background thread.
+
+        Args:
+            unix_path (Optional[str]): Listen on this Unix socket instead of TCP.
+            host (str): The TCP host.
+            port (int): The TCP port; 0 picks a free one.
+
+        Returns:
+            Any: The bound address.
+        """
+        started = threading.Event()
+        errors: List[BaseException] = []
+
+        async def run():
+            try:
+                await self.start(unix_path, host, port)
+            except (OSError, ValueError) as e:
+                errors.append(e)
+                return
+            finally:
+                started.set()
+            await self.serve_forever()
+
+        def target():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(run())
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=target, name='haackc-server', daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+        return self.address
+
+    def shutdown(self):
+        """Stops a server started with `serve_in_background`."""
+        if self._thread is None:
+            return
+
+        def cancel():
+            for task in asyncio.all_tasks(self._loop):
+                task.cancel()
+
+        self._loop.call_soon_threadsafe(cancel)
+        self._thread.join()
+        self._thread = None
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await read_frame(reader)
+                except ValueError as e:
+                    writer.write(encode_frame({'ok': False, 'error': str(e)}))
+                    break
+                if request is None:
+                    break
+                writer.write(encode_frame(await self.handle(request)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handles one request.
+
+        Args:
+            request (Dict[str, Any]): The decoded request.
+
+        Returns:
+            Dict[str, Any]: The response.
+        """
+        start = time.perf_counter()
+        op = request.get('op')
+        response: Dict[str, Any] = {'id': request.get('id')}
+        try:
+            if op == 'stats':
+                result = self._stats()
+            elif op in OPERATIONS:
+                result = await self._run_op(op, request)
+            else:
+                raise ValueError(f"Unknown operation: {op}")
+            response['ok'] = True
+            response['result'] = result
+        except Exception as e:
+            # Any failure is reported to the client rather than dropping the connection
+            response['ok'] = False
+            response['error'] = e.args[0] if isinstance(e, KeyError) and e.args else str(e)
+        elapsed = time.perf_counter() - start
+        if op in OPERATIONS:
+            self.latency.setdefault(op, Histogram()).observe(elapsed)
+        response['latency_us'] = round(elapsed * 1e6, 1)
+        return response
+
+    async def _run_op(self, op: str, request: Dict[str, Any]) -> Any:
+        """Runs an operation on the thread pool, in order with the session's other requests."""
+        name = request.get('session')
+        if not isinstance(name, str):
+            raise ValueError("Request needs a session name")
+        loop = asyncio.get_running_loop()
+        if op == 'load':
+            session = await loop.run_in_executor(self._executor, self._load, request)
+            previous = self.sessions.get(name)
+            if previous is not None:
+                async with previous.lock:
+                    self.sessions[name] = session
+            else:
+                self.sessions[name] = session
+            return {'session': name, 'digest': session.runtime.program.digest,
+                    'cached': session.cached, 'beat': session.runtime.beat,
+                    'output': session.runtime.read_output()}
+        session = self.sessions.get(name)
+        if session is None:
+            raise KeyError(f"Unknown session: {name}")
+        async with session.lock:
+            if op == 'close':
+                del self.sessions[name]
+                return {'session': name}
+            return await loop.run_in_executor(self._executor, self._session_ops[op], session.runtime, request)
+
+    def _load(self, request: Dict[str, Any]) -> Session:
+        source = request.get('source')
+        path = request.get('path')
+        if source is None:
+            if path is None:
+                raise ValueError("load needs a source or a path")
+            with open(path) as f:
+                source = f.read()
+        program, cached = self.cache.get(source, path)
+        return Session(Runtime(program), cached)
+
+    def _op_step(self, runtime: Runtime, request: Dict[str, Any]) -> Dict[str, Any]:
+        n = int(request.get('n', 1))
+        if n < 0:
+            raise ValueError("Cannot step a negative number of beats")
+        runtime.step(n)
+        return {'beat': runtime.beat, 'output': runtime.read_output()}
+
+    def _op_set(self, runtime: Runtime, request: Dict[str, Any]) -> Dict[str, Any]:
+        values = request.get('values')
+        if not isinstance(values, dict):
+            raise ValueError("set needs a values object")
+        runtime.set_many(values)
+        return {'updated': len(values)}
+
+    def _op_get(self, runtime: Runtime, request: Dict[str, Any]) -> Any:
+        return runtime.get(request['tv'], request.get('track'))
+
+    def _op_snapshot(self, runtime: Runtime, request: Dict[str, Any]) -> Dict[str, Any]:
+        return runtime.snapshot()
+
+    def _stats(self) -> Dict[str, Any]:
+        return {
+            'sessions': len(self.sessions),
+            'cache': {'programs': len(self.cache), 'hits': self.cache.hits, 'misses': self.cache.misses},
+            'latency_us': {
+                op: {'count': h.count, 'p50': round(h.quantile(0.5) * 1e6, 1),
+                     'p99': round(h.quantile(0.99) * 1e6, 1), 'max': round(h.max * 1e6, 1)}
+                for op, h in self.latency.items()
+            },
+        }
+
+
+class Client:
+    """
+    A blocking client for a HaackServer.
+
+    Example:
+        with Client(unix_path='/tmp/haackc.sock') as client:
+            client.call('load', session='a', path='model.haack')
+            client.call('step', session='a', n=100)
+    """
+
+    def __init__(self, unix_path: Optional[str] = None, host: str = '127.0.0.1', port: Optional[int] = None):
+        """
+        Connects to a server.
+
+        Args:
+            unix_path (Optional[str]): The server's Unix socket.
+            host (str): The server's TCP host.
+            port (Optional[int]): The server's TCP port.
+        """
+        if unix_path:
+            self.sock = socket.socket(socket.AF_UNIX)
+            self.sock.connect(unix_path)
+        else:
+            self.sock = socket.create_connection((host, port))
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._next_id = 0
+        self.last_latency_us = 0.0
+
+    def _read_exactly(self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Server closed the connection")
+            data.extend(chunk)
+        return bytes(data)
+
+    def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Sends a raw request and returns the raw response."""
+        self.sock.sendall(encode_frame(message))
+        (size,) = FRAME.unpack(self._read_exactly(FRAME.size))
+        return json.loads(self._read_exactly(size))
+
+    def call(self, op: str, **params: Any) -> Any:
+        """
+        Calls an operation.
+
+        Args:
+            op (str): The operation.
+            **params: The request fields.
+
+        Returns:
+            Any: The result.
+
+        Raises:
+            RuntimeError: If the server reports an error.
+        """
+        self._next_id += 1
+        response = self.request({'id': self._next_id, 'op': op, **params})
+        self.last_latency_us = response.get('latency_us', 0.0)
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error', 'Request failed'))
+        return response.get('result')
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self) -> 'Client':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command-line interface for `haackc serve`.
+
+    Args:
+        argv (Optional[List[str]]): The arguments after `serve`; defaults to
+            the process arguments.
+    """
+    parser = argparse.ArgumentParser(prog='haackc serve',
+                                     description='Host compiled HaackLang programs over a local socket')
+    parser.add_argument('--unix', metavar='PATH', help='Listen on a Unix domain socket')
+    parser.add_argument('--host', default='127.0.0.1', help='TCP host (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=7466, help='TCP port (default: 7466)')
+    parser.add_argument('--cache-size', type=int, default=64, metavar='N',
+                        help='Compiled programs kept in the LRU cache (default: 64)')
+    parser.add_argument('--workers', type=int, metavar='N', help='Threads executing session requests')
+    args = parser.parse_args(argv)
+
+    server = HaackServer(args.cache_size, args.workers)
+
+    async def run():
+        await server.start(args.unix, args.host, args.port)
+        print(f"haackc serving on {server.address}", file=sys.stderr)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,7 @@
+"""Execution trace module for HaackLang."""
+
+from .writer import TraceWriter
+from .reader import TraceReader
+from .query import TraceQuery
+
+__all__ = ['TraceWriter', 'TraceReader', 'TraceQuery']
@@ -0,0 +1,83 @@
+"""
+Trace CLI - `haackc trace` subcommands for inspecting and querying traces.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from .reader import TraceReader
+from .query import TraceQuery, COMPARISONS
+
+
+def _print_info(reader: TraceReader):
+    """Prints the layout of a trace."""
+    beats = sum(n_beats for _first_beat, n_beats, _offset in reader.chunks)
+    print(f"Truth values: {', '.join(reader.tv_names)}")
+    print(f"Tracks: {', '.join(reader.track_names)}")
+    print(f"Beats: {beats} in {len(reader.chunks)} chunks of {reader.chunk_beats}")
+    print(f"Indexed: {'yes' if reader.summaries is not None else 'no'}")
+
+
+def _run_query(reader: TraceReader, args: argparse.Namespace):
+    """Runs a range or threshold query and prints the matching beats."""
+    query = TraceQuery(reader)
+    tv_name, _, track_name = args.target.partition('.')
+
+    if args.where:
+        op, threshold = args.where
+        if not track_name:
+            raise ValueError("Threshold queries need a track-qualified target, e.g. fear.slow")
+        matches = query.where(tv_name, track_name, op, float(threshold),
+                              args.start, args.end, first=args.first)
+        for beat, value in matches:
+            print(f"{beat} {tv_name}.{track_name}={value:g}")
+        if args.first and not matches:
+            print("No match", file=sys.stderr)
+    else:
+        beats, values = query.range(tv_name, args.start, args.end)
+        track_names = [track_name] if track_name else reader.track_names
+        for i, beat in enumerate(beats):
+            fields = ' '.join(f"{tv_name}.{name}={values[name][i]:g}" for name in track_names)
+            print(f"{beat} {fields}")
+
+    if args.verbose:
+        print(f"Decoded {query.chunks_read} column blocks "
+              f"({len(reader.chunks)} chunks in trace)", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command-line interface for `haackc trace`.
+
+    Args:
+        argv (Optional[List[str]]): The arguments after `trace`; defaults to
+            the process arguments.
+    """
+    parser = argparse.ArgumentParser(prog='haackc trace', description='Inspect HaackLang execution traces')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    info = subparsers.add_parser('info', help='Show the layout of a trace')
+    info.add_argument('file', help='Trace file')
+
+    query = subparsers.add_parser('query', help='Query values by beat range or threshold')
+    query.add_argument('file', help='Trace file')
+    query.add_argument('target', help='Truth value, optionally track-qualified (e.g. fear.slow)')
+    query.add_argument('--from', dest='start', type=int, metavar='BEAT', help='First beat (inclusive)')
+    query.add_argument('--to', dest='end', type=int, metavar='BEAT', help='Last beat (exclusive)')
+    query.add_argument('--where', nargs=2, metavar=('OP', 'VALUE'),
+                       help=f"Threshold condition, OP one of {' '.join(COMPARISONS)}")
+    query.add_argument('--first', action='store_true', help='Only report the first matching beat')
+    query.add_argument('-v', '--verbose', action='store_true', help='Report how many blocks were decoded')
+
+    args = parser.parse_args(argv)
+
+    try:
+        with TraceReader(args.file) as reader:
+            if args.command == 'info':
+                _print_info(reader)
+            else:
+                _run_query(reader, args)
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
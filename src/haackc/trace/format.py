@@ -0,0 +1,95 @@
+"""
+Trace file format - constants and column codecs shared by writer and reader.
+
+A trace file is a header followed by a sequence of chunks:
+
+    header    magic, version, chunk size, tv count, track count, names
+    chunk     marker, first beat, beat count, payload size, payload
+    index     per chunk: first beat, beat count, payload offset, and per
+              column: block offset, min and max
+    trailer   index marker, index offset
+
+Columns are (tv, track) pairs in tv-major order. Each chunk payload holds one
+compressed block per column. A column block is encoded by XOR-ing every
+float64 with its predecessor (frozen tracks become runs of zeros), splitting
+the result into eight byte planes and compressing the planes with zlib.
+
+The index is written when the trace is closed. It lets readers seek straight
+to the chunk holding a beat and skip chunks whose min/max summary cannot
+match a threshold query. Traces without an index (e.g. from a crashed run)
+are still readable by scanning the chunk headers.
+"""
+
+import struct
+import sys
+import zlib
+from array import array
+
+
+MAGIC = b'HAACKTRC'
+VERSION = 1
+CHUNK_MARKER = b'CHNK'
+
+# magic, version, flags, chunk_beats, n_tvs, n_tracks, names_size
+HEADER = struct.Struct('<8sHHIIII')
+# marker, first_beat, n_beats, payload_size
+CHUNK_HEADER = struct.Struct('<4sqII')
+BLOCK_SIZE = struct.Struct('<I')
+# first_beat, n_beats, payload_offset
+INDEX_ENTRY = struct.Struct('<qIQ')
+# block offset relative to the payload, min, max
+INDEX_COLUMN = struct.Struct('<Idd')
+INDEX_MARKER = b'HIDX'
+# marker, index_offset, n_chunks
+TRAILER = struct.Struct('<4sQI')
+
+DEFAULT_CHUNK_BEATS = 4096
+
+
+def encode_column(values: array, level: int = zlib.Z_DEFAULT_COMPRESSION) -> bytes:
+    """
+    Compresses a column of float64 values.
+
+    Args:
+        values (array): The column values.
+        level (int): The zlib compression level.
+
+    Returns:
+        bytes: The compressed column block.
+    """
+    if sys.byteorder != 'little':
+        values = array('d', values)
+        values.byteswap()
+    raw = values.tobytes()
+    count = len(values)
+    # XOR delta on the whole column at once using big-integer arithmetic
+    bits = int.from_bytes(raw, 'little')
+    delta = (bits ^ (bits << 64)) & ((1 << (64 * count)) - 1)
+    packed = delta.to_bytes(8 * count, 'little')
+    planes = b''.join(packed[k::8] for k in range(8))
+    return zlib.compress(planes, level)
+
+
+def decode_column(block: bytes, count: int) -> bytes:
+    """
+    Decompresses a column block.
+
+    Args:
+        block (bytes): The compressed column block.
+        count (int): The number of values in the block.
+
+    Returns:
+        bytes: The little-endian float64 values of the column.
+    """
+    planes = zlib.decompress(block)
+    packed = bytearray(8 * count)
+    for k in range(8):
+        packed[k::8] = planes[k * count:(k + 1) * count]
+    # Undo the XOR delta with a prefix scan in log2(count) steps
+    bits = int.from_bytes(packed, 'little')
+    shift = 64
+    while shift < 64 * count:
+        bits ^= bits << shift
+        shift *= 2
+    bits &= (1 << (64 * count)) - 1
+    return bits.to_bytes(8 * count, 'little')
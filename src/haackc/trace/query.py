@@ -0,0 +1,160 @@
+"""
+Trace queries - beat-range and threshold queries driven by the trace index.
+"""
+
+import bisect
+import operator
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .reader import TraceReader, to_floats, to_result
+
+
+COMPARISONS: Dict[str, Callable[[float, float], bool]] = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+def _may_match(op: str, threshold: float, low: float, high: float) -> bool:
+    """Checks whether a chunk with values in [low, high] can satisfy `value op threshold`."""
+    if op == '>':
+        return high > threshold
+    if op == '>=':
+        return high >= threshold
+    if op == '<':
+        return low < threshold
+    if op == '<=':
+        return low <= threshold
+    if op == '==':
+        return low <= threshold <= high
+    return not (low == high == threshold)
+
+
+class TraceQuery:
+    """
+    Answers queries over a trace, decoding only the chunks that can match.
+
+    Beat ranges are located with a binary search over the chunk index, and
+    threshold queries skip every chunk whose min/max summary rules out a
+    match. Traces without an index are still queried, by decoding every
+    chunk in range.
+
+    Attributes:
+        reader (TraceReader): The trace being queried.
+        chunks_read (int): The number of column blocks decoded so far.
+    """
+
+    def __init__(self, reader: TraceReader):
+        """
+        Initializes a TraceQuery.
+
+        Args:
+            reader (TraceReader): The trace to query.
+        """
+        self.reader = reader
+        self.chunks_read = 0
+        self._first_beats = [chunk[0] for chunk in reader.chunks]
+
+    def _chunk_range(self, start: Optional[int], end: Optional[int]) -> range:
+        """Gets the chunk numbers overlapping the beat range [start, end)."""
+        first = 0
+        last = len(self._first_beats)
+        if start is not None:
+            first = max(bisect.bisect_right(self._first_beats, start) - 1, 0)
+        if end is not None:
+            last = bisect.bisect_left(self._first_beats, end)
+        return range(first, last)
+
+    def _decode(self, chunk_number: int, column: int) -> array:
+        """Decodes one column block and counts it."""
+        self.chunks_read += 1
+        return to_floats(self.reader.read_chunk_column(chunk_number, column))
+
+    def _candidates(self, column: int, op: str, threshold: float,
+                    start: Optional[int], end: Optional[int]) -> Iterator[int]:
+        """Yields the chunk numbers in range whose summary admits a match."""
+        summaries = self.reader.summaries
+        for chunk_number in self._chunk_range(start, end):
+            if summaries is not None:
+                _offset, low, high = summaries[chunk_number][column]
+                if not _may_match(op, threshold, low, high):
+                    continue
+            yield chunk_number
+
+    def where(self, tv_name: str, track_name: str, op: str, threshold: float,
+              start: Optional[int] = None, end: Optional[int] = None,
+              first: bool = False) -> List[Tuple[int, float]]:
+        """
+        Finds the beats at which `tv_name.track_name op threshold` holds.
+
+        Args:
+            tv_name (str): The truth value.
+            track_name (str): The track.
+            op (str): A comparison operator ('>', '>=', '<', '<=', '==', '!=').
+            threshold (float): The value to compare against.
+            start (Optional[int]): The first beat to consider.
+            end (Optional[int]): The beat to stop before.
+            first (bool): Stop at the first matching beat.
+
+        Returns:
+            List[Tuple[int, float]]: The matching (beat, value) pairs.
+
+        Raises:
+            ValueError: If the operator is not supported.
+        """
+        if op not in COMPARISONS:
+            raise ValueError(f"Unsupported comparison: {op}")
+        compare = COMPARISONS[op]
+        column = self.reader.column_index(tv_name, track_name)
+        matches = []
+        for chunk_number in self._candidates(column, op, threshold, start, end):
+            first_beat = self.reader.chunks[chunk_number][0]
+            for i, value in enumerate(self._decode(chunk_number, column)):
+                beat = first_beat + i
+                if (start is not None and beat < start) or (end is not None and beat >= end):
+                    continue
+                if compare(value, threshold):
+                    matches.append((beat, value))
+                    if first:
+                        return matches
+        return matches
+
+    def range(self, tv_name: str, start: Optional[int] = None,
+              end: Optional[int] = None) -> Tuple[object, Dict[str, object]]:
+        """
+        Reads the values of a truth value over a beat range.
+
+        Args:
+            tv_name (str): The truth value.
+            start (Optional[int]): The first beat to read.
+            end (Optional[int]): The beat to stop before.
+
+        Returns:
+            Tuple[object, Dict[str, object]]: The beats and one value array per
+                track, as NumPy arrays (or array('q')/array('d') without NumPy).
+        """
+        chunk_numbers = self._chunk_range(start, end)
+        beats = array('q')
+        for chunk_number in chunk_numbers:
+            first_beat, n_beats, _offset = self.reader.chunks[chunk_number]
+            beats.extend(range(first_beat, first_beat + n_beats))
+        lo = 0
+        hi = len(beats)
+        if start is not None:
+            lo = bisect.bisect_left(beats, start)
+        if end is not None:
+            hi = bisect.bisect_left(beats, end)
+
+        values = {}
+        for track_name in self.reader.track_names:
+            column = self.reader.column_index(tv_name, track_name)
+            track_values = array('d')
+            for chunk_number in chunk_numbers:
+                track_values.extend(self._decode(chunk_number, column))
+            values[track_name] = to_result(track_values[lo:hi])
+        return to_result(beats[lo:hi]), values
@@ -0,0 +1,213 @@
+"""
+Trace reader - loads per-track value arrays from a trace file.
+"""
+
+import os
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from .format import (
+    MAGIC, VERSION, HEADER, CHUNK_MARKER, CHUNK_HEADER, BLOCK_SIZE,
+    INDEX_ENTRY, INDEX_COLUMN, INDEX_MARKER, TRAILER, decode_column,
+)
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; fall back to array('d')
+    numpy = None
+
+
+def to_floats(raw: bytes) -> array:
+    """Converts little-endian float64 bytes to an array('d')."""
+    values = array('d', raw)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def to_result(values: array):
+    """Converts an array to a NumPy array when NumPy is available."""
+    if numpy is not None:
+        return numpy.asarray(values, dtype=values.typecode)
+    return values
+
+
+def to_array(raw: bytes):
+    """Converts little-endian float64 bytes to a NumPy array, or array('d') without NumPy."""
+    if numpy is not None:
+        return numpy.frombuffer(raw, dtype='<f8').astype(float)
+    return to_floats(raw)
+
+
+class TraceReader:
+    """
+    Reads a trace file written by TraceWriter.
+
+    Attributes:
+        path (str): The trace file path.
+        tv_names (List[str]): The traced truth values.
+        track_names (List[str]): The traced tracks.
+        chunk_beats (int): The number of beats per chunk.
+        chunks (List[Tuple[int, int, int]]): The (first beat, beat count,
+            payload offset) of each chunk.
+        summaries (Optional[List[List[Tuple[int, float, float]]]]): For each
+            chunk and column, the (block offset, min, max) from the index, or
+            None if the trace has no index.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens a trace file and reads its header and chunk layout.
+
+        Args:
+            path (str): The trace file path.
+
+        Raises:
+            ValueError: If the file is not a trace or has an unsupported version.
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        header = self._file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"Not a HaackLang trace: {path}")
+        magic, version, _flags, self.chunk_beats, n_tvs, n_tracks, names_size = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"Not a HaackLang trace: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported trace version {version} (expected {VERSION})")
+
+        names = self._file.read(names_size).decode('utf-8').split('\n') if names_size else []
+        self.tv_names: List[str] = names[:n_tvs]
+        self.track_names: List[str] = names[n_tvs:n_tvs + n_tracks]
+        self.summaries: Optional[List[List[Tuple[int, float, float]]]] = None
+        if not self._load_index():
+            self.chunks = self._scan_chunks(HEADER.size + names_size)
+
+    def _load_index(self) -> bool:
+        """Reads the chunk index from the end of the file, if there is one."""
+        size = self._file.seek(0, os.SEEK_END)
+        if size < TRAILER.size:
+            return False
+        self._file.seek(size - TRAILER.size)
+        marker, index_offset, n_chunks = TRAILER.unpack(self._file.read(TRAILER.size))
+        if marker != INDEX_MARKER:
+            return False
+
+        n_columns = len(self.tv_names) * len(self.track_names)
+        self._file.seek(index_offset)
+        data = self._file.read(size - TRAILER.size - index_offset)
+        self.chunks = []
+        self.summaries = []
+        offset = 0
+        for _ in range(n_chunks):
+            self.chunks.append(INDEX_ENTRY.unpack_from(data, offset))
+            offset += INDEX_ENTRY.size
+            columns = []
+            for _ in range(n_columns):
+                columns.append(INDEX_COLUMN.unpack_from(data, offset))
+                offset += INDEX_COLUMN.size
+            self.summaries.append(columns)
+        return True
+
+    def _scan_chunks(self, offset: int) -> List[Tuple[int, int, int]]:
+        """Walks the chunk headers from `offset` to the end of the file."""
+        chunks = []
+        while True:
+            self._file.seek(offset)
+            header = self._file.read(CHUNK_HEADER.size)
+            if len(header) < CHUNK_HEADER.size:
+                break
+            marker, first_beat, n_beats, payload_size = CHUNK_HEADER.unpack(header)
+            if marker != CHUNK_MARKER:
+                break
+            chunks.append((first_beat, n_beats, offset + CHUNK_HEADER.size))
+            offset += CHUNK_HEADER.size + payload_size
+        return chunks
+
+    def column_index(self, tv_name: str, track_name: str) -> int:
+        """
+        Gets the column number of a (tv, track) pair.
+
+        Raises:
+            KeyError: If the truth value or track was not traced.
+        """
+        if tv_name not in self.tv_names:
+            raise KeyError(f"Truth value not in trace: {tv_name}")
+        if track_name not in self.track_names:
+            raise KeyError(f"Track not in trace: {track_name}")
+        return self.tv_names.index(tv_name) * len(self.track_names) + self.track_names.index(track_name)
+
+    def read_chunk_column(self, chunk_number: int, column: int) -> bytes:
+        """
+        Decodes one column of one chunk.
+
+        With an index the column block is read directly; otherwise the blocks
+        before it in the chunk are skipped one by one.
+
+        Args:
+            chunk_number (int): The position of the chunk in `chunks`.
+            column (int): The column number.
+
+        Returns:
+            bytes: The little-endian float64 values of the column in the chunk.
+        """
+        _first_beat, n_beats, offset = self.chunks[chunk_number]
+        if self.summaries is not None:
+            self._file.seek(offset + self.summaries[chunk_number][column][0])
+        else:
+            self._file.seek(offset)
+            for _ in range(column):
+                (size,) = BLOCK_SIZE.unpack(self._file.read(BLOCK_SIZE.size))
+                self._file.seek(size, 1)
+        (size,) = BLOCK_SIZE.unpack(self._file.read(BLOCK_SIZE.size))
+        return decode_column(self._file.read(size), n_beats)
+
+    def beats(self):
+        """
+        Gets the beat numbers recorded in the trace.
+
+        Returns:
+            A NumPy int64 array, or array('q') without NumPy.
+        """
+        beats = array('q')
+        for first_beat, n_beats, _offset in self.chunks:
+            beats.extend(range(first_beat, first_beat + n_beats))
+        return to_result(beats)
+
+    def read(self, tv_name: str) -> Dict[str, object]:
+        """
+        Reads the full history of a truth value.
+
+        Args:
+            tv_name (str): The truth value to read.
+
+        Returns:
+            Dict[str, object]: One NumPy float64 array (or array('d') without
+                NumPy) per track, aligned with `beats()`.
+        """
+        result = {}
+        for track_name in self.track_names:
+            column = self.column_index(tv_name, track_name)
+            raw = b''.join(self.read_chunk_column(i, column) for i in range(len(self.chunks)))
+            result[track_name] = to_array(raw)
+        return result
+
+    def read_all(self) -> Dict[str, Dict[str, object]]:
+        """
+        Reads the full history of every traced truth value.
+
+        Returns:
+            Dict[str, Dict[str, object]]: The result of `read` for each truth value.
+        """
+        return {tv_name: self.read(tv_name) for tv_name in self.tv_names}
+
+    def close(self):
+        """Closes the trace file."""
+        self._file.close()
+
+    def __enter__(self) -> 'TraceReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
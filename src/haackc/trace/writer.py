@@ -0,0 +1,163 @@
+"""
+Trace writer - records per-beat truth values into a columnar trace file.
+"""
+
+import zlib
+from array import array
+from typing import Any, List, Optional, Sequence
+
+from .format import (
+    MAGIC, VERSION, HEADER, CHUNK_MARKER, CHUNK_HEADER, BLOCK_SIZE,
+    INDEX_ENTRY, INDEX_COLUMN, INDEX_MARKER, TRAILER,
+    DEFAULT_CHUNK_BEATS, encode_column,
+)
+
+
+class TraceWriter:
+    """
+    Records the values of selected truth values on every beat.
+
+    Rows are buffered in memory and written as compressed column chunks once
+    `chunk_beats` beats have been recorded, so recording a beat only appends
+    floats to a buffer. The chunk index, with per-column min/max summaries,
+    is kept in memory and written when the writer is closed.
+
+    The writer can be registered as a beat hook on an interpreter; it is then
+    called after every beat.
+
+    Attributes:
+        path (str): The trace file path.
+        tv_names (List[str]): The traced truth values.
+        track_names (List[str]): The traced tracks.
+        chunk_beats (int): The number of beats per chunk.
+    """
+
+    def __init__(self, path: str, tv_names: Sequence[str], track_names: Sequence[str],
+                 chunk_beats: int = DEFAULT_CHUNK_BEATS,
+                 level: int = zlib.Z_DEFAULT_COMPRESSION):
+        """
+        Initializes a TraceWriter and writes the file header.
+
+        Args:
+            path (str): The trace file path.
+            tv_names (Sequence[str]): The truth values to trace.
+            track_names (Sequence[str]): The tracks to trace.
+            chunk_beats (int): The number of beats per chunk.
+            level (int): The zlib compression level.
+        """
+        self.path = path
+        self.tv_names: List[str] = list(tv_names)
+        self.track_names: List[str] = list(track_names)
+        self.chunk_beats = chunk_beats
+        self.level = level
+
+        self._rows = array('d')
+        self._first_beat: Optional[int] = None
+        self._n_beats = 0
+        self._index: List[bytes] = []
+        self._file = open(path, 'wb')
+
+        names = '\n'.join(self.tv_names + self.track_names).encode('utf-8')
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, chunk_beats,
+                                     len(self.tv_names), len(self.track_names), len(names)))
+        self._file.write(names)
+
+    @classmethod
+    def for_interpreter(cls, path: str, interpreter: Any,
+                        tv_names: Optional[Sequence[str]] = None, **kwargs) -> 'TraceWriter':
+        """
+        Creates a writer tracing an interpreter's truth values on all its tracks.
+
+        Args:
+            path (str): The trace file path.
+            interpreter (Interpreter): The interpreter to trace.
+            tv_names (Optional[Sequence[str]]): The truth values to trace, or
+                None to trace every truth value currently defined.
+
+        Returns:
+            TraceWriter: The new writer.
+
+        Raises:
+            ValueError: If a selected truth value does not exist.
+        """
+        if tv_names is None:
+            tv_names = list(interpreter.truthvalues)
+        for name in tv_names:
+            if name not in interpreter.truthvalues:
+                raise ValueError(f"Cannot trace unknown truth value: {name}")
+        return cls(path, tv_names, list(interpreter.tracks), **kwargs)
+
+    def __call__(self, interpreter: Any):
+        """Records the current beat; allows the writer to be used as a beat hook."""
+        self.record(interpreter)
+
+    def record(self, interpreter: Any):
+        """
+        Records the values of the traced truth values at the current beat.
+
+        A beat that does not follow the previously recorded one flushes the
+        buffered beats, so every chunk covers a consecutive run of beats.
+
+        Args:
+            interpreter (Interpreter): The interpreter to read values from.
+        """
+        beat = interpreter.global_beat
+        if self._n_beats and beat != self._first_beat + self._n_beats:
+            # Chunks hold consecutive beats; a gap starts a new one
+            self.flush()
+        if not self._n_beats:
+            self._first_beat = beat
+        rows = self._rows
+        truthvalues = interpreter.truthvalues
+        for tv_name in self.tv_names:
+            tv = truthvalues.get(tv_name)
+            values = tv.values if tv is not None else {}
+            for track_name in self.track_names:
+                rows.append(values.get(track_name, 0.0))
+        self._n_beats += 1
+        if self._n_beats >= self.chunk_beats:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered beats as a chunk."""
+        if not self._n_beats:
+            return
+        n_columns = len(self.tv_names) * len(self.track_names)
+        blocks = []
+        summaries = []
+        block_offset = 0
+        for column in range(n_columns):
+            values = self._rows[column::n_columns]
+            block = encode_column(values, self.level)
+            blocks.append(BLOCK_SIZE.pack(len(block)))
+            blocks.append(block)
+            summaries.append(INDEX_COLUMN.pack(block_offset, min(values), max(values)))
+            block_offset += BLOCK_SIZE.size + len(block)
+        payload = b''.join(blocks)
+
+        payload_offset = self._file.tell() + CHUNK_HEADER.size
+        self._file.write(CHUNK_HEADER.pack(CHUNK_MARKER, self._first_beat, self._n_beats, len(payload)))
+        self._file.write(payload)
+        self._index.append(INDEX_ENTRY.pack(self._first_beat, self._n_beats, payload_offset))
+        self._index.extend(summaries)
+
+        self._n_beats = 0
+        self._rows = array('d')
+
+    def close(self):
+        """Flushes any buffered beats, writes the index and closes the file."""
+        if self._file.closed:
+            return
+        self.flush()
+        index_offset = self._file.tell()
+        n_columns = len(self.tv_names) * len(self.track_names)
+        n_chunks = len(self._index) // (1 + n_columns)
+        self._file.write(b''.join(self._index))
+        self._file.write(TRAILER.pack(INDEX_MARKER, index_offset, n_chunks))
+        self._file.close()
+
+    def __enter__(self) -> 'TraceWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
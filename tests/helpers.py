@@ -0,0 +1,41 @@
+"""
+Shared helpers for the HaackLang unit tests.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import io
+from typing import Optional, TextIO
+from haackc.lexer import Lexer
+from haackc.parser import Parser
+from haackc.parser.ast_nodes import Program
+from haackc.interpreter import Interpreter
+
+
+def parse(source: str) -> Program:
+    """Lexes and parses a program."""
+    return Parser(Lexer(source).tokenize()).parse()
+
+
+def load(source: str, output: Optional[TextIO] = None,
+         interpreter: Optional[Interpreter] = None) -> Interpreter:
+    """
+    Lexes, parses and interprets a program.
+
+    Args:
+        source (str): The program.
+        output (Optional[TextIO]): Where the program prints; None collects
+            the output in a fresh StringIO.
+        interpreter (Optional[Interpreter]): The interpreter to load the
+            program into; None creates one.
+
+    Returns:
+        Interpreter: The interpreter, with the program loaded.
+    """
+    if interpreter is None:
+        interpreter = Interpreter()
+    interpreter.output = output if output is not None else io.StringIO()
+    interpreter.interpret(parse(source))
+    return interpreter
@@ -0,0 +1,84 @@
+"""
+Unit tests for the embeddable HaackLang runtime API.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tempfile
+import unittest
+from haackc import CompiledProgram, Runtime, compile_file, compile_source
+
+
+SOURCE = """
+track main period 1 using fuzzy
+track slow period 4 using fuzzy
+tv threat = 0.0
+tv fear = 0.0
+rule react {
+    fear = threat and threat
+}
+print(fear.main)
+"""
+
+
+class TestRuntime(unittest.TestCase):
+    """Test cases for the Runtime API."""
+
+    def test_step_set_get(self):
+        """Test stepping, setting inputs and reading outputs"""
+        runtime = Runtime(SOURCE)
+        self.assertEqual(runtime.read_output(), '0.0\n')
+        self.assertEqual(runtime.read_output(), '')
+
+        runtime.set('threat', 'main', 0.8)
+        runtime.set_many({'threat.slow': 0.6, ('threat', 'syncop'): 2.0})
+        self.assertEqual(runtime.step(3), 3)
+        self.assertEqual(runtime.get('fear', 'main'), 0.8)
+        self.assertEqual(runtime.get('fear', 'slow'), 0.0)  # slow has not fired yet
+        runtime.step()
+        self.assertEqual(runtime.get('fear'), {'main': 0.8, 'slow': 0.6, 'syncop': 0.0})
+        self.assertEqual(runtime.get('threat', 'syncop'), 1.0)
+
+        snapshot = runtime.snapshot()
+        self.assertEqual(snapshot['beat'], 4)
+        self.assertEqual(snapshot['truthvalues']['fear']['slow'], 0.6)
+
+        with self.assertRaises(KeyError):
+            runtime.set('nothing', 'main', 1.0)
+        with self.assertRaises(KeyError):
+            runtime.set_many({'threat.main': 0.1, 'threat.nowhere': 0.2})
+        self.assertEqual(runtime.get('threat', 'main'), 0.8)
+
+    def test_shared_program_and_artifacts(self):
+        """Test sharing one compiled program and reusing cached artifacts"""
+        program = compile_source(SOURCE)
+        first, second = Runtime(program), Runtime(program)
+        first.set('threat', 'main', 1.0)
+        first.step()
+        second.step()
+        self.assertEqual(first.get('fear', 'main'), 1.0)
+        self.assertEqual(second.get('fear', 'main'), 0.0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'model.haack')
+            with open(path, 'w') as f:
+                f.write(SOURCE)
+            cache = os.path.join(tmp, 'cache')
+            compiled = compile_file(path, cache)
+            artifact = os.path.join(cache, f"{compiled.digest}.hkp")
+            self.assertTrue(os.path.exists(artifact))
+            self.assertEqual(CompiledProgram.load(artifact).digest, program.digest)
+            runtime = Runtime.from_file(path, cache)
+            runtime.step(2)
+            self.assertEqual(runtime.beat, 2)
+
+            with open(path, 'w') as f:
+                f.write('bogus')
+            with self.assertRaises(ValueError):
+                CompiledProgram.load(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+Unit tests for the HaackLang benchmark suite.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import copy
+import unittest
+from haackc.bench import run_suite, compare
+
+
+class TestBench(unittest.TestCase):
+    """Test cases for the benchmark suite."""
+
+    def test_suite_and_compare(self):
+        """Test that every area runs and that comparison flags slowdowns"""
+        report = run_suite(sizes=[20], repeat=2, beats=3)
+        self.assertEqual(set(report['results']),
+                         {'lexer/20', 'parser/20', 'interpreter/20', 'beats/20'})
+        for data in report['results'].values():
+            self.assertGreater(data['items'], 0)
+            self.assertGreater(data['throughput'], 0)
+
+        self.assertTrue(all(c.status == 'ok' for c in compare(report, report)))
+
+        slower = copy.deepcopy(report)
+        for data in slower['results'].values():
+            data['times'] = [t * 2 for t in data['times']]
+        statuses = {c.key: c.status for c in compare(slower, report, noise_factor=0.0)}
+        self.assertEqual(set(statuses.values()), {'regression'})
+
+
+if __name__ == '__main__':
+    unittest.main()
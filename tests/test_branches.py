@@ -0,0 +1,239 @@
+"""
+Unit tests for HaackLang contradiction-preserving branches (`if!!`).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from haackc.parser.ast_nodes import IfStatement
+from haackc.interpreter import Interpreter
+from haackc.runtime import Track, TruthValue
+from haackc.runtime.branches import Branch, BranchEngine
+import helpers
+from helpers import parse
+
+
+SOURCE = """
+track fast period 1 using fuzzy
+tv signal = 0.0
+tv out = 0.5
+score = 0
+
+rule decide {
+    if!! signal {
+        out = 1.0
+        score = 10
+    } else {
+        out = 0.0
+        score = 2
+    }
+}
+"""
+
+
+def load(source, policy='blend', max_branches=16):
+    interpreter = Interpreter()
+    interpreter.branches = BranchEngine(policy, max_branches)
+    return helpers.load(source, interpreter=interpreter)
+
+
+def contradict(interpreter):
+    """Makes the signal true on most tracks but mostly false on the fast one (mean 0.6), then runs a beat."""
+    signal = interpreter.truthvalues['signal']
+    for track, value in (('main', 1.0), ('fast', 0.2), ('slow', 0.6), ('syncop', 0.6)):
+        signal.set(track, value)
+    interpreter.step()
+
+
+def firing(tv):
+    """The tracks firing on the first beat."""
+    return {track: tv.get(track) for track in ('main', 'fast')}
+
+
+class TestBranchParsing(unittest.TestCase):
+    """Test cases for parsing if!!."""
+
+    def test_parse_paraconsistent_if(self):
+        """Test that if!! parses to a paraconsistent if statement and if does not."""
+        program = parse("if!! a {\n    b = 1\n}\nif a {\n    b = 2\n}\n")
+        statements = [node for node in program.declarations if isinstance(node, IfStatement)]
+        self.assertEqual([node.paraconsistent for node in statements], [True, False])
+
+
+class TestForkedBranches(unittest.TestCase):
+    """Test cases for executing and merging both arms of if!!."""
+
+    def test_consistent_condition_does_not_fork(self):
+        """Test that a condition true on every track runs only the then arm."""
+        interpreter = load(SOURCE)
+        interpreter.truthvalues['signal'].set_all(1.0)
+        interpreter.step()
+        self.assertEqual(interpreter.branches.forks, 0)
+        self.assertEqual(interpreter.variables['score'], 10)
+        self.assertEqual(firing(interpreter.truthvalues['out']), {'main': 1.0, 'fast': 1.0})
+
+    def test_blend_weights_tracks_by_condition(self):
+        """Test that blending takes each track of the condition as the then arm's weight."""
+        interpreter = load(SOURCE)
+        out = interpreter.truthvalues['out']
+        contradict(interpreter)
+        self.assertEqual(interpreter.branches.forks, 1)
+        self.assertIs(interpreter.truthvalues['out'], out)
+        self.assertAlmostEqual(out.get('main'), 1.0)
+        self.assertAlmostEqual(out.get('fast'), 0.2)
+        # Variables are weighted by the condition's mean, 0.6
+        self.assertAlmostEqual(interpreter.variables['score'], 6.8)
+        self.assertEqual(interpreter.branches.live, 0)
+
+    def test_merge_policies(self):
+        """Test the max, min, then, else and coherent policies."""
+        expected = {
+            'max': ({'main': 1.0, 'fast': 1.0}, 10),
+            'min': ({'main': 0.0, 'fast': 0.0}, 2),
+            'then': ({'main': 1.0, 'fast': 1.0}, 10),
+            'else': ({'main': 0.0, 'fast': 0.0}, 2),
+            'coherent': ({'main': 1.0, 'fast': 1.0}, 10),
+        }
+        for policy, (values, score) in expected.items():
+            interpreter = load(SOURCE, policy)
+            contradict(interpreter)
+            self.assertEqual(firing(interpreter.truthvalues['out']), values, policy)
+            self.assertEqual(interpreter.variables['score'], score, policy)
+
+    def test_coherent_prefers_agreeing_tracks(self):
+        """Test that coherence maximization keeps the arm whose truth values agree across tracks."""
+        # The then arm splits out's tracks; the else arm keeps them together
+        source = SOURCE.replace('out = 1.0', 'out = 1.0\n        out.fast = 0.0')
+        interpreter = load(source, 'coherent')
+        contradict(interpreter)
+        self.assertEqual(firing(interpreter.truthvalues['out']), {'main': 0.0, 'fast': 0.0})
+        self.assertEqual(interpreter.variables['score'], 2)
+
+    def test_arms_do_not_see_each_other(self):
+        """Test that each arm starts from the state forked from, not the other arm's writes."""
+        source = """
+track fast period 1 using fuzzy
+tv signal = 0.0
+count = 1
+rule split {
+    if!! signal {
+        count = count + 1
+    } else {
+        count = count + 10
+    }
+}
+"""
+        interpreter = load(source, 'else')
+        # Loading ran the rule once, with a consistently false signal
+        self.assertEqual(interpreter.variables['count'], 11)
+        contradict(interpreter)
+        self.assertEqual(interpreter.variables['count'], 21)
+
+    def test_one_arm_writes_merge_with_the_fork_state(self):
+        """Test that a name written by one arm only is merged with its value before the fork."""
+        source = """
+track fast period 1 using fuzzy
+tv signal = 0.0
+tv level = 0.4
+rule raise {
+    if!! signal {
+        level.fast = 1.0
+    }
+}
+"""
+        interpreter = load(source)
+        contradict(interpreter)
+        self.assertAlmostEqual(interpreter.truthvalues['level'].get('fast'), 0.2 * 1.0 + 0.8 * 0.4)
+
+    def test_branch_limit_collapses_nested_forks(self):
+        """Test that forks beyond the live branch limit fall back to a classical if."""
+        source = """
+track fast period 1 using fuzzy
+tv signal = 0.0
+inner = 0
+rule nested {
+    if!! signal {
+        if!! signal {
+            inner = 4
+        } else {
+            inner = 1
+        }
+    }
+}
+"""
+        limited = load(source, 'max', max_branches=2)
+        contradict(limited)
+        self.assertEqual(limited.branches.forks, 1)
+        self.assertEqual(limited.branches.collapsed, 1)
+        self.assertEqual(limited.branches.peak, 2)
+        self.assertIn('1 contradictions collapsed', limited.branches.report())
+
+        unlimited = load(source, 'max', max_branches=4)
+        contradict(unlimited)
+        self.assertEqual(unlimited.branches.forks, 2)
+        self.assertEqual(unlimited.branches.peak, 4)
+        self.assertEqual(unlimited.variables['inner'], 4)
+
+    def test_context_frames_and_switches_merge(self):
+        """Test that context variables and context switches written by arms are merged."""
+        source = """
+track fast period 1 using fuzzy
+tv signal = 0.0
+context watch {
+    let level = 0
+    rule assess {
+        if!! signal {
+            level = 4
+            exit calm
+        } else {
+            level = 0
+        }
+    }
+}
+context calm {
+}
+"""
+        interpreter = load(source)
+        contradict(interpreter)
+        self.assertAlmostEqual(interpreter.contexts['watch'].variables['level'], 2.4)
+        # The then arm's exit outweighs the else arm's staying (0.6 against 0.4)
+        self.assertFalse(interpreter.contexts['calm'].active)
+
+    def test_invalid_settings(self):
+        """Test that unknown policies and limits below one fork are rejected."""
+        with self.assertRaises(ValueError):
+            BranchEngine('vote')
+        with self.assertRaises(ValueError):
+            BranchEngine(max_branches=1)
+
+
+class TestBranchState(unittest.TestCase):
+    """Test cases for the structurally shared state of a branch."""
+
+    def test_fork_shares_and_copies_on_write(self):
+        """Test that forking copies nothing and writing copies only the written truth value."""
+        tracks = {'main': Track('main', 1)}
+        truthvalues = {f"tv{i}": TruthValue(tracks, 0.5) for i in range(1000)}
+        variables = {f"v{i}": i for i in range(1000)}
+        allocations = TruthValue.allocations
+        branch = Branch(truthvalues, variables)
+        self.assertEqual(TruthValue.allocations, allocations)
+        self.assertIs(branch.truthvalues['tv7'], truthvalues['tv7'])
+
+        branch.own('tv7').set('main', 1.0)
+        branch.variables['v3'] = -1
+        self.assertEqual(TruthValue.allocations, allocations + 1)
+        self.assertEqual(truthvalues['tv7'].get('main'), 0.5)
+        self.assertEqual(variables['v3'], 3)
+        self.assertEqual(list(branch.written_truthvalues), ['tv7'])
+        self.assertEqual(dict(branch.written_variables), {'v3': -1})
+
+        nested = Branch(branch.truthvalues, branch.variables, branch)
+        self.assertEqual(nested.truthvalues['tv7'].get('main'), 1.0)
+        self.assertEqual(nested.variables['v3'], -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
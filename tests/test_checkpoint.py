@@ -0,0 +1,119 @@
+"""
+Unit tests for HaackLang interpreter checkpoints.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tempfile
+import unittest
+from array import array
+from haackc.runtime.checkpoint import HEADER
+from helpers import load
+
+
+SOURCE = """
+track main period 1 using fuzzy
+track slow period 4 phase 1 priority 2 using fuzzy
+tv fear = 0.9
+tv calm = 0.1
+let steps = 0
+rule settle {
+    fear = fear * 0.9
+    calm.slow = calm.slow + 0.1
+}
+context watch priority 3 {
+}
+"""
+
+
+def downgrade(path):
+    """Rewrites a checkpoint in the version 2 layout, without priorities."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    fields = list(HEADER.unpack_from(data, 0))
+    n_tracks, n_contexts = fields[4], fields[7]
+    tracks_offset, tvs_offset, scalars_offset, contexts_offset = fields[10:14]
+    tracks = array('d', data[tracks_offset:tvs_offset])
+    contexts = array('d', data[contexts_offset:contexts_offset + 32 * n_contexts])
+    tracks = array('d', (v for i, v in enumerate(tracks) if i % 5 != 4))
+    contexts = array('d', (v for i, v in enumerate(contexts) if i % 4 != 3))
+    shift = 8 * n_tracks
+    fields[1] = 2
+    fields[11:14] = [tvs_offset - shift, scalars_offset - shift, contexts_offset - shift]
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(*fields))
+        f.write(data[HEADER.size:tracks_offset])
+        f.write(tracks.tobytes())
+        f.write(data[tvs_offset:contexts_offset])
+        f.write(contexts.tobytes())
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Test checkpoint and restore."""
+    
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.ckpt')
+        os.close(handle)
+    
+    def tearDown(self):
+        os.remove(self.path)
+    
+    def test_round_trip(self):
+        """Test that restored state matches the checkpointed state."""
+        original = load(SOURCE)
+        original.run(6)
+        original.checkpoint(self.path)
+        
+        restored = load(SOURCE)
+        restored.restore(self.path)
+        
+        self.assertEqual(restored.global_beat, 6)
+        self.assertEqual(restored.tracks["slow"].phase, 1)
+        self.assertEqual(restored.tracks["slow"].priority, 2)
+        self.assertEqual(restored.contexts["watch"].priority, 3)
+        self.assertEqual(restored.variables["steps"], 0.0)
+        for name, tv in original.truthvalues.items():
+            self.assertEqual(restored.truthvalues[name].to_dict(), tv.to_dict())
+    
+    def test_resume_matches_uninterrupted_run(self):
+        """Test that resuming from a checkpoint continues the same run."""
+        uninterrupted = load(SOURCE)
+        uninterrupted.run(10)
+        
+        first = load(SOURCE)
+        first.run(5)
+        first.checkpoint(self.path)
+        resumed = load(SOURCE)
+        resumed.restore(self.path)
+        resumed.run(5)
+        
+        for name, tv in uninterrupted.truthvalues.items():
+            self.assertEqual(resumed.truthvalues[name].to_dict(), tv.to_dict())
+    
+    def test_reads_version_2(self):
+        """Test that checkpoints written before priorities were saved still restore."""
+        original = load(SOURCE)
+        original.run(6)
+        original.checkpoint(self.path)
+        downgrade(self.path)
+
+        restored = load(SOURCE.replace(' priority 2', '').replace(' priority 3', ''))
+        restored.restore(self.path)
+        self.assertEqual(restored.global_beat, 6)
+        self.assertEqual(restored.tracks["slow"].priority, 0)
+        self.assertIsNone(restored.contexts["watch"].priority)
+        for name, tv in original.truthvalues.items():
+            self.assertEqual(restored.truthvalues[name].to_dict(), tv.to_dict())
+    
+    def test_rejects_other_files(self):
+        """Test that non-checkpoint files are rejected."""
+        with open(self.path, 'wb') as f:
+            f.write(b'not a checkpoint' * 8)
+        with self.assertRaises(ValueError):
+            load(SOURCE).restore(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
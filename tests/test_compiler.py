@@ -143,6 +143,61 @@ class TestInterpreter(unittest.TestCase):
         self.assertEqual(result.get("main"), 1.0)
         # Fuzzy: min(0.7, 0.6) = 0.6
         self.assertEqual(result.get("slow"), 0.6)
+    
+    def test_beat_freeze(self):
+        """Test that rules only update firing tracks on each beat."""
+        source = """
+        track main period 1 using fuzzy
+        track slow period 4 using fuzzy
+        tv level = 1.0
+        rule decay {
+            level = level * 0.5
+        }
+        """
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        ast = parser.parse()
+        
+        interpreter = Interpreter()
+        interpreter.interpret(ast)
+        interpreter.run(3)
+        
+        level = interpreter.truthvalues["level"]
+        self.assertEqual(interpreter.global_beat, 3)
+        # Main fired on beats 1-3, slow is frozen until beat 4
+        self.assertAlmostEqual(level.get("main"), 0.5 ** 3)
+        self.assertAlmostEqual(level.get("slow"), 1.0)
+    
+    def test_lazy_track_evaluation(self):
+        """Test that beat assignments only compute the firing tracks."""
+        import haackc.interpreter.interpreter as module
+        source = """
+        track main period 1 using fuzzy
+        track slow period 4 using fuzzy
+        tv a = 0.8
+        tv b = 0.3
+        rule mix {
+            a = not (a and b)
+        }
+        """
+        interpreter = Interpreter()
+        interpreter.interpret(Parser(Lexer(source).tokenize()).parse())
+        
+        calls = []
+        original = module.apply_logic_operator
+        module.apply_logic_operator = lambda op, logic, *args: calls.append(op) or original(op, logic, *args)
+        try:
+            interpreter.run(3)
+        finally:
+            module.apply_logic_operator = original
+        
+        # Only main fires on beats 1-3: one 'and' and one 'not' per beat
+        self.assertEqual(len(calls), 6)
+        a = interpreter.truthvalues["a"]
+        self.assertAlmostEqual(a.get("main"), 0.7)
+        self.assertAlmostEqual(a.get("slow"), 0.7)
+        self.assertAlmostEqual(a.get("syncop"), 0.7)
 
 
 if __name__ == "__main__":
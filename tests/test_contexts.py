@@ -0,0 +1,237 @@
+"""
+Unit tests for HaackLang context switching and context variables.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tempfile
+import unittest
+from haackc.parser.ast_nodes import ContextSwitch
+from haackc.interpreter import ReactiveExecutor, SaturationExecutor
+from helpers import load, parse
+
+
+SOURCE = """
+tv danger = 0.0
+calm_ticks = 0
+alert_ticks = 0
+
+context calm {
+    let ticks = 0
+    rule tick {
+        ticks = ticks + 1
+        calm_ticks = ticks
+        if danger {
+            exit calm
+            enter alert
+        }
+    }
+}
+
+context alert {
+    let ticks = 0
+    rule tick {
+        ticks = ticks + 1
+        alert_ticks = ticks
+        if not danger {
+            exit alert
+            enter calm
+        }
+    }
+}
+
+exit alert
+"""
+
+
+class TestContextSwitchParsing(unittest.TestCase):
+    """Test cases for parsing enter and exit."""
+
+    def test_parse_switches(self):
+        """Test that enter and exit parse to context switches."""
+        program = parse("enter calm\nexit alert\n")
+        switches = program.declarations
+        self.assertTrue(all(isinstance(node, ContextSwitch) for node in switches))
+        self.assertEqual([(node.context, node.enter) for node in switches],
+                         [('calm', True), ('alert', False)])
+
+    def test_parse_spec_switches(self):
+        """Test that the specification's enter context and exit context forms parse."""
+        program = parse("enter context panic\nexit context panic\n")
+        self.assertEqual([(node.context, node.enter) for node in program.declarations],
+                         [('panic', True), ('panic', False)])
+
+
+class TestContexts(unittest.TestCase):
+    """Test cases for context switching and context variables."""
+
+    def test_only_active_contexts_run(self):
+        """Test that the rules of an exited context stop running until it is entered."""
+        interpreter = load(SOURCE)
+        self.assertFalse(interpreter.contexts['alert'].active)
+        interpreter.run(3)
+        self.assertEqual(interpreter.variables['calm_ticks'], 4)
+        self.assertEqual(interpreter.variables['alert_ticks'], 1)
+
+        interpreter.truthvalues['danger'].set('main', 1.0)
+        interpreter.run(3)
+        # Calm's rule switches on the first beat; alert's runs later in that beat
+        self.assertTrue(interpreter.contexts['alert'].active)
+        self.assertFalse(interpreter.contexts['calm'].active)
+        self.assertEqual(interpreter.variables['calm_ticks'], 5)
+        self.assertEqual(interpreter.variables['alert_ticks'], 4)
+
+    def test_context_variables_are_separate(self):
+        """Test that each context's variables live in its own frame."""
+        interpreter = load(SOURCE)
+        interpreter.run(2)
+        self.assertNotIn('ticks', interpreter.variables)
+        self.assertEqual(interpreter.contexts['calm'].variables, {'ticks': 3})
+        self.assertEqual(interpreter.contexts['alert'].variables, {'ticks': 1})
+
+    def test_rules_are_compiled_to_slots(self):
+        """Test that references in a context's rules are resolved to frame slots."""
+        interpreter = load(SOURCE)
+        rule, context = interpreter.rules[0]
+        assignment = rule.body[0]
+        self.assertEqual(assignment.slot, context.slots['ticks'])
+        self.assertEqual(assignment.value.left.slot, context.slots['ticks'])
+
+    def test_rule_sets_group_contexts(self):
+        """Test that rules are grouped into one set per run of a context's rules."""
+        interpreter = load(SOURCE)
+        self.assertEqual([(context.name, start, end) for context, start, end in interpreter.rule_sets],
+                         [('calm', 0, 1), ('alert', 1, 2)])
+
+    def test_nested_contexts_see_enclosing_variables(self):
+        """Test that a nested context's rules read and write the variables of the contexts enclosing it."""
+        source = """
+context outer {
+    let k = 2
+    let n = 0
+    context inner {
+        let k = 10
+        rule r {
+            y = k + 1
+            n = n + 1
+        }
+    }
+    rule s {
+        z = k
+    }
+}
+"""
+        interpreter = load(source)
+        rule = interpreter.rules[0][0]
+        self.assertEqual((rule.body[0].value.left.slot, rule.body[0].value.left.depth), (0, 0))
+        self.assertEqual((rule.body[1].slot, rule.body[1].depth), (1, 1))
+        interpreter.run(2)
+        self.assertEqual(interpreter.variables['y'], 11)
+        self.assertEqual(interpreter.variables['z'], 2)
+        self.assertEqual(interpreter.contexts['outer'].variables, {'k': 2, 'n': 3})
+
+        interpreter = load("context outer {\n    let k = 2\n    context inner {\n        rule r {\n"
+                           "            y = k + 1\n        }\n    }\n}\n")
+        self.assertEqual(interpreter.variables['y'], 3)
+
+    def test_exiting_a_context_stops_nested_contexts(self):
+        """Test that the rules of a nested context stop when an enclosing context is exited."""
+        source = """
+n = 0
+context outer {
+    context inner {
+        rule r {
+            n = n + 1
+        }
+    }
+}
+"""
+        interpreter = load(source)
+        interpreter.run(2)
+        self.assertEqual(interpreter.variables['n'], 3)
+        interpreter.contexts['outer'].active = False
+        interpreter.run(2)
+        self.assertEqual(interpreter.variables['n'], 3)
+        self.assertTrue(interpreter.contexts['inner'].active)
+        self.assertFalse(interpreter.contexts['inner'].is_active())
+        interpreter.contexts['outer'].active = True
+        interpreter.run(1)
+        self.assertEqual(interpreter.variables['n'], 4)
+
+    def test_unknown_context(self):
+        """Test that switching to an undeclared context is an error."""
+        with self.assertRaises(RuntimeError):
+            load("enter nowhere\n")
+
+    def test_context_variable_must_be_numeric(self):
+        """Test that a context variable cannot hold a truth value."""
+        with self.assertRaises(RuntimeError):
+            load("tv a = 0.5\ncontext c {\n    let b = a\n}\n")
+
+    def test_inactive_event_rules_wait(self):
+        """Test that event rules of an exited context fire on transitions seen once it is entered."""
+        source = """
+track fast period 1 using fuzzy
+tv x = 0.0
+hits = 0
+context watch {
+    when x.fast > 0.5 {
+        hits = hits + 1
+    }
+}
+"""
+        interpreter = load(source)
+        interpreter.step()
+        interpreter.contexts['watch'].active = False
+        interpreter.truthvalues['x'].set('fast', 0.9)
+        interpreter.step()
+        self.assertEqual(interpreter.variables['hits'], 0)
+        interpreter.contexts['watch'].active = True
+        interpreter.step()
+        self.assertEqual(interpreter.variables['hits'], 1)
+
+    def test_checkpoint_keeps_frames_and_flags(self):
+        """Test that checkpoints save context variables and which contexts are active."""
+        handle, path = tempfile.mkstemp(suffix='.ckpt')
+        os.close(handle)
+        try:
+            interpreter = load(SOURCE)
+            interpreter.truthvalues['danger'].set('main', 1.0)
+            interpreter.run(2)
+            interpreter.checkpoint(path)
+            restored = load(SOURCE)
+            restored.restore(path)
+            self.assertTrue(restored.contexts['alert'].active)
+            self.assertFalse(restored.contexts['calm'].active)
+            self.assertEqual(restored.contexts['alert'].variables, interpreter.contexts['alert'].variables)
+            self.assertNotIn('calm::ticks', restored.variables)
+        finally:
+            os.remove(path)
+
+    def test_executors_skip_inactive_contexts(self):
+        """Test that the reactive and saturation executors follow context switches."""
+        def flip(interpreter, beat):
+            interpreter.truthvalues['danger'].set('main', 1.0 if beat % 4 < 2 else 0.0)
+
+        expected = load(SOURCE)
+        for beat in range(12):
+            flip(expected, beat)
+            expected.step()
+        for executor_type in (ReactiveExecutor, SaturationExecutor):
+            interpreter = load(SOURCE)
+            with executor_type(interpreter):
+                for beat in range(12):
+                    flip(interpreter, beat)
+                    interpreter.step()
+            self.assertEqual(interpreter.contexts['calm'].active, expected.contexts['calm'].active)
+            if executor_type is ReactiveExecutor:
+                self.assertEqual(interpreter.variables, expected.variables)
+                for name in ('calm', 'alert'):
+                    self.assertEqual(interpreter.contexts[name].variables,
+                                     expected.contexts[name].variables)
+
+
+if __name__ == '__main__':
+    unittest.main()
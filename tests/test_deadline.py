@@ -0,0 +1,121 @@
+"""
+Unit tests for HaackLang deadline-aware degradation.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from haackc.lexer import Lexer
+from haackc.parser import Parser
+from haackc.interpreter import Interpreter, DeadlineScheduler
+
+
+SOURCE = """
+track main period 1 priority 10 using fuzzy
+track slow period 4 priority 1 using fuzzy
+tv a = 0.0
+tv b = 0.0
+context fast using track main {
+    rule r1 {
+        a = not a
+    }
+}
+context bg using track slow {
+    rule r2 {
+        b = not b
+    }
+}
+"""
+
+
+class TestDeadline(unittest.TestCase):
+    """Test cases for the deadline scheduler."""
+
+    def setUp(self):
+        self.interpreter = Interpreter()
+        self.interpreter.interpret(Parser(Lexer(SOURCE).tokenize()).parse())
+        self.now = 0.0
+        costs = {'r1': 0.001, 'r2': 0.005}
+        execute_rule = self.interpreter.execute_rule
+
+        def timed_rule(node):
+            execute_rule(node)
+            self.now += costs[node.name]
+
+        self.interpreter.execute_rule = timed_rule
+
+    def test_priorities_parsed(self):
+        """Test track and context priority declarations"""
+        self.assertEqual(self.interpreter.tracks['main'].priority, 10)
+        self.assertEqual(self.interpreter.tracks['syncop'].priority, 0)
+        program = Parser(Lexer("context c using track slow priority 3 { }").tokenize()).parse()
+        self.assertEqual(program.declarations[0].priority, 3)
+
+    def test_defers_and_catches_up(self):
+        """Test that a low-priority rule is deferred and later applies the owed tracks"""
+        scheduler = DeadlineScheduler(self.interpreter, budget=0.003, clock=lambda: self.now, smoothing=1.0)
+        scheduler.enable()
+        b = self.interpreter.truthvalues['b']
+
+        self.interpreter.run(4)
+        self.assertEqual(scheduler.deferrals, {'bg::r2': 3})
+        self.assertEqual([beat for beat, _name in scheduler.log], [2, 3, 4])
+        # Rules also ran once at declaration, leaving a and b at 1.0 on every track
+        self.assertEqual(b.get('slow'), 1.0)
+        self.assertEqual(self.interpreter.truthvalues['a'].get('main'), 1.0)  # r1 ran on all 4 beats
+
+        scheduler.budget = 1.0
+        self.interpreter.step()
+        # Beat 5 does not fire slow, but the update owed from beat 4 lands now
+        self.assertEqual(b.get('slow'), 0.0)
+        self.assertEqual(scheduler.pending, 0)
+
+        scheduler.disable()
+        self.assertNotIn('execute_rules', vars(self.interpreter))
+
+    def test_unbound_rules_defer_low_priority_tracks(self):
+        """Test that a rule outside a track-bound context keeps its high-priority tracks and owes the rest"""
+        source = """
+track main period 1 priority 10 using fuzzy
+track slow period 2 priority 1 using fuzzy
+tv c = 0.0
+ticks = 0
+rule r3 {
+    c = not c
+    ticks = ticks + 1
+}
+"""
+        interpreter = Interpreter()
+        interpreter.interpret(Parser(Lexer(source).tokenize()).parse())
+        execute_rule = interpreter.execute_rule
+
+        def timed_rule(node):
+            execute_rule(node)
+            self.now += 0.005
+
+        interpreter.execute_rule = timed_rule
+        scheduler = DeadlineScheduler(interpreter, budget=0.003, clock=lambda: self.now, smoothing=1.0)
+        scheduler.enable()
+        c = interpreter.truthvalues['c']
+
+        interpreter.run(2)
+        # Loading left c at 1.0; beat 1 learns the cost, beat 2 defers the slow track
+        self.assertEqual(scheduler.deferrals, {'r3': 1})
+        self.assertEqual(c.get('main'), 1.0)
+        self.assertEqual(c.get('slow'), 1.0)
+        self.assertEqual(interpreter.variables['ticks'], 3)
+        self.assertEqual(scheduler.pending, 1)
+
+        scheduler.budget = 1.0
+        interpreter.step()
+        # Beat 3 does not fire slow, but the update owed from beat 2 lands now
+        self.assertEqual(c.get('main'), 0.0)
+        self.assertEqual(c.get('slow'), 0.0)
+        self.assertEqual(scheduler.pending, 0)
+        scheduler.disable()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Unit tests for HaackLang `when` event rules.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tempfile
+import unittest
+from haackc.parser.ast_nodes import WhenDecl
+from haackc.interpreter import ReactiveExecutor
+from haackc.analysis import prune_tracks
+from helpers import load, parse
+
+
+SOURCE = """
+track fast period 1 using fuzzy
+tv x = 0.0
+tv alarm = 0.0
+rises = 0
+falls = 0
+
+when x.fast > 0.8 {
+    rises = rises + 1
+    alarm.fast = 1.0
+} else {
+    falls = falls + 1
+    alarm.fast = 0.0
+}
+"""
+
+
+def drive(interpreter, name, track, values):
+    """Sets a track before each beat and runs the beat."""
+    for value in values:
+        interpreter.truthvalues[name].set(track, value)
+        interpreter.step()
+
+
+class TestWhenParsing(unittest.TestCase):
+    """Test cases for parsing event rules."""
+
+    def test_parse_when_else(self):
+        """Test that when parses a condition, a body and an else body."""
+        program = parse(SOURCE)
+        events = [decl for decl in program.declarations if isinstance(decl, WhenDecl)]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(len(events[0].body), 2)
+        self.assertEqual(len(events[0].else_body), 2)
+
+
+class TestWhenEvents(unittest.TestCase):
+    """Test cases for edge-triggered event rules."""
+
+    def test_fires_on_transitions_only(self):
+        """Test that bodies run on rising and falling edges, not while the condition holds."""
+        interpreter = load(SOURCE)
+        drive(interpreter, 'x', 'fast', [0.5, 0.9, 0.95, 1.0, 0.3, 0.2, 0.85])
+        self.assertEqual(interpreter.variables['rises'], 2)
+        self.assertEqual(interpreter.variables['falls'], 1)
+        self.assertEqual(interpreter.truthvalues['alarm'].get('fast'), 1.0)
+
+    def test_no_edge_when_loaded(self):
+        """Test that a condition already true when loaded does not fire."""
+        interpreter = load(SOURCE.replace('tv x = 0.0', 'tv x = 0.9'))
+        interpreter.run(3)
+        self.assertEqual(interpreter.variables['rises'], 0)
+        self.assertEqual(interpreter.variables['falls'], 0)
+
+    def test_only_crossed_thresholds_are_checked(self):
+        """Test that a track update checks only the events whose thresholds it crossed."""
+        levels = [0.1 * i for i in range(1, 10)]
+        source = "track fast period 1 using fuzzy\ntv x = 0.0\nhits = 0\n" + ''.join(
+            f"when {level:.1f} <= x.fast {{\n    hits = hits + 1\n}}\n" for level in levels)
+        interpreter = load(source)
+        index = interpreter.event_index
+        self.assertEqual(index.polled, [])
+        checks = index.checks
+        drive(interpreter, 'x', 'fast', [0.35])
+        self.assertEqual(index.checks - checks, 3)
+        self.assertEqual(interpreter.variables['hits'], 3)
+        drive(interpreter, 'x', 'fast', [0.35, 0.45])
+        self.assertEqual(index.checks - checks, 4)
+        self.assertEqual(interpreter.variables['hits'], 4)
+
+    def test_polled_conditions(self):
+        """Test that other conditions are evaluated on every beat."""
+        source = """
+track fast period 1 using fuzzy
+tv a = 0.0
+tv b = 1.0
+both = 0
+when a and b {
+    both = both + 1
+}
+"""
+        interpreter = load(source)
+        self.assertEqual(interpreter.event_index.polled, [0])
+        drive(interpreter, 'a', 'main', [0.0, 1.0, 1.0, 0.0, 1.0])
+        self.assertEqual(interpreter.variables['both'], 2)
+
+    def test_restore_resamples_without_firing(self):
+        """Test that restoring a checkpoint records the conditions afresh."""
+        handle, path = tempfile.mkstemp(suffix='.ckpt')
+        os.close(handle)
+        try:
+            interpreter = load(SOURCE)
+            drive(interpreter, 'x', 'fast', [0.9])
+            interpreter.checkpoint(path)
+            restored = load(SOURCE)
+            restored.restore(path)
+            drive(restored, 'x', 'fast', [0.95, 0.1])
+            self.assertEqual(restored.variables['rises'], 1)
+            self.assertEqual(restored.variables['falls'], 1)
+        finally:
+            os.remove(path)
+
+    def test_conditions_keep_tracks_live(self):
+        """Test that track pruning keeps the components event rules read."""
+        interpreter = load(SOURCE)
+        liveness = prune_tracks(interpreter)
+        self.assertIn('fast', liveness.live['x'])
+        drive(interpreter, 'x', 'fast', [0.9])
+        self.assertEqual(interpreter.variables['rises'], 1)
+
+    def test_reactive_sees_event_writes(self):
+        """Test that rules reading variables event rules assign re-run under the reactive executor."""
+        source = SOURCE + """
+rule report {
+    seen = rises * 10
+}
+"""
+        interpreter = load(source)
+        with ReactiveExecutor(interpreter):
+            drive(interpreter, 'x', 'fast', [0.1, 0.1, 0.9, 0.9, 0.9])
+        self.assertEqual(interpreter.variables['seen'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Unit tests for HaackLang external input bindings.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import socket
+import tempfile
+import time
+import unittest
+from haackc.lexer import Lexer
+from haackc.parser import Parser
+from haackc.interpreter import Interpreter
+from haackc.inputs import InputBinding, InputPipeline, parse_binding
+from haackc.inputs.sources import open_source
+
+
+SOURCE = """
+track main period 1 using fuzzy
+track slow period 4 using fuzzy
+tv threat = 0.0
+tv calm = 1.0
+rule react {
+    calm.main = 1.0 - threat.main
+}
+"""
+
+
+def _interpreter():
+    interpreter = Interpreter()
+    interpreter.interpret(Parser(Lexer(SOURCE).tokenize()).parse())
+    return interpreter
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for input")
+        time.sleep(0.01)
+
+
+class TestInputs(unittest.TestCase):
+    """Test cases for the input pipeline."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_binding(self):
+        """Test binding syntax and validation"""
+        binding = parse_binding('unix:/tmp/s.sock?t=threat.main&c=calm.slow', 8, 'block')
+        self.assertEqual(binding.targets, {'t': 'threat.main', 'c': 'calm.slow'})
+        self.assertEqual(binding.decode(b'{"t": 0.5, "x": 1}'), [('threat', 'main', 0.5)])
+        with self.assertRaises(ValueError):
+            parse_binding('ftp:host')
+        with self.assertRaises(ValueError):
+            parse_binding('tcp:7000?t=threat')
+        with self.assertRaises(ValueError):
+            parse_binding('tcp:7000').decode(b'[1, 2]')
+
+    def test_tail_jsonl_applied_at_beat_start(self):
+        """Test that tailed lines are coalesced and applied before rules run"""
+        path = os.path.join(self.tmp.name, 'sensors.jsonl')
+        with open(path, 'w') as f:
+            f.write('{"threat.main": 0.9}\n')  # Written before start: not replayed
+        interpreter = _interpreter()
+        pipeline = InputPipeline([parse_binding(f'jsonl:{path}')])
+        pipeline.attach(interpreter)
+        with pipeline:
+            with open(path, 'a') as f:
+                f.write('{"threat.main": 0.2, "calm.slow": 0.1}\n{"threat.main": 0.7}\n{"nothing.main": 1}\nnot json\n')
+            stats = pipeline.stats[f'jsonl:{path}']
+            _wait_for(lambda: stats['received'] == 3 and stats['errors'] == 1)
+            _wait_for(lambda: len(pipeline._pending) == 3)
+            interpreter.step()
+
+        self.assertEqual(interpreter.truthvalues['threat'].get('main'), 0.7)
+        self.assertAlmostEqual(interpreter.truthvalues['calm'].get('main'), 0.3)
+        self.assertEqual(interpreter.truthvalues['calm'].get('slow'), 0.1)
+        self.assertEqual(stats['applied'], 2)
+        self.assertEqual(stats['unknown'], 1)
+
+    def test_inputs_across_beats(self):
+        """Test that messages arriving after a beat applied inputs are applied on later beats"""
+        path = os.path.join(self.tmp.name, 'sensors.jsonl')
+        interpreter = _interpreter()
+        pipeline = InputPipeline([parse_binding(f'jsonl:{path}')])
+        pipeline.attach(interpreter)
+        stats = pipeline.stats[f'jsonl:{path}']
+        with pipeline:
+            for value in (0.3, 0.6, 0.9):
+                with open(path, 'a') as f:
+                    f.write(f'{{"threat.main": {value}}}\n')
+                _wait_for(lambda: len(pipeline._pending) == 1)
+                interpreter.step()
+                self.assertEqual(interpreter.truthvalues['threat'].get('main'), value)
+        self.assertEqual(stats['received'], 3)
+        self.assertEqual(stats['applied'], 3)
+
+    def test_sockets_and_pipe(self):
+        """Test the TCP, Unix socket and named pipe sources"""
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        sock_path = os.path.join(self.tmp.name, 'in.sock')
+        fifo_path = os.path.join(self.tmp.name, 'in.fifo')
+        bindings = [parse_binding(f'tcp:{port}?t=threat.main'),
+                    parse_binding(f'unix:{sock_path}?c=calm.slow'),
+                    parse_binding(f'pipe:{fifo_path}?t=threat.slow')]
+        interpreter = _interpreter()
+        with InputPipeline(bindings) as pipeline:
+            with socket.create_connection(('127.0.0.1', port)) as conn:
+                conn.sendall(b'{"t": 0.4}\n')
+            with socket.socket(socket.AF_UNIX) as conn:
+                conn.connect(sock_path)
+                conn.sendall(b'{"c": 0.6}\n')
+            with open(fifo_path, 'w') as fifo:
+                fifo.write('{"t": 0.8}\n')
+            _wait_for(lambda: len(pipeline._pending) == 3)
+            self.assertEqual(pipeline.apply(interpreter), 3)
+        self.assertFalse(os.path.exists(sock_path))
+        self.assertEqual(interpreter.truthvalues['threat'].get('main'), 0.4)
+        self.assertEqual(interpreter.truthvalues['calm'].get('slow'), 0.6)
+        self.assertEqual(interpreter.truthvalues['threat'].get('slow'), 0.8)
+
+    def test_unix_socket_path_must_be_a_socket(self):
+        """Test that a Unix source replaces a stale socket but never another file"""
+        path = os.path.join(self.tmp.name, 'in.sock')
+
+        async def on_line(line):
+            pass
+
+        async def open_and_close():
+            task = asyncio.ensure_future(await open_source(parse_binding(f'unix:{path}'), on_line))
+            await asyncio.sleep(0)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        with socket.socket(socket.AF_UNIX) as stale:
+            stale.bind(path)
+        asyncio.run(open_and_close())
+        self.assertFalse(os.path.exists(path))
+
+        with open(path, 'w') as f:
+            f.write('keep me\n')
+        with self.assertRaises(ValueError):
+            asyncio.run(open_and_close())
+        with open(path) as f:
+            self.assertEqual(f.read(), 'keep me\n')
+
+    def test_queue_policies(self):
+        """Test drop-newest and drop-oldest on a full queue"""
+        for policy, expected in (('drop-newest', 0.1), ('drop-oldest', 0.3)):
+            binding = InputBinding('tcp', '0', queue_size=1, policy=policy)
+            pipeline = InputPipeline([binding])
+            queue = asyncio.Queue(1)
+            handler = pipeline._make_handler(binding, queue)
+
+            async def feed():
+                for value in (0.1, 0.2, 0.3):
+                    await handler(f'{{"threat.main": {value}}}'.encode())
+
+            asyncio.run(feed())
+            self.assertEqual(pipeline.stats[binding.uri]['dropped'], 2)
+            self.assertEqual(queue.get_nowait(), [('threat', 'main', expected)])
+
+
+if __name__ == '__main__':
+    unittest.main()
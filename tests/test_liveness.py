@@ -0,0 +1,102 @@
+"""
+Unit tests for HaackLang track-liveness analysis and pruning.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from haackc.analysis import analyze_liveness, prune_tracks
+from helpers import load
+
+
+SOURCE = """
+track fast period 2 using fuzzy
+tv threat = 0.8
+tv fear = 0.0
+tv calm = 0.5
+tv noise = 0.3
+tv mood = 0.4
+fn report(x) {
+    print(x)
+    return 0
+}
+rule update {
+    fear = fear or threat
+    calm.slow = calm.slow * 0.9
+    noise = not noise
+    mood.fast = report(mood.fast) + 0.1
+    guard main fear > 0.5 {
+        print(fear.main)
+    }
+    guard fast threat.fast and calm {
+        print(calm.fast)
+    }
+}
+"""
+
+
+class TestLiveness(unittest.TestCase):
+    """Test cases for track liveness."""
+
+    def test_live_components(self):
+        """Test which components are found live"""
+        liveness = analyze_liveness(load(SOURCE))
+        self.assertEqual(liveness.live['fear'], {'main'})
+        self.assertEqual(liveness.live['threat'], {'main', 'fast'})
+        self.assertEqual(liveness.live['calm'], {'fast'})
+        self.assertEqual(liveness.live['noise'], set())
+        self.assertEqual(liveness.live['mood'], {'fast'})
+        self.assertEqual(len(liveness.pruned_statements), 2)
+        self.assertIn('5 of 20', liveness.report())
+
+    def test_pruning_preserves_behavior(self):
+        """Test that a pruned program prints the same and keeps live values"""
+        plain, pruned = load(SOURCE), load(SOURCE)
+        liveness = prune_tracks(pruned)
+        self.assertEqual(set(pruned.truthvalues['calm'].values), {'fast'})
+        plain.run(12)
+        pruned.run(12)
+        self.assertEqual(plain.output.getvalue(), pruned.output.getvalue())
+        for name, tracks in liveness.live.items():
+            for track in tracks:
+                self.assertEqual(plain.truthvalues[name].get(track), pruned.truthvalues[name].get(track))
+
+    def test_conservative(self):
+        """Test that aggregates, prints of whole values and kept names keep every track"""
+        liveness = analyze_liveness(load("tv a = 0.5\ntv b = 0.5\nrule r {\n    b = @meta(a)\n}\n"))
+        self.assertIsNotNone(liveness.conservative)
+        self.assertEqual(liveness.live_components, liveness.total_components)
+
+        interp = load("tv a = 0.5\ntv b = 0.5\nrule r {\n    print(a)\n}\n")
+        liveness = analyze_liveness(interp, keep=['b'])
+        self.assertEqual(liveness.live['a'], set(interp.tracks))
+        self.assertEqual(liveness.live['b'], set(interp.tracks))
+
+    def test_paraconsistent_if_reads_every_track(self):
+        """Test that an if!! condition keeps every track of its condition"""
+        source = """
+track fast period 1 using fuzzy
+tv x = 0.9
+tv signal = 0.0
+rule split {
+    signal.fast = 1.0
+    if!! signal {
+        x = 1.0
+    } else {
+        x = 0.0
+    }
+    print(x.main)
+}
+"""
+        plain, pruned = load(source), load(source)
+        liveness = prune_tracks(pruned)
+        self.assertEqual(liveness.live['signal'], set(pruned.tracks))
+        plain.run(3)
+        pruned.run(3)
+        self.assertEqual(plain.output.getvalue(), pruned.output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
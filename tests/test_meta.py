@@ -0,0 +1,144 @@
+"""
+Unit tests for the HaackLang meta-logic engine.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tempfile
+import unittest
+from haackc.parser.ast_nodes import MetaBeatDecl, MetaDecl, MetaOp
+from haackc.runtime import MetaEngine
+from helpers import load, parse
+
+
+SOURCE = """
+track main period 1 using fuzzy
+track slow period 4 using fuzzy
+tv fear = 0.9
+tv trust = 0.2
+tv calm = 0.5
+meta-beat 4
+rule flip {
+    fear.main = not fear.main
+}
+meta govern {
+    trust = @blend(trust, fear, 0.5)
+    calm = @resolve(trust)
+    print(@meta(beat))
+}
+"""
+
+
+class TestMetaSyntax(unittest.TestCase):
+    """Test cases for meta-logic syntax."""
+
+    def test_parse(self):
+        program = parse(SOURCE)
+        meta_beat = next(d for d in program.declarations if isinstance(d, MetaBeatDecl))
+        self.assertEqual(meta_beat.interval, 4)
+        block = next(d for d in program.declarations if isinstance(d, MetaDecl))
+        self.assertEqual(block.name, 'govern')
+        blend = block.body[0].value
+        self.assertIsInstance(blend, MetaOp)
+        self.assertEqual((blend.operator, len(blend.args)), ('blend', 3))
+
+    def test_period_argument(self):
+        program = parse("x = @meta(period(slow))")
+        arg = program.declarations[0].value.args[0]
+        self.assertEqual((arg.name, arg.args[0].name), ('period', 'slow'))
+
+
+class TestMetaLogic(unittest.TestCase):
+    """Test cases for meta-operators and meta-beats."""
+
+    def test_meta_blocks_run_on_meta_beats(self):
+        interpreter = load(SOURCE)
+        interpreter.run(9)
+        self.assertEqual(interpreter.output.getvalue().split(), ['4.0', '8.0'])
+
+    def test_default_meta_beat_is_longest_period(self):
+        interpreter = load(SOURCE.replace("meta-beat 4\n", ""))
+        interpreter.run(14)
+        # syncop, period 7
+        self.assertEqual(interpreter.output.getvalue().split(), ['7.0', '14.0'])
+
+    def test_blend_and_resolve(self):
+        interpreter = load(SOURCE)
+        trust = interpreter.truthvalues['trust']
+        interpreter.run(4)
+        # Scalar 'not' is classical: fear.main is 0.0 again on beat 4
+        self.assertAlmostEqual(trust.get('main'), 0.1)
+        self.assertAlmostEqual(trust.get('slow'), 0.55)
+        # Meta blocks update in place, on every track
+        self.assertIs(interpreter.truthvalues['trust'], trust)
+        self.assertEqual(interpreter.truthvalues['calm'].to_dict(), {'main': 0.0, 'slow': 0.0, 'syncop': 0.0})
+
+    def test_operators(self):
+        interpreter = load("""
+        track main period 1 using fuzzy
+        tv a = 1.0
+        tv b = 0.5
+        a.slow = 0.0
+        coh = @coh(b)
+        split = @coh(a)
+        dom = @dom(main)
+        level = @meta(a)
+        slow = @meta(slow)
+        """)
+        variables = interpreter.variables
+        self.assertEqual(variables['coh'], 1.0)
+        self.assertAlmostEqual(variables['split'], 1.0 - 2.0 * (2.0 / 9.0) ** 0.5)
+        # Only a is decisive: main 1.0, slow 1.0, syncop 1.0 of a total 3.0
+        self.assertAlmostEqual(variables['dom'], 1.0 / 3.0)
+        self.assertAlmostEqual(variables['level'], 2.0 / 3.0)
+        self.assertAlmostEqual(variables['slow'], 0.25)
+
+    def test_unknown_operator(self):
+        with self.assertRaises(RuntimeError):
+            load("x = @nope(1)")
+        with self.assertRaises(RuntimeError):
+            load("x = @dom(nowhere)")
+
+
+class TestMetaEngine(unittest.TestCase):
+    """Test cases for the incremental aggregates."""
+
+    def assertMatchesFresh(self, interpreter):
+        engine = interpreter.meta
+        fresh = MetaEngine(interpreter.tracks, dict(interpreter.truthvalues))
+        self.assertAlmostEqual(engine.coherence(), fresh.coherence())
+        for name in interpreter.tracks:
+            self.assertAlmostEqual(engine.dominance(name), fresh.dominance(name))
+            self.assertAlmostEqual(engine.track_mean(name), fresh.track_mean(name))
+        for tv in interpreter.truthvalues.values():
+            self.assertAlmostEqual(engine.coherence(tv), fresh.coherence(tv))
+
+    def test_incremental_matches_recomputation(self):
+        interpreter = load(SOURCE + "tv other = 0.3\nmirror = other\nrule r2 {\n    other = not other and fear\n}\n")
+        interpreter.run(40)
+        self.assertGreater(interpreter.meta.updates, 0)
+        self.assertMatchesFresh(interpreter)
+
+    def test_only_changes_are_applied(self):
+        interpreter = load(SOURCE)
+        interpreter.run(4)
+        updates = interpreter.meta.updates
+        interpreter.run(1)
+        # Beat 5: only fear.main flips
+        self.assertEqual(interpreter.meta.updates - updates, 1)
+
+    def test_checkpoint_restore(self):
+        interpreter = load(SOURCE)
+        interpreter.run(3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'state.ckpt')
+            interpreter.checkpoint(path)
+            interpreter.run(5)
+            interpreter.restore(path)
+        self.assertMatchesFresh(interpreter)
+
+
+if __name__ == '__main__':
+    unittest.main()
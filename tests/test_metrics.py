@@ -0,0 +1,89 @@
+"""
+Unit tests for HaackLang runtime metrics.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+import urllib.request
+from haackc.lexer import Lexer
+from haackc.parser import Parser
+from haackc.interpreter import Interpreter, RuntimeMetrics, MetricsServer
+from haackc.interpreter.metrics import Histogram
+from haackc.runtime import TruthValue
+
+
+SOURCE = """
+track main period 1 using fuzzy
+track slow period 4 using fuzzy
+tv fear = 0.5
+tv calm = 0.5
+fn damp(x) {
+    return x * 0.9
+}
+context reflect using track slow {
+    rule settle {
+        calm = damp(calm)
+    }
+}
+rule spike {
+    guard slow fear > 0.4 {
+        fear = fear and not calm
+    }
+}
+"""
+
+
+class TestMetrics(unittest.TestCase):
+    """Test runtime metrics."""
+    
+    def test_histogram_quantiles(self):
+        """Test histogram quantile estimates."""
+        histogram = Histogram(bounds=(1.0, 2.0, 4.0))
+        for value in (0.5, 1.5, 1.5, 3.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.max, 3.0)
+        self.assertTrue(1.0 <= histogram.quantile(0.5) <= 2.0)
+        self.assertEqual(histogram.quantile(1.0), 3.0)
+    
+    def test_beat_counters(self):
+        """Test that counters are flushed once per beat."""
+        ast = Parser(Lexer(SOURCE).tokenize()).parse()
+        interpreter = Interpreter()
+        interpreter.interpret(ast)
+        metrics = RuntimeMetrics(interpreter)
+        metrics.enable()
+        interpreter.run(8)
+        metrics.disable()
+        
+        snapshot = metrics.registry.snapshot()
+        self.assertEqual(snapshot['haackc_beats_total'][()], 8)
+        self.assertEqual(snapshot['haackc_beat_duration_seconds']['count'], 8)
+        self.assertEqual(snapshot['haackc_rule_evaluations_total'][(('track', 'slow'),)], 8)
+        self.assertEqual(snapshot['haackc_rule_evaluations_total'][(('track', 'unbound'),)], 8)
+        # The slow guard is evaluated on beats 4 and 8
+        self.assertEqual(snapshot['haackc_guard_evaluations_total'][(('track', 'slow'),)], 2)
+        self.assertEqual(snapshot['haackc_function_calls_total'][(('function', 'damp'),)], 8)
+        # Allocations are a process-wide total, not a count for this interpreter
+        self.assertEqual(snapshot['haackc_process_truthvalue_allocations'][()], TruthValue.allocations)
+    
+    def test_http_endpoint(self):
+        """Test the Prometheus HTTP endpoint."""
+        metrics = RuntimeMetrics(Interpreter())
+        metrics.enable()
+        metrics.interpreter.run(3)
+        server = MetricsServer(metrics.registry)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+                body = response.read().decode('utf-8')
+        finally:
+            server.close()
+        self.assertIn('haackc_beats_total 3', body)
+        self.assertIn('# TYPE haackc_beat_duration_seconds histogram', body)
+
+
+if __name__ == "__main__":
+    unittest.main()
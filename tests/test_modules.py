@@ -0,0 +1,128 @@
+"""
+Unit tests for HaackLang modules and imports.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import io
+import tempfile
+import unittest
+from haackc.lexer import Lexer
+from haackc.parser import Parser
+from haackc.parser.ast_nodes import ImportDecl, ModuleDecl
+from haackc.interpreter import Interpreter
+from haackc.modules import ModuleLoader
+
+
+FEAR = """
+import lib.util as u
+fn calm(x, rate) {
+    return u::damp(x, rate) * unit()
+}
+fn unit() {
+    return 1
+}
+"""
+
+UTIL = """
+fn damp(x, rate) {
+    return x * (1 - rate)
+}
+fn broken(a) {
+    return a and
+}
+"""
+
+
+def run(source, loader):
+    interpreter = Interpreter()
+    interpreter.modules = loader
+    interpreter.output = io.StringIO()
+    interpreter.interpret(Parser(Lexer(source).tokenize()).parse())
+    return interpreter
+
+
+class TestModules(unittest.TestCase):
+    """Test cases for modules, imports and the module loader."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.dir.name, 'lib'))
+        self.write('lib/fear.haack', FEAR)
+        self.write('lib/util.haack', UTIL)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write(self, relative, source):
+        with open(os.path.join(self.dir.name, relative), 'w') as f:
+            f.write(source)
+
+    def test_parse(self):
+        """Test parsing imports and inline modules"""
+        program = Parser(Lexer("import lib.fear as f\nmodule m {\n    fn g() {\n        return 1\n    }\n}\n")
+                         .tokenize()).parse()
+        imp, mod = program.declarations
+        self.assertIsInstance(imp, ImportDecl)
+        self.assertEqual((imp.module, imp.alias), ('lib.fear', 'f'))
+        self.assertIsInstance(mod, ModuleDecl)
+        self.assertEqual(mod.body[0].name, 'g')
+        with self.assertRaises(SyntaxError):
+            Parser(Lexer("module m {\n    tv a = 1\n}\n").tokenize()).parse()
+
+    def test_import_and_call(self):
+        """Test calls through aliases, sibling calls and the module's own imports"""
+        loader = ModuleLoader([self.dir.name])
+        interp = run("import lib.fear\nimport lib.fear as f\nprint(fear::calm(0.8, 0.5))\n"
+                     "print(f::calm(0.2, 0.5))\n", loader)
+        self.assertEqual(interp.output.getvalue().split(), ['0.4', '0.1'])
+
+        util = loader.load('lib.util')
+        self.assertEqual(set(util.compiled), {'damp'})
+        self.assertEqual(loader.loads, 2)
+        run("import lib.fear\nprint(fear::unit())\n", loader)
+        self.assertEqual(loader.loads, 2)
+
+    def test_inline_module(self):
+        """Test inline module blocks"""
+        interp = run("module m {\n    fn twice(x) {\n        return x * 2\n    }\n"
+                     "    fn quad(x) {\n        return twice(twice(x))\n    }\n}\nprint(m::quad(1.5))\n",
+                     ModuleLoader([self.dir.name]))
+        self.assertEqual(interp.output.getvalue().strip(), '6.0')
+
+    def test_errors(self):
+        """Test missing modules, unknown functions and namespace clashes"""
+        loader = ModuleLoader([self.dir.name])
+        for source in ("import lib.missing\n",
+                       "import lib.fear\nfear::nothing()\n",
+                       "nowhere::f()\n",
+                       "import lib.fear as u\nimport lib.util as u\n"):
+            with self.assertRaises(RuntimeError):
+                run(source, loader)
+
+    def test_artifact_cache(self):
+        """Test that modules compile once into artifacts that load lazily"""
+        self.write('lib/util.haack', UTIL.replace("a and", "a and a"))
+        cache = os.path.join(self.dir.name, 'cache')
+        ModuleLoader([self.dir.name], cache).load('lib.util')
+        self.assertEqual(len(os.listdir(cache)), 1)
+
+        module = ModuleLoader([self.dir.name], cache).load('lib.util')
+        self.assertEqual(module.compiled, {})
+        self.assertEqual(module.function('damp').params, ['x', 'rate'])
+        self.assertEqual(set(module.compiled), {'damp'})
+        interp = run("import lib.fear\nprint(fear::calm(1.0, 0.25))\n", ModuleLoader([self.dir.name], cache))
+        self.assertEqual(interp.output.getvalue().strip(), '0.75')
+
+    def test_reload_on_change(self):
+        """Test that a changed module file is loaded again"""
+        loader = ModuleLoader([self.dir.name])
+        first = loader.load('lib.util')
+        self.write('lib/util.haack', "fn damp(x, rate) {\n    return x\n}\n\n")
+        self.assertIsNot(loader.load('lib.util'), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Unit tests for HaackLang dependency analysis and parallel beat execution.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import io
+import unittest
+from haackc.interpreter import ParallelExecutor
+from haackc.analysis import analyze, partition, aliases_of
+from helpers import load
+
+
+SOURCE = """
+track fast period 2 using fuzzy
+tv a = 0.3
+tv b = 0.6
+tv c = 0.2
+tv d = 0.9
+tv mirror = 0.0
+mirror = d
+count = 0
+
+fn mix(x, y) {
+    return (x or not y) and y
+}
+
+rule ra {
+    a = mix(a, b)
+    guard fast a {
+        b.fast = 0.5
+    }
+}
+rule rc {
+    c = not c or a
+    count = count + 1
+}
+rule rd {
+    d.main = not d.main
+}
+rule rm {
+    mirror.fast = 0.25
+}
+rule rb {
+    b = not b and b
+}
+"""
+
+
+class TestDependencies(unittest.TestCase):
+    """Test cases for the rule dependency analysis."""
+
+    def setUp(self):
+        self.interpreter = load(SOURCE)
+        self.aliases = aliases_of(self.interpreter.truthvalues)
+        self.deps = analyze(self.interpreter.rules, self.interpreter.functions, self.aliases)
+
+    def test_read_write_sets(self):
+        ra = self.deps[0]
+        self.assertEqual(ra.reads, {'a', 'b'})
+        self.assertEqual(ra.writes, {'a', 'b'})
+        self.assertEqual(ra.calls, {'mix'})
+        self.assertEqual(self.deps[1].writes, {'c', 'count'})
+
+    def test_aliases_share_a_name(self):
+        self.assertEqual(self.aliases, {'mirror': 'd'})
+        self.assertEqual(self.deps[3].writes, {'d'})
+
+    def test_partition(self):
+        # rc reads a (written by ra), rb writes b; rm writes d through its alias
+        self.assertEqual(partition(self.deps), [[0, 1, 4], [2, 3]])
+
+
+class TestParallelExecutor(unittest.TestCase):
+    """Test cases for the parallel executor."""
+
+    def assertSameState(self, expected, actual):
+        for name, tv in expected.truthvalues.items():
+            self.assertEqual(tv.values, actual.truthvalues[name].values, name)
+        self.assertEqual(expected.variables, actual.variables)
+
+    def test_matches_sequential_execution(self):
+        sequential = load(SOURCE)
+        parallel = load(SOURCE)
+        executor = ParallelExecutor(parallel, workers=2)
+        self.assertEqual(executor.assignments, [[0, 1, 4], [2, 3]])
+        with executor:
+            parallel.run(25)
+        sequential.run(25)
+        self.assertSameState(sequential, parallel)
+        self.assertEqual(parallel.variables['count'], 26)
+
+    def test_values_set_between_beats_reach_workers(self):
+        sequential = load(SOURCE)
+        parallel = load(SOURCE)
+        with ParallelExecutor(parallel, workers=2):
+            for interpreter in (sequential, parallel):
+                interpreter.run(3)
+                interpreter.truthvalues['b'].set('slow', 0.8)
+            parallel.run(5)
+        sequential.run(5)
+        self.assertSameState(sequential, parallel)
+
+    def test_printing_rules_run_in_process(self):
+        source = SOURCE + "rule rp {\n    print(c)\n}\n"
+        output = io.StringIO()
+        interpreter = load(source, output)
+        executor = ParallelExecutor(interpreter, workers=2)
+        self.assertEqual(executor.local, [0, 1, 4, 5])
+        with executor:
+            interpreter.run(2)
+        self.assertEqual(len(output.getvalue().splitlines()), 3)
+
+    def test_worker_errors_are_raised(self):
+        source = "tv a = 0.0\nx = 1\nrule r {\n    guard main a {\n        x = x / 0\n    }\n    a.main = 1.0\n}\n"
+        interpreter = load(source)
+        with ParallelExecutor(interpreter, workers=1):
+            with self.assertRaises(RuntimeError) as caught:
+                interpreter.run(1)
+        self.assertIn("Division by zero", str(caught.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Unit tests for HaackLang populations sharing one compiled program.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import io
+import unittest
+from haackc import Runtime, compile_source
+from haackc.population import SharedProgram
+from haackc.bench import WorkloadSpec, generate
+
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples')
+
+SOURCE = """
+track main period 1 using fuzzy
+track slow period 3 using fuzzy
+track crisp period 2 using classical
+tv threat = 0.0
+tv fear = 0.0
+tv calm = 0.5
+tv mirror = 0.0
+let gain = 0.5
+mirror = threat
+rule react {
+    fear = threat and not calm
+    guard slow fear > 0.3 {
+        calm.slow = calm.slow * gain + 0.1
+    }
+    gain = gain * 0.9
+}
+"""
+
+
+class TestPopulation(unittest.TestCase):
+    """Test cases for shared programs and instance states."""
+
+    def test_matches_dedicated_runtimes(self):
+        """Test that batched instances evolve exactly like separate runtimes"""
+        for source in (SOURCE, generate(WorkloadSpec(seed=5, tvs=30, rules=15))):
+            program = compile_source(source)
+            shared = SharedProgram(program, output=io.StringIO())
+            states = shared.spawn(5)
+            runtimes = [Runtime(program) for _ in states]
+            tv_name = 'threat' if source is SOURCE else 'v0'
+            values = [i / 4 for i in range(5)]
+            shared.set_many(states, tv_name, 'main', values)
+            for runtime, value in zip(runtimes, values):
+                runtime.set(tv_name, 'main', value)
+
+            shared.step_many(states, 7)
+            shared.step(states[0], 2)
+            for runtime in runtimes:
+                runtime.step(7)
+            runtimes[0].step(2)
+
+            for state, runtime in zip(states, runtimes):
+                self.assertEqual(state.beat, runtime.beat)
+                for name in shared.tv_names:
+                    self.assertEqual(shared.get(state, name), runtime.get(name))
+                for name, value in zip(shared.scalar_names, state.scalars):
+                    self.assertEqual(value, runtime.interpreter.variables[name])
+
+    def test_state_layout(self):
+        """Test aliasing, clamping and the compact instance layout"""
+        shared = SharedProgram(SOURCE)
+        state = shared.spawn()
+        self.assertEqual(shared.scalar_names, ('gain',))
+        # mirror and threat name one object after the top-level alias, so they share a row
+        self.assertEqual(len(shared.tv_names), 4)
+        self.assertEqual(len(state.tvs), 3 * 4)
+        shared.set(state, 'threat', 'crisp', 0.7)
+        self.assertEqual(shared.get(state, 'mirror', 'crisp'), 1.0)
+        with self.assertRaises(KeyError):
+            shared.set(state, 'fear', 'nowhere', 0.1)
+
+    def test_decision_making_population(self):
+        """Test a population of the decision-making example"""
+        with open(os.path.join(EXAMPLES, 'decision_making.haack')) as f:
+            shared = SharedProgram(f.read(), output=io.StringIO())
+        agents = shared.spawn(1000)
+        shared.set_many(agents, 'time_pressure', 'slow', [i / 1000 for i in range(1000)])
+        shared.step_many(agents, 3)
+        self.assertEqual({agent.beat for agent in agents}, {3})
+        self.assertEqual(shared.get(agents[500], 'time_pressure', 'slow'), 0.5)
+
+    def test_context_state_is_per_instance(self):
+        """Test that context variables and context switches belong to each instance"""
+        source = """
+track fast period 1 using fuzzy
+tv level = 0.0
+context c {
+    let x = 0
+    rule grow {
+        x = x + level.fast
+        if x > 0.15 {
+            exit c
+        }
+    }
+}
+"""
+        shared = SharedProgram(source)
+        a, b = shared.spawn(2)
+        shared.set(a, 'level', 'fast', 0.1)
+        shared.set(b, 'level', 'fast', 0.02)
+        shared.step(a, 3)
+        shared.step(b)
+        runtime = Runtime(compile_source(source))
+        runtime.set('level', 'fast', 0.02)
+        runtime.step()
+        self.assertEqual(list(b.frames), [runtime.interpreter.contexts['c'].frame[0]])
+        self.assertEqual(list(b.active), [1])
+        # a exited c after two beats, so its third beat added nothing
+        self.assertAlmostEqual(a.frames[0], 0.2)
+        self.assertEqual(list(a.active), [0])
+        self.assertEqual(list(shared.spawn().active), [1])
+
+    def test_event_edges_are_per_instance(self):
+        """Test that each instance sees its own when transitions"""
+        source = """
+track fast period 1 using fuzzy
+tv x = 0.0
+hits = 0
+when x.fast > 0.5 {
+    hits = hits + 0.1
+}
+"""
+        shared = SharedProgram(source)
+        a, b = shared.spawn(2)
+        shared.step_many([a, b])
+        for state in (a, b):
+            shared.set(state, 'x', 'fast', 0.9)
+        shared.step_many([a, b], 2)
+        self.assertEqual([a.scalars[0], b.scalars[0]], [0.1, 0.1])
+
+
+if __name__ == '__main__':
+    unittest.main()
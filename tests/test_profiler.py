@@ -0,0 +1,73 @@
+"""
+Unit tests for the HaackLang execution profiler.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tempfile
+import unittest
+from haackc.lexer import Lexer
+from haackc.parser import Parser
+from haackc.interpreter import Interpreter, Profiler
+
+
+SOURCE = """
+track main period 1 using classical
+track slow period 4 using fuzzy
+tv fear = 0.5
+fn damp(x) {
+    return x * 0.9
+}
+context reflect using track slow {
+    rule settle {
+        fear = damp(fear)
+    }
+}
+"""
+
+
+class TestProfiler(unittest.TestCase):
+    """Test the profiler."""
+    
+    def test_counts_and_stacks(self):
+        """Test that calls are attributed to rules, functions and tracks."""
+        ast = Parser(Lexer(SOURCE).tokenize()).parse()
+        interpreter = Interpreter()
+        profiler = Profiler(interpreter)
+        profiler.enable()
+        interpreter.interpret(ast)
+        interpreter.run(8)
+        profiler.disable()
+        
+        calls = {(kind, name): int(entry[0]) for (kind, name, _, _), entry in profiler.stats.items()}
+        self.assertEqual(calls[('beat', '')], 8)
+        self.assertEqual(calls[('rule', 'reflect::settle')], 9)
+        self.assertEqual(calls[('fn', 'damp')], 9)
+        self.assertIn(('fn', 'damp', 10, 16), profiler.stats)
+        self.assertEqual(set(profiler.by_track()), {'slow'})
+        
+        handle, path = tempfile.mkstemp(suffix='.folded')
+        os.close(handle)
+        try:
+            profiler.write_collapsed(path)
+            with open(path) as f:
+                frames = [line.rsplit(' ', 1)[0] for line in f]
+        finally:
+            os.remove(path)
+        self.assertIn('beat;rule reflect::settle @9:5;statement fear = @10:9;fn damp @10:16', frames)
+    
+    def test_disable_restores_methods(self):
+        """Test that a disabled profiler leaves no wrappers behind."""
+        interpreter = Interpreter()
+        profiler = Profiler(interpreter)
+        profiler.enable()
+        self.assertIn('step', vars(interpreter))
+        profiler.disable()
+        for name in Profiler.WRAPPED:
+            self.assertNotIn(name, vars(interpreter))
+
+
+if __name__ == "__main__":
+    unittest.main()
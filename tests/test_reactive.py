@@ -0,0 +1,196 @@
+"""
+Unit tests for HaackLang reactive rule execution.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import io
+import unittest
+from haackc.interpreter import ReactiveExecutor
+from helpers import load
+
+
+SOURCE = """
+track fast period 2 using fuzzy
+track slow period 3 using fuzzy
+tv sensor = 0.8
+tv alarm = 0.0
+tv calm = 0.5
+tv decay = 0.9
+level = 0
+
+fn settle(x) {
+    return x and calm
+}
+
+rule detect {
+    alarm = settle(sensor) or alarm
+    guard fast alarm {
+        calm.fast = 0.2
+    }
+}
+rule count {
+    if alarm {
+        level = 1
+    }
+}
+rule fade {
+    decay = decay and 0.5
+    decay.slow = 0.4
+}
+"""
+
+
+def snapshot(interpreter):
+    return ({name: dict(tv.values) for name, tv in interpreter.truthvalues.items()},
+            dict(interpreter.variables))
+
+
+class TestReactiveExecutor(unittest.TestCase):
+    """Test cases for the reactive executor."""
+
+    def run_both(self, source, beats, between=None):
+        """Runs a program with full and reactive evaluation, returning both states per beat."""
+        runs = []
+        for reactive in (False, True):
+            output = io.StringIO()
+            interpreter = load(source, output)
+            executor = ReactiveExecutor(interpreter) if reactive else None
+            if executor:
+                executor.enable()
+            states = []
+            for beat in range(beats):
+                if between:
+                    between(interpreter, executor, beat)
+                interpreter.step()
+                states.append(snapshot(interpreter))
+            runs.append((states, output.getvalue(), executor))
+        return runs
+
+    def test_matches_full_evaluation(self):
+        """Test that every beat's state is the same as with every rule re-run."""
+        (full, _, _), (reactive, _, executor) = self.run_both(SOURCE, 30)
+        self.assertEqual(reactive, full)
+        self.assertGreater(executor.skipped, 0)
+        self.assertIn('skipped', executor.report())
+
+    def test_settled_rules_are_skipped(self):
+        """Test that rules whose inputs stop changing stop running."""
+        interpreter = load(SOURCE)
+        with ReactiveExecutor(interpreter) as executor:
+            interpreter.run(60)
+            executed = executor.executed
+            interpreter.run(12)
+        self.assertEqual(executor.executed, executed)
+        self.assertNotIn('execute_rules', vars(interpreter))
+
+    def test_external_changes_propagate(self):
+        """Test that host writes through set and invalidate re-run the rules downstream."""
+        def poke(interpreter, executor, beat):
+            if beat == 20:
+                interpreter.truthvalues['sensor'].set('main', 0.1)
+                interpreter.truthvalues['alarm'].set('main', 0.0)
+            if beat == 25:
+                interpreter.truthvalues['alarm'].values['fast'] = 0.0
+                if executor:
+                    executor.invalidate(['alarm'])
+        (full, _, _), (reactive, _, executor) = self.run_both(SOURCE, 40, poke)
+        self.assertEqual(reactive, full)
+        self.assertGreater(executor.versions['alarm'], 0)
+
+    def test_effects_run_every_beat(self):
+        """Test that printing rules and rules reading the beat are never skipped."""
+        source = """
+tv a = 0.7
+rule show {
+    print(a)
+}
+rule clock {
+    now = rhythm::beat()
+}
+"""
+        (full, full_output, _), (reactive, output, executor) = self.run_both(source, 8)
+        self.assertEqual(reactive, full)
+        self.assertEqual(output, full_output)
+        # Once when the program is loaded, then on every beat
+        self.assertEqual(output.count('\n'), 9)
+        self.assertEqual(executor.skipped, 0)
+
+    def test_later_rules_run_in_the_same_beat(self):
+        """Test that a change schedules the dependent rules declared after it into the beat."""
+        source = """
+tv a = 0.0
+tv b = 0.0
+step = 0
+rule source {
+    step = step + 1
+    if step > 5 {
+        a = 1.0
+    }
+}
+rule sink {
+    b = a
+}
+"""
+        (full, _, _), (reactive, _, _) = self.run_both(source, 10)
+        self.assertEqual(reactive, full)
+        self.assertEqual(reactive[5][0]['b']['main'], 1.0)
+
+
+    def test_meta_and_event_writes_propagate(self):
+        """Test that variables assigned by meta blocks and event rules re-run the rules reading them."""
+        source = """
+track fast period 1 using fuzzy
+tv x = 0.0
+tv seen = 0.0
+tv tuned = 0.0
+hits = 0
+gain = 0
+step = 0
+meta-beat 3
+rule ramp {
+    step = step + 1
+    x.fast = step / 10
+}
+rule copy {
+    seen = hits / 10
+    tuned = gain / 10
+}
+when x.fast > 0.45 {
+    hits = hits + 1
+}
+meta tune {
+    gain = gain + 1
+}
+"""
+        (full, _, _), (reactive, _, _) = self.run_both(source, 12)
+        self.assertEqual(reactive, full)
+        self.assertEqual(reactive[-1][0]['seen']['fast'], 0.1)
+
+    def test_quiet_beats_do_not_scan_rules(self):
+        """Test that a beat only looks at the rules its changes made pending, not the whole program."""
+        class CountingSet(frozenset):
+            scans = 0
+
+            def __iter__(self):
+                CountingSet.scans += 1
+                return super().__iter__()
+
+        interpreter = load(SOURCE)
+        with ReactiveExecutor(interpreter) as executor:
+            interpreter.run(60)
+            executor._stable = CountingSet(executor._stable)
+            interpreter.run(12)
+            self.assertEqual(CountingSet.scans, 0)
+            self.assertTrue(all(not pending for pending in executor._pending.values()))
+            interpreter.truthvalues['decay'].set('fast', 0.9)
+            executed = executor.executed
+            interpreter.step()
+        self.assertEqual(executor.executed, executed + 1)
+        self.assertEqual(CountingSet.scans, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Unit tests for HaackLang intra-beat rule saturation.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from haackc.interpreter import SaturationExecutor
+from helpers import load
+
+
+RULES = {
+    'confidence': """
+rule confidence {
+    confidence = courage
+}
+""",
+    'courage': """
+rule courage {
+    courage = not fear
+}
+""",
+    'fear': """
+rule fear {
+    fear = threat and not calm
+}
+""",
+}
+
+HEADER = """
+track fast period 2 using fuzzy
+tv threat = 0.8
+tv calm = 0.3
+tv fear = 0.0
+tv courage = 0.0
+tv confidence = 0.0
+"""
+
+
+def program(*order):
+    return HEADER + ''.join(RULES[name] for name in order)
+
+
+def state(interpreter):
+    return {name: dict(tv.values) for name, tv in interpreter.truthvalues.items()}
+
+
+class TestSaturationExecutor(unittest.TestCase):
+    """Test cases for the saturation executor."""
+
+    def test_declaration_order_does_not_matter(self):
+        """Test that saturated beats reach the same state for any rule order."""
+        states = []
+        for order in (('confidence', 'courage', 'fear'), ('fear', 'courage', 'confidence')):
+            interpreter = load(program(*order))
+            with SaturationExecutor(interpreter) as executor:
+                # Every track fires at least once
+                interpreter.run(28)
+            states.append(state(interpreter))
+            self.assertEqual(executor.capped, 0)
+        self.assertEqual(states[0], states[1])
+        self.assertEqual(states[0]['confidence'], states[0]['courage'])
+
+    def test_only_affected_rules_rerun(self):
+        """Test that later rounds re-run only the rules downstream of the last round's changes."""
+        interpreter = load(program('confidence', 'courage', 'fear'))
+        # The load pass ran each rule once; move the inputs so the beat has work
+        interpreter.truthvalues['threat'].set('main', 0.1)
+        with SaturationExecutor(interpreter) as executor:
+            interpreter.step()
+        # Every rule, then the readers of fear and courage, then of courage
+        self.assertEqual(executor.rounds, 3)
+        self.assertEqual(executor.rule_runs, 6)
+        self.assertEqual(interpreter.truthvalues['confidence'].get('main'),
+                         interpreter.truthvalues['courage'].get('main'))
+
+    def test_round_cap_reports_unconverged(self):
+        """Test that oscillating rules stop at the cap and are reported."""
+        source = """
+tv flip = 0.0
+tv steady = 0.5
+rule toggle {
+    flip = not flip
+}
+rule hold {
+    steady = 0.5
+}
+"""
+        interpreter = load(source)
+        with SaturationExecutor(interpreter, max_rounds=5) as executor:
+            interpreter.run(2)
+        self.assertEqual(executor.capped, 2)
+        self.assertEqual(executor.most_rounds, 5)
+        self.assertEqual(executor.last_unconverged, ['flip'])
+        self.assertEqual(executor.unconverged, {'flip': 2})
+        self.assertIn('flip', executor.report())
+        self.assertNotIn('execute_rules', vars(interpreter))
+
+    def test_epsilon_ends_fuzzy_convergence(self):
+        """Test that changes below epsilon count as converged."""
+        source = """
+track fast period 1 using fuzzy
+tv x = 0.0
+rule approach {
+    x.fast = tv::blend(x.fast, 1.0, 0.5)
+}
+"""
+        coarse = load(source)
+        with SaturationExecutor(coarse, epsilon=0.01) as loose:
+            coarse.step()
+        fine = load(source)
+        with SaturationExecutor(fine, epsilon=1e-9) as tight:
+            fine.step()
+        self.assertEqual(loose.capped, 0)
+        self.assertLess(loose.rounds, tight.rounds)
+        self.assertGreater(fine.truthvalues['x'].get('fast'), coarse.truthvalues['x'].get('fast'))
+
+    def test_invalid_settings(self):
+        """Test that a negative epsilon and no rounds are rejected."""
+        interpreter = load(program('fear'))
+        with self.assertRaises(ValueError):
+            SaturationExecutor(interpreter, epsilon=-1.0)
+        with self.assertRaises(ValueError):
+            SaturationExecutor(interpreter, max_rounds=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
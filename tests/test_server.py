@@ -0,0 +1,118 @@
+"""
+Unit tests for the HaackLang program server.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tempfile
+import threading
+import unittest
+from haackc.server import Client, HaackServer
+
+
+SOURCE = """
+track main period 1 using fuzzy
+tv threat = 0.0
+tv fear = 0.0
+rule react {
+    fear = threat and threat
+}
+print(threat.main)
+"""
+
+
+class TestServer(unittest.TestCase):
+    """Test cases for the program server."""
+
+    def setUp(self):
+        self.server = HaackServer(cache_size=2)
+        host, self.port = self.server.serve_in_background()
+
+    def tearDown(self):
+        self.server.shutdown()
+
+    def test_sessions(self):
+        """Test load, set, step, get, snapshot and close over TCP"""
+        with Client(port=self.port) as client:
+            loaded = client.call('load', session='a', source=SOURCE)
+            self.assertFalse(loaded['cached'])
+            self.assertEqual(loaded['output'], '0.0\n')
+            self.assertTrue(client.call('load', session='b', source=SOURCE)['cached'])
+
+            client.call('set', session='a', values={'threat.main': 0.7})
+            self.assertEqual(client.call('step', session='a', n=3)['beat'], 3)
+            self.assertEqual(client.call('get', session='a', tv='fear', track='main'), 0.7)
+            self.assertEqual(client.call('get', session='b', tv='fear', track='main'), 0.0)
+            self.assertEqual(client.call('snapshot', session='a')['truthvalues']['threat']['main'], 0.7)
+            self.assertGreater(client.last_latency_us, 0)
+
+            with self.assertRaisesRegex(RuntimeError, 'Unknown truth value'):
+                client.call('get', session='a', tv='nothing')
+            with self.assertRaisesRegex(RuntimeError, 'Unknown operation'):
+                client.call('explode', session='a')
+            with self.assertRaises(RuntimeError):
+                client.call('load', session='c', source='tv = =')
+            # Unexpected failures are reported and keep the connection open
+            with self.assertRaises(RuntimeError):
+                client.call('step', session='a', n=float('inf'))
+            self.assertEqual(client.call('step', session='a')['beat'], 4)
+
+            client.call('close', session='b')
+            with self.assertRaisesRegex(RuntimeError, 'Unknown session'):
+                client.call('step', session='b')
+
+            stats = client.call('stats')
+            self.assertEqual(stats['sessions'], 1)
+            self.assertEqual(stats['cache']['hits'], 1)
+            self.assertEqual(stats['latency_us']['step']['count'], 4)
+
+    def test_concurrent_clients(self):
+        """Test that concurrent clients on separate sessions see their own state"""
+        results = {}
+
+        def agent(name, value):
+            with Client(port=self.port) as client:
+                client.call('load', session=name, source=SOURCE)
+                for _ in range(20):
+                    client.call('set', session=name, values={'threat.main': value})
+                    client.call('step', session=name)
+                results[name] = client.call('get', session=name, tv='fear', track='main')
+
+        threads = [threading.Thread(target=agent, args=(f"s{i}", i / 10)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {f"s{i}": i / 10 for i in range(8)})
+        self.assertEqual(len(self.server.cache), 1)
+
+    def test_unix_socket(self):
+        """Test serving on a Unix domain socket"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'haackc.sock')
+            server = HaackServer()
+            server.serve_in_background(unix_path=path)
+            try:
+                with Client(unix_path=path) as client:
+                    client.call('load', session='u', source=SOURCE)
+                    self.assertEqual(client.call('step', session='u', n=2)['beat'], 2)
+            finally:
+                server.shutdown()
+            self.assertFalse(os.path.exists(path))
+
+    def test_unix_socket_path_must_be_a_socket(self):
+        """Test that the server refuses to replace a file that is not a socket"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'haackc.sock')
+            with open(path, 'w') as f:
+                f.write('keep me\n')
+            with self.assertRaises(ValueError):
+                HaackServer().serve_in_background(unix_path=path)
+            with open(path) as f:
+                self.assertEqual(f.read(), 'keep me\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
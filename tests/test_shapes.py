@@ -0,0 +1,123 @@
+"""
+Unit tests for HaackLang shape inference and specialized evaluation.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import io
+import unittest
+from haackc.parser.ast_nodes import Shape
+from haackc.interpreter import Interpreter
+from haackc.analysis import infer_shapes
+from helpers import load, parse
+
+
+SOURCE = """
+tv fear = 0.6
+tv calm = 0.3
+level = 0.4
+fn mix(a, b) {
+    return a and not b
+}
+rule update {
+    fear = fear or 0.2
+    calm = mix(calm, fear)
+    level = level * 0.9 + fear.slow
+    if fear and calm {
+        print(level)
+    }
+    guard slow 0.7 or calm {
+        print(not level)
+    }
+}
+"""
+
+
+def rule_body(program):
+    return [decl for decl in program.declarations if type(decl).__name__ == 'RuleDecl'][0].body
+
+
+class TestShapes(unittest.TestCase):
+    """Test cases for shape inference."""
+
+    def test_labels(self):
+        """Test that expressions are labelled scalar, truthvector or track"""
+        program = parse(SOURCE)
+        shapes = infer_shapes(program, Interpreter())
+        self.assertEqual(shapes.errors, [])
+        self.assertEqual(shapes.static, shapes.total)
+        fear, calm, level, branch, guard = rule_body(program)
+        self.assertEqual(fear.value.shape, Shape.TRUTHVECTOR)
+        self.assertEqual(fear.value.right.shape, Shape.SCALAR)
+        self.assertEqual(calm.value.shape, Shape.TRUTHVECTOR)
+        self.assertEqual(level.value.shape, Shape.SCALAR)
+        self.assertEqual(level.value.right.shape, Shape.TRACK)
+        self.assertEqual(branch.condition.shape, Shape.TRUTHVECTOR)
+        self.assertEqual(guard.condition.shape, Shape.TRUTHVECTOR)
+        self.assertEqual(guard.body[0].expression.args[0].shape, Shape.SCALAR)
+
+    def test_dynamic(self):
+        """Test that names bound to numbers and truth values, and module calls, are dynamic"""
+        program = parse("x = 0.5\ntv a = 0.5\nrule r {\n    x = a and x\n}\n")
+        infer_shapes(program, Interpreter())
+        self.assertEqual(rule_body(program)[0].value.shape, Shape.DYNAMIC)
+
+        program = parse("x = 0.5\ny = x or 0\nz = lib::f(x)\n")
+        infer_shapes(program, Interpreter())
+        self.assertEqual(program.declarations[1].value.shape, Shape.DYNAMIC)
+        self.assertEqual(program.declarations[2].value.shape, Shape.DYNAMIC)
+
+        # Numbers assigned to a declared truth value update its tracks
+        program = parse("tv a = 0.5\nrule r {\n    a = 0.2\n    b = a or 0\n}\n")
+        infer_shapes(program, Interpreter())
+        self.assertEqual(rule_body(program)[1].value.shape, Shape.TRUTHVECTOR)
+
+    def test_errors_before_running(self):
+        """Test that shape errors are raised before anything executes"""
+        for source in ("tv a = 0.5\nprint(1)\nrule r {\n    a.slow = a and a\n}\n",
+                       "x = 0.5\nprint(1)\nx.main = 1\n",
+                       "print(1)\ny = nothing.main\n"):
+            interpreter = Interpreter()
+            interpreter.output = io.StringIO()
+            with self.assertRaises(TypeError):
+                interpreter.interpret(parse(source))
+            self.assertEqual(interpreter.output.getvalue(), '')
+
+    def test_function_parameters(self):
+        """Test that parameters of uncalled functions are dynamic and errors are reported once"""
+        program = parse("fn f(a) {\n    return a.main\n}\n")
+        shapes = infer_shapes(program, Interpreter())
+        self.assertEqual(shapes.errors, [])
+        load("fn f(a) {\n    return a.main\n}\n")
+
+        shapes = infer_shapes(parse("fn f() {\n    return nothing.main\n}\n"), Interpreter())
+        self.assertEqual(shapes.errors, ["Type error at 2:12: nothing is not a truth value"])
+
+    def test_specialized_matches_dynamic(self):
+        """Test that specialized evaluation gives the same results as dynamic evaluation"""
+        typed = load(SOURCE)
+        dynamic = Interpreter()
+        dynamic.output = io.StringIO()
+        program = parse(SOURCE)
+        infer_shapes(program, dynamic)
+        stack = list(program.declarations)
+        while stack:
+            node = stack.pop()
+            if hasattr(node, 'shape'):
+                node.shape = Shape.DYNAMIC
+            for value in vars(node).values():
+                stack.extend(v for v in (value if isinstance(value, list) else [value]) if hasattr(v, 'line'))
+        for decl in program.declarations:
+            dynamic.execute_declaration(decl)
+        typed.run(12)
+        dynamic.run(12)
+        self.assertEqual(typed.output.getvalue(), dynamic.output.getvalue())
+        for name, tv in typed.truthvalues.items():
+            self.assertEqual(tv.values, dynamic.truthvalues[name].values)
+        self.assertEqual(typed.variables['level'], dynamic.variables['level'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Unit tests for the HaackLang native standard library.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from haackc.parser.ast_nodes import ExpressionStatement, FunctionCall, Variable
+from haackc.interpreter import Interpreter, Profiler, RuntimeMetrics
+from haackc.bench import stdlib_program
+from haackc.analysis import analyze
+import helpers
+from helpers import parse
+
+
+HEADER = """
+track main period 1 using classical
+track slow period 4 using fuzzy
+track para period 2 using paraconsistent
+"""
+
+
+def load(source):
+    return helpers.load(HEADER + source)
+
+
+class TestStdlib(unittest.TestCase):
+    """Test cases for the namespaced builtins."""
+
+    def test_parse_namespaced_call(self):
+        """Test that ns::name calls parse, including keyword namespaces and mode names"""
+        program = parse("tv::drift(a, 0.1)\npara::resolve(a, classical)\n")
+        first, second = program.declarations
+        self.assertIsInstance(first, ExpressionStatement)
+        self.assertEqual(first.expression.name, 'tv::drift')
+        call = second.expression
+        self.assertIsInstance(call, FunctionCall)
+        self.assertEqual(call.name, 'para::resolve')
+        self.assertIsInstance(call.args[1], Variable)
+        self.assertEqual(call.args[1].name, 'classical')
+
+    def test_truthvector_functions(self):
+        """Test tv:: and fuzzy:: builtins on whole truth values"""
+        interp = load("""
+tv a = 0.8
+tv b = 0.2
+let blended = tv::blend(a, b, 0.25)
+let drifted = tv::drift(a, 0.5)
+let low = fuzzy::t_norm(a, b)
+let smooth = fuzzy::smooth_step(a)
+let ramp = fuzzy::soft_threshold(a, 0.75, 0.2)
+""")
+        blended = interp.truthvalues['blended']
+        self.assertEqual(blended.get('main'), 1.0)
+        self.assertAlmostEqual(blended.get('slow'), 0.65)
+        self.assertAlmostEqual(interp.truthvalues['drifted'].get('slow'), 0.4)
+        self.assertAlmostEqual(interp.truthvalues['low'].get('para'), 0.2)
+        self.assertAlmostEqual(interp.truthvalues['smooth'].get('slow'), 0.896)
+        self.assertAlmostEqual(interp.truthvalues['ramp'].get('slow'), 0.75)
+        self.assertAlmostEqual(interp.truthvalues['a'].get('slow'), 0.8)
+
+    def test_para_and_rhythm(self):
+        """Test resolution modes, conflict and resonance"""
+        interp = load("""
+tv a = 0.0
+a.slow = 0.6
+a.para = 0.9
+let snapped = para::resolve(a, classical)
+let kept = para::resolve(a, preserve)
+let merged = para::resolve(a, blend)
+let tension = para::conflict(a, a)
+let aligned = rhythm::resonance(a, a, a)
+""")
+        self.assertEqual(interp.truthvalues['snapped'].values, {'main': 0.0, 'slow': 1.0, 'syncop': 0.0, 'para': 1.0})
+        self.assertEqual(interp.truthvalues['kept'].values, interp.truthvalues['a'].values)
+        self.assertAlmostEqual(interp.truthvalues['merged'].get('slow'), 0.375)
+        self.assertEqual(interp.variables['tension'], 0.0)
+        self.assertEqual(interp.variables['aligned'], 1.0)
+
+    def test_beat_assignment_freezes_tracks(self):
+        """Test that builtins in rules only update firing tracks"""
+        interp = load("""
+tv level = 1.0
+tv zero = 0.0
+rule decay {
+    level = tv::blend(level, zero, 0.5)
+    print(rhythm::beat())
+}
+""")
+        interp.run(2)
+        self.assertEqual(interp.output.getvalue().split(), ['0.0', '1.0', '2.0'])
+        self.assertAlmostEqual(interp.truthvalues['level'].get('slow'), 0.5)
+        self.assertAlmostEqual(interp.truthvalues['level'].get('para'), 0.25)
+
+    def test_calls_are_counted(self):
+        """Test that metrics and the profiler see builtin calls that are a beat assignment's whole value"""
+        source = """
+tv a = 0.8
+tv b = 0.2
+fn mix(x, y) {
+    return x and y
+}
+rule r {
+    b = tv::blend(a, b, 0.5)
+    if tv::blend(a, b, 0.5) > 0.3 {
+        b = mix(a, b)
+    }
+    a = mix(a, b)
+}
+"""
+        interp = load(source)
+        metrics = RuntimeMetrics(interp)
+        profiler = Profiler(interp)
+        metrics.enable()
+        profiler.enable()
+        interp.run(4)
+        profiler.disable()
+        metrics.disable()
+        calls = metrics.registry.snapshot()['haackc_function_calls_total']
+        self.assertEqual(calls[(('function', 'tv::blend'),)], 8)
+        self.assertEqual(calls[(('function', 'mix'),)], 8)
+        profiled = {}
+        for (kind, name, _line, _column), stats in profiler.stats.items():
+            if kind == 'fn':
+                profiled[name] = profiled.get(name, 0) + stats[0]
+        self.assertEqual(profiled, {'tv::blend': 8, 'mix': 8})
+
+    def test_errors(self):
+        """Test arity, symbol and mode errors"""
+        for source in ("tv a = 0.5\ntv::blend(a, a)\n",
+                       "tv a = 0.5\npara::resolve(a, 0.5)\n",
+                       "tv a = 0.5\npara::resolve(a, sideways)\n",
+                       "tv a = 0.5\ntv::nothing(a)\n"):
+            with self.assertRaises(RuntimeError):
+                load(source)
+
+    def test_dependencies(self):
+        """Test that builtin calls are pure for dependency analysis"""
+        interp = load("tv a = 0.5\ntv b = 0.5\nrule r {\n    a = tv::drift(b, 0.1)\n}\n")
+        deps = analyze(interp.rules, interp.functions)
+        self.assertEqual(deps[0].reads, {'b'})
+        self.assertEqual(deps[0].writes, {'a'})
+        self.assertFalse(deps[0].effects)
+
+    def test_benchmark_variants_agree(self):
+        """Test that the stdlib benchmark and its user-fn version compute the same state"""
+        states = []
+        for native in (True, False):
+            interp = Interpreter()
+            interp.interpret(parse(stdlib_program(20, native)))
+            interp.run(15)
+            states.append({name: tv.values for name, tv in interp.truthvalues.items()})
+        for name, values in states[0].items():
+            for track, value in values.items():
+                self.assertAlmostEqual(value, states[1][name][track])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Unit tests for HaackLang wall-clock tempo scheduling.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import unittest
+from haackc.interpreter import Interpreter, TempoScheduler
+from haackc.interpreter.tempo import parse_tempo
+
+
+class FakeClock:
+    """A clock advanced by sleeping and by simulated beat compute time."""
+
+    def __init__(self, costs):
+        self.now = 0.0
+        self.costs = list(costs)
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _scheduler(policy, costs):
+    interpreter = Interpreter()
+    clock = FakeClock(costs)
+
+    def step():
+        interpreter.step()
+        clock.now += clock.costs.pop(0) if clock.costs else 0.001
+
+    return TempoScheduler(interpreter, 100, policy, step=step, clock=clock, sleep=clock.sleep), clock
+
+
+class TestTempo(unittest.TestCase):
+    """Test cases for the tempo scheduler."""
+
+    def test_parse_tempo(self):
+        """Test Hz and BPM tempo syntax"""
+        self.assertEqual(parse_tempo('100'), 100.0)
+        self.assertEqual(parse_tempo('100Hz'), 100.0)
+        self.assertEqual(parse_tempo('120bpm'), 2.0)
+        for bad in ('fast', '0', '-5hz'):
+            with self.assertRaises(ValueError):
+                parse_tempo(bad)
+
+    def test_on_time(self):
+        """Test that beats start on their due times when compute fits the period"""
+        scheduler, clock = _scheduler('catch-up', [])
+        scheduler.run(10)
+        self.assertEqual(scheduler.beats, 10)
+        self.assertEqual(scheduler.overruns, 0)
+        self.assertAlmostEqual(scheduler.lateness.max, 0.0)
+        self.assertAlmostEqual(scheduler.jitter, 0.0)
+        self.assertAlmostEqual(clock.now, 0.091)
+
+    def test_catch_up(self):
+        """Test that a long beat is followed by back-to-back beats until on schedule"""
+        scheduler, clock = _scheduler('catch-up', [0.035])
+        scheduler.run(6)
+        # Beats 1 and 2 run late and miss their deadlines too; beat 3 is back on schedule
+        self.assertEqual(scheduler.overruns, 3)
+        self.assertEqual(scheduler.skipped, 0)
+        self.assertEqual(scheduler.interpreter.global_beat, 6)
+        self.assertAlmostEqual(scheduler.lateness.max, 0.025)
+        self.assertGreater(scheduler.jitter, 0.0)
+
+    def test_skip(self):
+        """Test that overdue beats are skipped but still advance the global beat"""
+        scheduler, clock = _scheduler('skip', [0.035])
+        scheduler.run(4)
+        self.assertEqual(scheduler.overruns, 1)
+        self.assertEqual(scheduler.skipped, 2)
+        self.assertEqual(scheduler.beats, 4)
+        self.assertEqual(scheduler.interpreter.global_beat, 6)
+        self.assertIn('2 skipped', scheduler.report())
+
+    def test_skip_calls_beat_hooks(self):
+        """Test that beat hooks see skipped beats as well as executed ones"""
+        scheduler, clock = _scheduler('skip', [0.035])
+        beats = []
+        scheduler.interpreter.beat_hooks.append(lambda interpreter: beats.append(interpreter.global_beat))
+        scheduler.run(4)
+        self.assertEqual(beats, [1, 2, 3, 4, 5, 6])
+
+    def test_run_async(self):
+        """Test the asyncio driver"""
+        scheduler = TempoScheduler(Interpreter(), 1000)
+        asyncio.run(scheduler.run_async(5))
+        self.assertEqual(scheduler.beats, 5)
+        self.assertEqual(scheduler.interpreter.global_beat, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
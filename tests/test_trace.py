@@ -0,0 +1,115 @@
+"""
+Unit tests for HaackLang execution traces.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tempfile
+import unittest
+from array import array
+from haackc.lexer import Lexer
+from haackc.parser import Parser
+from haackc.interpreter import Interpreter
+from haackc.trace import TraceWriter, TraceReader, TraceQuery
+from haackc.trace.format import encode_column, decode_column
+
+
+SOURCE = """
+track main period 1 using fuzzy
+track slow period 4 using fuzzy
+tv fear = 0.9
+tv calm = 0.1
+rule settle {
+    fear = fear * 0.9
+    calm = calm + 0.05
+}
+"""
+
+
+class TestTrace(unittest.TestCase):
+    """Test the trace writer and reader."""
+    
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.hlt')
+        os.close(handle)
+    
+    def tearDown(self):
+        os.remove(self.path)
+    
+    def test_column_codec(self):
+        """Test that column encoding is lossless."""
+        values = array('d', [0.5, 0.5, 0.5, 0.25, 1e-300, -3.75, 0.5])
+        decoded = array('d', decode_column(encode_column(values), len(values)))
+        self.assertEqual(decoded, values)
+    
+    def test_records_every_beat(self):
+        """Test that traced values match the interpreter state on each beat."""
+        ast = Parser(Lexer(SOURCE).tokenize()).parse()
+        interpreter = Interpreter()
+        interpreter.interpret(ast)
+        
+        expected = []
+        with TraceWriter.for_interpreter(self.path, interpreter, ['fear'], chunk_beats=4) as writer:
+            writer.record(interpreter)
+            expected.append(interpreter.truthvalues['fear'].to_dict())
+            interpreter.beat_hooks.append(writer)
+            for _ in range(10):
+                interpreter.step()
+                expected.append(interpreter.truthvalues['fear'].to_dict())
+        
+        with TraceReader(self.path) as reader:
+            self.assertEqual(reader.tv_names, ['fear'])
+            self.assertEqual(len(reader.chunks), 3)
+            self.assertEqual(list(reader.beats()), list(range(11)))
+            fear = reader.read('fear')
+            for track_name in ('main', 'slow', 'syncop'):
+                self.assertEqual(list(fear[track_name]),
+                                 [values[track_name] for values in expected])
+
+    def test_beat_gaps_start_chunks(self):
+        """Test that beats recorded after a gap keep their own beat numbers."""
+        ast = Parser(Lexer(SOURCE).tokenize()).parse()
+        interpreter = Interpreter()
+        interpreter.interpret(ast)
+
+        with TraceWriter.for_interpreter(self.path, interpreter, ['fear'], chunk_beats=4) as writer:
+            interpreter.beat_hooks.append(writer)
+            interpreter.run(2)
+            for _ in range(4):
+                interpreter.advance_beat()
+            interpreter.run(3)
+
+        with TraceReader(self.path) as reader:
+            self.assertEqual(list(reader.beats()), [1, 2, 7, 8, 9])
+            self.assertEqual([chunk[:2] for chunk in reader.chunks], [(1, 2), (7, 3)])
+            query = TraceQuery(reader)
+            beats, _values = query.range('fear', 5, 9)
+            self.assertEqual(list(beats), [7, 8])
+    
+    def test_indexed_queries(self):
+        """Test that queries only decode the chunks they need."""
+        with TraceWriter(self.path, ['ramp'], ['main'], chunk_beats=10) as writer:
+            interpreter = Interpreter()
+            interpreter.truthvalues['ramp'] = interpreter._to_truthvalue(0.0)
+            for beat in range(100):
+                interpreter.global_beat = beat
+                interpreter.truthvalues['ramp'].values['main'] = beat / 100
+                writer.record(interpreter)
+        
+        with TraceReader(self.path) as reader:
+            self.assertIsNotNone(reader.summaries)
+            query = TraceQuery(reader)
+            
+            self.assertEqual(query.where('ramp', 'main', '>', 0.7, first=True), [(71, 0.71)])
+            self.assertEqual(query.chunks_read, 1)
+            
+            beats, values = query.range('ramp', 45, 52)
+            self.assertEqual(list(beats), list(range(45, 52)))
+            self.assertEqual(list(values['main']), [beat / 100 for beat in range(45, 52)])
+            self.assertEqual(query.chunks_read, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()